@@ -554,6 +554,11 @@ PAPERTRADE_DECISION_PROMPT = """你是「模拟盘决策代理」（无人格）
         便于后续只查流水也能回看。
       - **sell 时 reason 必须对照 1.6 的入场计划**：写「触发原止损 / 触发原止盈 /
         未触计划但因…覆盖 / 无历史计划改用模式默认止损 -x%」。
+   **本轮有两笔及以上买卖时**：改用 papertrade_order_batch 一次下完（orders 为 JSON
+   数组，先卖后买），它在一个事务里完成 6a-6c（撮合 / 流水 / 现金 / 持仓），规则与
+   逐笔完全相同；**不要**再对这些单调 trade_insert / position_upsert。按返回数组逐笔
+   看 ok：被拒的（涨跌停 / T+1 / 现金不足）照上面的规则改写 hold 决策，成交的用返回的
+   trade_id 走 6d。
 7. 若 hold：只 papertrade_decision_insert 写决策（reason 详细写为什么不动；
    有持仓时简述相对入场计划：距止损/止盈还有多少）
 8. 更新 account.last_decided_at
@@ -8,11 +8,15 @@ from gsuid_core.logger import logger
 from gsuid_core.models import Event
 
 from .get_cloudmap import render_image
+from ..utils.prerender import PRERENDER
 from ..utils.resource_path import DATA_PATH
 from ..stock_config.stock_config import STOCK_CONFIG
 
 sv_stock_cloudmap = SV("大盘云图")
 
+# 三种云图的出图入口都是 render_image(市场, 参数)，预渲染目标按 (市场, 参数) 区分
+PRERENDER.register("云图", render_image)
+
 
 # 每日零点二十清理过期缓存数据，避免每天全量清空影响长周期缓存。
 @scheduler.scheduled_job("cron", hour=0, minute=20)
@@ -43,7 +47,7 @@ async def delete_all_data() -> None:
 )
 async def send_cloudmap_img(bot: Bot, ev: Event) -> None:
     logger.info("开始执行[大盘云图]")
-    im = await render_image("大盘云图", ev.text.strip())
+    im = await PRERENDER.serve("云图", "大盘云图", ev.text.strip())
     await bot.send(im)
 
 
@@ -60,7 +64,7 @@ async def send_cloudmap_img(bot: Bot, ev: Event) -> None:
 )
 async def send_typemap_img(bot: Bot, ev: Event) -> None:
     logger.info("开始执行[板块云图]")
-    im = await render_image("行业云图", ev.text.strip())
+    im = await PRERENDER.serve("云图", "行业云图", ev.text.strip())
     await bot.send(im)
 
 
@@ -78,5 +82,5 @@ async def send_typemap_img(bot: Bot, ev: Event) -> None:
 )
 async def send_gn_img(bot: Bot, ev: Event) -> None:
     logger.info("开始执行[概念云图]")
-    im = await render_image("概念云图", ev.text.strip())
+    im = await PRERENDER.serve("云图", "概念云图", ev.text.strip())
     await bot.send(im)
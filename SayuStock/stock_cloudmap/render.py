@@ -1,6 +1,7 @@
-"""云图渲染（plotly + playwright 截图）—— 大盘 / 行业 / 概念。
+"""云图渲染 —— 大盘 / 行业 / 概念。
 
-**这是活的那份 plotly 渲染器**：`大盘云图` / `行业云图` / `概念云图` 三个命令走这里。
+`大盘云图` / `行业云图` / `概念云图` 三个命令走这里。默认用 ``render_native`` 在进程内
+直接画矩形树图；``mapcloud_native`` 关掉时回退到 plotly + Playwright 截图（``to_fig``）。
 个股、日K、对比走的是 ``stock_stockinfo/``（matplotlib），与本模块无关。
 
 本模块曾是 ``stock_stockinfo/render.py`` 的整份拷贝，因此长期挂着 kline / 分时 /
@@ -12,23 +13,29 @@
 渲染前的数据层见 ``utils/render_data.py``，给 AI 的文字见 ``utils/render_text.py``。
 """
 
+import asyncio
 from pathlib import Path
 from datetime import datetime, timedelta
+from dataclasses import dataclass
 
 import plotly.express as px
 from plotly.graph_objects import Figure
 
 from gsuid_core.logger import logger
-from gsuid_core.ai_core.trigger_bridge import ai_return
+from gsuid_core.utils.image.convert import convert_img
 
 from .data import CLOUDMAP_DATA_SERVICE
 from ..utils import render_text
 from .render_data import (
     build_cloudmap_render_data,
 )
-from ..utils.image import is_plotly_html, render_image_by_pw
+from ..utils.image import scale, view_port, is_plotly_html, screenshot_html
+from .render_native import cloudmap_image
 from ..utils.constant import ErroText
+from ..utils.prerender import ai_return
 from ..utils.stock.utils import get_file
+from ..utils.image_encode import encode_options
+from ..utils.render_cache import RENDER_CACHE, stable_hash
 from ..utils.market.models import BoardSnapshot
 from ..stock_config.stock_config import STOCK_CONFIG
 
@@ -79,12 +86,24 @@ async def to_fig(snap: BoardSnapshot, market: str, sector: str | None = None, la
     return fig
 
 
-async def render_html(
-    market: str = "沪深A",
-    sector: str | None = None,
-    start_time: datetime | None = None,
-    end_time: datetime | None = None,
-) -> str | Path:
+@dataclass(slots=True)
+class _CloudmapRequest:
+    market: str
+    sector: str | None
+    snap: BoardSnapshot
+    special_cache_key: str | None
+
+    @property
+    def layer(self) -> int:
+        return 2 if self.market == "大盘云图" else 1
+
+
+async def _fetch_cloudmap(
+    market: str,
+    sector: str | None,
+    start_time: datetime | None,
+    end_time: datetime | None,
+) -> str | _CloudmapRequest:
     logger.info(f"[SayuStock] market: {market} sector: {sector}")
     if sector == "single-stock" and not market:
         return ErroText["notMarket"]
@@ -101,11 +120,27 @@ async def render_html(
         return ErroText["notData"]
 
     # 文字必须在缓存判断**之前**发：部分模型看不到图，ai_return 的文字是它唯一的
-    # 输入，而命中 HTML 缓存会直接 return，绕过下面的出图 —— 那样同一命令在刷新
-    # 窗口内问第二次，AI 就一个字都收不到。
+    # 输入，而命中 HTML / 内容缓存会直接 return，绕过下面的出图 —— 那样同一命令在
+    # 刷新窗口内问第二次，AI 就一个字都收不到。
     _ai_return_cloudmap(raw_data, market, sector)
+    return _CloudmapRequest(market, sector, raw_data, data_result.special_cache_key)
+
 
-    file = get_file(market, "html", sector, data_result.special_cache_key)
+async def render_html(
+    market: str = "沪深A",
+    sector: str | None = None,
+    start_time: datetime | None = None,
+    end_time: datetime | None = None,
+) -> str | Path:
+    request = await _fetch_cloudmap(market, sector, start_time, end_time)
+    if isinstance(request, str):
+        return request
+    return await _write_html(request)
+
+
+async def _write_html(request: _CloudmapRequest) -> str | Path:
+    market, sector = request.market, request.sector
+    file = get_file(market, "html", sector, request.special_cache_key)
     if file.exists():
         minutes = int(STOCK_CONFIG.get_config("mapcloud_refresh_minutes").data)
         file_mod_time = datetime.fromtimestamp(file.stat().st_mtime)
@@ -119,7 +154,7 @@ async def render_html(
                 return file
             logger.info("[SayuStock] 缓存不是 plotly HTML，忽略并重渲。")
 
-    fig = await to_fig(raw_data, market, sector, 2 if market == "大盘云图" else 1)
+    fig = await to_fig(request.snap, market, sector, request.layer)
     if isinstance(fig, str):
         return fig
 
@@ -140,11 +175,45 @@ async def render_image(
     start_time: datetime | None = None,
     end_time: datetime | None = None,
 ) -> str | bytes:
-    html_path = await render_html(market, sector, start_time, end_time)
-    if isinstance(html_path, str):
-        return html_path
-    # w/h/scale 全 0 = 让 playwright 按 HTML 自身尺寸截图（云图是满幅矩形树图）
-    return await render_image_by_pw(html_path, 0, 0, 0)
+    request = await _fetch_cloudmap(market, sector, start_time, end_time)
+    if isinstance(request, str):
+        return request
+
+    native = bool(STOCK_CONFIG.get_config("mapcloud_native").data)
+    # 截图版固定是 Playwright 出的 PNG；原生版按出图格式配置编码
+    options = encode_options() if native else None
+    ext = options.ext if options is not None else "png"
+    # 同一份板块快照 + 同样的出图尺寸 / 编码参数 → 同一张图，跳过绘制 / 截图
+    cache_key = await asyncio.to_thread(
+        stable_hash,
+        "native-cloudmap" if native else "plotly-cloudmap",
+        request.snap,
+        request.market,
+        request.sector,
+        request.layer,
+        view_port,
+        scale,
+        options,
+    )
+    image_bytes = await RENDER_CACHE.get(cache_key, ext)
+    if image_bytes is not None:
+        logger.info("[SayuStock] 云图数据未变化，复用内容缓存。")
+    elif options is not None:
+        result = await asyncio.to_thread(
+            cloudmap_image, request.snap, request.market, request.sector, request.layer, view_port, scale, options
+        )
+        if isinstance(result, str):
+            return result
+        image_bytes = result
+        await RENDER_CACHE.put(cache_key, image_bytes, ext)
+    else:
+        html_path = await _write_html(request)
+        if isinstance(html_path, str):
+            return html_path
+        # w/h/scale 全 0 = 让 playwright 按配置的云图分辨率截图（云图是满幅矩形树图）
+        image_bytes = await screenshot_html(html_path, 0, 0, 0)
+        await RENDER_CACHE.put(cache_key, image_bytes, ext)
+    return await convert_img(image_bytes)
 
 
 __all__ = [
@@ -0,0 +1,230 @@
+"""云图原生渲染：squarified 矩形树图 + PIL，不经 plotly / 浏览器。
+
+plotly 版（``render.py`` 的 ``to_fig``）要先 ``write_html``，再起一个 Chromium 按
+``mapcloud_viewport`` × ``mapcloud_scale`` 截图：几千个方块的 SVG 排版与截图都压在
+浏览器上，部署还得常备 Playwright + Chromium。这里直接在进程内画：
+
+- 层级与 plotly 版相同：``build_cloudmap_render_data`` 给出的 ``treemap_path``
+  （大盘云图 板块 → 个股；行业 / 概念云图 行业 → 板块 → 个股）；
+- 布局用 ``utils/treemap.squarify``，父节点留出与 plotly ``marker_pad`` 相同的
+  标题栏与边距，父节点颜色取子节点按市值加权的平均涨跌幅（与 plotly 一致）；
+- 颜色一次性向量化算完；文字按参考字号量一次宽度，线性缩放到能放进方块的最大字号，
+  小于下限就不写字。
+
+输出尺寸与截图版一致：``view_port * scale`` 见方。
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from dataclasses import field, dataclass
+
+import numpy as np
+import pandas as pd
+from PIL import Image, ImageDraw, ImageFont
+
+from gsuid_core.utils.fonts.fonts import core_font as ss_font
+
+from ..utils.treemap import Rect, squarify, diff_colors
+from ..utils.render_data import build_cloudmap_render_data
+from ..utils.image_encode import EncodeOptions, encode_image
+from ..utils.market.models import BoardSnapshot
+
+__all__ = [
+    "TreemapNode",
+    "build_tree",
+    "cloudmap_image",
+    "draw_cloudmap_native",
+    "layout_tree",
+]
+
+BG_COLOR = (0, 0, 0)
+TEXT_COLOR = (255, 255, 255)
+
+# 与 plotly 版 marker_pad / textfont_size 相同，单位是 CSS 像素（再乘 scale）
+_PAD_TOP = 60
+_PAD_SIDE = 5
+_MAX_FONT = 50
+_MIN_FONT = 8
+_TEXT_PAD = 4
+# 量宽度用的参考字号；行高按字号的倍数估算
+_REF_FONT = 100
+_LINE_HEIGHT = 1.3
+
+
+@dataclass(slots=True)
+class TreemapNode:
+    label: str
+    value: float
+    diff: float
+    depth: int
+    children: list[TreemapNode] = field(default_factory=list)
+    rect: Rect = (0.0, 0.0, 0.0, 0.0)
+
+    @property
+    def text(self) -> str:
+        if self.children:
+            return self.label
+        pct = f"+{self.diff}%" if self.diff >= 0 else f"{self.diff}%"
+        return f"{self.label}\n{pct}"
+
+
+@lru_cache(maxsize=128)
+def _font(size: int) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
+    return ss_font(size)
+
+
+def build_tree(df: pd.DataFrame, path: list[str], root_label: str = "-") -> list[TreemapNode]:
+    """按 path 逐层分组成树；叶子是个股，父节点 value 为子节点之和、diff 为市值加权均值。"""
+    columns = [df[col].where(df[col].notna(), root_label).astype(str).to_numpy() for col in path]
+    values = df["value"].to_numpy(dtype=float)
+    diffs = df["diff_val"].to_numpy(dtype=float)
+    leaf_depth = len(path) - 1
+
+    def _build(index: np.ndarray, depth: int) -> list[TreemapNode]:
+        if depth == leaf_depth:
+            return [TreemapNode(columns[depth][i], float(values[i]), float(diffs[i]), depth) for i in index]
+        groups: dict[str, list[int]] = {}
+        for position, key in zip(index, columns[depth][index]):
+            groups.setdefault(key, []).append(int(position))
+        nodes: list[TreemapNode] = []
+        for key, members in groups.items():
+            member_index = np.asarray(members, dtype=np.intp)
+            weight = values[member_index]
+            total = float(weight.sum())
+            if total > 0:
+                diff = float(np.dot(weight, diffs[member_index]) / total)
+            else:
+                diff = float(diffs[member_index].mean())
+            nodes.append(TreemapNode(key, total, diff, depth, _build(member_index, depth + 1)))
+        return nodes
+
+    return _build(np.arange(len(df)), 0)
+
+
+def layout_tree(roots: list[TreemapNode], width: float, height: float, scale: int = 1) -> list[TreemapNode]:
+    """给整棵树排版，返回先序遍历的可见节点（父在前、子在后，正好是绘制顺序）。
+
+    父节点内部扣掉标题栏与边距后再铺子节点；放不下子节点的父节点只画自己。
+    """
+    pad_top = _PAD_TOP * scale
+    pad_side = _PAD_SIDE * scale
+    placed: list[TreemapNode] = []
+
+    def _place(nodes: list[TreemapNode], x: float, y: float, w: float, h: float) -> None:
+        nodes.sort(key=lambda node: node.value, reverse=True)
+        for node, rect in zip(nodes, squarify([node.value for node in nodes], x, y, w, h)):
+            if rect[2] <= 0 or rect[3] <= 0:
+                continue
+            node.rect = rect
+            placed.append(node)
+            if not node.children:
+                continue
+            rx, ry, rw, rh = rect
+            inner_w = rw - 2 * pad_side
+            inner_h = rh - pad_top - pad_side
+            if inner_w > 0 and inner_h > 0:
+                _place(node.children, rx + pad_side, ry + pad_top, inner_w, inner_h)
+
+    _place(roots, 0.0, 0.0, float(width), float(height))
+    return placed
+
+
+def _fit_font_size(text: str, box_w: float, box_h: float, max_size: int) -> int:
+    """能把 text（可多行）放进 box 的最大字号：参考字号下量一次宽度再线性缩放。"""
+    if box_w <= 0 or box_h <= 0:
+        return 0
+    lines = text.split("\n")
+    ref = _font(_REF_FONT)
+    widest = max(ref.getlength(line) for line in lines)
+    if widest <= 0:
+        return 0
+    by_width = box_w * _REF_FONT / widest
+    by_height = box_h / (len(lines) * _LINE_HEIGHT)
+    return int(min(max_size, by_width, by_height))
+
+
+def _draw_text(draw: ImageDraw.ImageDraw, node: TreemapNode, scale: int) -> None:
+    x, y, w, h = node.rect
+    min_size = _MIN_FONT * scale
+    if node.children:
+        # 父节点：标签写在顶部标题栏里，左对齐
+        pad_top = _PAD_TOP * scale
+        pad_side = _PAD_SIDE * scale
+        size = _fit_font_size(node.text, w - 4 * pad_side, min(pad_top, h) * 0.8, _MAX_FONT * scale)
+        if size >= min_size:
+            draw.text((x + 2 * pad_side, y + min(pad_top, h) / 2), node.text, TEXT_COLOR, _font(size), "lm")
+        return
+
+    pad = _TEXT_PAD * scale
+    box_w, box_h = w - 2 * pad, h - 2 * pad
+    size = _fit_font_size(node.text, box_w, box_h, _MAX_FONT * scale)
+    if size < min_size:
+        return
+    center = (x + w / 2, y + h / 2)
+    spacing = int(size * 0.15)
+    left, top, right, bottom = draw.multiline_textbbox(
+        center, node.text, _font(size), "mm", spacing=spacing, align="center"
+    )
+    # 参考字号的线性估算偶尔偏大（字距 / 行高取整），超出就按比例再缩一次
+    shrink = min(box_w / max(right - left, 1), box_h / max(bottom - top, 1))
+    if shrink < 1:
+        size = int(size * shrink)
+        spacing = int(size * 0.15)
+        if size < min_size:
+            return
+    draw.multiline_text(center, node.text, TEXT_COLOR, _font(size), "mm", spacing=spacing, align="center")
+
+
+def _paint_tiles(draw: ImageDraw.ImageDraw, placed: list[TreemapNode], scale: int) -> None:
+    """按先序填色：父节点先铺底色，子节点盖在上面，边框用背景色隔开。"""
+    colors = diff_colors([node.diff for node in placed])
+    border = max(1, scale)
+    for node, color in zip(placed, colors):
+        x, y, w, h = node.rect
+        x0, y0, x1, y1 = round(x), round(y), round(x + w) - 1, round(y + h) - 1
+        if x1 < x0 or y1 < y0:
+            continue
+        draw.rectangle(
+            (x0, y0, x1, y1), fill=(int(color[0]), int(color[1]), int(color[2])), outline=BG_COLOR, width=border
+        )
+
+
+def draw_cloudmap_native(
+    snap: BoardSnapshot,
+    market: str,
+    sector: str | None = None,
+    layer: int = 2,
+    view_port: int = 2500,
+    scale: int = 2,
+) -> str | Image.Image:
+    data = build_cloudmap_render_data(snap, market, sector, layer)
+    if isinstance(data, str):
+        return data
+
+    size = int(view_port * scale)
+    roots = build_tree(data.df, data.treemap_path, root_label=data.title)
+    placed = layout_tree(roots, size, size, scale)
+
+    img = Image.new("RGB", (size, size), BG_COLOR)
+    draw = ImageDraw.Draw(img)
+    _paint_tiles(draw, placed, scale)
+    for node in placed:
+        _draw_text(draw, node, scale)
+    return img
+
+
+def cloudmap_image(
+    snap: BoardSnapshot,
+    market: str,
+    sector: str | None = None,
+    layer: int = 2,
+    view_port: int = 2500,
+    scale: int = 2,
+    options: EncodeOptions | None = None,
+) -> str | bytes:
+    """画云图并按 options 编码成字节；数据不足时返回错误文本。"""
+    img = draw_cloudmap_native(snap, market, sector, layer, view_port, scale)
+    if isinstance(img, str):
+        return img
+    return encode_image(img, options, label="cloudmap").data
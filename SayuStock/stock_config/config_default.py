@@ -37,6 +37,76 @@ CONFIG_DEFAULT: Dict[str, GSC] = {
         3,
         options=[1, 2, 3, 4, 5, 10, 30, 60],
     ),
+    "mapcloud_native": GsBoolConfig(
+        "云图原生渲染",
+        "云图直接用内置矩形树图绘制，不再启动浏览器截图；关闭则回退 plotly + Playwright",
+        True,
+    ),
+    "chart_image_format": GsStrConfig(
+        "出图格式",
+        "个股/K线/对比/云图的输出格式：png 无损；webp 无损且更小；jpeg 有损、最小（质量见下）",
+        "png",
+        options=["png", "webp", "jpeg"],
+    ),
+    "chart_png_compress_level": GsIntConfig(
+        "PNG压缩级别",
+        "0~9，越大文件越小、编码越慢；图表以纯色块为主，3 左右性价比最高",
+        3,
+        options=[1, 3, 6, 9],
+    ),
+    "chart_jpeg_quality": GsIntConfig(
+        "JPEG质量",
+        "出图格式为 jpeg 时的质量上限，越高越清晰、文件越大",
+        90,
+        options=[75, 85, 90, 95],
+    ),
+    "papertrade_quote_refresh_seconds": GsIntConfig(
+        "模拟盘持仓报价刷新(秒)",
+        "交易时段每隔多少秒在后台统一刷新所有模拟盘持仓的报价，估值时直接读缓存不再等网络；0 为关闭",
+        30,
+        options=[0, 15, 30, 60, 120],
+    ),
+    "papertrade_eod_snapshot": GsBoolConfig(
+        "模拟盘收盘批量快照",
+        "交易日 15:05 一次性给所有启用的模拟盘写当日净值快照（同一天重跑只更新不新增）",
+        True,
+    ),
+    "papertrade_archive_days": GsIntConfig(
+        "模拟盘流水归档保留天数",
+        "每月 1 日把早于该天数的整月交易流水 / 决策日志搬进压缩冷文件，库里只留月度汇总（历史查询仍可读到）；0 为关闭",
+        180,
+        options=[0, 90, 180, 365, 730],
+    ),
+    "prerender_top_n": GsIntConfig(
+        "预渲染热门数",
+        "交易时段每隔「大盘云图刷新时间」把请求最多的前 N 个图（命令+参数）预先渲染好，命中直接发；0 为关闭",
+        5,
+        options=[0, 3, 5, 10, 20],
+    ),
+    "prerender_budget_seconds": GsIntConfig(
+        "预渲染预算(秒)",
+        "每轮预渲染逐个拉数据、出图，累计超过该时长就停下（正在画的也会打断），没轮到的下一轮优先补上",
+        30,
+        options=[10, 30, 60, 120],
+    ),
+    "render_pool_size": GsIntConfig(
+        "出图进程数",
+        "个股/K线/对比图用多少个常驻进程并行绘制，0 为不启用（在线程内逐张绘制）",
+        0,
+        options=[0, 1, 2, 4, 8],
+    ),
+    "render_pool_timeout": GsIntConfig(
+        "出图超时(秒)",
+        "单张图在进程池里超过该时长视为卡死，结束并重建进程池",
+        60,
+        options=[30, 60, 120, 300],
+    ),
+    "news_send_concurrency": GsIntConfig(
+        "新闻推送并发数",
+        "订阅新闻推送时各群并行发送，全局同时在发的消息条数上限；同一个群内仍逐条间隔 2~5 秒",
+        8,
+        options=[1, 4, 8, 16, 32],
+    ),
     "stock_cache_retention_days": GsIntConfig(
         "股票缓存保留天数",
         "每日定时任务只会清理超过该天数的缓存文件，不再每天清空缓存目录",
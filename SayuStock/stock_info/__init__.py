@@ -6,13 +6,17 @@ from gsuid_core.models import Event
 
 from .draw_info import draw_info_img
 from .draw_future import draw_future_img
-from .draw_my_info import draw_my_stock_img
+from .draw_my_info import draw_my_stock_list, get_my_stock_codes
 from .draw_fund_info import draw_fund_info
+from ..utils.prerender import PRERENDER
 
 sv_stock_info = SV("大盘概览")
 sv_my_stock = SV("我的自选")
 sv_fund_info = SV("基金持仓信息")
 
+PRERENDER.register("大盘概览", draw_info_img)
+PRERENDER.register("我的自选", draw_my_stock_list)
+
 
 @sv_fund_info.on_command(
     ("基金持仓", "持仓分布"),
@@ -47,7 +51,7 @@ async def send_fund_info(bot: Bot, ev: Event) -> None:
 )
 async def send_stock_info(bot: Bot, ev: Event) -> None:
     logger.info("[SayuStock] 开始执行[大盘概览]")
-    im = await draw_info_img()
+    im = await PRERENDER.serve("大盘概览")
     await bot.send(im)
 
 
@@ -66,7 +70,10 @@ async def send_stock_info(bot: Bot, ev: Event) -> None:
 )
 async def send_my_stock(bot: Bot, ev: Event) -> None:
     logger.info("[SayuStock] 开始执行[我的自选]")
-    await bot.send(await draw_my_stock_img(ev))
+    codes = await get_my_stock_codes(ev)
+    if not codes:
+        return await bot.send("您还未添加自选呢~请输入 添加自选 查看帮助!")
+    await bot.send(await PRERENDER.serve("我的自选", *codes))
 
 
 @sv_my_stock.on_fullmatch(
@@ -3,16 +3,22 @@ from typing import Union
 from PIL import Image, ImageDraw
 
 from gsuid_core.logger import logger
-from gsuid_core.utils.fonts.fonts import core_font as ss_font
 from gsuid_core.utils.image.convert import convert_img
 from gsuid_core.ai_core.trigger_bridge import ai_return
 
-from ..utils.image import get_footer
 from .draw_my_info import DIFF_MAP, TEXT_PATH, draw_bar_from_quote
 from ..utils.market import get_market, is_market_error
+from ..utils.render_assets import FOOTER_PATH, font, stamp, texture, static_layer
 from ..utils.stock.request_utils import get_code_id, get_fund_pos_list
 
 
+def _fund_background(h: int) -> Image.Image:
+    """基金持仓静态底图：底色 + footer，按条数（画布高度）缓存。"""
+    img = Image.new("RGBA", (900, h), (7, 9, 27))
+    stamp(img, texture(FOOTER_PATH), (25, h - 55))
+    return img
+
+
 async def draw_fund_info(fcode: Union[str, int]) -> str | bytes:
     _code = await get_code_id(str(fcode))
     if _code is None:
@@ -27,17 +33,14 @@ async def draw_fund_info(fcode: Union[str, int]) -> str | bytes:
     if not holdings:
         return "获取基金持仓数据失败，请稍后再试~"
 
-    img = Image.new(
-        "RGBA",
-        (900, 400 + 60 + len(holdings) * 110),
-        (7, 9, 27),
-    )
+    h = 400 + 60 + len(holdings) * 110
+    img = static_layer(("fund", h), lambda: _fund_background(h))
     img_draw = ImageDraw.Draw(img)
     img_draw.text(
         (450, 355),
         f"{_code[1]}({_code[0]})持仓信息",
         (255, 255, 255),
-        ss_font(36),
+        font(36),
         "mm",
     )
 
@@ -51,7 +54,7 @@ async def draw_fund_info(fcode: Union[str, int]) -> str | bytes:
             continue
         bar = draw_bar_from_quote(q, q.symbol.code or share_code, percent=percent)
         all_p += float(q.change_pct) if q.change_pct is not None else 0.0
-        img.paste(bar, (0, 400 + index * 110), bar)
+        stamp(img, bar, (0, 400 + index * 110))
 
     avg_p = all_p / len(holdings)
     for i in DIFF_MAP:
@@ -61,19 +64,7 @@ async def draw_fund_info(fcode: Union[str, int]) -> str | bytes:
     else:
         title_num = 11
 
-    title = Image.open(TEXT_PATH / f"title{title_num}.png")
-    img.paste(
-        title,
-        (25, -31),
-        title,
-    )
-
-    footer = get_footer()
-    img.paste(
-        footer,
-        (25, img.size[1] - 55),
-        footer,
-    )
+    stamp(img, texture(TEXT_PATH / f"title{title_num}.png"), (25, -31))
 
     res = await convert_img(img)
 
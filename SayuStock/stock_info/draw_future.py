@@ -12,10 +12,10 @@ from gsuid_core.ai_core.trigger_bridge import ai_return
 
 from .draw_info import draw_block
 from .get_jp_data import get_jpy
-from ..utils.image import get_footer
 from ..utils.market import DisplayItem, from_quote, get_market, is_market_error
 from ..utils.get_OKX import CRYPTO_MAP
 from ..utils.constant import bond, whsc, i_code, commodity
+from ..utils.render_assets import FOOTER_PATH, stamp, texture, stamp_grid, static_layer
 
 TEXT_PATH = Path(__file__).parent / "texture2d"
 ItemMap = dict[str, DisplayItem]
@@ -61,6 +61,11 @@ async def append_jpy(result: ItemMap) -> None:
         )
 
 
+def _future_background() -> Image.Image:
+    """全天候底图：bg1.jpg 解码并转成 RGBA 只做一次。"""
+    return texture(TEXT_PATH / "bg1.jpg").convert("RGBA")
+
+
 async def draw_future_img() -> str | bytes:
     market = get_market()
     intl = await market.board("国际市场", limit=100, sort_asc=False)
@@ -88,22 +93,21 @@ async def draw_future_img() -> str | bytes:
     data4 = safe_map(results[2])
     data5 = safe_map(results[3])
 
-    img = Image.open(TEXT_PATH / "bg1.jpg").convert("RGBA")
+    img = static_layer("future", _future_background)
     ox = 223
     oy = 140
 
     async def paste_blocks(items: list[DisplayItem] | ItemMap, keys: dict[str, str] | list[str], y_base: int) -> None:
-        index = 0
         key_list = list(keys.keys()) if isinstance(keys, dict) else list(keys)
         pool: list[DisplayItem] = list(items.values()) if isinstance(items, dict) else list(items)
+        blocks: list[Image.Image] = []
         for d in key_list:
             for item in pool:
                 if item.name != d and d not in item.name and item.name not in d:
                     continue
-                block = await draw_block(item)
-                img.paste(block, (62 + ox * (index % 4), y_base + oy * (index // 4)), block)
-                index += 1
+                blocks.append(await draw_block(item))
                 break
+        stamp_grid(img, blocks, 62, y_base, cols=4, dx=ox, dy=oy)
 
     await paste_blocks(data_gz, i_code, 487)
     await paste_blocks(data2, commodity, 1007)
@@ -111,8 +115,8 @@ async def draw_future_img() -> str | bytes:
     await paste_blocks(data4, whsc, 1773)
     await paste_blocks(data5, list(CRYPTO_MAP.keys())[:8], 1988)
 
-    footer = get_footer()
-    img.paste(footer, (75, 2135), footer)
+    # 加密货币第二行会压到 footer 所在行，footer 必须最后贴，不能并进底图
+    stamp(img, texture(FOOTER_PATH), (75, 2135))
     res = await convert_img(img)
     _ai_return_all_weather(data_gz, data2, data3, data4, data5)
     return res
@@ -2,15 +2,13 @@ import asyncio
 from typing import Dict, List, Tuple
 from pathlib import Path
 from datetime import datetime
+from functools import lru_cache
 
 from PIL import Image, ImageOps, ImageDraw
 
 from gsuid_core.logger import logger
-from gsuid_core.utils.fonts.fonts import core_font as ss_font
 from gsuid_core.utils.image.convert import convert_img
-from gsuid_core.ai_core.trigger_bridge import ai_return
 
-from ..utils.image import get_footer
 from ..utils.utils import number_to_chinese
 from ..utils.market import (
     DisplayItem,
@@ -19,6 +17,17 @@ from ..utils.market import (
     is_market_error,
     board_rows_to_items,
 )
+from ..utils.prerender import ai_return
+from ..utils.render_assets import (
+    FOOTER_PATH,
+    font,
+    stamp,
+    texture,
+    stamp_grid,
+    stamp_rows,
+    static_layer,
+    texture_copy,
+)
 from ..utils.stock.request import get_bar, get_hours_from_em
 from ..utils.stock.request_utils import get_image_from_em
 
@@ -134,16 +143,16 @@ async def draw_block(item: DisplayItem, _type: str = "diff") -> Image.Image:
 
     zs_draw.rounded_rectangle((15, 13, 185, 127), 0, zsc)
 
-    t_font = ss_font(24)
+    t_font = font(24)
     name = name_s
     if len(name) >= 15:
         name = name[:6]
     elif len(name) >= 10:
-        t_font = ss_font(18)
+        t_font = font(18)
 
     zs_draw.text((100, 99), name, (255, 255, 255), t_font, "mm")
-    zs_draw.text((100, 38), f"{price_s}", zsc2, ss_font(30), "mm")
-    zs_draw.text((100, 70), f"{'+' if diff >= 0 else ''}{diff}%", zsc2, ss_font(30), "mm")
+    zs_draw.text((100, 38), f"{price_s}", zsc2, font(30), "mm")
+    zs_draw.text((100, 70), f"{'+' if diff >= 0 else ''}{diff}%", zsc2, font(30), "mm")
     return zs_img
 
 
@@ -245,14 +254,9 @@ async def draw_info_img(is_save: bool = False) -> str | bytes:
 
     h0 = 90
     h = 1060 + 20 * h0
-    img = Image.new("RGBA", (1700, h), (7, 9, 27))
+    img = static_layer(("info", h), lambda: _info_background(h))
     img_draw = ImageDraw.Draw(img)
 
-    bar1 = Image.open(TEXT_PATH / "bar1.png")
-    bar2 = Image.open(TEXT_PATH / "bar2.png")
-    bar3 = Image.open(TEXT_PATH / "bar3.png")
-    bar4 = Image.open(TEXT_PATH / "bar4.png")
-
     zyzs = [
         "上证指数",
         "中证全指",
@@ -271,7 +275,6 @@ async def draw_info_img(is_save: bool = False) -> str | bytes:
     ]
 
     # 主要指数
-    n = 0
     qz_diff = 0
     sz_diff = 0
 
@@ -285,6 +288,7 @@ async def draw_info_img(is_save: bool = False) -> str | bytes:
             return True
         return False
 
+    zs_tiles: list[Image.Image] = []
     for zs_name in zyzs:
         for item in data_zs_items:
             if not _match_index(zs_name, item):
@@ -300,15 +304,12 @@ async def draw_info_img(is_save: bool = False) -> str | bytes:
                 amount=item.amount,
                 code=item.code,
             )
-            zs_img = await draw_block(disp)
-            img.paste(zs_img, (25 + 200 * (n % 4), 440 + 140 * (n // 4)), zs_img)
-            n += 1
+            zs_tiles.append(await draw_block(disp))
             break
-
-    img_draw.rectangle((16, 434, 834, 584), None, (246, 180, 0), 5)
+    stamp_grid(img, zs_tiles, 25, 440, cols=4, dx=200, dy=140)
 
     # 分布统计
-    div = Image.open(TEXT_PATH / "div.png")
+    div = texture_copy(TEXT_PATH / "div.png")
     div_draw = ImageDraw.Draw(div)
     max_num = max(diff_bar.values())
     max_h = 366
@@ -326,14 +327,14 @@ async def draw_info_img(is_save: bool = False) -> str | bytes:
         (60, 20),
         f"{down_value}",
         (255, 255, 255),
-        ss_font(24),
+        font(24),
         "mm",
     )
     div_draw.text(
         (790, 20),
         f"{up_value}",
         (255, 255, 255),
-        ss_font(24),
+        font(24),
         "mm",
     )
     for dindex, ij_num in enumerate(diff_bar.values().__reversed__()):
@@ -354,7 +355,7 @@ async def draw_info_img(is_save: bool = False) -> str | bytes:
             (66 + offset, 413 - lenth - 25),
             f"{ij_num}",
             (255, 255, 255),
-            ss_font(24),
+            font(24),
             "mm",
         )
     img.paste(div, (850, 420), div)
@@ -392,19 +393,19 @@ async def draw_info_img(is_save: bool = False) -> str | bytes:
         days_ago = (today_date - last_trade_date).days
         days_label = {1: "上日", 2: "前日", 3: "三日前"}.get(days_ago, f"{days_ago}日前")
         img_draw.rectangle((1395, 62, 1655, 229), (60, 60, 60, 180))
-        img_draw.text((1524, 95), f"{weekday}", (160, 160, 160), ss_font(36), "mm")
-        img_draw.text((1524, 145), "休  市", (255, 200, 0), ss_font(58), "mm")
-        img_draw.text((1524, 197), f"{date}", (160, 160, 160), ss_font(36), "mm")
+        img_draw.text((1524, 95), f"{weekday}", (160, 160, 160), font(36), "mm")
+        img_draw.text((1524, 145), "休  市", (255, 200, 0), font(58), "mm")
+        img_draw.text((1524, 197), f"{date}", (160, 160, 160), font(36), "mm")
         vol_label = f"成交额({days_label}): {all_f6_str}"
     else:
         img_draw.rectangle((1395, 62, 1655, 229), time_color)
-        img_draw.text((1524, 95), f"{weekday}", (255, 255, 255), ss_font(36), "mm")
-        img_draw.text((1524, 145), f"{time}", (255, 255, 255), ss_font(58), "mm")
-        img_draw.text((1524, 197), f"{date}", (255, 255, 255), ss_font(36), "mm")
+        img_draw.text((1524, 95), f"{weekday}", (255, 255, 255), font(36), "mm")
+        img_draw.text((1524, 145), f"{time}", (255, 255, 255), font(58), "mm")
+        img_draw.text((1524, 197), f"{date}", (255, 255, 255), font(36), "mm")
         vol_label = f"成交额: {all_f6_str}"
 
-    img_draw.text((1529, 263), vol_label, time_color, ss_font(28), "mm")
-    img_draw.text((1529, 305), f6diff_str, fcolor, ss_font(34), "mm")
+    img_draw.text((1529, 263), vol_label, time_color, font(28), "mm")
+    img_draw.text((1529, 305), f6diff_str, fcolor, font(34), "mm")
 
     for i in DIFF_MAP:
         if qz_diff >= i:
@@ -413,15 +414,7 @@ async def draw_info_img(is_save: bool = False) -> str | bytes:
     else:
         title_num = 11
 
-    title = Image.open(TEXT_PATH / f"title{title_num}.png")
-
-    img.paste(bar1, (0, 331), bar1)
-    img.paste(bar4, (850, 331), bar4)
-
-    img.paste(bar2, (0, 875), bar2)
-    img.paste(bar3, (850, 875), bar3)
-
-    img.paste(title, (0, -30), title)
+    stamp(img, texture(TEXT_PATH / f"title{title_num}.png"), (0, -30))
 
     await draw_bar(data_hy_z[:20], img, 10, 980, h0)
     await draw_bar(data_hy_f[:20], img, 415, 980, h0)
@@ -429,44 +422,64 @@ async def draw_info_img(is_save: bool = False) -> str | bytes:
     await draw_bar(data_gn_z[:20], img, 860, 980, h0)
     await draw_bar(data_gn_f[:20], img, 1265, 980, h0)
 
-    footer = get_footer()
-    img.paste(footer, (425, h - 50), footer)
-
     res = await convert_img(img)
     return res
 
 
+def _info_background(h: int) -> Image.Image:
+    """大盘概览的静态底图：底色、栏目条、指数框与 footer。
+
+    这些元素的不透明像素与指数格、分布图、板块列表都不重叠，先画后画结果一致。
+    """
+    img = Image.new("RGBA", (1700, h), (7, 9, 27))
+    ImageDraw.Draw(img).rectangle((16, 434, 834, 584), None, (246, 180, 0), 5)
+    stamp(img, texture(TEXT_PATH / "bar1.png"), (0, 331))
+    stamp(img, texture(TEXT_PATH / "bar4.png"), (850, 331))
+    stamp(img, texture(TEXT_PATH / "bar2.png"), (0, 875))
+    stamp(img, texture(TEXT_PATH / "bar3.png"), (850, 875))
+    stamp(img, texture(FOOTER_PATH), (425, h - 50))
+    return img
+
+
 async def draw_bar(sd: List[DisplayItem], img: Image.Image, start: int, y: int, h: int = 90) -> None:
     ls = len(sd)
+    rows: list[Image.Image] = []
     for hindex, hy in enumerate(sd):
         hy_diff = hy.change_pct
-        hy_img = Image.new("RGBA", (425, h))
         base_o = int(255 * (((ls + 1) - hindex) / ls))
         if hy_diff >= 0:
-            hyc2 = (140, 18, 22, base_o)
             dd = (201, 26, 32, 200)
             lead = hy.lead_name or ""
             lead_pct = hy.lead_change_pct
         else:
-            hyc2 = (59, 140, 18, base_o)
             dd = (25, 199, 16, 200)
             lead = hy.fall_name or hy.lead_name or ""
             lead_pct = hy.fall_change_pct if hy.fall_change_pct is not None else hy.lead_change_pct
 
+        hy_img = _bar_row_base(h, hy_diff >= 0, base_o).copy()
         hy_draw = ImageDraw.Draw(hy_img)
-        hy_draw.rounded_rectangle((23, 2, 403, 57), 0, hyc2)
-        hy_draw.text((53, 30), hy.name, (255, 255, 255), ss_font(30), "lm")
-        hy_draw.text((53, 75), f"{lead}", dd, ss_font(24), "lm")
+        hy_draw.text((53, 30), hy.name, (255, 255, 255), font(30), "lm")
+        hy_draw.text((53, 75), f"{lead}", dd, font(24), "lm")
         lp = f"{'+' if (lead_pct or 0) >= 0 else ''}{lead_pct}%" if lead_pct is not None else ""
-        hy_draw.text((384, 75), lp, dd, ss_font(24), "rm")
+        hy_draw.text((384, 75), lp, dd, font(24), "rm")
         hy_draw.text(
             (384, 30),
             f"{'+' if hy_diff >= 0 else ''}{hy_diff}%",
             (255, 255, 255),
-            ss_font(30),
+            font(30),
             "rm",
         )
-        img.paste(hy_img, (start, y + h * hindex), hy_img)
+        rows.append(hy_img)
+    stamp_rows(img, rows, start, y, h)
+
+
+@lru_cache(maxsize=256)
+def _bar_row_base(h: int, up: bool, alpha: int) -> Image.Image:
+    """板块列表行的底板（只读，取用时 copy）；透明度随名次递减，取值有限。"""
+    hy_img = Image.new("RGBA", (425, h))
+    hyc2 = (140, 18, 22, alpha) if up else (59, 140, 18, alpha)
+    ImageDraw.Draw(hy_img).rounded_rectangle((23, 2, 403, 57), 0, hyc2)
+    return hy_img
 
 
 def _ai_return_market_overview(
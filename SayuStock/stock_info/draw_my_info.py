@@ -1,18 +1,18 @@
 import asyncio
 from typing import Optional
 from pathlib import Path
+from functools import lru_cache
 
 from PIL import Image, ImageDraw
 
 from gsuid_core.logger import logger
 from gsuid_core.models import Event
-from gsuid_core.utils.fonts.fonts import core_font as ss_font
 from gsuid_core.utils.image.convert import convert_img
-from gsuid_core.ai_core.trigger_bridge import ai_return
 
-from ..utils.image import get_footer
 from ..utils.utils import convert_list, number_to_chinese
 from ..utils.market import Quote, get_market, is_market_error, board_rows_to_items
+from ..utils.prerender import ai_return
+from ..utils.render_assets import FOOTER_PATH, font, stamp, texture, static_layer, texture_copy
 from ..stock_info.draw_info import DIFF_MAP
 from ..utils.database.models import SsBind
 
@@ -42,45 +42,79 @@ def draw_bar_from_quote(
     b_title, code = bar_labels_from_quote(q, u)
     s_title = f"({code}) 换: {hs}% 额: {e_money} 价: {now_price}"
     if p > 0:
-        bar = Image.open(TEXT_PATH / "myup.png")
+        bar = texture_copy(TEXT_PATH / "myup.png")
         p_color = (213, 102, 102)
     elif p == 0:
-        bar = Image.open(TEXT_PATH / "myeq.png")
+        bar = texture_copy(TEXT_PATH / "myeq.png")
         p_color = (240, 240, 240)
     else:
-        bar = Image.open(TEXT_PATH / "mydown.png")
+        bar = texture_copy(TEXT_PATH / "mydown.png")
         p_color = (175, 231, 170)
     bar_draw = ImageDraw.Draw(bar)
-    bar_draw.text((82, 40), b_title, (255, 255, 255), ss_font(32), "lm")
-    bar_draw.text((82, 75), s_title, p_color, ss_font(20), "lm")
-    bar_draw.text((758, 55), f"+{p}%" if p >= 0 else f"{p}%", (255, 255, 255), ss_font(28), "mm")
+    bar_draw.text((82, 40), b_title, (255, 255, 255), font(32), "lm")
+    bar_draw.text((82, 75), s_title, p_color, font(20), "lm")
+    bar_draw.text((758, 55), f"+{p}%" if p >= 0 else f"{p}%", (255, 255, 255), font(28), "mm")
     if percent is not None:
-        bar_draw.text((613, 55), percent, (240, 240, 240), ss_font(28), "mm")
+        bar_draw.text((613, 55), percent, (240, 240, 240), font(28), "mm")
     return bar
 
 
-async def draw_my_stock_img(ev: Event) -> str | bytes:
+@lru_cache(maxsize=2)
+def _index_tile_base(up: bool) -> Image.Image:
+    zs_img = Image.new("RGBA", (200, 140))
+    zsc = (140, 18, 22, 55) if up else (59, 140, 18, 55)
+    ImageDraw.Draw(zs_img).rounded_rectangle((15, 13, 185, 127), 0, zsc)
+    return zs_img
+
+
+def draw_index_tile(name: str, price: object, diff: float) -> Image.Image:
+    """宽基指数格（我的自选 / 模拟盘持仓简图共用）：底板缓存，只写名称与行情。"""
+    zs_img = _index_tile_base(diff >= 0).copy()
+    zsc2 = (206, 34, 30) if diff >= 0 else (36, 206, 30)
+    zs_draw = ImageDraw.Draw(zs_img)
+    zs_draw.text((100, 99), name, (255, 255, 255), font(24), "mm")
+    zs_draw.text((100, 38), f"{price}", zsc2, font(30), "mm")
+    zs_draw.text((100, 70), f"{'+' if diff >= 0 else ''}{diff}%", zsc2, font(30), "mm")
+    return zs_img
+
+
+def _my_stock_background(size: tuple[int, int]) -> Image.Image:
+    """我的自选的静态底图：底色 +「我的自选」栏目条 + footer（与动态内容不重叠）。"""
+    img = Image.new("RGBA", size, (7, 9, 27))
+    x = 25 + 450 if size[0] > 900 else 25
+    stamp(img, texture(TEXT_PATH / "bar5.png"), (x, 443))
+    stamp(img, texture(FOOTER_PATH), (x, size[1] - 55))
+    return img
+
+
+async def get_my_stock_codes(ev: Event) -> list[str]:
+    """当前用户（或被 @ 的人）的自选代码，已展开为行情代码。"""
     user_id = ev.at if ev.at else ev.user_id
     uid = await SsBind.get_uid_list_by_game(user_id, ev.bot_id)
+    return convert_list(uid) if uid else []
+
 
-    if not uid:
+async def draw_my_stock_img(ev: Event) -> str | bytes:
+    return await draw_my_stock_list(*await get_my_stock_codes(ev))
+
+
+async def draw_my_stock_list(*codes: str) -> str | bytes:
+    """按自选代码出「我的自选」图；同一份自选列表的图相同，可被预渲染共享。"""
+    if not codes:
         return "您还未添加自选呢~请输入 添加自选 查看帮助!"
 
-    uid = convert_list(uid)
+    uid = list(codes)
     market = get_market()
     zs_snap = await market.board("主要指数", limit=100, sort_asc=False)
     if is_market_error(zs_snap):
         return zs_snap.message
     zs_items = board_rows_to_items(zs_snap.rows)
 
-    img = Image.new(
-        "RGBA",
-        (
-            900 if len(uid) < 18 else 1800,
-            (541 + len(uid) * 110 + 60 if len(uid) < 18 else 541 + (((len(uid) - 1) // 2) + 1) * 110 + 60),
-        ),
-        (7, 9, 27),
+    size = (
+        900 if len(uid) < 18 else 1800,
+        (541 + len(uid) * 110 + 60 if len(uid) < 18 else 541 + (((len(uid) - 1) // 2) + 1) * 110 + 60),
     )
+    img = static_layer(("my_stock", size), lambda: _my_stock_background(size))
     zyzs = (
         [
             "上证指数",
@@ -107,20 +141,8 @@ async def draw_my_stock_img(ev: Event) -> str | bytes:
         for item in zs_items:
             if zs_name != item.name.split("(")[0].strip() and zs_name not in item.name:
                 continue
-            diff = item.change_pct
-            zs_img = Image.new("RGBA", (200, 140))
-            zs_draw = ImageDraw.Draw(zs_img)
-            if diff >= 0:
-                zsc = (140, 18, 22, 55)
-                zsc2 = (206, 34, 30)
-            else:
-                zsc = (59, 140, 18, 55)
-                zsc2 = (36, 206, 30)
-            zs_draw.rounded_rectangle((15, 13, 185, 127), 0, zsc)
-            zs_draw.text((100, 99), zs_name, (255, 255, 255), ss_font(24), "mm")
-            zs_draw.text((100, 38), f"{item.price}", zsc2, ss_font(30), "mm")
-            zs_draw.text((100, 70), f"{'+' if diff >= 0 else ''}{diff}%", zsc2, ss_font(30), "mm")
-            img.paste(zs_img, (x0 + 200 * n, 308 + 140 * 0), zs_img)
+            zs_img = draw_index_tile(zs_name, item.price, item.change_pct)
+            stamp(img, zs_img, (x0 + 200 * n, 308 + 140 * 0))
             n += 1
             break
 
@@ -152,7 +174,7 @@ async def draw_my_stock_img(ev: Event) -> str | bytes:
         else:
             x = 0
             y = 541 + index * 110
-        img.paste(bar, (x, y), bar)
+        stamp(img, bar, (x, y))
 
     for index, u in enumerate(uid):
         TASK.append(sg(img, index, u, len(uid)))
@@ -166,26 +188,7 @@ async def draw_my_stock_img(ev: Event) -> str | bytes:
     else:
         title_num = 11
 
-    title = Image.open(TEXT_PATH / f"title{title_num}.png")
-    img.paste(
-        title,
-        (25 + 450 if len(uid) >= 18 else 25, -31),
-        title,
-    )
-
-    bar5 = Image.open(TEXT_PATH / "bar5.png")
-    img.paste(
-        bar5,
-        (25 + 450 if len(uid) >= 18 else 25, 443),
-        bar5,
-    )
-
-    footer = get_footer()
-    img.paste(
-        footer,
-        (25 + 450 if len(uid) >= 18 else 25, img.size[1] - 55),
-        footer,
-    )
+    stamp(img, texture(TEXT_PATH / f"title{title_num}.png"), (25 + 450 if len(uid) >= 18 else 25, -31))
 
     res = await convert_img(img)
 
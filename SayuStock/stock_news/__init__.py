@@ -1,8 +1,7 @@
 import random
 import asyncio
-from typing import Dict, Union, Optional
+from typing import Dict, List, Union, Callable, Optional, Awaitable
 from datetime import datetime
-from collections import deque
 
 from gsuid_core.sv import SV
 from gsuid_core.aps import scheduler
@@ -12,38 +11,61 @@ from gsuid_core.models import Event
 from gsuid_core.subscribe import gs_subscribe
 from gsuid_core.utils.database.models import Subscribe
 
+from .delivery import NewsDeliveryEngine
 from ..utils.request import get_news, clean_news
+from ..utils.news_store import NewsStore
+from ..stock_config.stock_config import STOCK_CONFIG
 
 sv_stock_subscribe = SV("订阅新闻", pm=2, area="GROUP")
 
 TASK_NAME = "雪球新闻订阅"
 
-# 进程内发送去重（不持久化，重启即清空，仅作安全网）
-# 不同群会推送相同新闻，因此以 group_id 为 key
-# 结构: group_id -> 最近发送过的 news id 队列（最多 50 条，超出自动驱逐最旧）
-_SENT_HISTORY: Dict[str, deque] = {}
-_SENT_HISTORY_MAX = 50
+# 进程内发送去重（不持久化，重启即清空，仅作安全网；跨重启靠订阅里的水位线）
+# 不同群会推送相同新闻，因此以 (group_id, news_id) 为 key
+# 定长 + 过期：群再多、开机再久，内存也是平的
+_SENT_HISTORY_MAX = 5000
+_SENT_HISTORY_TTL_SECONDS = 2 * 86400
+_SENT_HISTORY = NewsStore(_SENT_HISTORY_MAX, _SENT_HISTORY_TTL_SECONDS)
 
 
 def _already_sent(group_id: Optional[str], news_id: int) -> bool:
     """检查该群最近是否已发送过这条新闻"""
     if not group_id:
         return False
-    history = _SENT_HISTORY.get(group_id)
-    if not history:
-        return False
-    return news_id in history
+    return (group_id, news_id) in _SENT_HISTORY
 
 
 def _mark_sent(group_id: Optional[str], news_id: int) -> None:
     """记录该群已发送过这条新闻"""
     if not group_id:
         return
-    history = _SENT_HISTORY.get(group_id)
-    if history is None:
-        history = deque(maxlen=_SENT_HISTORY_MAX)
-        _SENT_HISTORY[group_id] = history
-    history.append(news_id)
+    _SENT_HISTORY.add((group_id, news_id))
+
+
+def _queue_key(subscribe: Subscribe) -> str:
+    """发送队列按 bot + 群（私聊按用户）划分。"""
+    return f"{subscribe.bot_id}:{subscribe.bot_self_id}:{subscribe.group_id or subscribe.user_id}"
+
+
+def _news_sender(subscribe: Subscribe, new: dict) -> Callable[[], Awaitable[bool]]:
+    """一条新闻发往一个订阅的协程工厂；同一群内去重放到真正轮到它时再判断。"""
+
+    async def send() -> bool:
+        if _already_sent(subscribe.group_id, new["id"]):
+            return False
+        dt_local = datetime.fromtimestamp(new["created_at"] / 1000).strftime("%Y-%m-%d %H:%M:%S")
+        await subscribe.send(f"【{dt_local}】雪球7x24消息\n{new['text']}")
+        _mark_sent(subscribe.group_id, new["id"])
+        return True
+
+    return send
+
+
+def _watermark_updater(watermarks: List[int], idx: int, news_id: int) -> Callable[[], None]:
+    def update() -> None:
+        watermarks[idx] = max(watermarks[idx], news_id)
+
+    return update
 
 
 @sv_stock_subscribe.on_fullmatch(
@@ -104,24 +126,27 @@ async def send_subscribe_info() -> None:
             logger.error(f"[SayuStock] 发送订阅新闻失败, 取消发送, 错误码：{news}!")
             return
 
-        for subscribe in datas:
-            # 用真正发送出去的最大 ID 作为水位线，
-            # 避免被雪球撤回的新闻卡死导致下一轮重发
-            sent_max_id: int = int(subscribe.extra_message or 0)
-
-            # 发送
+        # 各群一条发送队列并发排空；同群内逐条、间隔 2~5 秒
+        engine = NewsDeliveryEngine(max_in_flight=int(STOCK_CONFIG.get_config("news_send_concurrency").data))
+        # 用真正发送出去的最大 ID 作为水位线，
+        # 避免被雪球撤回的新闻卡死导致下一轮重发
+        watermarks: List[int] = []
+        for idx, subscribe in enumerate(datas):
+            watermarks.append(int(subscribe.extra_message or 0))
+            em = subscribe.extra_message
             for new in reversed(news[1]["items"]):
-                em = subscribe.extra_message
                 if em and new["id"] > int(em) and new["mark"] in [1]:
-                    # 同一群内同一条新闻去重
-                    if _already_sent(subscribe.group_id, new["id"]):
-                        continue
-                    dt_local = datetime.fromtimestamp(new["created_at"] / 1000).strftime("%Y-%m-%d %H:%M:%S")
-                    await subscribe.send(f"【{dt_local}】雪球7x24消息\n{new['text']}")
-                    await asyncio.sleep(2 + random.random() * 3)
-                    sent_max_id = max(sent_max_id, new["id"])
-                    _mark_sent(subscribe.group_id, new["id"])
+                    engine.submit(
+                        _queue_key(subscribe),
+                        _news_sender(subscribe, new),
+                        on_sent=_watermark_updater(watermarks, idx, new["id"]),
+                    )
+
+        stats = await engine.join()
+        if stats.sent or stats.failed:
+            logger.info(f"[SayuStock] 雪球新闻推送完成：{stats.summary()}")
 
+        for subscribe, sent_max_id in zip(datas, watermarks):
             # 更新max_id
             opt: Dict[str, Union[str, int, None]] = {
                 "bot_id": subscribe.bot_id,
@@ -146,9 +171,9 @@ async def send_subscribe_info() -> None:
             )
 
 
-# 每天凌晨零点，清空NEWS
+# 每天凌晨零点，淘汰过期新闻
 @scheduler.scheduled_job("cron", hour=0, minute=0)
 async def clean_news_data() -> None:
-    logger.info("[SayuStock] 开始执行[清空新闻缓存]")
+    logger.info("[SayuStock] 开始执行[清理新闻缓存]")
     await clean_news()
-    logger.success("[SayuStock] 清空新闻缓存成功!")
+    logger.success("[SayuStock] 清理新闻缓存成功!")
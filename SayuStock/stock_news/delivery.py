@@ -0,0 +1,175 @@
+"""新闻推送投递引擎：每个目标群一条发送队列，群与群之间并发。
+
+老做法是"逐群、逐条、每条之间睡 2~5 秒"，一波 10 条 × 30 个群要串行睡几十分钟，
+排在后面的群收到时早已过时。这里改成：
+
+- 每个目标（``key``，一般是 bot + 群）一条 ``asyncio.Queue``，单独一个 worker 按序发送；
+  同一个群内保持原来的节奏（``min_interval`` + ``jitter`` 随机抖动），不刷屏、不触发风控；
+- 不同群的队列并发排空，全局再用一个信号量限制"同时在发"的条数（``max_in_flight``），
+  避免一口气把 bot 连接打满；
+- 单条发送失败按指数退避重试 ``retries`` 次，仍失败只记日志，不影响同队列后面的消息；
+- 从入队到真正发出的耗时记进直方图（:class:`DeliveryStats`），``STATS`` 是进程级累计。
+
+发送本身由调用方以无参协程工厂传入（``submit(key, send)``），引擎不关心发的是什么；
+工厂返回 ``False`` 表示"轮到它时发现不用发了"（比如同群已发过），只计跳过。
+"""
+
+import time
+import random
+import asyncio
+from typing import Any, Dict, List, Tuple, Callable, Optional, Awaitable
+from dataclasses import field, dataclass
+
+from gsuid_core.logger import logger
+
+SendFn = Callable[[], Awaitable[Any]]
+
+# 延迟直方图分桶上界（秒），最后一桶兜底
+LATENCY_BUCKETS: Tuple[float, ...] = (1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, float("inf"))
+
+
+@dataclass(slots=True)
+class DeliveryStats:
+    """投递计数 + 入队到发出的延迟直方图。"""
+
+    sent: int = 0
+    failed: int = 0
+    retried: int = 0
+    skipped: int = 0
+    buckets: List[int] = field(default_factory=lambda: [0] * len(LATENCY_BUCKETS))
+    max_latency: float = 0.0
+    total_latency: float = 0.0
+
+    def observe(self, latency: float) -> None:
+        self.sent += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if latency <= bound:
+                self.buckets[i] += 1
+                break
+
+    def merge(self, other: "DeliveryStats") -> None:
+        self.sent += other.sent
+        self.failed += other.failed
+        self.retried += other.retried
+        self.skipped += other.skipped
+        self.total_latency += other.total_latency
+        self.max_latency = max(self.max_latency, other.max_latency)
+        self.buckets = [a + b for a, b in zip(self.buckets, other.buckets)]
+
+    def quantile(self, q: float) -> float:
+        """按直方图估分位数，返回所在桶的上界（最后一桶返回最大值）。"""
+        if not self.sent:
+            return 0.0
+        target = q * self.sent
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.buckets):
+            seen += count
+            if seen >= target:
+                return self.max_latency if bound == float("inf") else bound
+        return self.max_latency
+
+    def histogram(self) -> Dict[str, int]:
+        labels = [f"<={b:g}s" if b != float("inf") else f">{LATENCY_BUCKETS[-2]:g}s" for b in LATENCY_BUCKETS]
+        return dict(zip(labels, self.buckets))
+
+    def summary(self) -> str:
+        avg = self.total_latency / self.sent if self.sent else 0.0
+        return (
+            f"成功 {self.sent} / 失败 {self.failed} / 重试 {self.retried} / 跳过 {self.skipped}，"
+            f"延迟 平均 {avg:.1f}s P50≤{self.quantile(0.5):g}s P95≤{self.quantile(0.95):g}s "
+            f"最大 {self.max_latency:.1f}s"
+        )
+
+
+STATS = DeliveryStats()
+
+
+@dataclass(slots=True)
+class _Job:
+    send: SendFn
+    enqueued_at: float
+    on_sent: Optional[Callable[[], None]] = None
+
+
+class NewsDeliveryEngine:
+    """按 key 分队列的并发投递器；一次推送批次用一个实例，``join`` 等全部发完。"""
+
+    def __init__(
+        self,
+        *,
+        max_in_flight: int = 8,
+        min_interval: float = 2.0,
+        jitter: float = 3.0,
+        retries: int = 2,
+        backoff_base: float = 2.0,
+        stats: Optional[DeliveryStats] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.min_interval = min_interval
+        self.jitter = jitter
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.stats = stats if stats is not None else DeliveryStats()
+        self._clock = clock
+        self._sem = asyncio.Semaphore(max(1, max_in_flight))
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._workers: Dict[str, asyncio.Task] = {}
+
+    def submit(self, key: str, send: SendFn, *, on_sent: Optional[Callable[[], None]] = None) -> None:
+        """把一条发送放进 ``key`` 的队列；该队列没有 worker 就起一个。"""
+        queue = self._queues.get(key)
+        if queue is None:
+            queue = self._queues[key] = asyncio.Queue()
+            self._workers[key] = asyncio.create_task(self._drain(key, queue))
+        queue.put_nowait(_Job(send, self._clock(), on_sent))
+
+    async def join(self) -> DeliveryStats:
+        """等所有队列排空，收掉 worker，并把本批统计并入进程级 ``STATS``。"""
+        try:
+            await asyncio.gather(*(q.join() for q in self._queues.values()))
+        finally:
+            for task in self._workers.values():
+                task.cancel()
+            await asyncio.gather(*self._workers.values(), return_exceptions=True)
+            self._queues.clear()
+            self._workers.clear()
+        if self.stats is not STATS:
+            STATS.merge(self.stats)
+        return self.stats
+
+    async def _drain(self, key: str, queue: asyncio.Queue) -> None:
+        pace = False
+        while True:
+            job: _Job = await queue.get()
+            try:
+                # 同一个群内保持原节奏：上一条真的发过才等，第一条 / 跳过的不等
+                if pace:
+                    await asyncio.sleep(self.min_interval + random.random() * self.jitter)
+                pace = await self._send_with_retry(key, job) or pace
+            finally:
+                queue.task_done()
+
+    async def _send_with_retry(self, key: str, job: _Job) -> bool:
+        """发一条（带重试）；返回是否真的向 bot 发过（跳过的返回 False）。"""
+        for attempt in range(self.retries + 1):
+            try:
+                async with self._sem:
+                    result = await job.send()
+            except Exception as e:
+                if attempt >= self.retries:
+                    self.stats.failed += 1
+                    logger.warning(f"[SayuStock] 新闻推送失败 {key}（已重试 {attempt} 次）: {e}")
+                    return True
+                self.stats.retried += 1
+                await asyncio.sleep(self.backoff_base * (2**attempt) * (0.5 + random.random() / 2))
+                continue
+            if result is False:
+                self.stats.skipped += 1
+                return False
+            self.stats.observe(self._clock() - job.enqueued_at)
+            if job.on_sent is not None:
+                job.on_sent()
+            return True
+        return True
@@ -13,6 +13,9 @@
 - ``admin.py``: master-only 压测 / 清库命令（``sv_papertrade_admin`` 注册）
 - ``account_scope.py``: 盘名解析 / 账户解析 / 写入授权
 - ``broadcast.py``: 一个盘 → 多个群的成交播报扇出
+- ``quote_refresh.py``: 交易时段定时刷新所有持仓报价（``quote_service`` 常驻集合）
+- ``eod_snapshot.py``: 交易日收盘后一次给所有盘批量写净值快照
+- ``archive.py`` / ``cold_store.py``: 每月把过了保留期的流水 / 决策搬进压缩冷文件
 - ``strategies/``: 策略注册表；每个策略通过提示词注入 / 候选池偏好 / 数据库硬闸
   三个生效点影响真实行为（见 ``strategies/base.py`` 的说明）
 - 其它兄弟文件（ai_tools / db / cross_group / indicators / matcher / render /
@@ -118,7 +121,7 @@ def _register_recurring_gates() -> None:
 _register_recurring_gates()
 
 # ── SV 实例 + 子模块导入触发装饰器 ───────────────────────────────
-from . import db, admin, ai_tools, commands  # noqa: E402,F401
+from . import db, admin, archive, ai_tools, commands, eod_snapshot, quote_refresh  # noqa: E402,F401
 from .sv import sv_papertrade, sv_papertrade_admin  # noqa: E402,F401
 from .admin import send_dry_run, send_clear_all  # noqa: E402,F401
 
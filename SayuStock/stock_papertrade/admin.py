@@ -4,6 +4,8 @@ PM gate + private chat gate 完全交给框架层（``gsuid_core/handler.py`` 
 ``_sv_authorized``），本文件内不再做运行时 master 检查。
 
 公开命令：
+- ``send_rebuild_leaderboard`` / ``send_check_leaderboard``: 排行物化表全量重建 / 一致性校验。
+- ``send_archive``: 按保留期把老流水 / 决策搬进冷文件，报告腾出的空间（可选 VACUUM）。
 - ``send_dry_run``: 真 agent 端到端压测（preflight → 造 Kanban init/period
   树 → 真跑 papertrade_setup_agent / papertrade_decision_agent → 真推主动
   消息 → DB 状态总览）。
@@ -19,7 +21,7 @@ from apscheduler.schedulers.base import BaseScheduler
 from gsuid_core.bot import Bot
 from gsuid_core.models import Event
 
-from . import db as _db, account_scope as _scope
+from . import db as _db, archive as _archive, account_scope as _scope
 from .sv import sv_papertrade_admin
 from ..utils.database.papertrade_models import (
     SayuPaperTrade,
@@ -217,6 +219,57 @@ async def send_clear_all(bot: Bot, ev: Event) -> list[str] | None:
     return await bot.send("\n\n".join(sections))
 
 
+# ============================================================
+# 排行物化表重建 / 校验（master-only）
+# ============================================================
+@sv_papertrade_admin.on_fullmatch(("模拟盘排行重建",))
+async def send_rebuild_leaderboard(bot: Bot, ev: Event) -> list[str] | None:
+    """从快照表全量重建排行物化表（``SayuPaperAccountStats``），重建后顺手校验一遍。"""
+    t0: float = _time.perf_counter()
+    try:
+        count = await _db.PaperSnapshotRepo.rebuild_account_stats()
+        problems = await _db.PaperSnapshotRepo.check_account_stats()
+    except Exception as e:
+        return await bot.send(f"❌ 排行重建失败: {type(e).__name__}: {e}")
+    lines = [f"✅ 排行物化表已重建：{count} 个盘，⏱ {_time.perf_counter() - t0:.2f}s"]
+    lines.append("校验一致" if not problems else f"⚠️ 重建后仍有 {len(problems)} 处不一致：")
+    lines.extend(problems[:20])
+    return await bot.send("\n".join(lines))
+
+
+@sv_papertrade_admin.on_fullmatch(("模拟盘排行校验",))
+async def send_check_leaderboard(bot: Bot, ev: Event) -> list[str] | None:
+    """排行物化表 vs 全历史 group by 查询逐盘比对，只报告不修复。"""
+    try:
+        problems = await _db.PaperSnapshotRepo.check_account_stats()
+    except Exception as e:
+        return await bot.send(f"❌ 排行校验失败: {type(e).__name__}: {e}")
+    if not problems:
+        return await bot.send("✅ 排行物化表与快照表一致")
+    lines = [f"⚠️ 排行物化表有 {len(problems)} 处不一致（发「模拟盘排行重建」修复）："]
+    lines.extend(problems[:20])
+    if len(problems) > 20:
+        lines.append(f"……另有 {len(problems) - 20} 处")
+    return await bot.send("\n".join(lines))
+
+
+# ============================================================
+# 流水 / 决策冷归档（master-only）
+# ============================================================
+@sv_papertrade_admin.on_fullmatch(("模拟盘归档",))
+@sv_papertrade_admin.on_prefix(("模拟盘归档",))
+async def send_archive(bot: Bot, ev: Event) -> list[str] | None:
+    """``模拟盘归档 [压缩]``：立即按 ``papertrade_archive_days`` 跑一次归档；带「压缩」时归档后 VACUUM。"""
+    vacuum = ev.text.strip() in ("压缩", "vacuum")
+    try:
+        report = await _archive.run_archive(vacuum=vacuum)
+    except Exception as e:
+        return await bot.send(f"❌ 归档失败: {type(e).__name__}: {e}")
+    if report is None:
+        return await bot.send("ℹ️ 归档未开启（papertrade_archive_days = 0）")
+    return await bot.send(f"✅ 模拟盘归档完成\n{report.summary()}")
+
+
 # ============================================================
 # 真 agent 端到端压测（扩写：全流程覆盖）
 # ============================================================
@@ -564,6 +617,7 @@ async def send_dry_run(bot: Bot, ev: Event) -> list[str] | None:
         snapshot_decision_state,
         build_papertrade_proactive_text,
     )
+    from .valuation import valuation_round
 
     # variant 调度：段编号 → 共享模块 variant 字面量
     _STEP_VARIANT: dict[str, _Variant] = {
@@ -596,47 +650,49 @@ async def send_dry_run(bot: Bot, ev: Event) -> list[str] | None:
         proactive_ok: bool = False
         baseline = await snapshot_decision_state(account_id)
 
-        try:
-            with _scope.grant_write(account_id):
-                result = await run_capability_agent(
-                    profile_id="papertrade_decision_agent",
-                    task=task,
-                    ev=ev,
-                    bot=bot,
-                    session_id_suffix=session_suffix,
-                )
-            lines.append("✅ run_capability_agent 返回")
-            lines.append(f"   profile = papertrade_decision_agent（{head_label}）")
-            lines.append("   返回（前 200 字符）:")
-            lines.append("   ┌─")
-            for ln in result[:200].split("\n")[:6]:
-                lines.append(f"   │ {ln[:60]}")
-            lines.append("   └─")
-        except Exception as e:
-            lines.append(f"❌ LLM 调用失败: {type(e).__name__}: {e}")
+        # 同一段的 agent 工具调用与下面的播报文本共用一份账户估值（成交后自动失效）
+        with valuation_round(f"dry_run_{account_id}_{session_suffix}"):
+            try:
+                with _scope.grant_write(account_id):
+                    result = await run_capability_agent(
+                        profile_id="papertrade_decision_agent",
+                        task=task,
+                        ev=ev,
+                        bot=bot,
+                        session_id_suffix=session_suffix,
+                    )
+                lines.append("✅ run_capability_agent 返回")
+                lines.append(f"   profile = papertrade_decision_agent（{head_label}）")
+                lines.append("   返回（前 200 字符）:")
+                lines.append("   ┌─")
+                for ln in result[:200].split("\n")[:6]:
+                    lines.append(f"   │ {ln[:60]}")
+                lines.append("   └─")
+            except Exception as e:
+                lines.append(f"❌ LLM 调用失败: {type(e).__name__}: {e}")
 
-        try:
-            trades_d, positions_d, decisions_d = await decision_state_delta(baseline, account_id)
-        except Exception as e:
-            lines.append(f"❌ 副作用查询失败: {type(e).__name__}: {e}")
-
-        # 每段后 emit_proactive_message（即使 LLM 失败也推，验证链路）
-        # 真实播报：从 DB 动态拼"📈 模拟盘操盘播报"，让 master 看到的就是产品形态。
-        #   ②/③/④/⑤ 都会拼 — ⑥ (KB/Web 通路) 保留元文本因为没有真实交易可播
-        #   fallback_text 传给 build_papertrade_proactive_text：DB 异常 / 账户不存在时退化用
-        text: str = proactive_text
-        if step_no in _STEP_VARIANT:
             try:
-                text = await build_papertrade_proactive_text(
-                    account_id,
-                    variant=_STEP_VARIANT[step_no],
-                    trades_d=trades_d,
-                    positions_d=positions_d,
-                    decisions_d=decisions_d,
-                    fallback_text=proactive_text,
-                )
+                trades_d, positions_d, decisions_d = await decision_state_delta(baseline, account_id)
             except Exception as e:
-                lines.append(f"❌ build_proactive_text 失败: {type(e).__name__}: {e}，回退到 proactive_text")
+                lines.append(f"❌ 副作用查询失败: {type(e).__name__}: {e}")
+
+            # 每段后 emit_proactive_message（即使 LLM 失败也推，验证链路）
+            # 真实播报：从 DB 动态拼"📈 模拟盘操盘播报"，让 master 看到的就是产品形态。
+            #   ②/③/④/⑤ 都会拼 — ⑥ (KB/Web 通路) 保留元文本因为没有真实交易可播
+            #   fallback_text 传给 build_papertrade_proactive_text：DB 异常 / 账户不存在时退化用
+            text: str = proactive_text
+            if step_no in _STEP_VARIANT:
+                try:
+                    text = await build_papertrade_proactive_text(
+                        account_id,
+                        variant=_STEP_VARIANT[step_no],
+                        trades_d=trades_d,
+                        positions_d=positions_d,
+                        decisions_d=decisions_d,
+                        fallback_text=proactive_text,
+                    )
+                except Exception as e:
+                    lines.append(f"❌ build_proactive_text 失败: {type(e).__name__}: {e}，回退到 proactive_text")
         try:
             proactive_ok = await emit_proactive_message(
                 ev,
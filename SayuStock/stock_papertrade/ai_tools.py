@@ -31,7 +31,7 @@
 
 import json
 import datetime as _dt
-from typing import Any, Set, Dict, TypedDict
+from typing import Any, Set, TypedDict
 
 from pydantic_ai import RunContext
 
@@ -39,10 +39,9 @@ from gsuid_core.ai_core.models import ToolContext
 from gsuid_core.ai_core.register import ai_tools
 from gsuid_core.ai_core.planning.runtime import PlanRunContext, get_plan_context
 
-from . import db, broadcast, strategies, account_scope
+from . import db, broadcast, valuation, strategies, eod_snapshot, account_scope
 from .indicators import compute_indicators
 from ..utils.market import KlinePeriod, get_market, is_market_error
-from .quote_service import quote_service
 from .trading_calendar import (
     is_trading_time,
     trading_day_summary,
@@ -285,24 +284,59 @@ async def _gate_entry(
     )
 
 
+def _parse_snapshot(snapshot: str) -> dict[str, Any]:
+    """流水 ``snapshot`` JSON → dict（给落库硬闸用）；空 / 解析失败 / 非对象都返回空 dict。"""
+    raw = (snapshot or "").strip()
+    if not raw or raw == "{}":
+        return {}
+    try:
+        parsed: object = json.loads(raw)
+    except (json.JSONDecodeError, TypeError, ValueError):
+        return {}
+    return {str(k): v for k, v in parsed.items()} if isinstance(parsed, dict) else {}
+
+
 # ============================================================
 # 0) Enrich Helper：把持仓补上"现价 / 市值 / 浮盈"
 #
 # 2026-07-01 新增：``papertrade_position_list`` / ``papertrade_account_query``
-# 之前不返回现价，agent 拿到数据后无法算持仓市值 / 浮盈 / 总资产。本 helper
-# 自动：
+# 之前不返回现价，agent 拿到数据后无法算持仓市值 / 浮盈 / 总资产。
 #
-#   1. 读 DB 持仓
-#   2. 找出 ``last_quote_at`` 超过 ``max_stale_seconds`` 的行（含 None）
-#   3. 把 secid 喂 ``quote_service.get_quotes_batch``（60s TTL 内存缓存 + 东财 push2）
-#   4. 成功的报价 ``PaperPositionRepo.bulk_set_quote`` 写回 DB（让下次调用立即看到）
-#   5. 失败的报价降级 ``last_quote_price → avg_cost``
+# 估值本身（读持仓 → 批量刷 stale 报价 → 写回 DB → 降级 ``last_quote_price →
+# avg_cost``）在 ``valuation.compute_valuation``；这里按 Kanban ``root_task_id``
+# 走轮次备忘，同一轮里查账 / 列持仓 / 写快照共用一份估值和报价快照，成交后由
+# ``trade_executor`` 失效。
 #
-# 返回值每条带 ``quote_source`` 字段："live" / "db" / "cost"，LLM 据此知道
+# 每条 enrichment 带 ``quote_source`` 字段："live" / "db" / "cost"，LLM 据此知道
 # 数据新鲜度，避免拿着过期报价瞎决策。
 # ============================================================
 from gsuid_core.logger import logger as _gslogger  # noqa: E402  -- pyright 看不见根包导入
 
+# 收盘快照能接受的本轮估值年龄，与报价缓存 TTL 对齐
+_SNAPSHOT_MAX_AGE_SECONDS: float = 60.0
+
+
+async def _get_valuation(
+    account_id: int,
+    *,
+    account: SayuPaperAccount | None = None,
+    max_stale_seconds: int = 60,
+    max_age_seconds: float | None = None,
+) -> valuation.AccountValuation:
+    """本轮的账户估值（轮次备忘，见 ``valuation.get_valuation``）。
+
+    ``max_age_seconds`` 缺省取 ``max_stale_seconds``：轮次按 root_task_id 归轮、空闲
+    窗口会滑动，长任务后半程若一直复用备忘，几分钟前的报价会带着 ``quote_source="live"``、
+    ``quote_age_seconds=0`` 被当成现价返回。备忘超过报价 TTL 就重算。
+    """
+    return await valuation.get_valuation(
+        account_id,
+        account=account,
+        round_key=_root_task_id(),
+        max_stale_seconds=max_stale_seconds,
+        max_age_seconds=float(max_stale_seconds) if max_age_seconds is None else max_age_seconds,
+    )
+
 
 async def _get_enriched_positions(
     account_id: int,
@@ -322,115 +356,8 @@ async def _get_enriched_positions(
         （"live"=60s 内/db=已有缓存但超龄/cost=未刷过用均价兜底）。
         ``quote_age_seconds`` 为 None 表示从未刷过价。
     """
-    positions: list[SayuPaperPosition] = await db.PaperPositionRepo.list_by_account(account_id)
-    if not positions:
-        return []
-
-    now = _dt.datetime.now()
-    # 1) 找出需要刷新的持仓
-    to_refresh: list[SayuPaperPosition] = []
-    for p in positions:
-        if not p.last_quote_at:
-            to_refresh.append(p)
-            continue
-        try:
-            age = (now - p.last_quote_at).total_seconds()
-        except TypeError:
-            # 老库 last_quote_at 是 None / 字符串乱码等异常情况
-            to_refresh.append(p)
-            continue
-        if age > max_stale_seconds:
-            to_refresh.append(p)
-
-    # 2) 批量拉一次报价（缓存优先；缺失项并发穿透）。结果**就地复用**给"写 DB"
-    #    和"组装 enrichment"，避免双重 HTTP 调用。
-    secid_to_fresh: Dict[str, float] = {}
-    if to_refresh:
-        secids = [p.secid for p in to_refresh if p.secid]
-        if secids:
-            try:
-                fetched = await quote_service.get_quotes_batch(secids)
-            except Exception as e:
-                _gslogger.debug(f"[SayuStock][PaperTrade] quote_service.get_quotes_batch 异常：{e}")
-                fetched = {}
-            secid_to_fresh = {secid: float(price) for secid, price in fetched.items() if price is not None}
-            # 3) 写回 DB（让下一次调用立即看到新价，省一次 API）
-            if secid_to_fresh:
-                writes: list[dict] = [
-                    {
-                        "stock_code": p.stock_code,
-                        "price": secid_to_fresh[p.secid],
-                        "at": now,
-                    }
-                    for p in to_refresh
-                    if p.secid in secid_to_fresh
-                ]
-                if writes:
-                    try:
-                        await db.PaperPositionRepo.bulk_set_quote(writes, account_id)
-                    except Exception as e:
-                        # 老库可能列未迁移完；这里 swallow 不影响主流程
-                        _gslogger.debug(f"[SayuStock][PaperTrade] bulk_set_quote 写 DB 失败（降级）：{e}")
-
-    # 4) 拼 enrichment——不再二次读 DB，组合原 position + secid_to_fresh
-    enriched: list[tuple[SayuPaperPosition, dict]] = []
-    for p in positions:
-        fresh = secid_to_fresh.get(p.secid) if p.secid else None
-        if fresh is not None:
-            current_price = fresh
-            quote_source = "live"
-            quote_age = 0
-            last_quote_at = now
-        elif p.last_quote_price is not None and p.last_quote_at is not None:
-            current_price = p.last_quote_price
-            quote_source = "db"
-            try:
-                quote_age = int((now - p.last_quote_at).total_seconds())
-            except TypeError:
-                quote_age = None
-            last_quote_at = p.last_quote_at
-        else:
-            # 用均价兜底；最后兜
-            current_price = p.avg_cost if p.avg_cost else 0.0
-            quote_source = "cost"
-            quote_age = None
-            last_quote_at = None
-
-        cost_basis = p.avg_cost * p.qty if p.avg_cost else 0.0
-        market_value = current_price * p.qty
-        unrealized_pnl = (current_price - p.avg_cost) * p.qty if p.avg_cost else 0.0
-        unrealized_pnl_pct = (unrealized_pnl / cost_basis * 100) if cost_basis else 0.0
-
-        enrichment: dict[str, Any] = {
-            "current_price": round(current_price, 4),
-            "market_value": round(market_value, 2),
-            "unrealized_pnl": round(unrealized_pnl, 2),
-            "unrealized_pnl_pct": round(unrealized_pnl_pct, 4),
-            "quote_age_seconds": quote_age,
-            "quote_source": quote_source,
-            "last_quote_at": last_quote_at.isoformat() if last_quote_at else None,
-        }
-        enriched.append((p, enrichment))
-    return enriched
-
-
-def _aggregate_enriched(
-    enriched: list[tuple[SayuPaperPosition, dict]],
-) -> dict[str, float]:
-    """聚合 enriched 持仓用于 ``papertrade_account_query`` 输出。"""
-    position_value: float = 0.0
-    total_unrealized_pnl: float = 0.0
-    quote_stale_count: int = 0
-    for _, e in enriched:
-        if e["quote_source"] != "live":
-            quote_stale_count += 1
-        position_value += float(e["market_value"])
-        total_unrealized_pnl += float(e["unrealized_pnl"])
-    return {
-        "position_value": round(position_value, 2),
-        "total_unrealized_pnl": round(total_unrealized_pnl, 2),
-        "quote_stale_count": quote_stale_count,
-    }
+    val = await _get_valuation(account_id, max_stale_seconds=max_stale_seconds)
+    return val.positions
 
 
 # ============================================================
@@ -519,14 +446,13 @@ async def papertrade_account_query(
     if acc is None or acc.id is None:
         return account_scope.not_opened_message(name=account_name)
 
-    # ── enriched 持仓聚合（自动刷报价，含浮盈 / 现价） ──
-    enriched: list[tuple[SayuPaperPosition, dict]] = await _get_enriched_positions(acc.id)
-    agg: dict[str, float] = _aggregate_enriched(enriched)
-    position_value: float = agg["position_value"]
-    total_unrealized_pnl: float = agg["total_unrealized_pnl"]
-    quote_stale_count: int = int(agg["quote_stale_count"])
+    # ── 本轮估值（自动刷报价，含浮盈 / 现价；同轮其他工具复用） ──
+    val = await _get_valuation(acc.id, account=acc)
+    position_value: float = val.position_value
+    total_unrealized_pnl: float = val.total_unrealized_pnl
+    quote_stale_count: int = val.quote_stale_count
 
-    total_equity: float = round(acc.cash + position_value, 2)
+    total_equity: float = val.total_equity
     realized_pnl: float = round(acc.principal - acc.initial_cash, 2)
     total_unrealized_pnl_pct: float = (
         round(total_unrealized_pnl / acc.initial_cash * 100, 4) if acc.initial_cash else 0.0
@@ -547,7 +473,7 @@ async def papertrade_account_query(
         "total_unrealized_pnl": total_unrealized_pnl,
         "total_unrealized_pnl_pct": total_unrealized_pnl_pct,
         "realized_pnl": realized_pnl,
-        "position_count": len(enriched),
+        "position_count": len(val.positions),
         "quote_stale_count": quote_stale_count,
         "mode": acc.mode,
         "frequency_minutes": acc.frequency_minutes,
@@ -1069,21 +995,10 @@ async def papertrade_trade_insert(
 
     side_lc: str = (side or "").lower().strip()
     if side_lc in ("buy", "sell"):
-        import json as _json
-
-        snap_obj: dict[str, Any] = {}
-        raw_snap = (snapshot or "").strip()
-        if raw_snap and raw_snap != "{}":
-            try:
-                parsed_snap: object = _json.loads(raw_snap)
-            except (_json.JSONDecodeError, TypeError, ValueError):
-                parsed_snap = None
-            if isinstance(parsed_snap, dict):
-                snap_obj = {str(k): v for k, v in parsed_snap.items()}
         gate_msg: str = await _gate_entry(
             acc,
             stock_code=stock_code,
-            indicators=snap_obj,
+            indicators=_parse_snapshot(snapshot),
             score=0.0,
             source="trade",
             side=side_lc,
@@ -1220,11 +1135,13 @@ async def papertrade_candidate_refresh(
     from .candidate_pool import (
         BASE_KEEP,
         BLUECHIP_BASE,
+        SHARED_SOURCES,
         POOL_TARGET_SIZE,
         AUTO_EXPIRE_HOURS,
         BASE_EXPIRE_HOURS,
         ROTATE_OUT_PER_REFRESH,
         derive_secid,
+        fetch_sources,
         _from_position,
         _from_watchlist,
         pick_base_slice,
@@ -1234,6 +1151,7 @@ async def papertrade_candidate_refresh(
         _from_amount_leaders,
         _from_market_gainers,
         _from_market_laggards,
+        format_source_timings,
         _from_sector_top_picks,
         _from_concept_top_picks,
         interleave_source_pairs,
@@ -1346,30 +1264,20 @@ async def papertrade_candidate_refresh(
         momentum_cap = min(momentum_cap, batch_size)
 
     if momentum_cap > 0:
-        import asyncio
-        from collections.abc import Awaitable
-
-        async def _safe_source(label: str, coro: Awaitable[list[str]]) -> list[tuple[str, str]]:
-            try:
-                codes = await coro
-                return [(c, label) for c in codes]
-            except Exception as ex:
-                _gslogger.debug(f"[SayuStock][PaperTrade] candidate_refresh {label} 失败: {ex}")
-                return []
-
         # 策略权重为 0 的来源**根本不拉**（省掉一整轮 HTTP），不是拉回来再丢
         def _weight(label: str) -> float:
             return float(pref.source_weights.get(label, 1.0)) if pref.source_weights else 1.0
 
+        # 全市场源跨账户共享（SHARED_SOURCES 按源 TTL 缓存），本账户只做下面的去重 / 过滤
         planned: list[tuple[str, Any]] = [
-            ("sector", _from_sector_top_picks(top_sectors=4, per_sector=3)),
-            ("concept", _from_concept_top_picks(top_concepts=3, per_concept=3)),
-            ("hotmap", _from_hotmap_top_n(n=12)),
-            ("gainer", _from_market_gainers(n=10)),
-            ("laggard", _from_market_laggards(n=8)),
-            ("amount", _from_amount_leaders(n=10)),
-            ("quality", _from_quality_roe(n=10)),
-            ("news", _from_news_extract_tickers()),
+            ("sector", SHARED_SOURCES.get("sector", _from_sector_top_picks, top_sectors=4, per_sector=3)),
+            ("concept", SHARED_SOURCES.get("concept", _from_concept_top_picks, top_concepts=3, per_concept=3)),
+            ("hotmap", SHARED_SOURCES.get("hotmap", _from_hotmap_top_n, n=12)),
+            ("gainer", SHARED_SOURCES.get("gainer", _from_market_gainers, n=10)),
+            ("laggard", SHARED_SOURCES.get("laggard", _from_market_laggards, n=8)),
+            ("amount", SHARED_SOURCES.get("amount", _from_amount_leaders, n=10)),
+            ("quality", SHARED_SOURCES.get("quality", _from_quality_roe, n=10)),
+            ("news", SHARED_SOURCES.get("news", _from_news_extract_tickers)),
         ]
         active: list[tuple[str, Any]] = []
         for label, coro in planned:
@@ -1378,11 +1286,10 @@ async def papertrade_candidate_refresh(
             else:
                 coro.close()  # 未 await 的协程必须显式关闭，否则 RuntimeWarning 刷屏
 
-        # 多源并行拉取，降低串行时延
-        batches = await asyncio.gather(*(_safe_source(label, coro) for label, coro in active))
-        raw_pairs: list[tuple[str, str]] = []
-        for batch in batches:
-            raw_pairs.extend(batch)
+        # 多源并行拉取，单路超时即丢弃，降低串行时延
+        fetched, source_timings = await fetch_sources(active)
+        _gslogger.debug(f"[SayuStock][PaperTrade] candidate_refresh 源耗时：{format_source_timings(source_timings)}")
+        raw_pairs: list[tuple[str, str]] = [(c, label) for label, _ in active for c in fetched[label]]
 
         # 去重（保留首次出现的 source），过滤非法 + 已 seen
         uniq: list[tuple[str, str]] = []
@@ -1543,6 +1450,123 @@ async def papertrade_match_order(
     return json.dumps(view, ensure_ascii=False)
 
 
+@ai_tools(
+    category="default",
+    capability_domain="AI模拟盘",
+    visible_when=_visible_to_papertrade_agent,
+)
+async def papertrade_order_batch(
+    ctx: RunContext[ToolContext],
+    orders: str,
+    mode: str = "balanced",
+) -> str:
+    """一次执行本轮的多笔买卖（撮合 + 写流水 + 维护现金 + 更新持仓），返回每笔结果的 JSON 数组。
+
+    本轮要下 **两笔及以上** 单时用它，代替逐笔 ``papertrade_match_order`` →
+    ``papertrade_trade_insert`` → ``papertrade_position_upsert``：行情批量拉一次，
+    按给定顺序在内存里撮合（前一笔的成交影响后一笔的可用现金 / 可卖股数），
+    全部流水 + 现金 + 持仓一个事务落库。**不要**再对这些单调 trade_insert /
+    position_upsert。
+
+    规则与逐笔路径完全一致：按撮合此刻实时价成交、涨跌停拦截、整手 / 现金降档、
+    A 股 T+1（当天买过的股整单拒卖，本批先买后卖同一只也算）、buy 入场止损硬门
+    （``snapshot`` 须含 ``plan_stop_pct`` 或 ``plan_stop_price``）。某笔被拒不影响其余；
+    落库失败则整批都不生效。成交冒泡由系统逐笔推送。
+
+    Args:
+        orders: JSON 数组，每项 ``{"side": "buy"/"sell", "stock_code": "600000", "qty": 1000,
+            "stock_name": "", "price": 参考价(可省), "reason": "", "snapshot": "{...}",
+            "decision_id": 0}``；卖出建议先卖后买，回笼的现金给后面的买单用。
+        mode: 交易模式（写进流水）。
+
+    Returns:
+        JSON 数组，与 ``orders`` 一一对应：``ok`` / ``side`` / ``code`` / ``actual_qty`` /
+        ``price`` / ``amount`` / ``fee_total`` / ``realized_pnl`` / ``trade_id`` /
+        ``position_qty`` / ``avg_cost`` / ``message``（拒单原因或现金变动说明）。
+    """
+    from .trade_executor import OrderRequest, get_executor
+
+    acc, note = await _write_account()
+    if acc is None or acc.id is None:
+        return note or "⚠️ 无法确定要写入的模拟盘。"
+    denied: str = await _deny_write(acc)
+    if denied:
+        return denied
+
+    try:
+        raw_orders: object = json.loads(orders)
+    except (json.JSONDecodeError, TypeError, ValueError) as e:
+        return f"⚠️ orders 不是合法 JSON 数组：{e}"
+    if not isinstance(raw_orders, list) or not raw_orders:
+        return "⚠️ orders 必须是非空 JSON 数组。"
+
+    # 先逐笔解析 + 过落库硬闸；没过的不进撮合，原样回报
+    results: list[dict[str, Any]] = []
+    accepted: list[tuple[int, OrderRequest]] = []
+    for item in raw_orders:
+        if not isinstance(item, dict):
+            results.append({"ok": False, "message": "⚠️ 订单必须是 JSON 对象"})
+            continue
+        try:
+            order = OrderRequest(
+                side=str(item.get("side", "")).lower().strip(),
+                stock_code=str(item.get("stock_code", "")).strip(),
+                qty=int(item.get("qty", 0)),
+                stock_name=str(item.get("stock_name", "")),
+                price=float(item.get("price", 0.0) or 0.0),
+                reason=str(item.get("reason", "")),
+                snapshot=str(item.get("snapshot", "") or ""),
+                decision_id=int(item.get("decision_id", 0) or 0),
+            )
+        except (TypeError, ValueError) as e:
+            results.append({"ok": False, "message": f"⚠️ 订单字段非法：{e}"})
+            continue
+        result: dict[str, Any] = {"ok": False, "side": order.side, "code": order.stock_code}
+        results.append(result)
+        if order.side in ("buy", "sell"):
+            gate_msg: str = await _gate_entry(
+                acc,
+                stock_code=order.stock_code,
+                indicators=_parse_snapshot(order.snapshot),
+                score=0.0,
+                source="trade",
+                side=order.side,
+            )
+            if gate_msg:
+                result["message"] = gate_msg
+                continue
+        accepted.append((len(results) - 1, order))
+
+    outcomes = await get_executor().execute_batch(acc.id, [o for _, o in accepted], mode=mode)
+    for (index, order), outcome in zip(accepted, outcomes):
+        res, record = outcome.match, outcome.record
+        results[index].update(
+            {
+                "ok": record.ok,
+                "actual_qty": res.actual_qty if record.ok else 0,
+                "price": res.price,
+                "amount": res.amount if record.ok else 0.0,
+                "fee_total": res.fee_total if record.ok else 0.0,
+                "realized_pnl": outcome.realized_pnl,
+                "trade_id": record.trade_id,
+                "position_qty": outcome.position_qty,
+                "avg_cost": outcome.avg_cost,
+                "message": record.message,
+            }
+        )
+        if record.ok:
+            await broadcast.broadcast_fill(
+                acc,
+                side=res.side,
+                stock_code=order.stock_code,
+                stock_name=order.stock_name,
+                qty=res.actual_qty,
+                price=res.price,
+                realized_pnl=outcome.realized_pnl,
+            )
+    return json.dumps(results, ensure_ascii=False)
+
+
 @ai_tools(
     category="default",
     capability_domain="AI模拟盘",
@@ -1553,13 +1577,15 @@ async def papertrade_snapshot_write(
 ) -> str:
     """写当日收盘净值快照（现金 + Σ持仓实时市值），按 trade_date 幂等 upsert。
 
-    ⚠️ 仅 papertrade_*_agent 可见，**收盘快照代理专用**。一次做完：
-      1. 读账户 + enriched 持仓（自动刷实时报价算 market_value）；
+    ⚠️ 仅 papertrade_*_agent 可见，**收盘快照代理专用**。与 15:05 的全盘批量快照
+    （``eod_snapshot.write_eod_snapshots``）同一套计算，只写当前这个盘：
+      1. 读账户 + 持仓（复用本轮估值的报价快照，超过 60s 则重新批量拉；拉不到按库里
+         旧报价 / 均价兜底）；
       2. total_equity = cash + Σmarket_value；
          total_pnl = total_equity - initial_cash；
          total_pnl_pct = total_pnl / initial_cash × 100；
          day_pnl = total_equity - 上一交易日快照的 total_equity（无历史则相对 initial_cash）；
-      3. ``PaperSnapshotRepo.upsert_for_date`` 幂等写入（同一 trade_date 重跑只更新不新增）。
+      3. ``PaperSnapshotRepo.upsert_many_for_date`` 幂等写入（同一 trade_date 重跑只更新不新增）。
 
     这是**纯记账**，不做任何买卖 / 撮合 / 决策，收盘后（非交易时段）调用。
     trade_date 取东八区当天。
@@ -1571,53 +1597,29 @@ async def papertrade_snapshot_write(
     if denied:
         return denied
 
-    # 东八区当天作为 trade_date（系统时钟漂到 UTC 时避免快照记错日）
-    try:
-        from zoneinfo import ZoneInfo
-
-        today_cn: _dt.date = _dt.datetime.now(ZoneInfo("Asia/Shanghai")).date()
-    except Exception:
-        today_cn = _dt.date.today()
-
-    enriched: list[tuple[SayuPaperPosition, dict]] = await _get_enriched_positions(acc.id)
-    agg: dict[str, float] = _aggregate_enriched(enriched)
-    position_value: float = agg["position_value"]
-    total_equity: float = round(acc.cash + position_value, 2)
-    total_pnl: float = round(total_equity - acc.initial_cash, 2)
-    total_pnl_pct: float = round(total_pnl / acc.initial_cash * 100, 4) if acc.initial_cash else 0.0
-
-    # day_pnl：相对上一交易日快照的 total_equity；无历史则相对初始本金
-    prev = await db.PaperSnapshotRepo.prev_before(acc.id, today_cn)
-    baseline_equity: float = prev.total_equity if prev is not None else acc.initial_cash
-    day_pnl: float = round(total_equity - baseline_equity, 2)
-    day_pnl_pct: float = round(day_pnl / baseline_equity * 100, 4) if baseline_equity else 0.0
-
-    snap = await db.PaperSnapshotRepo.upsert_for_date(
-        acc.id,
-        today_cn,
-        cash=round(acc.cash, 2),
-        position_value=position_value,
-        total_equity=total_equity,
-        day_pnl=day_pnl,
-        day_pnl_pct=day_pnl_pct,
-        total_pnl=total_pnl,
-        total_pnl_pct=total_pnl_pct,
-    )
+    trade_date: _dt.date = eod_snapshot.today_cn()
+    # 本轮刚估过值就用同一份报价快照（和前面 account_query 看到的数字一致）；
+    # 超过报价 TTL 的估值不拿来记收盘净值，重估一次并回填本轮
+    val = await _get_valuation(acc.id, account=acc, max_age_seconds=_SNAPSHOT_MAX_AGE_SECONDS)
+    snaps = await eod_snapshot.write_eod_snapshots(trade_date, [acc], prices=val.quotes)
+    if not snaps:
+        return "⚠️ 快照写入失败。"
+    s = snaps[0]
     return json.dumps(
         {
             "ok": True,
             "account_id": acc.id,
             "account_name": acc.name,
-            "snapshot_id": snap.id,
-            "trade_date": today_cn.isoformat(),
-            "cash": round(acc.cash, 2),
-            "position_value": position_value,
-            "position_count": len(enriched),
-            "total_equity": total_equity,
-            "day_pnl": day_pnl,
-            "day_pnl_pct": day_pnl_pct,
-            "total_pnl": total_pnl,
-            "total_pnl_pct": total_pnl_pct,
+            "snapshot_id": s.snapshot_id,
+            "trade_date": trade_date.isoformat(),
+            "cash": s.cash,
+            "position_value": s.position_value,
+            "position_count": s.position_count,
+            "total_equity": s.total_equity,
+            "day_pnl": s.day_pnl,
+            "day_pnl_pct": s.day_pnl_pct,
+            "total_pnl": s.total_pnl,
+            "total_pnl_pct": s.total_pnl_pct,
         },
         ensure_ascii=False,
     )
@@ -0,0 +1,214 @@
+"""模拟盘流水 / 决策冷归档。
+
+流水和决策日志（带整段 LLM 推理文本）只增不减，SQLite 文件越滚越大，全表扫描、
+VACUUM、备份都跟着变慢。这里把早于保留期的**整月**行搬进 :mod:`cold_store` 的
+分区文件，热表只留 ``SayuPaperArchiveMonth`` 汇总行：
+
+1. 保留期 ``papertrade_archive_days`` 换算成截止月初（截止点对齐到月，冷文件
+   永远是整月，汇总行就是该月的精确合计）；
+2. 逐月取出该月全部热行，按盘写分区文件（该盘该月已有有效分区时先合并、按 id
+   去重），文件 fsync 落盘后，同一事务里写汇总行并删掉热行；
+3. 清掉没有汇总行对应的分区文件（写完文件但没来得及提交的，或盘已被清掉的）。
+
+读路径在 ``db.py``：``list_by_account`` / ``list_recent`` 热表不够数时按月倒序读冷
+文件补齐，``aggregate_pnl`` 加上汇总行合计，调用方无感。
+
+每月 1 日 04:20 自动跑一次；master 可发「模拟盘归档」手动触发（可选 VACUUM）。
+"""
+
+from __future__ import annotations
+
+import time
+import asyncio
+from typing import Any, Dict, List, Tuple, Optional
+from pathlib import Path
+from datetime import date, datetime, timedelta
+from dataclasses import field, dataclass
+
+from gsuid_core.aps import scheduler
+from gsuid_core.logger import logger
+
+from . import cold_store
+from .db import PaperArchiveRepo
+from ..stock_config.stock_config import STOCK_CONFIG
+
+__all__ = ["ArchiveReport", "archive_cutoff", "archive_before", "run_archive"]
+
+
+@dataclass(slots=True)
+class ArchiveReport:
+    """一次归档的结果。"""
+
+    cutoff: datetime
+    # {kind: 搬走的行数}
+    rows: Dict[str, int] = field(default_factory=dict)
+    months: int = 0
+    partitions: int = 0
+    # 本次写出的分区：压缩后 / 原始 JSONL 字节数
+    cold_bytes: int = 0
+    raw_bytes: int = 0
+    purged_files: int = 0
+    # SQLite 库 (总字节, 空闲页字节)，归档前后各一次；其他方言为 None
+    db_before: Optional[Tuple[int, int]] = None
+    db_after: Optional[Tuple[int, int]] = None
+    vacuumed: bool = False
+    elapsed: float = 0.0
+
+    @property
+    def reclaimed_bytes(self) -> int:
+        """归档腾出的库空间：VACUUM 过看文件缩小量，否则看新增的空闲页。"""
+        if self.db_before is None or self.db_after is None:
+            return 0
+        if self.vacuumed:
+            return self.db_before[0] - self.db_after[0]
+        return self.db_after[1] - self.db_before[1]
+
+    def summary(self) -> str:
+        moved = "，".join(f"{kind} {n} 行" for kind, n in self.rows.items()) or "无"
+        lines = [
+            f"截止 {self.cutoff:%Y-%m-%d}：搬走 {moved}（{self.months} 个月，{self.partitions} 个分区）",
+            f"冷文件 {_mb(self.cold_bytes)}（原始 {_mb(self.raw_bytes)}）",
+        ]
+        if self.db_before is not None and self.db_after is not None:
+            action = "VACUUM 后库文件" if self.vacuumed else "库文件"
+            lines.append(
+                f"{action} {_mb(self.db_before[0])} → {_mb(self.db_after[0])}，腾出 {_mb(self.reclaimed_bytes)}"
+            )
+        if self.purged_files:
+            lines.append(f"清理失效分区 {self.purged_files} 个")
+        lines.append(f"耗时 {self.elapsed:.2f}s")
+        return "\n".join(lines)
+
+
+def _mb(n: int) -> str:
+    return f"{n / 1024 / 1024:.2f} MB"
+
+
+def archive_cutoff(days: int, today: Optional[date] = None) -> datetime:
+    """保留 ``days`` 天 → 截止点取 ``today - days`` 所在月的月初（只归档整月）。"""
+    day = (today or date.today()) - timedelta(days=days)
+    return datetime(day.year, day.month, 1)
+
+
+def _summarize(kind: str, account_id: int, rows: List[Dict[str, Any]], stamp_key: str) -> Dict[str, Any]:
+    """一个盘一个月的汇总行（``rows`` 是写进冷文件的形态，时间为 ISO 字符串）。"""
+    stamps = [datetime.fromisoformat(r[stamp_key]) for r in rows if r.get(stamp_key)]
+    out: Dict[str, Any] = {
+        "account_id": account_id,
+        "row_count": len(rows),
+        "first_at": min(stamps) if stamps else None,
+        "last_at": max(stamps) if stamps else None,
+    }
+    if kind == "trade":
+        out["realized_pnl"] = round(sum(float(r.get("realized_pnl") or 0.0) for r in rows), 2)
+        out["amount"] = round(sum(float(r.get("amount") or 0.0) for r in rows), 2)
+        out["fee"] = round(sum(float(r.get("fee") or 0.0) for r in rows), 2)
+    return out
+
+
+def _write_month(
+    kind: str,
+    month: str,
+    rows: List[Dict[str, Any]],
+    merge_accounts: set[int],
+    root: Optional[Path],
+) -> Tuple[List[Dict[str, Any]], int, int]:
+    """把一个月的热行按盘写成分区（同步，跑在线程里），返回 ``(汇总, 压缩字节, 原始字节)``。"""
+    stamp_key = "executed_at" if kind == "trade" else "created_at"
+    by_account: Dict[int, List[Dict[str, Any]]] = {}
+    for row in rows:
+        by_account.setdefault(int(row["account_id"]), []).append(row)
+
+    summaries: List[Dict[str, Any]] = []
+    cold = raw = 0
+    for account_id, fresh in by_account.items():
+        merged: Dict[int, Dict[str, Any]] = {}
+        if account_id in merge_accounts:
+            for old in cold_store.read_partition(kind, month, account_id, root):
+                merged[int(old["id"])] = old
+        for row in fresh:
+            merged[int(row["id"])] = {k: v.isoformat() if isinstance(v, datetime) else v for k, v in row.items()}
+        ordered = [merged[i] for i in sorted(merged)]
+        _, packed, plain = cold_store.write_partition(kind, month, account_id, ordered, root)
+        summary = _summarize(kind, account_id, ordered, stamp_key)
+        summary["file_bytes"] = packed
+        summaries.append(summary)
+        cold += packed
+        raw += plain
+    return summaries, cold, raw
+
+
+async def archive_before(cutoff: datetime, *, vacuum: bool = False, root: Optional[Path] = None) -> ArchiveReport:
+    """把 ``cutoff`` 之前的流水 / 决策整月归档，返回报告。
+
+    Args:
+        cutoff: 截止点，应对齐到月初（:func:`archive_cutoff`）；不对齐时只归档
+            ``cutoff`` 之前的整月。
+        vacuum: 归档后对 SQLite 做 VACUUM，把空闲页还给文件系统。
+        root: 冷文件根目录，默认 ``cold_store.ARCHIVE_ROOT``。
+    """
+    started = time.perf_counter()
+    report = ArchiveReport(cutoff=cutoff)
+    report.db_before = await PaperArchiveRepo.storage_bytes()
+
+    for kind in cold_store.KINDS:
+        report.rows[kind] = 0
+        oldest = await PaperArchiveRepo.oldest(kind)
+        if oldest is None:
+            continue
+        month = cold_store.month_key(oldest)
+        while True:
+            start, end = cold_store.month_bounds(month)
+            if end > cutoff:
+                break
+            rows = await PaperArchiveRepo.load_range(kind, start, end)
+            if rows:
+                # 只有登记过汇总行的老分区才合并；没登记的是无效文件，直接覆盖
+                valid = {m.account_id for m in await PaperArchiveRepo.list_months(kind, month)}
+                summaries, cold, raw = await asyncio.to_thread(_write_month, kind, month, rows, valid, root)
+                max_id = max(int(r["id"]) for r in rows)
+                deleted = await PaperArchiveRepo.commit_month(kind, start, end, max_id, summaries)
+                report.rows[kind] += deleted
+                report.months += 1
+                report.partitions += len(summaries)
+                report.cold_bytes += cold
+                report.raw_bytes += raw
+            month = cold_store.month_key(end)
+
+    report.purged_files = await _purge_orphans(root)
+    if vacuum:
+        report.vacuumed = await PaperArchiveRepo.vacuum()
+    report.db_after = await PaperArchiveRepo.storage_bytes()
+    report.elapsed = time.perf_counter() - started
+    return report
+
+
+async def _purge_orphans(root: Optional[Path]) -> int:
+    """删掉没有汇总行对应的分区文件。"""
+    removed = 0
+    for kind in cold_store.KINDS:
+        valid = {(m.month, m.account_id) for m in await PaperArchiveRepo.list_months(kind)}
+        for month, account_id, path in list(cold_store.iter_partitions(kind, root)):
+            if (month, account_id) not in valid:
+                path.unlink(missing_ok=True)
+                removed += 1
+    return removed
+
+
+async def run_archive(*, vacuum: bool = False) -> Optional[ArchiveReport]:
+    """按配置的保留期跑一次归档；``papertrade_archive_days`` 为 0 时不跑，返回 None。"""
+    days = int(STOCK_CONFIG.get_config("papertrade_archive_days").data or 0)
+    if days <= 0:
+        return None
+    return await archive_before(archive_cutoff(days), vacuum=vacuum)
+
+
+@scheduler.scheduled_job("cron", day=1, hour=4, minute=20)
+async def archive_job() -> None:
+    try:
+        report = await run_archive()
+    except Exception as e:
+        logger.exception(f"[SayuStock][PaperTrade] 冷归档异常: {e}")
+        return
+    if report is not None:
+        logger.info(f"[SayuStock][PaperTrade] 冷归档完成\n{report.summary()}")
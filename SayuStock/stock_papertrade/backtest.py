@@ -0,0 +1,528 @@
+"""模拟盘离线回测：本地 K 线面板 + 向量化信号 + 与实盘同一套撮合规则。
+
+实盘策略只能挂在 Kanban 轮次里跑，一次实验要好几天。这里把同一套规则搬到离线：
+
+- **数据**：:class:`BarPanel` 把每只股票的日 K / 分钟 K（``kline_to_df`` 同款英文列）
+  对齐成「bar × 标的」的二维面板，缺失值 = 停牌 / 未上市；
+- **信号**：按策略在整张面板上一次算完（``utils.indicators`` 的 series 层直接吃宽表），
+  不逐根逐股循环：
+
+  * ``multi_factor``：实盘四维评分由 LLM 完成，离线拿不到基本面 / 舆情，
+    只复刻 :func:`strategy.score_stock` 的**技术面 + 波动率**部分，门槛用
+    :data:`strategy.MODE_THRESHOLDS`，止损 / 回撤熔断 / 止盈同 :func:`strategy.decide_action`；
+  * ``volume_extremum``：复刻 ``volume_structure`` 的月 K 粗筛 + 日 K 确认和硬闸阈值；
+
+- **成交**：第 t 根收盘出信号，第 t+1 根开盘价成交，每一笔都走
+  :func:`matcher.match_order`（整手 / 涨跌停拦截 / 现金降档 / 费率）；
+  当天买过的股票当天整只不可卖（与实盘 ``_t1_blocked`` 同口径，分钟 K 才会真正触发）。
+
+风控矩阵取 :data:`strategy.MODE_RULES`：单笔仓位上限、最低现金、最大持仓数、
+单日交易次数、同票单日加仓次数。产出逐日快照（列与 ``SayuPaperSnapshot`` 一致）
+和排行用的收益指标。
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Tuple, Mapping, Callable, Optional, Sequence
+from pathlib import Path
+from dataclasses import field, dataclass
+
+import numpy as np
+import pandas as pd
+
+from .matcher import LOT_SIZE, match_order, calc_new_avg_cost, calc_realized_pnl
+from .strategy import MODE_RULES, MODE_THRESHOLDS
+from .strategies import resolve_with_params
+from ..utils.indicators import ma, cmf, rsi, macd, volume_ratio
+
+__all__ = [
+    "BarPanel",
+    "Signals",
+    "BacktestResult",
+    "SIGNAL_BUILDERS",
+    "MULTI_FACTOR_WEIGHTS",
+    "multi_factor_signals",
+    "volume_extremum_signals",
+    "run_backtest",
+    "summarize",
+]
+
+_FIELDS = ("open", "high", "low", "close", "volume")
+
+# 与 calc_macd / calc_rsi 的最少根数保持一致，不足时实盘给 None、不计分
+_MACD_MIN_BARS = 35
+
+# score_stock 技术面各项的加减分，默认值与实盘一致。实盘策略参数里没有这些键
+# （评分由 LLM 做），离线调参时可在 params 里按同名键覆盖。
+MULTI_FACTOR_WEIGHTS: Dict[str, float] = {
+    "w_macd_cross": 0.20,
+    "w_macd_bar": 0.05,
+    "w_rsi": 0.10,
+    "w_ma_align": 0.10,
+    "w_ma20": 0.05,
+    "w_cmf": 0.10,
+    "w_volume": 0.05,
+    "w_turnover": 0.05,
+}
+
+
+# ============================================================
+# 面板
+# ============================================================
+@dataclass(slots=True)
+class BarPanel:
+    """对齐后的 K 线面板：每个字段一张 ``bar × 标的`` 宽表，缺失 = 停牌 / 未上市。"""
+
+    open: pd.DataFrame
+    high: pd.DataFrame
+    low: pd.DataFrame
+    close: pd.DataFrame
+    volume: pd.DataFrame
+    turnover: Optional[pd.DataFrame] = None
+    names: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def dates(self) -> pd.DatetimeIndex:
+        return pd.DatetimeIndex(self.close.index)
+
+    @property
+    def codes(self) -> List[str]:
+        return [str(c) for c in self.close.columns]
+
+    @classmethod
+    def from_frames(
+        cls,
+        frames: Mapping[str, pd.DataFrame],
+        names: Optional[Mapping[str, str]] = None,
+    ) -> "BarPanel":
+        """由 ``{代码: kline_to_df 结果}`` 拼面板；``date`` 列或 DatetimeIndex 均可。"""
+        cols: Dict[str, Dict[str, pd.Series]] = {f: {} for f in (*_FIELDS, "turnover_rate")}
+        for code, df in frames.items():
+            if df.empty:
+                continue
+            if "date" in df.columns:
+                df = df.set_index(pd.to_datetime(df["date"]))
+            else:
+                df = df.set_index(pd.to_datetime(df.index))
+            df = df[~df.index.duplicated(keep="last")].sort_index()
+            for f in cols:
+                if f in df.columns:
+                    cols[f][code] = pd.to_numeric(df[f], errors="coerce").astype(float)
+        if not cols["close"]:
+            raise ValueError("没有可用的 K 线")
+
+        close = pd.DataFrame(cols["close"]).sort_index()
+
+        def _wide(f: str) -> pd.DataFrame:
+            return pd.DataFrame(cols[f]).reindex(index=close.index, columns=close.columns)
+
+        turnover = _wide("turnover_rate") if cols["turnover_rate"] else None
+        return cls(
+            open=_wide("open"),
+            high=_wide("high"),
+            low=_wide("low"),
+            close=close,
+            volume=_wide("volume"),
+            turnover=turnover,
+            names=dict(names or {}),
+        )
+
+    @classmethod
+    def from_dir(cls, path: Path | str, pattern: str = "*.csv") -> "BarPanel":
+        """读本地目录下每个标的一份的 K 线文件（文件名即代码，csv / parquet）。
+
+        文件里若带 ``name`` 列，取首行作股票名（判 ST 涨跌停幅度要用）。
+        """
+        frames: Dict[str, pd.DataFrame] = {}
+        names: Dict[str, str] = {}
+        for file in sorted(Path(path).glob(pattern)):
+            df = pd.read_parquet(file) if file.suffix == ".parquet" else pd.read_csv(file)
+            frames[file.stem] = df
+            if "name" in df.columns and not df.empty:
+                names[file.stem] = str(df["name"].iloc[0])
+        return cls.from_frames(frames, names)
+
+
+# ============================================================
+# 信号
+# ============================================================
+@dataclass(slots=True)
+class Signals:
+    """策略在整张面板上的信号（均为 ``bar × 标的``，第 t 行只用到第 t 根及以前的数据）。
+
+    - ``score``：排序用，同一根里分高的先买；
+    - ``entry`` / ``add``：空仓 / 已持仓时的目标仓位，按 ``max_pos_pct`` 的倍数给，0 = 不买；
+    - ``exit``：策略自己的卖出信号（清仓）；
+    - ``take_profit``：是否套用决策树的 +30% 卖一半 / +50% 清仓。
+    """
+
+    score: pd.DataFrame
+    entry: pd.DataFrame
+    add: pd.DataFrame
+    exit: pd.DataFrame
+    take_profit: bool = False
+
+
+def _bars_seen(panel: BarPanel) -> pd.DataFrame:
+    """每只标的截至当根已有的 K 线根数（停牌 / 未上市不计）。"""
+    return panel.close.notna().cumsum()
+
+
+def _crossed_in(fast: pd.DataFrame, slow: pd.DataFrame, days: int = 3) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """``cross_signals`` 的面板版：近 N 根内是否上穿 / 下穿。"""
+    prev_fast = fast.shift(1)
+    prev_slow = slow.shift(1)
+    golden = (prev_fast <= prev_slow) & (fast > slow)
+    death = (prev_fast >= prev_slow) & (fast < slow)
+    return (
+        golden.astype(float).rolling(days, min_periods=1).max() > 0,
+        death.astype(float).rolling(days, min_periods=1).max() > 0,
+    )
+
+
+def _atr_pct(panel: BarPanel, period: int = 14) -> pd.DataFrame:
+    """``indicators.atr_pct`` 的面板版（原实现按列 concat 取 max，不能直接吃宽表）。"""
+    prev_close = panel.close.shift(1)
+    tr = np.fmax(
+        (panel.high - panel.low).abs().to_numpy(),
+        np.fmax((panel.high - prev_close).abs().to_numpy(), (panel.low - prev_close).abs().to_numpy()),
+    )
+    atr = pd.DataFrame(tr, index=panel.close.index, columns=panel.close.columns).rolling(period).mean()
+    return (atr / panel.close).where(panel.close != 0)
+
+
+def _close_percentile(close: pd.DataFrame, m: int) -> pd.DataFrame:
+    """``calc_close_percentile`` 的面板版：近 m 根收盘分位，窗口内无波动记 0.5。"""
+    lo = close.rolling(m, min_periods=2).min()
+    hi = close.rolling(m, min_periods=2).max()
+    pct = (close - lo) / (hi - lo)
+    return pct.where(hi != lo, 0.5).where(lo.notna())
+
+
+def _month_percentile(close: pd.DataFrame, years: int) -> pd.DataFrame:
+    """月 K 粗筛分位：当根收盘在「前 years×12-1 根已收月线 + 当月（以当根为收盘）」里的位置。
+
+    与 ``evaluate_location`` 拉近 N 年月 K、最后一根是当月未收线的口径一致。
+    """
+    months = close.index.to_period("M")
+    month_close = close.groupby(months).last()
+    window = max(years * 12 - 1, 1)
+    prior_lo = month_close.rolling(window, min_periods=1).min().shift(1).reindex(months)
+    prior_hi = month_close.rolling(window, min_periods=1).max().shift(1).reindex(months)
+    prior_lo.index = prior_hi.index = close.index
+    lo = np.fmin(prior_lo, close)
+    hi = np.fmax(prior_hi, close)
+    pct = (close - lo) / (hi - lo)
+    # 只有当月一根时没有可比区间，实盘同样算不出分位
+    return pct.where(hi != lo, 0.5).where(prior_lo.notna() & close.notna())
+
+
+def multi_factor_signals(panel: BarPanel, params: Mapping[str, Any], mode: str) -> Signals:
+    """``score_stock`` 技术面 + 波动率调节的面板版；基本面 / 舆情离线缺失，按 0 分计。
+
+    各项加减分取 params 里的 ``w_*``（缺省见 :data:`MULTI_FACTOR_WEIGHTS`）；
+    ``min_buy_score`` 同提示词里的买入评分下限，不到就不开仓 / 加仓。
+    """
+    w = {k: float(params.get(k, v)) for k, v in MULTI_FACTOR_WEIGHTS.items()}
+    close = panel.close
+    seen = _bars_seen(panel)
+    score = pd.DataFrame(0.0, index=close.index, columns=close.columns)
+
+    dif, dea, bar = macd(close)
+    macd_ok = seen >= _MACD_MIN_BARS
+    golden, death = _crossed_in(dif, dea)
+    score += w["w_macd_cross"] * ((golden & macd_ok) * 1.0 - (death & macd_ok))
+    score += w["w_macd_bar"] * (((bar > 0) & (dif > dea) & macd_ok) * 1.0 - ((bar < 0) & (dif < dea) & macd_ok))
+
+    rsi6 = rsi(close, 6).where(seen >= 7)
+    score += w["w_rsi"] * (((rsi6 >= 25) & (rsi6 <= 35)) * 1.0 - ((rsi6 >= 65) & (rsi6 <= 75)))
+
+    ma5, ma10, ma20 = ma(close, 5), ma(close, 10), ma(close, 20)
+    score += w["w_ma_align"] * (((ma5 > ma10) & (ma10 > ma20)) * 1.0 - ((ma5 < ma10) & (ma10 < ma20)))
+    score += w["w_ma20"] * ((close > ma20) * 1.0 - (close < ma20))
+
+    cmf20 = cmf(panel.high, panel.low, close, panel.volume, 20)
+    score += w["w_cmf"] * ((cmf20 > 0.10) * 1.0 - (cmf20 < -0.10))
+    vol_ratio = volume_ratio(panel.volume, 5)
+    score += w["w_volume"] * ((vol_ratio > 2.0) * 1.0 - (vol_ratio < 0.5))
+    if panel.turnover is not None:
+        turnover = panel.turnover
+        score += w["w_turnover"] * (((turnover >= 0.5) & (turnover <= 5.0)) * 1.0 - (turnover > 15.0))
+
+    atr = _atr_pct(panel)
+    score = score.where(~(atr > 0.05), score * 0.7).where(~(atr < 0.015), score * 1.1)
+    score = score.clip(-1.0, 1.0).where(close.notna(), 0.0)
+
+    th = MODE_THRESHOLDS[mode]
+    # 决策树：强买补到满仓位上限；试探仓 0.33 倍，已持仓加到 0.7 倍
+    allowed = score >= float(params.get("min_buy_score", 0.0))
+    strong = (score > th["strong_buy"]) & allowed
+    trial = (score > th["try_buy"]) & ~strong & allowed
+    entry = strong * 1.0 + trial * 0.33
+    add = strong * 1.0 + trial * 0.7
+    return Signals(score=score, entry=entry, add=add, exit=score < th["strong_sell"], take_profit=True)
+
+
+def volume_extremum_signals(panel: BarPanel, params: Mapping[str, Any], mode: str) -> Signals:
+    """量能极值硬闸的面板版：月 K 粗筛 → 日 K 分位 + 放量（+ 收阳）。"""
+    close = panel.close
+    vol_n = int(params["vol_ma_n"])
+    rel_volume = panel.volume / panel.volume.rolling(vol_n).mean()
+    day_pct = _close_percentile(close, int(params["lookback_m"]))
+    month_pct = _month_percentile(close, int(params["month_lookback_years"]))
+    loud = rel_volume >= float(params["vol_ratio_min"])
+
+    buy = (month_pct <= float(params["month_bottom_pct"])) & loud & (day_pct <= float(params["bottom_pct"]))
+    if bool(params["require_bullish_close"]):
+        buy &= close > panel.open
+    sell = (month_pct >= float(params["month_top_pct"])) & loud & (day_pct >= float(params["top_pct"]))
+    entry = buy * 1.0
+    return Signals(score=rel_volume.fillna(0.0), entry=entry, add=entry, exit=sell)
+
+
+SIGNAL_BUILDERS: Dict[str, Callable[[BarPanel, Mapping[str, Any], str], Signals]] = {
+    "multi_factor": multi_factor_signals,
+    "volume_extremum": volume_extremum_signals,
+}
+
+_OFFLINE_PARAMS: Dict[str, Mapping[str, float]] = {
+    "multi_factor": MULTI_FACTOR_WEIGHTS,
+}
+
+
+# ============================================================
+# 结果
+# ============================================================
+@dataclass(slots=True)
+class BacktestResult:
+    """回测结果：逐日快照 + 成交流水 + 被撮合拒掉的单子计数。"""
+
+    strategy_id: str
+    mode: str
+    params: Dict[str, Any]
+    initial_cash: float
+    snapshots: pd.DataFrame
+    trades: pd.DataFrame
+    rejected: Dict[str, int]
+
+    @property
+    def equity(self) -> pd.Series:
+        return self.snapshots["total_equity"]
+
+    def metrics(self) -> Dict[str, float]:
+        """排行同口径的收益指标（``total_pnl_pct`` 为百分数），另附回撤 / 交易统计。"""
+        equity = self.equity.to_numpy(dtype=float)
+        final = float(equity[-1]) if len(equity) else self.initial_cash
+        total_pnl = final - self.initial_cash
+        max_dd = float((equity / np.maximum.accumulate(equity) - 1.0).min()) * 100.0 if len(equity) else 0.0
+        sells = self.trades[self.trades["side"] == "sell"] if not self.trades.empty else self.trades
+        wins = int((sells["realized_pnl"] > 0).sum()) if not sells.empty else 0
+        return {
+            "total_equity": final,
+            "total_pnl": total_pnl,
+            "total_pnl_pct": total_pnl / self.initial_cash * 100 if self.initial_cash else 0.0,
+            "max_drawdown_pct": max_dd,
+            "trade_count": float(len(self.trades)),
+            "fee_total": float(self.trades["fee"].sum()) if not self.trades.empty else 0.0,
+            "win_rate": wins / len(sells) if len(sells) else 0.0,
+        }
+
+
+# ============================================================
+# 回测主循环
+# ============================================================
+def _prev_day_close(close: pd.DataFrame, days: pd.DatetimeIndex) -> np.ndarray:
+    """每根 K 线对应的昨收（上一个交易日最后一笔收盘，停牌沿用更早的收盘）。"""
+    filled = close.ffill()
+    day_last = filled.groupby(days).last().shift(1)
+    return day_last.reindex(days).to_numpy(dtype=float)
+
+
+def run_backtest(
+    panel: BarPanel,
+    strategy_id: str = "multi_factor",
+    params: Optional[Mapping[str, Any]] = None,
+    *,
+    mode: str = "balanced",
+    initial_cash: float = 1_000_000.0,
+) -> BacktestResult:
+    """在面板上回测一个策略，返回逐日快照和成交流水。
+
+    Args:
+        panel: :class:`BarPanel`，日 K 或分钟 K 均可（分钟 K 按自然日切交易日）。
+        strategy_id: 策略 id，未知 id 同实盘一样回落默认策略。
+        params: 策略参数，经 ``normalize_params`` 补默认 / 夹紧。
+        mode: 风控模式，见 :data:`strategy.MODE_RULES`。
+        initial_cash: 期初本金。
+    """
+    strategy, norm = resolve_with_params(strategy_id, params)
+    # 实盘参数表之外的离线调参键（如多因子权重）也带上，快照里能看到实际用的值
+    for key, default in _OFFLINE_PARAMS.get(strategy.id, {}).items():
+        norm[key] = float((params or {}).get(key, default))
+    signals = SIGNAL_BUILDERS[strategy.id](panel, norm, mode)
+    rules = MODE_RULES[mode]
+
+    codes = panel.codes
+    names = [panel.names.get(c) for c in codes]
+    dates = panel.dates
+    days = dates.normalize()
+    opens = panel.open.to_numpy(dtype=float)
+    marks = panel.close.ffill().to_numpy(dtype=float)
+    prev_close = _prev_day_close(panel.close, days)
+    score = signals.score.to_numpy(dtype=float)
+    entry = signals.entry.to_numpy(dtype=float)
+    add = signals.add.to_numpy(dtype=float)
+    exit_ = signals.exit.to_numpy(dtype=bool)
+
+    n_bars, n_codes = marks.shape
+    qty = np.zeros(n_codes, dtype=np.int64)
+    avg_cost = np.zeros(n_codes)
+    bought_today = np.zeros(n_codes, dtype=np.int64)
+    buys_today = np.zeros(n_codes, dtype=np.int64)
+    cash = float(initial_cash)
+    trades_today = 0
+    current_day: Optional[pd.Timestamp] = None
+    pending: List[Tuple[str, int, int]] = []
+
+    trades: List[Tuple[Any, ...]] = []
+    rejected: Dict[str, int] = {}
+    bar_cash = np.empty(n_bars)
+    bar_value = np.empty(n_bars)
+
+    for t in range(n_bars):
+        if days[t] != current_day:
+            current_day = days[t]
+            bought_today[:] = 0
+            buys_today[:] = 0
+            trades_today = 0
+
+        # 1) 上一根的决策在本根开盘成交：先卖后买，卖出回笼的现金给买单用
+        carried: List[Tuple[str, int, int]] = []
+        for side, j, want in pending:
+            price = opens[t, j]
+            if not np.isfinite(price):
+                rejected["停牌"] = rejected.get("停牌", 0) + 1
+                continue
+            last_close = prev_close[t, j] if np.isfinite(prev_close[t, j]) else None
+            # T+1 与实盘 ``_t1_blocked`` 同口径：当天买过这只就整单拒卖（不拆成只卖老仓），
+            # 挂到下一根，免得一根K线的卖出信号就此丢掉；次日开盘 bought_today 清零即成交
+            if side == "sell" and bought_today[j] > 0:
+                rejected["T+1"] = rejected.get("T+1", 0) + 1
+                carried.append((side, j, want))
+                continue
+            res = match_order(
+                side, codes[j], want, float(price), cash, int(qty[j]), last_close=last_close, name=names[j]
+            )
+            if not res.ok:
+                key = res.reason.split(" ", 1)[0]
+                rejected[key] = rejected.get(key, 0) + 1
+                continue
+            realized = 0.0
+            if side == "buy":
+                avg_cost[j] = calc_new_avg_cost(int(qty[j]), avg_cost[j], res.actual_qty, res.price, res.fee_total)
+                qty[j] += res.actual_qty
+                bought_today[j] += res.actual_qty
+                buys_today[j] += 1
+                cash -= res.amount + res.fee_total
+            else:
+                realized = calc_realized_pnl(avg_cost[j], res.actual_qty, res.price, res.fee_total)
+                qty[j] -= res.actual_qty
+                cash += res.amount - res.fee_total
+                if qty[j] == 0:
+                    avg_cost[j] = 0.0
+            trades_today += 1
+            trades.append((dates[t], codes[j], side, res.actual_qty, res.price, res.fee_total, realized))
+        pending = carried
+
+        # 2) 收盘估值（停牌沿用最后一笔收盘）
+        mark = marks[t]
+        held = qty > 0
+        position_value = float(np.dot(qty[held], mark[held]))
+        equity = cash + position_value
+        bar_cash[t] = cash
+        bar_value[t] = position_value
+        if t == n_bars - 1:
+            break
+
+        # 3) 收盘决策，下一根开盘成交
+        budget = int(rules["max_daily_trades"])
+        same_day = days[t + 1] == current_day
+        if same_day:
+            budget -= trades_today
+        if budget <= 0:
+            continue
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pnl = np.where(held, mark / avg_cost - 1.0, 0.0)
+        account_pnl = equity / initial_cash - 1.0
+        forced = held & ((pnl <= rules["stop_loss"]) | (account_pnl <= rules["max_drawdown"]) | exit_[t])
+        half = np.zeros(n_codes, dtype=bool)
+        if signals.take_profit:
+            forced |= held & (pnl >= 0.50)
+            half = held & ~forced & (pnl >= 0.30)
+        waiting = {j for _, j, _ in pending}
+        for j in np.flatnonzero(forced | half)[:budget]:
+            if int(j) in waiting:
+                continue
+            want = int(qty[j]) if forced[j] else int(qty[j]) // 2
+            pending.append(("sell", int(j), want))
+        budget -= len(pending)
+
+        selling = forced | half
+        selling[list(waiting)] = True
+        weight = np.where(held, add[t], entry[t])
+        candidates = np.flatnonzero((weight > 0) & ~selling & np.isfinite(mark))
+        if budget <= 0 or len(candidates) == 0:
+            continue
+        holdings = int(held.sum()) - int(forced.sum())
+        reentry_cap = int(rules["reentry_per_day"])
+        available = cash - equity * rules["min_cash_pct"]
+        for j in candidates[np.argsort(-score[t, candidates], kind="stable")]:
+            if budget <= 0 or available <= 0:
+                break
+            if not held[j] and holdings >= rules["max_holdings"]:
+                continue
+            if same_day and buys_today[j] >= reentry_cap:
+                continue
+            price = mark[j]
+            buy_value = equity * rules["max_pos_pct"] * weight[j] - qty[j] * price
+            if buy_value < price * LOT_SIZE:
+                continue
+            buy_value = min(buy_value, available * 0.95)
+            want = int(buy_value / price // LOT_SIZE * LOT_SIZE)
+            if want < LOT_SIZE:
+                continue
+            pending.append(("buy", int(j), want))
+            available -= want * price
+            budget -= 1
+            if not held[j]:
+                holdings += 1
+
+    snaps = pd.DataFrame({"cash": bar_cash, "position_value": bar_value}, index=dates)
+    snaps["total_equity"] = snaps["cash"] + snaps["position_value"]
+    # 分钟 K 取每个交易日最后一根，口径同每日收盘快照
+    snaps = snaps.groupby(days).last()
+    snaps.index.name = "trade_date"
+    snaps["day_pnl"] = snaps["total_equity"].diff().fillna(snaps["total_equity"].iloc[0] - initial_cash)
+    snaps["total_pnl"] = snaps["total_equity"] - initial_cash
+    snaps["total_pnl_pct"] = snaps["total_pnl"] / initial_cash * 100 if initial_cash else 0.0
+
+    trade_df = pd.DataFrame(
+        trades,
+        columns=["trade_date", "stock_code", "side", "qty", "price", "fee", "realized_pnl"],
+    )
+    return BacktestResult(
+        strategy_id=strategy.id,
+        mode=mode,
+        params=dict(norm),
+        initial_cash=float(initial_cash),
+        snapshots=snaps,
+        trades=trade_df,
+        rejected=rejected,
+    )
+
+
+def summarize(results: Sequence[BacktestResult]) -> pd.DataFrame:
+    """多组回测按 ``total_pnl_pct`` 降序排成一张表，口径同 ``模拟盘排行``。"""
+    rows = [{"strategy_id": r.strategy_id, "mode": r.mode, **r.metrics()} for r in results]
+    return pd.DataFrame(rows).sort_values("total_pnl_pct", ascending=False, ignore_index=True)
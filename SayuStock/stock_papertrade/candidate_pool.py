@@ -15,12 +15,19 @@
      排队也难成交，追高风险大）。
    - ``post_decision_pool_update`` 让 sell 从池移除、buy 促成保留；hold **不**续期
      （旧实现 hold+强信号会不断续期 → 反而把标的钉死在池里，这里已修正）。
+
+全市场源（板块 / 热股 / 涨跌幅榜 / 成交额 / 质量 / 新闻）与账户无关，同一时间窗口
+内每个账户拉到的都一样。这些源统一经 ``SHARED_SOURCES`` 取：按源 TTL 缓存、
+同一时刻并发请求只跑一次，各账户只在共享结果上叠加自己的持仓 / 关注 / 去重过滤。
+``SHARED_SOURCES.stats`` 记实际调用次数与省下的调用次数。
 """
 
-import re
+import time
 import random
-from typing import Set, Dict, List, Tuple, Iterable, TypedDict
+import asyncio
+from typing import Any, Set, Dict, List, Tuple, Callable, Iterable, Optional, Sequence, Awaitable, TypedDict
 from datetime import datetime, timedelta
+from dataclasses import field, dataclass
 
 from gsuid_core.logger import logger
 
@@ -60,6 +67,23 @@ QUALITY_CACHE_HOURS = 6  # 进程内结果 TTL（避免每 30 分钟重打榜）
 # ROE 榜拉取宽度（再本地过滤）；须 ≤ eastmoney rank_list 单页上限 100
 QUALITY_RANK_LIMIT = 80
 
+# 全市场源共享缓存 TTL（秒）：决策节奏是几十分钟一轮，榜单 5 分钟内视为同一窗口；
+# 质量池本身按 QUALITY_CACHE_HOURS 缓存，这里对齐
+SHARED_SOURCE_TTL: Dict[str, float] = {
+    "sector": 300.0,
+    "concept": 300.0,
+    "hotmap": 300.0,
+    "gainer": 300.0,
+    "laggard": 300.0,
+    "amount": 300.0,
+    "quality": QUALITY_CACHE_HOURS * 3600.0,
+    "news": 300.0,
+}
+
+# 单路超时（秒）：超时的源整路丢弃，不拖住整个池子；质量池降级路径要串几十次财务快照，放宽
+DEFAULT_SOURCE_TIMEOUT_S = 8.0
+SOURCE_TIMEOUT_S: Dict[str, float] = {"quality": 20.0}
+
 # 动量源写入顺序（refresh 时轮询交织，勿改成「某一路先塞满」）
 MOMENTUM_SOURCE_ORDER: Tuple[str, ...] = (
     "sector",
@@ -117,6 +141,99 @@ BLUECHIP_BASE: Tuple[Tuple[str, str], ...] = (
 )
 
 
+@dataclass
+class SourceTiming:
+    """单路源本次拉取的耗时与结果。``status``: ok / timeout / error。"""
+
+    ms: float
+    status: str = "ok"
+    count: int = 0
+
+
+@dataclass
+class SharedSourceStats:
+    calls: int = 0  # 实际执行源函数的次数
+    saved: int = 0  # 命中缓存 / 搭上进行中的同一请求而省下的次数
+    by_source: Dict[str, List[int]] = field(default_factory=dict)  # label -> [calls, saved]
+
+    def summary(self) -> str:
+        total = self.calls + self.saved
+        ratio = self.saved / total if total else 0.0
+        return f"调用 {self.calls}，省下 {self.saved}（{ratio:.0%}）"
+
+
+class SharedSourceCache:
+    """全市场候选源的跨账户共享结果（按源 TTL + single-flight）。
+
+    键是 ``(label, 源函数, 参数)``：同一源不同参数（如 n=8 / n=10）各自缓存。
+    空结果（源内部失败时返回 ``[]``）与异常都不缓存，下一个账户会重试。
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[Dict[str, float]] = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl: Dict[str, float] = dict(SHARED_SOURCE_TTL if ttl is None else ttl)
+        self.clock = clock
+        self.stats = SharedSourceStats()
+        self._entries: Dict[Tuple[Any, ...], Tuple[float, List[str]]] = {}
+        self._inflight: Dict[Tuple[Any, ...], "asyncio.Task[List[str]]"] = {}
+
+    def _count(self, label: str, *, saved: bool) -> None:
+        counts = self.stats.by_source.setdefault(label, [0, 0])
+        if saved:
+            self.stats.saved += 1
+            counts[1] += 1
+        else:
+            self.stats.calls += 1
+            counts[0] += 1
+
+    async def get(
+        self,
+        label: str,
+        fn: Callable[..., Awaitable[List[str]]],
+        *args: Any,
+        **kwargs: Any,
+    ) -> List[str]:
+        key = (label, fn, args, tuple(sorted(kwargs.items())))
+        now = self.clock()
+        hit = self._entries.get(key)
+        if hit is not None and hit[0] > now:
+            self._count(label, saved=True)
+            return list(hit[1])
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self._count(label, saved=True)
+            return list(await asyncio.shield(task))
+
+        self._count(label, saved=False)
+        task = asyncio.ensure_future(fn(*args, **kwargs))
+        self._inflight[key] = task
+        # 结果在任务完成时落缓存：等待方超时被取消（shield 保住任务本身）也不白跑
+        task.add_done_callback(lambda t: self._settle(key, label, t))
+        return list(await asyncio.shield(task))
+
+    def _settle(self, key: Tuple[Any, ...], label: str, task: "asyncio.Task[List[str]]") -> None:
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            self._entries.pop(key, None)
+            return
+        codes = list(task.result())
+        if codes:
+            self._entries[key] = (self.clock() + self.ttl.get(label, 0.0), codes)
+        else:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+SHARED_SOURCES = SharedSourceCache()
+
+
 def derive_secid(code: str) -> str:
     """6 位代码推 东财 secid：沪市(6 开头) → 1.xxx，其余(深/创/北) → 0.xxx。"""
     return f"1.{code}" if code.startswith("6") else f"0.{code}"
@@ -362,9 +479,6 @@ async def _from_quality_roe(n: int = 8) -> List[str]:
 
     榜空时降级：成交额/行业/涨幅宇宙 + ``financial_snapshot``。
     """
-    import time
-    import asyncio
-
     now = time.time()
     expire_ts = _QUALITY_ROE_CACHE["expire_ts"]
     cached_codes = _QUALITY_ROE_CACHE["codes"]
@@ -460,10 +574,8 @@ async def _from_quality_roe(n: int = 8) -> List[str]:
     return codes[:n]
 
 
-# 常见 A 股 6 位代码模式
-_TICKER_RE = re.compile(r"\b(\d{6})\b")
-
-# 中文名 → 6 位代码的简易映射（仅作为兜底；新闻文本常不写代码）
+# 新闻里常见的俗称 → 6 位代码；全称 / 代码由 stock_matcher 从 chinese_stocks.json 自动覆盖，
+# 简称不自动派生（"武汉""统一""美的"这类两字简称本身就是常用词），要认的简称在这里逐个列（别名优先级最高）
 _KNOWN_NAMES = {
     "茅台": "600519",
     "贵州茅台": "600519",
@@ -488,37 +600,73 @@ _KNOWN_NAMES = {
     "长江电力": "600900",
     "中远海控": "601919",
     "沪电股份": "002463",
+    "沪电": "002463",
     "新易盛": "300502",
     "天孚通信": "300394",
 }
 
 
 async def _from_news_extract_tickers(limit: int = 50) -> List[str]:
-    """从雪球 7x24 新闻文本里提取股票代码/名称 → 6 位代码。"""
+    """从雪球 7x24 新闻文本里提取股票代码/名称 → 6 位代码（按新闻顺序、首次出现去重）。"""
     try:
         from ..utils.request import get_news
 
         news = await get_news()
         if isinstance(news, int):
             return []
+        from ..utils.stock_matcher import get_stock_matcher
+
         _, news_data = news
         items = news_data.get("items", [])[:limit]
-        found: Set[str] = set()
-        for it in items:
-            text = it.get("text", "") or it.get("desc", "") or ""
-            # 1) 提取 6 位数字
-            for m in _TICKER_RE.findall(text):
-                found.add(m)
-            # 2) 提取已知中文名
-            for name, code in _KNOWN_NAMES.items():
-                if name in text:
-                    found.add(code)
+        # 自动机一遍扫完每条新闻：代码 / 全称 / 简称 / 俗称，重叠取最左最长
+        matcher = get_stock_matcher(_KNOWN_NAMES)
+        found: Dict[str, None] = {}
+        for codes in matcher.tag_news(items):
+            found.update(dict.fromkeys(codes))
         return list(found)[: SOURCE_CAPS["news"]]
     except Exception as e:
         logger.warning(f"[PaperTrade] 新闻 ticker 提取失败: {e}")
         return []
 
 
+async def fetch_sources(
+    planned: Sequence[Tuple[str, Awaitable[List[str]]]],
+) -> Tuple[Dict[str, List[str]], Dict[str, SourceTiming]]:
+    """并发拉取多路源；每路单独超时、单独兜底，返回 ``(label → codes, label → 计时)``。
+
+    超时 / 异常的源记为空列表，不影响其它路；结果按 ``planned`` 的顺序排列，
+    调用方按这个顺序合并即可得到与逐路串行拉取一致的结果。
+    """
+
+    async def _one(label: str, aw: Awaitable[List[str]]) -> Tuple[List[str], SourceTiming]:
+        start = time.perf_counter()
+        timeout = SOURCE_TIMEOUT_S.get(label, DEFAULT_SOURCE_TIMEOUT_S)
+        try:
+            codes = list(await asyncio.wait_for(aw, timeout=timeout))
+        except asyncio.TimeoutError:
+            logger.debug(f"[PaperTrade] {label} 源超时（>{timeout:.0f}s），本轮跳过")
+            return [], SourceTiming((time.perf_counter() - start) * 1000, "timeout")
+        except Exception as e:
+            logger.debug(f"[PaperTrade] {label} 源失败: {e}")
+            return [], SourceTiming((time.perf_counter() - start) * 1000, "error")
+        return codes, SourceTiming((time.perf_counter() - start) * 1000, "ok", len(codes))
+
+    done = await asyncio.gather(*(_one(label, aw) for label, aw in planned))
+    results: Dict[str, List[str]] = {}
+    timings: Dict[str, SourceTiming] = {}
+    for (label, _), (codes, timing) in zip(planned, done):
+        results[label] = codes
+        timings[label] = timing
+    return results, timings
+
+
+def format_source_timings(timings: Dict[str, SourceTiming]) -> str:
+    return "，".join(
+        f"{label} {t.ms:.0f}ms" + (f"({t.status})" if t.status != "ok" else f"×{t.count}")
+        for label, t in timings.items()
+    )
+
+
 # ============================================================
 # 主入口
 # ============================================================
@@ -529,21 +677,49 @@ async def build_candidate_pool(
     include_hotmap: bool = True,
     include_news: bool = True,
     include_extra_momentum: bool = True,
+    timings: Optional[Dict[str, SourceTiming]] = None,
 ) -> List[str]:
     """返回去重保序的股票代码列表（≤ 50 只）
 
     顺序：position → watchlist → agent_pool → sector → concept → hotmap →
     gainer → laggard → amount → quality → news
+
+    前三路按账户读库；其余全市场源走 ``SHARED_SOURCES``，多个账户共用一份结果。
+    各路经 ``fetch_sources`` 并发拉取（单路超时即丢弃），再按上面的顺序合并，
+    结果与逐路串行一致。传入 ``timings`` 时写回每路的耗时 / 状态。
     """
+    planned: List[Tuple[str, Awaitable[List[str]]]] = [
+        ("position", _from_position(account_id)),
+        ("watchlist", _from_watchlist(account_id)),
+        ("agent_pool", _from_agent_pool(account_id)),
+    ]
+    if include_sector:
+        planned.append(("sector", SHARED_SOURCES.get("sector", _from_sector_top_picks)))
+        if include_extra_momentum:
+            planned.append(("concept", SHARED_SOURCES.get("concept", _from_concept_top_picks)))
+    if include_hotmap:
+        planned.append(("hotmap", SHARED_SOURCES.get("hotmap", _from_hotmap_top_n)))
+    if include_extra_momentum:
+        planned.append(("gainer", SHARED_SOURCES.get("gainer", _from_market_gainers)))
+        planned.append(("laggard", SHARED_SOURCES.get("laggard", _from_market_laggards)))
+        planned.append(("amount", SHARED_SOURCES.get("amount", _from_amount_leaders)))
+        planned.append(("quality", SHARED_SOURCES.get("quality", _from_quality_roe)))
+    if include_news:
+        planned.append(("news", SHARED_SOURCES.get("news", _from_news_extract_tickers)))
+
+    results, source_timings = await fetch_sources(planned)
+    if timings is not None:
+        timings.update(source_timings)
+    logger.debug(f"[PaperTrade] 候选池 account={account_id} 源耗时：{format_source_timings(source_timings)}")
+
     pool: List[str] = []
     seen: Set[str] = set()
-
-    def _add(codes: List[str], cap: int) -> None:
+    for label, _ in planned:
         n = 0
-        for c in codes:
+        for c in results[label]:
             if c in seen:
                 continue
-            if n >= cap:
+            if n >= SOURCE_CAPS[label]:
                 break
             if not _valid_a_share_code(c):
                 continue
@@ -551,68 +727,6 @@ async def build_candidate_pool(
             pool.append(c)
             n += 1
 
-    # P0: 持仓
-    try:
-        pos_codes = await _from_position(account_id)
-        _add(pos_codes, SOURCE_CAPS["position"])
-    except Exception as e:
-        logger.debug(f"[PaperTrade] position 源失败: {e}")
-
-    # P0: 群友关注
-    try:
-        wl_codes = await _from_watchlist(account_id)
-        _add(wl_codes, SOURCE_CAPS["watchlist"])
-    except Exception as e:
-        logger.debug(f"[PaperTrade] watchlist 源失败: {e}")
-
-    # P1: AI 内部池
-    try:
-        ap_codes = await _from_agent_pool(account_id)
-        _add(ap_codes, SOURCE_CAPS["agent_pool"])
-    except Exception as e:
-        logger.debug(f"[PaperTrade] agent_pool 源失败: {e}")
-
-    if include_sector:
-        try:
-            _add(await _from_sector_top_picks(), SOURCE_CAPS["sector"])
-        except Exception as e:
-            logger.debug(f"[PaperTrade] sector 源失败: {e}")
-        if include_extra_momentum:
-            try:
-                _add(await _from_concept_top_picks(), SOURCE_CAPS["concept"])
-            except Exception as e:
-                logger.debug(f"[PaperTrade] concept 源失败: {e}")
-
-    if include_hotmap:
-        try:
-            _add(await _from_hotmap_top_n(), SOURCE_CAPS["hotmap"])
-        except Exception as e:
-            logger.debug(f"[PaperTrade] hotmap 源失败: {e}")
-
-    if include_extra_momentum:
-        try:
-            _add(await _from_market_gainers(), SOURCE_CAPS["gainer"])
-        except Exception as e:
-            logger.debug(f"[PaperTrade] gainer 源失败: {e}")
-        try:
-            _add(await _from_market_laggards(), SOURCE_CAPS["laggard"])
-        except Exception as e:
-            logger.debug(f"[PaperTrade] laggard 源失败: {e}")
-        try:
-            _add(await _from_amount_leaders(), SOURCE_CAPS["amount"])
-        except Exception as e:
-            logger.debug(f"[PaperTrade] amount 源失败: {e}")
-        try:
-            _add(await _from_quality_roe(), SOURCE_CAPS["quality"])
-        except Exception as e:
-            logger.debug(f"[PaperTrade] quality 源失败: {e}")
-
-    if include_news:
-        try:
-            _add(await _from_news_extract_tickers(), SOURCE_CAPS["news"])
-        except Exception as e:
-            logger.debug(f"[PaperTrade] news 源失败: {e}")
-
     return pool[:TOTAL_CAP]
 
 
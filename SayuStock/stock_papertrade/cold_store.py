@@ -0,0 +1,145 @@
+"""模拟盘冷数据分区文件（归档后的流水 / 决策）。
+
+布局 ``DATA_PATH/papertrade_archive/{kind}/{YYYY-MM}/acc_{account_id}.jsonl.zst``：
+按月分目录、按盘分文件，读一个盘的历史只解压它自己的那几个小文件。每行一条
+JSON（datetime 写成 ISO 字符串），装了 ``zstandard`` 用 zstd，否则退回标准库 gzip
+（``.jsonl.gz``），读的时候两种后缀都认。
+
+写入先落临时文件再 ``os.replace``，中途被 kill 不会留下半截分区。哪些分区有效由
+热表 ``SayuPaperArchiveMonth`` 决定，这里只管文件本身。
+"""
+
+from __future__ import annotations
+
+import os
+import gzip
+import json
+from typing import Any, Dict, List, Tuple, Iterator, Optional, Sequence
+from pathlib import Path
+from datetime import date, datetime
+from functools import lru_cache
+
+from ..utils.resource_path import DATA_PATH
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ARCHIVE_ROOT: Path = DATA_PATH / "papertrade_archive"
+
+KINDS: Tuple[str, ...] = ("trade", "decision")
+_SUFFIXES: Tuple[str, ...] = (".jsonl.zst", ".jsonl.gz")
+_ZSTD_LEVEL = 10
+
+
+def month_key(at: datetime | date) -> str:
+    return f"{at.year:04d}-{at.month:02d}"
+
+
+def month_bounds(month: str) -> Tuple[datetime, datetime]:
+    """``"2025-03"`` → ``(2025-03-01 00:00, 2025-04-01 00:00)``。"""
+    year, mon = (int(x) for x in month.split("-"))
+    start = datetime(year, mon, 1)
+    end = datetime(year + 1, 1, 1) if mon == 12 else datetime(year, mon + 1, 1)
+    return start, end
+
+
+def _root(root: Optional[Path]) -> Path:
+    return root if root is not None else ARCHIVE_ROOT
+
+
+def _stem(kind: str, month: str, account_id: int, root: Optional[Path]) -> Path:
+    return _root(root) / kind / month / f"acc_{account_id}"
+
+
+def partition_path(kind: str, month: str, account_id: int, root: Optional[Path] = None) -> Optional[Path]:
+    """已存在的分区文件（任一压缩格式），没有返回 None。"""
+    stem = _stem(kind, month, account_id, root)
+    for suffix in _SUFFIXES:
+        path = stem.with_name(stem.name + suffix)
+        if path.exists():
+            return path
+    return None
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} 不能写进冷文件")
+
+
+def encode_rows(rows: Sequence[Dict[str, Any]]) -> bytes:
+    lines = (json.dumps(r, ensure_ascii=False, default=_json_default, separators=(",", ":")) for r in rows)
+    return ("\n".join(lines) + "\n").encode("utf-8") if rows else b""
+
+
+def write_partition(
+    kind: str,
+    month: str,
+    account_id: int,
+    rows: Sequence[Dict[str, Any]],
+    root: Optional[Path] = None,
+) -> Tuple[Path, int, int]:
+    """整体覆盖写一个分区，返回 ``(路径, 压缩后字节数, 原始 JSONL 字节数)``。"""
+    raw = encode_rows(rows)
+    stem = _stem(kind, month, account_id, root)
+    stem.parent.mkdir(parents=True, exist_ok=True)
+    if zstandard is not None:
+        path = stem.with_name(stem.name + ".jsonl.zst")
+        blob = zstandard.ZstdCompressor(level=_ZSTD_LEVEL).compress(raw)
+    else:
+        path = stem.with_name(stem.name + ".jsonl.gz")
+        blob = gzip.compress(raw, compresslevel=6, mtime=0)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(blob)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    # 换了压缩格式（装 / 卸了 zstandard）时清掉另一种后缀的旧文件
+    for suffix in _SUFFIXES:
+        other = stem.with_name(stem.name + suffix)
+        if other != path:
+            other.unlink(missing_ok=True)
+    return path, len(blob), len(raw)
+
+
+def read_partition(kind: str, month: str, account_id: int, root: Optional[Path] = None) -> List[Dict[str, Any]]:
+    """读一个分区的全部行（时间字段仍是 ISO 字符串），文件不存在返回空列表。"""
+    path = partition_path(kind, month, account_id, root)
+    if path is None:
+        return []
+    return [dict(r) for r in _decode(str(path), path.stat().st_mtime_ns)]
+
+
+@lru_cache(maxsize=64)
+def _decode(path: str, mtime_ns: int) -> Tuple[Dict[str, Any], ...]:
+    # mtime 进缓存键：重新归档覆盖写之后自然失效
+    blob = Path(path).read_bytes()
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError(f"读 {Path(path).name} 需要安装 zstandard")
+        raw = zstandard.ZstdDecompressor().decompressobj().decompress(blob)
+    else:
+        raw = gzip.decompress(blob)
+    return tuple(json.loads(line) for line in raw.decode("utf-8").splitlines() if line)
+
+
+def iter_partitions(kind: str, root: Optional[Path] = None) -> Iterator[Tuple[str, int, Path]]:
+    """遍历某类别下所有分区文件，产出 ``(month, account_id, path)``。"""
+    base = _root(root) / kind
+    if not base.is_dir():
+        return
+    for month_dir in sorted(base.iterdir()):
+        if not month_dir.is_dir():
+            continue
+        for path in sorted(month_dir.iterdir()):
+            name = path.name
+            if not name.startswith("acc_") or not name.endswith(_SUFFIXES):
+                continue
+            try:
+                account_id = int(name[4:].split(".", 1)[0])
+            except ValueError:
+                continue
+            yield month_dir.name, account_id, path
@@ -27,7 +27,7 @@ import datetime as _dt
 from gsuid_core.bot import Bot
 from gsuid_core.models import Event
 
-from . import db as _db, strategies as _strat, cross_group as _cross, account_scope as _scope
+from . import db as _db, valuation as _valuation, strategies as _strat, cross_group as _cross, account_scope as _scope
 from .sv import sv_papertrade
 from .render import draw_leaderboard, draw_account_view, build_holdings_snapshot_image
 from .permissions import check_admin
@@ -287,7 +287,7 @@ async def _kick_immediate_decision(ev: Event, account: SayuPaperAccount) -> None
     # adhoc_*，对不上账户的 Kanban 树，不发票会被 deny_write_reason 拒掉（它本该能真实成交）。
     try:
         async with _DECISION_KICK_SEM:
-            with _scope.grant_write(account.id or 0):
+            with _scope.grant_write(account.id or 0), _valuation.valuation_round(f"init_decision_acc_{account.id}"):
                 await run_capability_agent(
                     profile_id=strategy.agent_profile,
                     task=task_prompt,
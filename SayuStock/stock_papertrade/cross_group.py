@@ -103,7 +103,7 @@ async def query_latest_snapshot(account_id: int) -> Optional[dict]:
 
 
 async def query_leaderboard(limit: int = 20) -> List[dict]:
-    """跨盘排行：每个盘最新一条快照，按 total_pnl_pct 降序。"""
+    """跨盘排行：每个盘最新一条快照，按 total_pnl_pct 降序（读排行物化表）。"""
     snaps = await db.PaperSnapshotRepo.list_latest_all_accounts(limit=limit)
     accounts = {a.id: a for a in await db.PaperAccountRepo.list_all()}
     out: List[dict] = []
@@ -118,6 +118,8 @@ async def query_leaderboard(limit: int = 20) -> List[dict]:
                 "total_equity": s.total_equity,
                 "total_pnl": s.total_pnl,
                 "total_pnl_pct": s.total_pnl_pct,
+                "max_drawdown_pct": round(s.max_drawdown_pct, 2),
+                "rank": s.rank,
             }
         )
     return out
@@ -8,16 +8,19 @@ origin），只为人肉查库时能看出这条流水属于哪个盘的原群
 """
 
 import json
-from typing import Any, Dict, List, Optional
-from datetime import date, datetime
+import asyncio
+from typing import Any, Dict, List, Tuple, Optional, Sequence
+from datetime import date, datetime, timedelta
 
 from sqlmodel import col
-from sqlalchemy import or_, and_, func, select
+from sqlalchemy import DateTime, or_, and_, case, func, text, select, update
 from sqlalchemy.engine import Result, CursorResult
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from gsuid_core.logger import logger
 from gsuid_core.utils.database.base_models import with_session
 
+from . import cold_store
 from ..utils.database.papertrade_models import (
     DEFAULT_STRATEGY_ID,
     DEFAULT_ACCOUNT_NAME,
@@ -28,6 +31,8 @@ from ..utils.database.papertrade_models import (
     SayuPaperSnapshot,
     SayuPaperAgentPool,
     SayuPaperWatchlist,
+    SayuPaperAccountStats,
+    SayuPaperArchiveMonth,
     SayuPaperBroadcastTarget,
 )
 
@@ -37,6 +42,436 @@ def _rowcount(result: Result[Any]) -> int:
     return result.rowcount if isinstance(result, CursorResult) else 0
 
 
+# SQLite 单条语句绑定变量上限（3.32 前的编译默认值；新版更大，按老的来）
+_SQLITE_MAX_VARS = 999
+# 报价批量写：每只 2 个 CASE 分支 × 2 变量 + IN 列表 1 个变量，外加 1 个 account_id
+_QUOTE_ROWS_PER_STMT = (_SQLITE_MAX_VARS - 1) // 5
+
+
+async def _update_quotes(
+    session: AsyncSession,
+    key_column: Any,
+    rows: Sequence[Tuple[str, float, Optional[datetime]]],
+    *where: Any,
+) -> int:
+    """按 ``key_column``（stock_code / secid）把 ``(key, price, at)`` 写进持仓报价列。
+
+    每块一条 ``UPDATE ... SET col = CASE key WHEN ... END WHERE key IN (...)``，
+    块大小受 SQLite 变量上限约束；同一 key 出现多次以最后一条为准。
+    """
+    latest: Dict[str, Tuple[float, Optional[datetime]]] = {}
+    for key, price, at in rows:
+        if key and price is not None:
+            latest[key] = (price, at)
+    keys = list(latest)
+    affected: int = 0
+    for start in range(0, len(keys), _QUOTE_ROWS_PER_STMT):
+        chunk = keys[start : start + _QUOTE_ROWS_PER_STMT]
+        stmt = (
+            update(SayuPaperPosition)
+            .where(key_column.in_(chunk), *where)
+            .values(
+                last_quote_price=case({k: latest[k][0] for k in chunk}, value=key_column),
+                last_quote_at=case({k: latest[k][1] for k in chunk}, value=key_column),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        result = await session.execute(stmt)
+        affected += _rowcount(result)
+    await session.flush()
+    return affected
+
+
+def _day_range(column: Any, day: date) -> Any:
+    """``column`` 落在 ``day`` 当天：写成 ``>= 当天 0 点 AND < 次日 0 点`` 的半开区间。
+
+    不用 ``func.date(column) == day``：对列套函数后 SQLite 用不上
+    ``(account_id, executed_at)`` 复合索引，只能把该盘全部历史流水逐行算一遍。
+    """
+    start = datetime(day.year, day.month, day.day)
+    return and_(column >= start, column < start + timedelta(days=1))
+
+
+# 批量写快照时允许从调用方 dict 落库的数值列
+_SNAPSHOT_VALUE_FIELDS: frozenset[str] = frozenset(
+    {
+        "group_id",
+        "bot_id",
+        "cash",
+        "position_value",
+        "total_equity",
+        "day_pnl",
+        "day_pnl_pct",
+        "total_pnl",
+        "total_pnl_pct",
+    }
+)
+
+
+async def _equity_before(session: AsyncSession, trade_date: date) -> Dict[int, float]:
+    """每个盘在 ``trade_date`` 之前最近一条快照的 total_equity，一条查询取全。"""
+    subq = (
+        select(
+            col(SayuPaperSnapshot.account_id),
+            func.max(col(SayuPaperSnapshot.trade_date)).label("prev_date"),
+        )
+        .where(col(SayuPaperSnapshot.trade_date) < trade_date)
+        .group_by(col(SayuPaperSnapshot.account_id))
+        .subquery()
+    )
+    stmt = select(col(SayuPaperSnapshot.account_id), col(SayuPaperSnapshot.total_equity)).join(
+        subq,
+        and_(
+            col(SayuPaperSnapshot.account_id) == subq.c.account_id,
+            col(SayuPaperSnapshot.trade_date) == subq.c.prev_date,
+        ),
+    )
+    result = await session.execute(stmt)
+    # 同一天有重复行（老版本 append 写入）时取哪条都一样，后者覆盖前者即可
+    return {int(account_id): float(equity) for account_id, equity in result.all()}
+
+
+async def _upsert_snapshots(
+    session: AsyncSession,
+    trade_date: date,
+    rows: Sequence[Dict[str, Any]],
+) -> List[SayuPaperSnapshot]:
+    """按 ``(account_id, trade_date)`` 批量幂等写快照。
+
+    ``rows`` 每项含 ``account_id`` 和 ``_SNAPSHOT_VALUE_FIELDS`` 里的列。当天已有行的
+    原地更新，没有的新建；老版本遗留的同日重复行顺手删掉，保证重跑后每盘每天只剩一条。
+    查当天已有行按 SQLite 变量上限分块。
+    """
+    by_account = {int(r["account_id"]): r for r in rows}
+    ids = list(by_account)
+    existing: Dict[int, SayuPaperSnapshot] = {}
+    for start in range(0, len(ids), _SQLITE_MAX_VARS - 1):
+        stmt = (
+            select(SayuPaperSnapshot)
+            .where(
+                and_(
+                    col(SayuPaperSnapshot.trade_date) == trade_date,
+                    col(SayuPaperSnapshot.account_id).in_(ids[start : start + _SQLITE_MAX_VARS - 1]),
+                )
+            )
+            .order_by(col(SayuPaperSnapshot.id))
+        )
+        for snap in (await session.execute(stmt)).scalars().all():
+            if snap.account_id in existing:
+                await session.delete(snap)
+            else:
+                existing[snap.account_id] = snap
+
+    now = datetime.now()
+    out: List[SayuPaperSnapshot] = []
+    for account_id, row in by_account.items():
+        values = {k: v for k, v in row.items() if k in _SNAPSHOT_VALUE_FIELDS}
+        snap = existing.get(account_id)
+        if snap is None:
+            snap = SayuPaperSnapshot(account_id=account_id, trade_date=trade_date, **values)
+        else:
+            for key, value in values.items():
+                setattr(snap, key, value)
+            snap.created_at = now
+        session.add(snap)
+        out.append(snap)
+    await session.flush()
+    await _refresh_stats(session, out)
+    return out
+
+
+# ============================================================
+# 排行物化表维护（SayuPaperAccountStats）
+# ============================================================
+def _curve_stats(equities: Sequence[float]) -> Tuple[float, float, float]:
+    """按交易日顺序的净值序列 → ``(峰值, 当前回撤 %, 最大回撤 %)``，回撤为 ≤0 的百分数。"""
+    peak, drawdown, max_drawdown = 0.0, 0.0, 0.0
+    for equity in equities:
+        peak = max(peak, equity)
+        drawdown = (equity / peak - 1.0) * 100 if peak > 0 else 0.0
+        max_drawdown = min(max_drawdown, drawdown)
+    return peak, drawdown, max_drawdown
+
+
+def _latest_snapshots_stmt() -> Any:
+    """每个盘最新交易日的快照行（物化表的"真值"查询，全历史 group by）。"""
+    subq = (
+        select(
+            col(SayuPaperSnapshot.account_id),
+            func.max(col(SayuPaperSnapshot.trade_date)).label("max_date"),
+        )
+        .where(col(SayuPaperSnapshot.account_id) > 0)
+        .group_by(col(SayuPaperSnapshot.account_id))
+        .subquery()
+    )
+    return select(SayuPaperSnapshot).join(
+        subq,
+        and_(
+            col(SayuPaperSnapshot.account_id) == subq.c.account_id,
+            col(SayuPaperSnapshot.trade_date) == subq.c.max_date,
+        ),
+    )
+
+
+async def _load_stats(session: AsyncSession, account_ids: Sequence[int]) -> Dict[int, SayuPaperAccountStats]:
+    ids = list(account_ids)
+    out: Dict[int, SayuPaperAccountStats] = {}
+    for start in range(0, len(ids), _SQLITE_MAX_VARS - 1):
+        stmt = select(SayuPaperAccountStats).where(
+            col(SayuPaperAccountStats.account_id).in_(ids[start : start + _SQLITE_MAX_VARS - 1])
+        )
+        out.update({st.account_id: st for st in (await session.execute(stmt)).scalars().all()})
+    return out
+
+
+async def _recompute_stats(session: AsyncSession, account_ids: Optional[Sequence[int]] = None) -> int:
+    """从快照表全量重算指定盘（None 为所有盘）的物化行；没有快照的盘删掉其物化行。
+
+    同一交易日有重复快照（老版本 append 写入）时取 id 最大的一条。返回写入行数。
+    """
+    stmt = (
+        select(
+            col(SayuPaperSnapshot.id),
+            col(SayuPaperSnapshot.account_id),
+            col(SayuPaperSnapshot.trade_date),
+            col(SayuPaperSnapshot.total_equity),
+            col(SayuPaperSnapshot.total_pnl),
+            col(SayuPaperSnapshot.total_pnl_pct),
+        )
+        .where(col(SayuPaperSnapshot.account_id) > 0)
+        .order_by(col(SayuPaperSnapshot.account_id), col(SayuPaperSnapshot.trade_date), col(SayuPaperSnapshot.id))
+    )
+    chunks: List[Optional[List[int]]] = [None]
+    if account_ids is not None:
+        ids = list(account_ids)
+        chunks = [ids[i : i + _SQLITE_MAX_VARS - 1] for i in range(0, len(ids), _SQLITE_MAX_VARS - 1)]
+    # account_id → {trade_date: 行}，同日后写的覆盖先写的
+    curves: Dict[int, Dict[date, Any]] = {}
+    for chunk in chunks:
+        chunk_stmt = stmt if chunk is None else stmt.where(col(SayuPaperSnapshot.account_id).in_(chunk))
+        for row in (await session.execute(chunk_stmt)).all():
+            curves.setdefault(row.account_id, {})[row.trade_date] = row
+
+    targets = list(curves) if account_ids is None else list(account_ids)
+    existing = await _load_stats(session, targets)
+    if account_ids is None:
+        stale = select(SayuPaperAccountStats).where(col(SayuPaperAccountStats.account_id).not_in(targets or [0]))
+        for st in (await session.execute(stale)).scalars().all():
+            await session.delete(st)
+
+    now = datetime.now()
+    written = 0
+    for account_id in targets:
+        days = curves.get(account_id)
+        st = existing.get(account_id)
+        if not days:
+            if st is not None:
+                await session.delete(st)
+            continue
+        rows = [days[d] for d in sorted(days)]
+        peak, drawdown, max_drawdown = _curve_stats([r.total_equity for r in rows])
+        last = rows[-1]
+        if st is None:
+            st = SayuPaperAccountStats(account_id=account_id, trade_date=last.trade_date)
+        st.snapshot_id = last.id
+        st.trade_date = last.trade_date
+        st.total_equity = last.total_equity
+        st.total_pnl = last.total_pnl
+        st.total_pnl_pct = last.total_pnl_pct
+        st.peak_equity = peak
+        st.drawdown_pct = drawdown
+        st.max_drawdown_pct = max_drawdown
+        st.snapshot_days = len(rows)
+        st.updated_at = now
+        session.add(st)
+        written += 1
+    await session.flush()
+    return written
+
+
+async def _rerank_stats(session: AsyncSession) -> None:
+    """按 ``total_pnl_pct`` 降序重排名次（并列同名次），只改名次变了的行。"""
+    stmt = select(SayuPaperAccountStats).order_by(
+        col(SayuPaperAccountStats.total_pnl_pct).desc(), col(SayuPaperAccountStats.account_id)
+    )
+    rank, prev = 0, None
+    for i, st in enumerate((await session.execute(stmt)).scalars().all(), 1):
+        if st.total_pnl_pct != prev:
+            rank, prev = i, st.total_pnl_pct
+        if st.rank != rank:
+            st.rank = rank
+            session.add(st)
+    await session.flush()
+
+
+async def _refresh_stats(session: AsyncSession, snaps: Sequence[SayuPaperSnapshot]) -> None:
+    """快照写入后在同一事务内更新物化行并重排名次。
+
+    新交易日的快照（比物化行更新）O(1) 增量推进峰值 / 回撤；同日重写、补写历史日
+    或物化行还不存在时，只对这些盘从快照表重算，保证回撤口径不被旧值污染。
+    """
+    latest: Dict[int, SayuPaperSnapshot] = {}
+    for snap in snaps:
+        if snap.account_id > 0:
+            cur = latest.get(snap.account_id)
+            if cur is None or snap.trade_date >= cur.trade_date:
+                latest[snap.account_id] = snap
+    if not latest:
+        return
+    existing = await _load_stats(session, list(latest))
+    now = datetime.now()
+    recompute: List[int] = []
+    for account_id, snap in latest.items():
+        st = existing.get(account_id)
+        if st is None or snap.trade_date <= st.trade_date:
+            recompute.append(account_id)
+            continue
+        st.peak_equity = max(st.peak_equity, snap.total_equity)
+        st.drawdown_pct = (snap.total_equity / st.peak_equity - 1.0) * 100 if st.peak_equity > 0 else 0.0
+        st.max_drawdown_pct = min(st.max_drawdown_pct, st.drawdown_pct)
+        st.snapshot_days += 1
+        st.snapshot_id = snap.id
+        st.trade_date = snap.trade_date
+        st.total_equity = snap.total_equity
+        st.total_pnl = snap.total_pnl
+        st.total_pnl_pct = snap.total_pnl_pct
+        st.updated_at = now
+        session.add(st)
+    if recompute:
+        await _recompute_stats(session, recompute)
+    await _rerank_stats(session)
+
+
+async def _check_stats(session: AsyncSession) -> List[str]:
+    """物化表 vs 全历史 group by 查询，返回不一致项（空列表即一致）。"""
+    truth: Dict[int, SayuPaperSnapshot] = {}
+    for snap in (await session.execute(_latest_snapshots_stmt())).scalars().all():
+        cur = truth.get(snap.account_id)
+        if cur is None or (snap.id or 0) > (cur.id or 0):
+            truth[snap.account_id] = snap
+    stats = {st.account_id: st for st in (await session.execute(select(SayuPaperAccountStats))).scalars().all()}
+
+    problems: List[str] = []
+    for account_id in sorted(set(truth) | set(stats)):
+        snap, st = truth.get(account_id), stats.get(account_id)
+        if snap is None:
+            problems.append(f"#{account_id}: 物化行多余（快照表里没有这个盘）")
+        elif st is None:
+            problems.append(f"#{account_id}: 缺物化行（最新快照 {snap.trade_date}）")
+        elif (st.trade_date, st.total_equity, st.total_pnl_pct) != (
+            snap.trade_date,
+            snap.total_equity,
+            snap.total_pnl_pct,
+        ):
+            problems.append(
+                f"#{account_id}: 物化 {st.trade_date} {st.total_equity} {st.total_pnl_pct}% ≠ "
+                f"快照 {snap.trade_date} {snap.total_equity} {snap.total_pnl_pct}%"
+            )
+    rank, prev = 0, None
+    for i, st in enumerate(sorted(stats.values(), key=lambda st: (-st.total_pnl_pct, st.account_id)), 1):
+        if st.total_pnl_pct != prev:
+            rank, prev = i, st.total_pnl_pct
+        if st.rank != rank:
+            problems.append(f"#{st.account_id}: 名次 {st.rank}，应为 {rank}")
+    return problems
+
+
+# ============================================================
+# 冷归档读路径（流水 / 决策老于保留期的整月在冷文件里，热表只剩汇总行）
+# ============================================================
+_ARCHIVE_KINDS: Dict[str, Tuple[Any, Any]] = {
+    "trade": (SayuPaperTrade, SayuPaperTrade.executed_at),
+    "decision": (SayuPaperDecision, SayuPaperDecision.created_at),
+}
+
+
+def _from_cold(model: Any, row: Dict[str, Any]) -> Any:
+    """冷文件里的一行还原成（游离的）模型实例，ISO 字符串转回 datetime。"""
+    values = dict(row)
+    for column in model.__table__.columns:
+        value = values.get(column.name)
+        if isinstance(value, str) and isinstance(column.type, DateTime):
+            values[column.name] = datetime.fromisoformat(value)
+    return model(**values)
+
+
+async def _archived_months(session: AsyncSession, account_id: int, kind: str) -> List[SayuPaperArchiveMonth]:
+    stmt = (
+        select(SayuPaperArchiveMonth)
+        .where(
+            and_(
+                col(SayuPaperArchiveMonth.account_id) == account_id,
+                col(SayuPaperArchiveMonth.kind) == kind,
+            )
+        )
+        .order_by(col(SayuPaperArchiveMonth.month).desc())
+    )
+    return list((await session.execute(stmt)).scalars().all())
+
+
+async def _read_cold(kind: str, month: str, account_id: int) -> List[Dict[str, Any]]:
+    try:
+        return await asyncio.to_thread(cold_store.read_partition, kind, month, account_id)
+    except Exception as e:
+        # 冷文件损坏 / 被删只影响历史查询，不能把近期记录也一起拖挂
+        logger.warning(f"[SayuStock][PaperTrade] 读归档 {kind}/{month}/acc_{account_id} 失败: {e}")
+        return []
+
+
+async def _with_archived(
+    session: AsyncSession,
+    kind: str,
+    account_id: int,
+    hot: List[Any],
+    limit: int,
+    stock_code: Optional[str] = None,
+) -> List[Any]:
+    """热表取到的最近 ``hot`` 不够 ``limit`` 条时，按月倒序从冷文件补齐。
+
+    冷文件都是整月、且早于热表里的行；同一行两边都有（归档写完文件、删热表前
+    被打断）时以热表为准。
+    """
+    if len(hot) >= limit:
+        return hot
+    months = await _archived_months(session, account_id, kind)
+    if not months:
+        return hot
+    model, time_attr = _ARCHIVE_KINDS[kind]
+    seen = {r.id for r in hot}
+    cold: List[Any] = []
+    for m in months:
+        rows = await _read_cold(kind, m.month, account_id)
+        for row in rows:
+            if row.get("id") in seen or (stock_code and row.get("stock_code") != stock_code):
+                continue
+            cold.append(_from_cold(model, row))
+        if len(hot) + len(cold) >= limit:
+            break
+    merged = hot + cold
+    merged.sort(key=lambda r: (getattr(r, time_attr.key), r.id or 0), reverse=True)
+    return merged[:limit]
+
+
+async def _archived_pnl(session: AsyncSession, account_id: int, since: Optional[datetime]) -> Dict[str, float]:
+    """已归档流水的盈亏合计：整月落在 ``since`` 之后的直接用汇总行，跨 ``since`` 的那个月读冷文件。"""
+    out = {"total_pnl": 0.0, "total_amount": 0.0, "total_fee": 0.0, "trade_count": 0}
+    for m in await _archived_months(session, account_id, "trade"):
+        start, end = cold_store.month_bounds(m.month)
+        if since is None or start >= since:
+            out["total_pnl"] += m.realized_pnl
+            out["total_amount"] += m.amount
+            out["total_fee"] += m.fee
+            out["trade_count"] += m.row_count
+        elif end > since:
+            for t in (_from_cold(SayuPaperTrade, r) for r in await _read_cold("trade", m.month, account_id)):
+                if t.executed_at >= since:
+                    out["total_pnl"] += t.realized_pnl
+                    out["total_amount"] += t.amount
+                    out["total_fee"] += t.fee
+                    out["trade_count"] += 1
+    return out
+
+
 # ============================================================
 # Account Repo
 # ============================================================
@@ -291,7 +726,7 @@ class PaperAccountRepo:
     @classmethod
     @with_session
     async def reset_account(cls, session: AsyncSession, account_id: int) -> Dict[str, int]:
-        """重置**指定盘**：清空账户 + 持仓 + 流水 + 决策 + 快照 + 内部池 + 关注 + 播报目标。
+        """重置**指定盘**：清空账户 + 持仓 + 流水 + 决策 + 快照 + 内部池 + 关注 + 播报目标 + 排行物化行 + 归档汇总。
 
         多账户改造后按 ``account_id`` 删——绝不能再按 group_id 删，否则会把同一个
         群里另一个盘的数据一起清掉。
@@ -314,6 +749,9 @@ class PaperAccountRepo:
             ("agent_pool", SayuPaperAgentPool, SayuPaperAgentPool.account_id),
             # 播报目标必须一起删：孤儿目标会在 id 被复用时误播到别的群
             ("broadcast", SayuPaperBroadcastTarget, SayuPaperBroadcastTarget.account_id),
+            ("stats", SayuPaperAccountStats, SayuPaperAccountStats.account_id),
+            # 汇总行删了冷文件就失效（读路径不看），下次归档顺手清掉文件
+            ("archive", SayuPaperArchiveMonth, SayuPaperArchiveMonth.account_id),
         )
         for label, model, account_col in child_specs:
             r = await session.execute(delete(model).where(col(account_col) == account_id))
@@ -321,9 +759,178 @@ class PaperAccountRepo:
 
         r = await session.execute(delete(SayuPaperAccount).where(col(SayuPaperAccount.id) == account_id))
         deleted["account"] = _rowcount(r)
+        if deleted["stats"]:
+            await _rerank_stats(session)
         return deleted
 
 
+async def _upsert_position(
+    session: AsyncSession,
+    account_id: int,
+    *,
+    stock_code: str,
+    stock_name: str,
+    secid: str,
+    qty: int,
+    avg_cost: float,
+    group_id: str = "",
+    bot_id: str = "",
+    last_quote_price: Optional[float] = None,
+    last_quote_at: Optional[datetime] = None,
+) -> Optional[SayuPaperPosition]:
+    """``PaperPositionRepo.upsert`` 的本体，在调用方的 session 里跑（批量成交共用一个事务）。"""
+    if qty <= 0:
+        from sqlalchemy import delete as _sa_delete
+
+        stmt = _sa_delete(SayuPaperPosition).where(
+            and_(
+                col(SayuPaperPosition.account_id) == account_id,
+                col(SayuPaperPosition.stock_code) == stock_code,
+            )
+        )
+        await session.execute(stmt)
+        await session.flush()
+        return None
+    found = await session.execute(
+        select(SayuPaperPosition).where(
+            and_(
+                col(SayuPaperPosition.account_id) == account_id,
+                col(SayuPaperPosition.stock_code) == stock_code,
+            )
+        )
+    )
+    existing: Optional[SayuPaperPosition] = found.scalars().first()
+    now = datetime.now()
+    if existing:
+        existing.qty = qty
+        existing.avg_cost = avg_cost
+        existing.stock_name = stock_name
+        existing.secid = secid
+        existing.updated_at = now
+        if last_quote_price is not None:
+            existing.last_quote_price = last_quote_price
+            existing.last_quote_at = last_quote_at or now
+        session.add(existing)
+        await session.flush()
+        return existing
+    pos = SayuPaperPosition(
+        account_id=account_id,
+        group_id=group_id,
+        bot_id=bot_id,
+        stock_code=stock_code,
+        stock_name=stock_name,
+        secid=secid,
+        qty=qty,
+        avg_cost=avg_cost,
+        last_quote_price=last_quote_price,
+        last_quote_at=last_quote_at or now if last_quote_price is not None else None,
+        opened_at=now,
+        updated_at=now,
+    )
+    session.add(pos)
+    await session.flush()
+    return pos
+
+
+def _append_trade(
+    session: AsyncSession,
+    acc: SayuPaperAccount,
+    *,
+    stock_code: str,
+    stock_name: str,
+    secid: str,
+    side: str,
+    price: float,
+    qty: int,
+    amount: float,
+    fee: float,
+    realized_pnl: float = 0.0,
+    reason: str = "",
+    snapshot: str = "",
+    decision_id: Optional[int] = None,
+    mode: str = "balanced",
+) -> SayuPaperTrade:
+    """写一条流水并按成交调整 ``acc`` 的现金 / 本金（调用方负责 flush）。
+
+    现金口径见 ``PaperTradeRepo.append_with_cash_update``；单笔与批量成交共用这一段，
+    两条路径落库结果一致。
+    """
+    if side not in ("buy", "sell"):
+        raise ValueError(f"side 非法: {side!r}（期望 buy 或 sell）")
+    trade = SayuPaperTrade(
+        account_id=acc.id,
+        group_id=acc.group_id,
+        bot_id=acc.bot_id,
+        stock_code=stock_code,
+        stock_name=stock_name,
+        secid=secid,
+        side=side,
+        price=price,
+        qty=qty,
+        amount=amount,
+        fee=fee,
+        realized_pnl=realized_pnl,
+        reason=reason,
+        snapshot=snapshot,
+        decided_at=datetime.now(),
+        executed_at=datetime.now(),
+        decision_id=decision_id,
+        mode=mode,
+    )
+    session.add(trade)
+
+    if side == "buy":
+        # buy：现金要付出 amount + fee
+        acc.cash -= amount + fee
+    else:  # sell
+        # sell：现金回 amount - fee；principal 累计 realized_pnl
+        acc.cash += amount - fee + realized_pnl
+        acc.principal += realized_pnl
+
+    acc.last_decided_at = datetime.now()
+    session.add(acc)
+    return trade
+
+
+# 批量成交里每笔的持仓落库字段（其余键原样透传给 ``_append_trade``）
+_FILL_POSITION_FIELDS: Tuple[str, ...] = ("position_qty", "avg_cost")
+
+
+async def _append_fills(
+    session: AsyncSession,
+    account_id: int,
+    fills: Sequence[Dict[str, Any]],
+) -> List[Tuple[SayuPaperTrade, Optional[SayuPaperPosition]]]:
+    """在一个事务里按顺序落一批成交：每笔写流水 + 调现金 + 落持仓。
+
+    ``fills`` 每项是 ``_append_trade`` 的关键字参数，外加成交后的 ``position_qty`` /
+    ``avg_cost``；持仓报价列写成交价。任何一笔出错整批回滚。
+    """
+    acc_stmt = select(SayuPaperAccount).where(col(SayuPaperAccount.id) == account_id)
+    acc: Optional[SayuPaperAccount] = (await session.execute(acc_stmt)).scalars().first()
+    if acc is None:
+        raise RuntimeError(f"SayuPaperAccount 不存在 (account_id={account_id})；请先创建模拟盘")
+
+    out: List[Tuple[SayuPaperTrade, Optional[SayuPaperPosition]]] = []
+    for fill in fills:
+        trade_fields = {k: v for k, v in fill.items() if k not in _FILL_POSITION_FIELDS}
+        trade = _append_trade(session, acc, **trade_fields)
+        await session.flush()
+        position = await _upsert_position(
+            session,
+            account_id,
+            stock_code=fill["stock_code"],
+            stock_name=fill["stock_name"],
+            secid=fill["secid"],
+            qty=int(fill["position_qty"]),
+            avg_cost=float(fill["avg_cost"]),
+            last_quote_price=fill["price"] if fill["price"] > 0 else None,
+            last_quote_at=datetime.now() if fill["price"] > 0 else None,
+        )
+        out.append((trade, position))
+    return out
+
+
 # ============================================================
 # Position Repo
 # ============================================================
@@ -373,6 +980,37 @@ class PaperPositionRepo:
         result = await session.execute(stmt)
         return [row[0] for row in result.all()]
 
+    @classmethod
+    @with_session
+    async def list_held_secids(cls, session: AsyncSession) -> List[str]:
+        """所有账户当前持仓的 secid 并集（去重），供报价后台刷新用。"""
+        stmt = (
+            select(col(SayuPaperPosition.secid))
+            .where(
+                and_(
+                    col(SayuPaperPosition.qty) > 0,
+                    col(SayuPaperPosition.secid) != "",
+                )
+            )
+            .distinct()
+        )
+        result = await session.execute(stmt)
+        return [row[0] for row in result.all()]
+
+    @classmethod
+    @with_session
+    async def list_open(
+        cls,
+        session: AsyncSession,
+        account_ids: Optional[Sequence[int]] = None,
+    ) -> List[SayuPaperPosition]:
+        """一次查出所有（或指定）账户的在持仓位，供收盘批量快照用。"""
+        stmt = select(SayuPaperPosition).where(col(SayuPaperPosition.qty) > 0)
+        if account_ids is not None:
+            stmt = stmt.where(col(SayuPaperPosition.account_id).in_(list(account_ids)))
+        result = await session.execute(stmt)
+        return list(result.scalars().all())
+
     @classmethod
     @with_session
     async def upsert(
@@ -398,49 +1036,19 @@ class PaperPositionRepo:
 
         qty=0 分支直接走 DELETE，避开跨会话的 detached instance。
         """
-        if qty <= 0:
-            from sqlalchemy import delete as _sa_delete
-
-            stmt = _sa_delete(SayuPaperPosition).where(
-                and_(
-                    col(SayuPaperPosition.account_id) == account_id,
-                    col(SayuPaperPosition.stock_code) == stock_code,
-                )
-            )
-            await session.execute(stmt)
-            await session.flush()
-            return None
-        existing = await cls.get(account_id, stock_code)
-        now = datetime.now()
-        if existing:
-            existing.qty = qty
-            existing.avg_cost = avg_cost
-            existing.stock_name = stock_name
-            existing.secid = secid
-            existing.updated_at = now
-            if last_quote_price is not None:
-                existing.last_quote_price = last_quote_price
-                existing.last_quote_at = last_quote_at or now
-            session.add(existing)
-            await session.flush()
-            return existing
-        pos = SayuPaperPosition(
-            account_id=account_id,
-            group_id=group_id,
-            bot_id=bot_id,
+        return await _upsert_position(
+            session,
+            account_id,
             stock_code=stock_code,
             stock_name=stock_name,
             secid=secid,
             qty=qty,
             avg_cost=avg_cost,
+            group_id=group_id,
+            bot_id=bot_id,
             last_quote_price=last_quote_price,
-            last_quote_at=last_quote_at or now if last_quote_price is not None else None,
-            opened_at=now,
-            updated_at=now,
+            last_quote_at=last_quote_at,
         )
-        session.add(pos)
-        await session.flush()
-        return pos
 
     @classmethod
     @with_session
@@ -453,34 +1061,36 @@ class PaperPositionRepo:
         """批量写报价。``quotes`` 形如 ``[{stock_code, price, at}, ...]``。
 
         用于 ``quote_service.get_quotes_batch`` 一次拉多只股票后批量落库。
-        实现上仍是逐条 ``UPDATE``（同一 ``session`` 内），共享一次 ``flush``。
+        按 SQLite 变量上限分块，每块一条 ``CASE`` 批量 ``UPDATE``，同一事务内完成。
 
         Returns:
             受影响总行数；调用方不强制使用。
         """
-        from sqlalchemy import update as _sa_update
-
-        affected: int = 0
-        for q in quotes:
-            code = q.get("stock_code")
-            price = q.get("price")
-            at = q.get("at")
-            if not code or price is None:
-                continue
-            stmt = (
-                _sa_update(SayuPaperPosition)
-                .where(
-                    and_(
-                        col(SayuPaperPosition.account_id) == account_id,
-                        col(SayuPaperPosition.stock_code) == code,
-                    )
-                )
-                .values(last_quote_price=price, last_quote_at=at)
-            )
-            result = await session.execute(stmt)
-            affected += _rowcount(result)
-        await session.flush()
-        return affected
+        rows = [(q.get("stock_code") or "", q.get("price"), q.get("at")) for q in quotes]
+        return await _update_quotes(
+            session,
+            col(SayuPaperPosition.stock_code),
+            rows,
+            col(SayuPaperPosition.account_id) == account_id,
+        )
+
+    @classmethod
+    @with_session
+    async def mark_to_market(
+        cls,
+        session: AsyncSession,
+        quotes: Sequence[Tuple[str, float, Optional[datetime]]],
+    ) -> int:
+        """按 secid 给**所有账户**的持仓写报价；``quotes`` 形如 ``[(secid, price, at), ...]``。
+
+        整批在一个事务里完成（持仓报价后台刷新后调用），返回受影响行数。
+        """
+        return await _update_quotes(
+            session,
+            col(SayuPaperPosition.secid),
+            quotes,
+            col(SayuPaperPosition.qty) > 0,
+        )
 
 
 # ============================================================
@@ -509,12 +1119,42 @@ class PaperTradeRepo:
                 col(SayuPaperTrade.account_id) == account_id,
                 col(SayuPaperTrade.stock_code) == stock_code,
                 col(SayuPaperTrade.side) == "buy",
-                func.date(col(SayuPaperTrade.executed_at)) == today,
+                _day_range(col(SayuPaperTrade.executed_at), today),
             )
         )
         result = await session.execute(stmt)
         return int(result.scalar_one() or 0)
 
+    @classmethod
+    @with_session
+    async def locked_qty_today_many(
+        cls,
+        session: AsyncSession,
+        account_id: int,
+        stock_codes: Sequence[str],
+        today: Optional[date] = None,
+    ) -> Dict[str, int]:
+        """``locked_qty_today`` 的批量版：一条 GROUP BY 查出多只股票的今日买入股数。"""
+        if not stock_codes:
+            return {}
+        if today is None:
+            today = date.today()
+        stmt = (
+            select(col(SayuPaperTrade.stock_code), func.sum(SayuPaperTrade.qty))
+            .where(
+                and_(
+                    col(SayuPaperTrade.account_id) == account_id,
+                    col(SayuPaperTrade.stock_code).in_(list(stock_codes)),
+                    col(SayuPaperTrade.side) == "buy",
+                    _day_range(col(SayuPaperTrade.executed_at), today),
+                )
+            )
+            .group_by(col(SayuPaperTrade.stock_code))
+        )
+        result = await session.execute(stmt)
+        locked = {str(code): int(qty or 0) for code, qty in result.all()}
+        return {code: locked.get(code, 0) for code in stock_codes}
+
     @classmethod
     @with_session
     async def append(
@@ -611,10 +1251,9 @@ class PaperTradeRepo:
         if acc is None:
             raise RuntimeError(f"SayuPaperAccount 不存在 (account_id={account_id})；请先创建模拟盘")
 
-        trade = SayuPaperTrade(
-            account_id=account_id,
-            group_id=acc.group_id,
-            bot_id=acc.bot_id,
+        trade = _append_trade(
+            session,
+            acc,
             stock_code=stock_code,
             stock_name=stock_name,
             secid=secid,
@@ -626,26 +1265,26 @@ class PaperTradeRepo:
             realized_pnl=realized_pnl,
             reason=reason,
             snapshot=snapshot,
-            decided_at=datetime.now(),
-            executed_at=datetime.now(),
             decision_id=decision_id,
             mode=mode,
         )
-        session.add(trade)
         await session.flush()
+        return trade
 
-        if side == "buy":
-            # buy：现金要付出 amount + fee
-            acc.cash -= amount + fee
-        else:  # sell
-            # sell：现金回 amount - fee；principal 累计 realized_pnl
-            acc.cash += amount - fee + realized_pnl
-            acc.principal += realized_pnl
+    @classmethod
+    @with_session
+    async def append_batch(
+        cls,
+        session: AsyncSession,
+        account_id: int,
+        fills: Sequence[Dict[str, Any]],
+    ) -> List[Tuple[SayuPaperTrade, Optional[SayuPaperPosition]]]:
+        """一个事务落一批成交（流水 + 现金 + 持仓），返回每笔的 ``(trade, position)``。
 
-        acc.last_decided_at = datetime.now()
-        session.add(acc)
-        await session.flush()
-        return trade
+        逐笔口径与 ``append_with_cash_update`` + ``PaperPositionRepo.upsert`` 相同，
+        见 ``_append_fills``；持仓清零的那笔 position 为 None。
+        """
+        return await _append_fills(session, account_id, fills)
 
     @classmethod
     @with_session
@@ -665,7 +1304,7 @@ class PaperTradeRepo:
         if stock_code:
             stmt = stmt.where(col(SayuPaperTrade.stock_code) == stock_code)
         result = await session.execute(stmt)
-        return list(result.scalars().all())
+        return await _with_archived(session, "trade", account_id, list(result.scalars().all()), limit, stock_code)
 
     @classmethod
     @with_session
@@ -678,7 +1317,7 @@ class PaperTradeRepo:
         stmt = select(func.count(col(SayuPaperTrade.id))).where(
             and_(
                 col(SayuPaperTrade.account_id) == account_id,
-                func.date(col(SayuPaperTrade.executed_at)) == today,
+                _day_range(col(SayuPaperTrade.executed_at), today),
             )
         )
         result = await session.execute(stmt)
@@ -703,7 +1342,7 @@ class PaperTradeRepo:
                 and_(
                     col(SayuPaperTrade.account_id) == account_id,
                     col(SayuPaperTrade.side) == "buy",
-                    func.date(col(SayuPaperTrade.executed_at)) == today,
+                    _day_range(col(SayuPaperTrade.executed_at), today),
                 )
             )
             .group_by(
@@ -722,7 +1361,7 @@ class PaperTradeRepo:
         account_id: int,
         since: Optional[datetime] = None,
     ) -> Dict[str, float]:
-        """聚合已实现盈亏等指标。无成交时全返回 0。"""
+        """聚合已实现盈亏等指标（含已归档到冷文件的流水）。无成交时全返回 0。"""
         stmt = select(
             func.coalesce(func.sum(col(SayuPaperTrade.realized_pnl)), 0.0).label("total_pnl"),
             func.coalesce(func.sum(col(SayuPaperTrade.amount)), 0.0).label("total_amount"),
@@ -733,11 +1372,12 @@ class PaperTradeRepo:
             stmt = stmt.where(col(SayuPaperTrade.executed_at) >= since)
         result = await session.execute(stmt)
         row = result.one()
+        archived = await _archived_pnl(session, account_id, since)
         return {
-            "total_pnl": float(row.total_pnl),
-            "total_amount": float(row.total_amount),
-            "total_fee": float(row.total_fee),
-            "trade_count": int(row.trade_count),
+            "total_pnl": float(row.total_pnl) + archived["total_pnl"],
+            "total_amount": float(row.total_amount) + archived["total_amount"],
+            "total_fee": float(row.total_fee) + archived["total_fee"],
+            "trade_count": int(row.trade_count) + int(archived["trade_count"]),
         }
 
 
@@ -797,7 +1437,7 @@ class PaperDecisionRepo:
         if stock_code:
             stmt = stmt.where(col(SayuPaperDecision.stock_code) == stock_code)
         result = await session.execute(stmt)
-        return list(result.scalars().all())
+        return await _with_archived(session, "decision", account_id, list(result.scalars().all()), limit, stock_code)
 
 
 # ============================================================
@@ -836,6 +1476,7 @@ class PaperSnapshotRepo:
         )
         session.add(snap)
         await session.flush()
+        await _refresh_stats(session, [snap])
         return snap
 
     @classmethod
@@ -935,6 +1576,7 @@ class PaperSnapshotRepo:
             existing.created_at = datetime.now()
             session.add(existing)
             await session.flush()
+            await _refresh_stats(session, [existing])
             return existing
         snap = SayuPaperSnapshot(
             account_id=account_id,
@@ -951,35 +1593,59 @@ class PaperSnapshotRepo:
         )
         session.add(snap)
         await session.flush()
+        await _refresh_stats(session, [snap])
         return snap
 
     @classmethod
     @with_session
-    async def list_latest_all_accounts(cls, session: AsyncSession, limit: int = 20) -> List[SayuPaperSnapshot]:
-        """跨盘排行：返回每个盘最新一条快照 + total_pnl_pct。"""
-        subq = (
-            select(
-                col(SayuPaperSnapshot.account_id),
-                func.max(col(SayuPaperSnapshot.trade_date)).label("max_date"),
-            )
-            .where(col(SayuPaperSnapshot.account_id) > 0)
-            .group_by(col(SayuPaperSnapshot.account_id))
-            .subquery()
-        )
+    async def equity_before(cls, session: AsyncSession, trade_date: date) -> Dict[int, float]:
+        """每个盘在 ``trade_date`` 之前最近一条快照的 total_equity（批量算 day_pnl 的基准）。"""
+        return await _equity_before(session, trade_date)
+
+    @classmethod
+    @with_session
+    async def upsert_many_for_date(
+        cls,
+        session: AsyncSession,
+        trade_date: date,
+        rows: Sequence[Dict[str, Any]],
+    ) -> List[SayuPaperSnapshot]:
+        """``upsert_for_date`` 的批量版：一个事务写完所有盘当天的快照（见 ``_upsert_snapshots``）。"""
+        return await _upsert_snapshots(session, trade_date, rows)
+
+    @classmethod
+    @with_session
+    async def list_latest_all_accounts(cls, session: AsyncSession, limit: int = 20) -> List[SayuPaperAccountStats]:
+        """跨盘排行：按名次读排行物化表前 ``limit`` 个盘（每盘最新快照 + 收益率 / 回撤）。
+
+        物化表为空而快照表有数据（刚升级、或物化表被手动清过）时，就地全量重建一次。
+        """
         stmt = (
-            select(SayuPaperSnapshot)
-            .join(
-                subq,
-                and_(
-                    col(SayuPaperSnapshot.account_id) == subq.c.account_id,
-                    col(SayuPaperSnapshot.trade_date) == subq.c.max_date,
-                ),
-            )
-            .order_by(col(SayuPaperSnapshot.total_pnl_pct).desc())
+            select(SayuPaperAccountStats)
+            .order_by(col(SayuPaperAccountStats.rank), col(SayuPaperAccountStats.account_id))
             .limit(limit)
         )
-        result = await session.execute(stmt)
-        return list(result.scalars().all())
+        rows = list((await session.execute(stmt)).scalars().all())
+        if rows:
+            return rows
+        if await _recompute_stats(session) == 0:
+            return []
+        await _rerank_stats(session)
+        return list((await session.execute(stmt)).scalars().all())
+
+    @classmethod
+    @with_session
+    async def rebuild_account_stats(cls, session: AsyncSession) -> int:
+        """从快照表全量重建排行物化表，返回重建的盘数。"""
+        count = await _recompute_stats(session)
+        await _rerank_stats(session)
+        return count
+
+    @classmethod
+    @with_session
+    async def check_account_stats(cls, session: AsyncSession) -> List[str]:
+        """排行物化表与全历史 group by 查询逐盘比对，返回不一致项（空列表即一致）。"""
+        return await _check_stats(session)
 
 
 # ============================================================
@@ -1350,6 +2016,124 @@ class PaperBroadcastRepo:
         return True
 
 
+# ============================================================
+# Archive Repo（冷归档的热表一侧：取待归档的整月、写汇总并删热行）
+# ============================================================
+class PaperArchiveRepo:
+    @classmethod
+    @with_session
+    async def oldest(cls, session: AsyncSession, kind: str) -> Optional[datetime]:
+        """热表里最早一行的时间；表空返回 None。"""
+        _, time_attr = _ARCHIVE_KINDS[kind]
+        return (await session.execute(select(func.min(col(time_attr))))).scalar()
+
+    @classmethod
+    @with_session
+    async def load_range(
+        cls,
+        session: AsyncSession,
+        kind: str,
+        start: datetime,
+        end: datetime,
+    ) -> List[Dict[str, Any]]:
+        """``[start, end)`` 内的全部热行（所有盘），按 id 升序转成 dict。"""
+        model, time_attr = _ARCHIVE_KINDS[kind]
+        stmt = select(model).where(and_(col(time_attr) >= start, col(time_attr) < end)).order_by(col(model.id))
+        return [r.model_dump() for r in (await session.execute(stmt)).scalars().all()]
+
+    @classmethod
+    @with_session
+    async def list_months(
+        cls,
+        session: AsyncSession,
+        kind: Optional[str] = None,
+        month: Optional[str] = None,
+    ) -> List[SayuPaperArchiveMonth]:
+        stmt = select(SayuPaperArchiveMonth)
+        if kind:
+            stmt = stmt.where(col(SayuPaperArchiveMonth.kind) == kind)
+        if month:
+            stmt = stmt.where(col(SayuPaperArchiveMonth.month) == month)
+        return list((await session.execute(stmt)).scalars().all())
+
+    @classmethod
+    @with_session
+    async def commit_month(
+        cls,
+        session: AsyncSession,
+        kind: str,
+        start: datetime,
+        end: datetime,
+        max_id: int,
+        summaries: Sequence[Dict[str, Any]],
+    ) -> int:
+        """冷文件落盘之后调用：同一事务里写汇总行、删掉 ``[start, end)`` 内 ``id <= max_id`` 的热行。
+
+        汇总行按 (盘, 类别, 月) 整行覆盖（重跑同一个月时冷文件已合并过旧行，
+        汇总也是合并后的全量）。返回删除的热行数。
+        """
+        from sqlalchemy import delete as _sa_delete
+
+        model, time_attr = _ARCHIVE_KINDS[kind]
+        month = cold_store.month_key(start)
+        existing = {
+            m.account_id: m
+            for m in (
+                await session.execute(
+                    select(SayuPaperArchiveMonth).where(
+                        and_(
+                            col(SayuPaperArchiveMonth.kind) == kind,
+                            col(SayuPaperArchiveMonth.month) == month,
+                        )
+                    )
+                )
+            )
+            .scalars()
+            .all()
+        }
+        now = datetime.now()
+        for summary in summaries:
+            row = existing.get(summary["account_id"])
+            if row is None:
+                row = SayuPaperArchiveMonth(account_id=summary["account_id"], kind=kind, month=month)
+            for key, value in summary.items():
+                setattr(row, key, value)
+            row.archived_at = now
+            session.add(row)
+        r = await session.execute(
+            _sa_delete(model).where(and_(col(time_attr) >= start, col(time_attr) < end, col(model.id) <= max_id))
+        )
+        await session.flush()
+        return _rowcount(r)
+
+    @classmethod
+    @with_session
+    async def storage_bytes(cls, session: AsyncSession) -> Optional[Tuple[int, int]]:
+        """SQLite 库文件 ``(总字节, 空闲页字节)``；其他方言返回 None。
+
+        删行只会把页挂到 freelist 上供后续写入复用，文件要 VACUUM 才会真的变小。
+        """
+        if session.get_bind().dialect.name != "sqlite":
+            return None
+        page_size = (await session.execute(text("PRAGMA page_size"))).scalar() or 0
+        pages = (await session.execute(text("PRAGMA page_count"))).scalar() or 0
+        free = (await session.execute(text("PRAGMA freelist_count"))).scalar() or 0
+        return int(pages) * int(page_size), int(free) * int(page_size)
+
+    @classmethod
+    @with_session
+    async def vacuum(cls, session: AsyncSession) -> bool:
+        """SQLite 上 VACUUM 整库收缩文件；其他方言不做，返回 False。"""
+        bind = session.get_bind()
+        if bind.dialect.name != "sqlite":
+            return False
+        # VACUUM 不能在事务里跑：另开一条 autocommit 连接
+        async with session.bind.connect() as conn:  # type: ignore[union-attr]
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.exec_driver_sql("VACUUM")
+        return True
+
+
 # ============================================================
 # 策略参数解析（strategy_params JSON → dict）
 # ============================================================
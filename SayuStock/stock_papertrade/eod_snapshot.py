@@ -0,0 +1,224 @@
+"""收盘净值快照批量写入。
+
+交易日 15:05 给所有启用的模拟盘一次写完当日快照，不再每个盘各跑一遍
+"读账户 → 读持仓 → 拉报价 → 查昨日快照 → 写快照"：
+
+1. 两条查询取账户与全部在持仓位（``list_enabled`` / ``list_open``），一条查询取
+   每盘上一条快照的净值作 day_pnl 基准（``equity_before``）；
+2. 所有持仓 secid 的并集交给 ``quote_service.refresh`` 统一重拉一次收盘价（不动常驻集合），
+   拉到的价格经 ``mark_to_market`` 一个事务写回持仓报价列；
+3. 持仓市值按账户 ``np.bincount`` 聚合，算出净值 / 盈亏；
+4. ``PaperSnapshotRepo.upsert_many_for_date`` 一个事务写入，同一交易日重跑只更新。
+
+收盘快照代理调用的 ``papertrade_snapshot_write`` 也走 :func:`write_eod_snapshots`
+（只传自己那一个盘），两边口径一致。
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+from datetime import date, datetime
+from dataclasses import asdict, dataclass
+
+import numpy as np
+
+from gsuid_core.aps import scheduler
+from gsuid_core.logger import logger
+
+from .db import PaperAccountRepo, PaperPositionRepo, PaperSnapshotRepo
+from .quote_service import quote_service
+from .trading_calendar import is_a_share_trading_day
+from ..stock_config.stock_config import STOCK_CONFIG
+from ..utils.database.papertrade_models import SayuPaperAccount, SayuPaperPosition
+
+
+@dataclass(slots=True)
+class AccountSnapshot:
+    """一个盘当天的快照数值（写库前的中间结果）。"""
+
+    account_id: int
+    group_id: str
+    bot_id: str
+    cash: float
+    position_value: float
+    total_equity: float
+    day_pnl: float
+    day_pnl_pct: float
+    total_pnl: float
+    total_pnl_pct: float
+    position_count: int = 0
+    # 没拿到新报价、按库里旧报价 / 均价估值的持仓数
+    stale_count: int = 0
+    snapshot_id: Optional[int] = None
+
+    def row(self) -> Dict[str, Any]:
+        """``upsert_many_for_date`` 用的行。"""
+        out = asdict(self)
+        for key in ("position_count", "stale_count", "snapshot_id"):
+            out.pop(key)
+        return out
+
+
+def today_cn() -> date:
+    """东八区当天（系统时钟漂到 UTC 时避免快照记错日）。"""
+    try:
+        from zoneinfo import ZoneInfo
+
+        return datetime.now(ZoneInfo("Asia/Shanghai")).date()
+    except Exception:
+        return date.today()
+
+
+def compute_snapshots(
+    accounts: Sequence[SayuPaperAccount],
+    positions: Sequence[SayuPaperPosition],
+    prices: Mapping[str, float],
+    baselines: Mapping[int, float],
+) -> List[AccountSnapshot]:
+    """按账户聚合持仓市值，算出每个盘的快照数值。
+
+    Args:
+        accounts: 要写快照的盘；``positions`` 里不属于这些盘的持仓忽略。
+        positions: 在持仓位（``qty > 0``）。
+        prices: ``{secid: 新报价}``；缺失的持仓按 ``last_quote_price → avg_cost`` 兜底。
+        baselines: ``{account_id: 上一条快照的 total_equity}``；缺失则相对期初本金。
+
+    口径与单盘的 ``papertrade_snapshot_write`` 一致：单只市值先舍到分再求和，
+    ``total_equity = cash + position_value``，百分比保留 4 位。
+    """
+    slots = {acc.id: i for i, acc in enumerate(accounts) if acc.id is not None}
+    held = [p for p in positions if p.account_id in slots and p.qty > 0]
+
+    slot = np.fromiter((slots[p.account_id] for p in held), dtype=np.int64, count=len(held))
+    qty = np.fromiter((p.qty for p in held), dtype=np.float64, count=len(held))
+    price = np.empty(len(held), dtype=np.float64)
+    fresh = np.zeros(len(held), dtype=bool)
+    for i, p in enumerate(held):
+        quote = prices.get(p.secid) if p.secid else None
+        if quote is not None:
+            price[i] = quote
+            fresh[i] = True
+        elif p.last_quote_price is not None and p.last_quote_at is not None:
+            price[i] = p.last_quote_price
+        else:
+            price[i] = p.avg_cost or 0.0
+
+    n = len(accounts)
+    value = np.bincount(slot, weights=np.round(price * qty, 2), minlength=n)
+    count = np.bincount(slot, minlength=n)
+    stale = np.bincount(slot, weights=~fresh, minlength=n)
+
+    out: List[AccountSnapshot] = []
+    for acc in accounts:
+        if acc.id is None:
+            continue
+        i = slots[acc.id]
+        position_value = round(float(value[i]), 2)
+        total_equity = round(acc.cash + position_value, 2)
+        total_pnl = round(total_equity - acc.initial_cash, 2)
+        baseline = baselines.get(acc.id, acc.initial_cash)
+        day_pnl = round(total_equity - baseline, 2)
+        out.append(
+            AccountSnapshot(
+                account_id=acc.id,
+                group_id=acc.group_id,
+                bot_id=acc.bot_id,
+                cash=round(acc.cash, 2),
+                position_value=position_value,
+                total_equity=total_equity,
+                day_pnl=day_pnl,
+                day_pnl_pct=round(day_pnl / baseline * 100, 4) if baseline else 0.0,
+                total_pnl=total_pnl,
+                total_pnl_pct=round(total_pnl / acc.initial_cash * 100, 4) if acc.initial_cash else 0.0,
+                position_count=int(count[i]),
+                stale_count=int(stale[i]),
+            )
+        )
+    return out
+
+
+async def _fetch_prices(secids: List[str], *, held_universe: bool) -> Dict[str, float]:
+    """一次拉齐 ``secids`` 的报价，只返回拉到的。
+
+    ``held_universe``：``secids`` 是所有账户持仓的并集，此时走 ``refresh`` 强制
+    重拉（常驻报价在上限内读缓存，收盘后不重拉就拿不到收盘价）；否则只是某几个
+    盘的子集，走缓存优先的 ``get_quotes_batch``。两条路都不动常驻集合，那是盘中
+    刷新任务的事。
+    """
+    if not secids:
+        return {}
+    try:
+        if held_universe:
+            # 单只失败时保留的是旧条目，refresh 不算它
+            refreshed = await quote_service.refresh(secids)
+            return {secid: float(entry.price) for secid, entry in refreshed.items() if entry.price is not None}
+        fetched = await quote_service.get_quotes_batch(secids)
+    except Exception as e:
+        logger.debug(f"[PaperTrade][Snapshot] 批量拉报价异常：{e}")
+        return {}
+    return {secid: float(price) for secid, price in fetched.items() if price is not None}
+
+
+async def _mark_to_market(prices: Mapping[str, float]) -> None:
+    """新拉到的报价一个事务写回持仓报价列。"""
+    if not prices:
+        return
+    now = datetime.now()
+    try:
+        await PaperPositionRepo.mark_to_market([(secid, price, now) for secid, price in prices.items()])
+    except Exception as e:
+        # 老库可能列未迁移完；快照照算，落库失败不影响
+        logger.debug(f"[PaperTrade][Snapshot] 持仓报价写回 DB 失败（降级）：{e}")
+
+
+async def write_eod_snapshots(
+    trade_date: Optional[date] = None,
+    accounts: Optional[Sequence[SayuPaperAccount]] = None,
+    prices: Optional[Mapping[str, float]] = None,
+) -> List[AccountSnapshot]:
+    """给一批盘写 ``trade_date`` 的收盘快照，返回写入结果（含 ``snapshot_id``）。
+
+    Args:
+        trade_date: 快照日期，默认东八区当天。
+        accounts: 要写的盘，默认所有启用的盘。
+        prices: 调用方已有的报价快照 ``{secid: price}``（单盘快照复用本轮估值）；
+            给了就不再拉报价、也不写回持仓报价列（估值时已写过）。
+    """
+    trade_date = trade_date or today_cn()
+    all_accounts = accounts is None
+    targets = [a for a in (await PaperAccountRepo.list_enabled() if accounts is None else accounts) if a.id is not None]
+    if not targets:
+        return []
+
+    # 全量跑时连停用盘的持仓一起取：收盘价一并写回所有持仓
+    positions = await PaperPositionRepo.list_open(None if all_accounts else [a.id for a in targets if a.id])
+    secids = sorted({p.secid for p in positions if p.secid})
+    if prices is None:
+        prices = await _fetch_prices(secids, held_universe=all_accounts)
+        await _mark_to_market(prices)
+
+    baselines = await PaperSnapshotRepo.equity_before(trade_date)
+    snapshots = compute_snapshots(targets, positions, prices, baselines)
+    written = await PaperSnapshotRepo.upsert_many_for_date(trade_date, [s.row() for s in snapshots])
+    ids = {snap.account_id: snap.id for snap in written}
+    for s in snapshots:
+        s.snapshot_id = ids.get(s.account_id)
+    return snapshots
+
+
+@scheduler.scheduled_job("cron", day_of_week="mon-fri", hour=15, minute=5)
+async def eod_snapshot_job() -> None:
+    if not STOCK_CONFIG.get_config("papertrade_eod_snapshot").data or not is_a_share_trading_day():
+        return
+    start = time.perf_counter()
+    try:
+        snapshots = await write_eod_snapshots()
+    except Exception as e:
+        logger.exception(f"[SayuStock][PaperTrade] 收盘批量快照异常: {e}")
+        return
+    stale = sum(s.stale_count for s in snapshots)
+    logger.info(
+        f"[SayuStock][PaperTrade] 收盘快照 {len(snapshots)} 个盘，旧报价持仓 {stale} 只，"
+        f"耗时 {time.perf_counter() - start:.2f}s"
+    )
@@ -36,7 +36,7 @@ import re
 import json
 from typing import Tuple, Literal, Optional
 
-from . import db as _db
+from . import db as _db, valuation as _valuation
 from ..utils.database.papertrade_models import (
     SayuPaperTrade,
     SayuPaperAccount,
@@ -242,13 +242,14 @@ async def build_papertrade_proactive_text(
             ts = await _db.PaperTradeRepo.list_by_account(account_id, limit=1)
             if ts:
                 latest_trade = ts[0]
-        positions_now: list[SayuPaperPosition] = await _db.PaperPositionRepo.list_by_account(account_id)
+        if acc is None:
+            return fallback_text
+        # 本轮估值：调用方包了 valuation_round 时与 agent 工具看到的是同一份
+        val = await _valuation.get_valuation(account_id, account=acc)
+        positions_now: list[SayuPaperPosition] = [p for p, _ in val.positions]
     except Exception:
         return fallback_text
 
-    if acc is None:
-        return fallback_text
-
     # ── 选 variant 决定标题 + 页脚 + 内部渲染分支 ──
     if variant == "auto":
         action_map = {"buy": "🟢 买入", "sell": "🔴 卖出", "hold": "⏸️ 持币"}
@@ -289,6 +290,7 @@ async def build_papertrade_proactive_text(
             if ind:
                 lines.append(f"📈 行情快照：{ind}")
         lines.append(f"💰 账户现金：¥{acc.cash:,.2f}")
+        lines.append(f"💼 总资产：¥{val.total_equity:,.2f}（持仓市值 ¥{val.position_value:,.2f}）")
         lines.append("")
         if positions_now:
             lines.append("📊 当前持仓：")
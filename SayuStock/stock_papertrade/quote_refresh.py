@@ -0,0 +1,60 @@
+"""持仓报价后台刷新。
+
+交易时段内每隔 ``papertrade_quote_refresh_seconds`` 秒，把所有账户持仓 secid 的
+并集交给 ``quote_service.refresh_held`` 统一重拉一遍。这些 secid 在报价缓存里常驻，
+持仓估值 / 撮合读报价时直接命中，不再同步等东财接口。拉到的价格随后经
+``PaperPositionRepo.mark_to_market`` 一个事务写回所有账户的持仓报价列。
+
+定时任务按最小档位 15 秒触发一次，再按配置的间隔决定是否真正刷新，改配置无需重启。
+刷新关闭或不在交易时段时清空常驻集合，避免午休 / 隔夜后还一直读停刷前的报价。
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Optional
+from datetime import datetime
+
+from gsuid_core.aps import scheduler
+from gsuid_core.logger import logger
+
+from .db import PaperPositionRepo
+from .quote_service import quote_service
+from .trading_calendar import is_trading_time, is_a_share_trading_day
+from ..stock_config.stock_config import STOCK_CONFIG
+
+_last_refresh: Optional[float] = None
+
+
+@scheduler.scheduled_job("interval", seconds=15)
+async def refresh_held_quotes() -> None:
+    global _last_refresh
+    interval = int(STOCK_CONFIG.get_config("papertrade_quote_refresh_seconds").data)
+    if interval <= 0 or not is_a_share_trading_day() or not is_trading_time():
+        quote_service.release_held()
+        return
+    now = time.monotonic()
+    if _last_refresh is not None and now - _last_refresh < interval:
+        return
+    _last_refresh = now
+
+    try:
+        secids = await PaperPositionRepo.list_held_secids()
+        ok = await quote_service.refresh_held(secids, interval)
+    except Exception as e:
+        logger.exception(f"[SayuStock][PaperTrade] 持仓报价刷新异常: {e}")
+        return
+
+    marks = [
+        (secid, entry.price, datetime.fromtimestamp(entry.fetched_at))
+        for secid, entry in quote_service.held_quotes().items()
+        if entry.price is not None
+    ]
+    rows = 0
+    if marks:
+        try:
+            rows = await PaperPositionRepo.mark_to_market(marks)
+        except Exception as e:
+            # 老库可能列未迁移完；内存缓存已刷新，落库失败不影响读
+            logger.debug(f"[PaperTrade][Quote] 持仓报价写回 DB 失败（降级）：{e}")
+    logger.debug(f"[PaperTrade][Quote] 持仓报价刷新 {ok}/{len(secids)}，写回 {rows} 行，{quote_service.stats()}")
@@ -27,6 +27,19 @@ API：
   - ``_lock`` 保护同一 ``(secid, ts_window)`` 内并发触发的重复 API。一次会话内
     同一秒里 N 个并发 ``get_quote(secid)`` 只发一次 HTTP。
 
+容量 / 持仓常驻（2026-10 调整）：
+  - 报价与 per-secid 锁都是 LRU，各自最多 ``QUOTE_CACHE_MAX_KEYS`` 条；之前两张
+    dict 只增不减，查过的每只股票都永久驻留。锁按引用计数淘汰：拿到锁还没用完的
+    协程（含正在排队、已被唤醒但还没跑到的）都算一个引用，引用归零才可能被淘汰，
+    否则后来者会新建一把锁，和仍在排队的那个同时进临界区。
+  - 所有账户的持仓 secid 由 ``quote_refresh`` 定时任务交易时段内按
+    ``papertrade_quote_refresh_seconds`` 调 ``refresh_held`` 统一刷新；这些 secid
+    是「常驻」的：不参与 LRU 淘汰，过了 TTL 也直接返回，不在估值路径上同步等网络；
+    但最多容忍 ``QUOTE_HELD_STALENESS_FACTOR`` 个刷新间隔，再旧（刷新任务卡住 /
+    午休、收盘后停刷）就照常穿透去拉。刷新任务关掉或不在交易时段时调
+    ``release_held`` 清空常驻集合。
+  - 每个条目带 ``staleness``（距拉取的秒数），调用方据此判断报价新旧。
+
 参考模式：``gsuid_core/ai_core/budget/manager.py:121-150``（BudgetManager 单
 timestamp + 显式 ``invalidate()``）。
 """
@@ -35,7 +48,9 @@ from __future__ import annotations
 
 import time
 import asyncio
-from typing import Dict, List, Optional
+from typing import Dict, List, Iterable, Optional, AsyncIterator
+from contextlib import asynccontextmanager
+from collections import OrderedDict
 from dataclasses import field, dataclass
 
 from gsuid_core.logger import logger
@@ -45,6 +60,9 @@ from gsuid_core.logger import logger
 # ============================================================
 QUOTE_CACHE_TTL: float = 60.0  # 内存缓存秒数；超过即穿透去拉
 QUOTE_TIMEOUT_S: float = 8.0  # 单只 HTTP 超时
+QUOTE_CACHE_MAX_KEYS: int = 1024  # 报价 / 锁 LRU 容量（常驻的持仓 secid 不计入淘汰）
+QUOTE_REFRESH_CONCURRENCY: int = 8  # 后台刷新持仓时的并发请求数
+QUOTE_HELD_STALENESS_FACTOR: float = 3.0  # 常驻报价最多容忍几个刷新间隔，再旧就穿透
 
 
 # ============================================================
@@ -61,6 +79,11 @@ class QuoteCacheEntry:
     last_close: Optional[float] = None  # f60 昨收价
     change_pct: Optional[float] = None  # f45 涨跌幅（%，如 9.99）
 
+    @property
+    def staleness(self) -> float:
+        """距拉取过去的秒数。"""
+        return max(time.time() - self.fetched_at, 0.0)
+
 
 # ============================================================
 # 主服务
@@ -73,13 +96,21 @@ class QuoteService:
 
     _instance: Optional["QuoteService"] = None
 
-    def __init__(self) -> None:
-        self._cache: Dict[str, QuoteCacheEntry] = {}
-        self._locks: Dict[str, asyncio.Lock] = {}
+    def __init__(self, max_keys: int = QUOTE_CACHE_MAX_KEYS) -> None:
+        self._max_keys: int = max_keys
+        self._cache: "OrderedDict[str, QuoteCacheEntry]" = OrderedDict()
+        self._locks: "OrderedDict[str, asyncio.Lock]" = OrderedDict()
+        # 每把锁被多少个协程拿着（持有 + 排队）；只有归零的才可淘汰
+        self._lock_refs: Dict[str, int] = {}
         self._global_lock: asyncio.Lock = asyncio.Lock()
+        # 后台刷新维护的持仓 secid：不淘汰，过 TTL 也不阻塞读
+        self._held: frozenset[str] = frozenset()
+        # 常驻报价可容忍的最大秒数，由 refresh_held 按刷新间隔设置
+        self._held_max_staleness: float = QUOTE_CACHE_TTL
         # 统计：监控 cache 命中 / 穿透比
         self._hits: int = 0
         self._misses: int = 0
+        self._evictions: int = 0
 
     # ----------------------------------------------------------------
     # 单例
@@ -91,70 +122,128 @@ class QuoteService:
         return cls._instance
 
     # ----------------------------------------------------------------
-    # 内部 helper：拿 secid 维度的锁
+    # 内部 helper：持有 secid 维度的锁
     # ----------------------------------------------------------------
-    async def _get_lock(self, secid: str) -> asyncio.Lock:
+    @asynccontextmanager
+    async def _key_lock(self, secid: str) -> AsyncIterator[None]:
+        """``async with self._key_lock(secid):`` 进入 secid 的临界区。
+
+        从取锁到退出全程占一个引用；淘汰只动引用为 0 的锁，所以排队中的协程
+        拿到的那把锁一直在表里，后来者总能拿到同一把。
+        """
         async with self._global_lock:
-            if secid not in self._locks:
-                self._locks[secid] = asyncio.Lock()
-            return self._locks[secid]
+            lock = self._locks.get(secid)
+            if lock is None:
+                lock = self._locks[secid] = asyncio.Lock()
+            self._locks.move_to_end(secid)
+            self._lock_refs[secid] = self._lock_refs.get(secid, 0) + 1
+            if len(self._locks) > self._max_keys:
+                # 从最久未用的一端淘汰；有人持有 / 排队的锁留着
+                for key in [k for k in self._locks if k not in self._lock_refs]:
+                    if len(self._locks) <= self._max_keys:
+                        break
+                    del self._locks[key]
+        try:
+            async with lock:
+                yield
+        finally:
+            refs = self._lock_refs[secid] - 1
+            if refs:
+                self._lock_refs[secid] = refs
+            else:
+                del self._lock_refs[secid]
+
+    # ----------------------------------------------------------------
+    # 内部 helper：LRU 读 / 写
+    # ----------------------------------------------------------------
+    def _lookup(self, secid: str) -> Optional[QuoteCacheEntry]:
+        """可直接返回的缓存条目：TTL 内，或常驻持仓有报价且不超过常驻上限；否则 None。"""
+        entry = self._cache.get(secid)
+        if entry is None:
+            return None
+        staleness = entry.staleness
+        if staleness < QUOTE_CACHE_TTL or (
+            secid in self._held and entry.price is not None and staleness < self._held_max_staleness
+        ):
+            self._cache.move_to_end(secid)
+            return entry
+        return None
+
+    def _store(self, entry: QuoteCacheEntry) -> None:
+        self._cache[entry.secid] = entry
+        self._cache.move_to_end(entry.secid)
+        if len(self._cache) <= self._max_keys:
+            return
+        for key in list(self._cache):
+            if len(self._cache) <= self._max_keys:
+                break
+            if key in self._held or key == entry.secid:
+                continue
+            del self._cache[key]
+            self._evictions += 1
+
+    async def _fetch_and_store(self, secid: str, *, keep_last_good: bool = False) -> QuoteCacheEntry:
+        """打一次 HTTP 写缓存；调用方需持有 secid 锁。
+
+        ``keep_last_good``：拉取失败时保留上一条有价格的条目（后台刷新用），
+        而不是用 None 覆盖掉。
+        """
+        price: Optional[float] = None
+        last_close: Optional[float] = None
+        change_pct: Optional[float] = None
+        name: Optional[str] = None
+        try:
+            price, last_close, change_pct, name = await self._fetch_one(secid)
+        except Exception as e:
+            logger.debug(f"[PaperTrade][Quote] secid={secid} 拉报价失败: {e}")
+            # 失败也写一条 None 缓存，避免下一秒立刻又重试；TTL 仍是 60s
+            # （调大 TTL 也可，但这层 cache 是临时挡板，主要兜底在 DB 列）
+        previous = self._cache.get(secid)
+        if price is None and keep_last_good and previous is not None and previous.price is not None:
+            return previous
+        entry = QuoteCacheEntry(
+            secid=secid,
+            price=price,
+            name=name,
+            last_close=last_close,
+            change_pct=change_pct,
+            fetched_at=time.time(),
+        )
+        self._store(entry)
+        return entry
 
     # ----------------------------------------------------------------
     # 公共 API：单只
     # ----------------------------------------------------------------
     async def get_quote(self, secid: str) -> Optional[float]:
         """拿一只股票的当前价；带 60s TTL 缓存 + per-key lock 防穿透。"""
+        entry = await self._get_entry(secid)
+        return entry.price if entry is not None else None
+
+    async def _get_entry(self, secid: str) -> Optional[QuoteCacheEntry]:
         if not secid:
             return None
-        now = time.time()
-        cached = self._cache.get(secid)
-        if cached is not None and (now - cached.fetched_at) < QUOTE_CACHE_TTL:
+        cached = self._lookup(secid)
+        if cached is not None:
             self._hits += 1
-            return cached.price
+            return cached
 
-        lock = await self._get_lock(secid)
-        async with lock:
+        async with self._key_lock(secid):
             # 双重检查：拿锁期间其它协程可能已经拉过
-            cached = self._cache.get(secid)
-            if cached is not None and (time.time() - cached.fetched_at) < QUOTE_CACHE_TTL:
+            cached = self._lookup(secid)
+            if cached is not None:
                 self._hits += 1
-                return cached.price
+                return cached
 
             self._misses += 1
-            price: Optional[float] = None
-            last_close: Optional[float] = None
-            change_pct: Optional[float] = None
-            name: Optional[str] = None
-            try:
-                price, last_close, change_pct, name = await self._fetch_one(secid)
-            except Exception as e:
-                logger.debug(f"[PaperTrade][Quote] secid={secid} 拉报价失败: {e}")
-                # 失败也写一条 None 缓存，避免下一秒立刻又重试；TTL 仍是 60s
-                # （调大 TTL 也可，但这层 cache 是临时挡板，主要兜底在 DB 列）
-            self._cache[secid] = QuoteCacheEntry(
-                secid=secid,
-                price=price,
-                name=name,
-                last_close=last_close,
-                change_pct=change_pct,
-                fetched_at=time.time(),
-            )
-            return price
+            return await self._fetch_and_store(secid)
 
     # ----------------------------------------------------------------
     # 公共 API：单条目（后向兼容 get_quote 拿现价）
     # ----------------------------------------------------------------
     async def get_quote_detail(self, secid: str) -> Optional[QuoteCacheEntry]:
-        """拿完整缓存条目（含 last_close / change_pct）。优先走缓存；缺失穿透。"""
-        if not secid:
-            return None
-        now = time.time()
-        cached = self._cache.get(secid)
-        if cached is not None and (now - cached.fetched_at) < QUOTE_CACHE_TTL:
-            return cached
-        # 穿透一次 get_quote 让它把整条 cache entry 写齐
-        await self.get_quote(secid)
-        return self._cache.get(secid)
+        """拿完整缓存条目（含 last_close / change_pct / staleness）。优先走缓存；缺失穿透。"""
+        return await self._get_entry(secid)
 
     # ----------------------------------------------------------------
     # 公共 API：批量（缓存优先；并发拉缺失项）
@@ -175,11 +264,10 @@ class QuoteService:
         unique_secids: List[str] = list(dict.fromkeys(secids))
 
         # 1) 缓存命中
-        now = time.time()
         misses: List[str] = []
         for secid in unique_secids:
-            entry = self._cache.get(secid)
-            if entry is not None and (now - entry.fetched_at) < QUOTE_CACHE_TTL:
+            entry = self._lookup(secid)
+            if entry is not None:
                 result[secid] = entry.price
                 self._hits += 1
             else:
@@ -205,8 +293,65 @@ class QuoteService:
         """
         if not secids:
             return {}
-        await self.get_quotes_batch(secids)
-        return {s: self._cache.get(s) for s in secids}
+        unique_secids: List[str] = list(dict.fromkeys(secids))
+        entries = await asyncio.gather(*(self._get_entry(s) for s in unique_secids), return_exceptions=True)
+        found: Dict[str, Optional[QuoteCacheEntry]] = {}
+        for secid, item in zip(unique_secids, entries):
+            if isinstance(item, BaseException):
+                logger.debug(f"[PaperTrade][Quote] secid={secid} failed: {item}")
+                found[secid] = None
+            else:
+                found[secid] = item
+        return {s: found.get(s) for s in secids}
+
+    # ----------------------------------------------------------------
+    # 公共 API：后台刷新持仓
+    # ----------------------------------------------------------------
+    async def refresh_held(self, secids: Iterable[str], interval: float = QUOTE_CACHE_TTL) -> int:
+        """把 ``secids`` 设为常驻集合并逐只重拉（不看 TTL）；返回拿到价格的只数。
+
+        由 ``quote_refresh`` 定时任务传入所有账户持仓的并集和刷新间隔（秒）；常驻
+        报价最多被复用 ``QUOTE_HELD_STALENESS_FACTOR × interval`` 秒。清仓后不再
+        出现的 secid 退出常驻，之后照常参与 LRU 淘汰。单只失败保留上一条有效报价。
+        """
+        held = frozenset(s for s in secids if s)
+        self._held = held
+        self._held_max_staleness = max(QUOTE_CACHE_TTL, QUOTE_HELD_STALENESS_FACTOR * interval)
+        return len(await self.refresh(held))
+
+    async def refresh(self, secids: Iterable[str]) -> Dict[str, QuoteCacheEntry]:
+        """不看 TTL 强制重拉一批 secid，返回这次新拉到价格的条目；不动常驻集合。
+
+        收盘快照要拿收盘价就走这里，而不是 ``refresh_held``（那会把常驻集合换成
+        收盘后的这批）。单只失败保留上一条有效报价，但不计入返回值。
+        """
+        unique = list(dict.fromkeys(s for s in secids if s))
+        if not unique:
+            return {}
+        sem = asyncio.Semaphore(QUOTE_REFRESH_CONCURRENCY)
+
+        async def _one(secid: str) -> Optional[QuoteCacheEntry]:
+            async with sem:
+                async with self._key_lock(secid):
+                    before = self._cache.get(secid)
+                    entry = await self._fetch_and_store(secid, keep_last_good=True)
+                    return entry if entry is not before and entry.price is not None else None
+
+        done = await asyncio.gather(*(_one(s) for s in unique), return_exceptions=True)
+        return {secid: entry for secid, entry in zip(unique, done) if isinstance(entry, QuoteCacheEntry)}
+
+    def release_held(self) -> None:
+        """清空常驻集合：刷新任务关闭 / 不在交易时段时调用，之后按普通 TTL 读。"""
+        self._held = frozenset()
+
+    def held_quotes(self) -> Dict[str, QuoteCacheEntry]:
+        """常驻持仓里已拉到价格的条目（供刷新后批量写回 DB）。"""
+        held: Dict[str, QuoteCacheEntry] = {}
+        for secid in self._held:
+            entry = self._cache.get(secid)
+            if entry is not None and entry.price is not None:
+                held[secid] = entry
+        return held
 
     # ----------------------------------------------------------------
     # 内部：单次 HTTP
@@ -250,7 +395,14 @@ class QuoteService:
             self._cache.pop(secid, None)
 
     def stats(self) -> Dict[str, int]:
-        return {"hits": self._hits, "misses": self._misses, "cached_keys": len(self._cache)}
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "cached_keys": len(self._cache),
+            "held_keys": len(self._held),
+            "lock_keys": len(self._locks),
+            "evictions": self._evictions,
+        }
 
 
 # ============================================================
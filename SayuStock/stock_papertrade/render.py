@@ -7,12 +7,13 @@ from dataclasses import dataclass
 
 from PIL import Image, ImageDraw, ImageFont
 
-from gsuid_core.utils.fonts.fonts import core_font as ss_font
 from gsuid_core.utils.image.convert import convert_img
 
 from . import db
 from ..utils.image import get_footer
 from ..utils.market import get_market, is_market_error, board_rows_to_items
+from ..utils.render_assets import FOOTER_PATH, font, stamp, texture, static_layer, texture_copy
+from ..stock_info.draw_my_info import draw_index_tile
 
 # 与「我的自选」共用纹理（涨跌条 / 标题情绪图）
 _MY_STOCK_TEX = Path(__file__).resolve().parent.parent / "stock_info" / "texture2d"
@@ -34,7 +35,7 @@ _DIFF_MAP: dict[float, str] = {
 # 工具
 # ============================================================
 def _font(size: int = 22) -> ImageFont.FreeTypeFont:
-    return ss_font(size)
+    return font(size)
 
 
 def _new_canvas(w: int, h: int) -> Image.Image:
@@ -238,13 +239,13 @@ def _draw_holding_bar(row: HoldingBarRow) -> Image.Image:
         paint = day
 
     if paint > 0:
-        bar = Image.open(_MY_STOCK_TEX / "myup.png")
+        bar = texture_copy(_MY_STOCK_TEX / "myup.png")
         sub_color = (213, 102, 102)
     elif paint == 0:
-        bar = Image.open(_MY_STOCK_TEX / "myeq.png")
+        bar = texture_copy(_MY_STOCK_TEX / "myeq.png")
         sub_color = (240, 240, 240)
     else:
-        bar = Image.open(_MY_STOCK_TEX / "mydown.png")
+        bar = texture_copy(_MY_STOCK_TEX / "mydown.png")
         sub_color = (175, 231, 170)
 
     b_title = (row.name or row.code).split(" (")[0]
@@ -259,13 +260,13 @@ def _draw_holding_bar(row: HoldingBarRow) -> Image.Image:
     hold_label = f"持{row.unrealized_pnl_pct:+.2f}%"
 
     draw = ImageDraw.Draw(bar)
-    title_font = ss_font(32)
-    sub_font = ss_font(18)
+    title_font = font(32)
+    sub_font = font(18)
     draw.text((82, 40), _fit_text(draw, b_title, title_font, 420), (255, 255, 255), title_font, "lm")
     draw.text((82, 75), _fit_text(draw, s_title, sub_font, 430), sub_color, sub_font, "lm")
     # 中间：持仓收益（相对成本）；右侧：今日涨跌（相对昨收）
-    draw.text((580, 55), hold_label, (240, 240, 240), ss_font(26), "mm")
-    draw.text((758, 55), day_label, (255, 255, 255), ss_font(26), "mm")
+    draw.text((580, 55), hold_label, (240, 240, 240), font(26), "mm")
+    draw.text((758, 55), day_label, (255, 255, 255), font(26), "mm")
     return bar
 
 
@@ -287,6 +288,16 @@ def _holdings_layout(n_rows: int) -> tuple[int, int, int]:
     return body_h, bar5_y, rows_y0
 
 
+def _holdings_background(body_h: int, bar5_y: int) -> Image.Image:
+    """持仓简图静态底图：底色 +「我的持仓」banner（摘要下方）+ footer，按画布高度缓存。"""
+    img = Image.new("RGBA", (900, body_h), (7, 9, 27))
+    bar5_path = _MY_STOCK_TEX / "bar5.png"
+    if bar5_path.is_file():
+        stamp(img, texture(bar5_path), (25, bar5_y))
+    stamp(img, texture(FOOTER_PATH), (25, body_h - 55))
+    return img
+
+
 async def draw_holdings_snapshot(
     *,
     account_name: str,
@@ -301,7 +312,7 @@ async def draw_holdings_snapshot(
     """
     n = len(holdings)
     body_h, bar5_y, rows_y0 = _holdings_layout(n)
-    img = Image.new("RGBA", (900, body_h), (7, 9, 27))
+    img = static_layer(("holdings", body_h), lambda: _holdings_background(body_h, bar5_y))
 
     # —— 宽基指数（与我的自选一致，失败则跳过）——
     market = get_market()
@@ -314,24 +325,8 @@ async def draw_holdings_snapshot(
             for item in zs_items:
                 if zs_name != item.name.split("(")[0].strip() and zs_name not in item.name:
                     continue
-                diff = float(item.change_pct)
-                zs_img = Image.new("RGBA", (200, 140))
-                zs_draw = ImageDraw.Draw(zs_img)
-                if diff >= 0:
-                    zsc, zsc2 = (140, 18, 22, 55), (206, 34, 30)
-                else:
-                    zsc, zsc2 = (59, 140, 18, 55), (36, 206, 30)
-                zs_draw.rounded_rectangle((15, 13, 185, 127), 0, zsc)
-                zs_draw.text((100, 99), zs_name, (255, 255, 255), ss_font(24), "mm")
-                zs_draw.text((100, 38), f"{item.price}", zsc2, ss_font(30), "mm")
-                zs_draw.text(
-                    (100, 70),
-                    f"{'+' if diff >= 0 else ''}{diff}%",
-                    zsc2,
-                    ss_font(30),
-                    "mm",
-                )
-                img.paste(zs_img, (50 + 200 * ni, _HS_INDEX_Y), zs_img)
+                zs_img = draw_index_tile(zs_name, item.price, float(item.change_pct))
+                stamp(img, zs_img, (50 + 200 * ni, _HS_INDEX_Y))
                 ni += 1
                 break
 
@@ -348,8 +343,8 @@ async def draw_holdings_snapshot(
     summary = Image.new("RGBA", (850, _HS_SUMMARY_H), (20, 24, 48, 220))
     sd = ImageDraw.Draw(summary)
     sd.rounded_rectangle((0, 0, 849, _HS_SUMMARY_H - 1), 8, (20, 24, 48, 220))
-    head_font = ss_font(22)
-    line_font = ss_font(17)
+    head_font = font(22)
+    line_font = font(17)
     # 左右各留 20px
     max_text_w = 810
     head = _fit_text(sd, f"模拟盘持仓简图 · {account_name}", head_font, max_text_w)
@@ -370,34 +365,24 @@ async def draw_holdings_snapshot(
     sd.text((20, 18), head, (255, 210, 120), head_font, "lm")
     sd.text((20, 50), line1, (220, 220, 230), line_font, "lm")
     sd.text((20, 76), line2, (200, 210, 220), line_font, "lm")
-    img.paste(summary, (25, _HS_SUMMARY_Y), summary)
+    stamp(img, summary, (25, _HS_SUMMARY_Y))
 
     # —— 标题情绪图（按持仓等权日均涨跌）——
     title_num = _title_num_for_avg(avg_day)
     title_path = _MY_STOCK_TEX / f"title{title_num}.png"
     if title_path.is_file():
-        title = Image.open(title_path)
-        img.paste(title, (25, -31), title)
-
-    # —— 「我的持仓」banner：必须在摘要下方，持仓条再在其下 ——
-    bar5_path = _MY_STOCK_TEX / "bar5.png"
-    if bar5_path.is_file():
-        bar5 = Image.open(bar5_path)
-        img.paste(bar5, (25, bar5_y), bar5)
+        stamp(img, texture(title_path), (25, -31))
 
     # —— 持仓条 ——
     if not holdings:
         empty = Image.new("RGBA", (850, 90), (30, 30, 40, 200))
         ed = ImageDraw.Draw(empty)
-        ed.text((425, 45), "（当前无持仓）", (160, 160, 170), ss_font(28), "mm")
-        img.paste(empty, (25, rows_y0), empty)
+        ed.text((425, 45), "（当前无持仓）", (160, 160, 170), font(28), "mm")
+        stamp(img, empty, (25, rows_y0))
     else:
         for i, row in enumerate(holdings):
-            bar = _draw_holding_bar(row)
-            img.paste(bar, (0, rows_y0 + i * _HS_ROW_H), bar)
+            stamp(img, _draw_holding_bar(row), (0, rows_y0 + i * _HS_ROW_H))
 
-    footer = get_footer()
-    img.paste(footer, (25, img.size[1] - 55), footer)
     return await convert_img(img)
 
 
@@ -480,7 +465,7 @@ async def build_holdings_snapshot_image(account_id: int) -> bytes | str:
 # ============================================================
 async def draw_leaderboard() -> bytes:
     snaps = await db.PaperSnapshotRepo.list_latest_all_accounts(limit=20)
-    # 快照里只有 account_id，盘名要另查；一次拉全表比逐行查库省往返
+    # 物化行里只有 account_id，盘名要另查；一次拉全表比逐行查库省往返
     accounts = {a.id: a for a in await db.PaperAccountRepo.list_all()}
 
     W, H = 900, 100 + 60 * (len(snaps) + 1)
@@ -500,11 +485,12 @@ async def draw_leaderboard() -> bytes:
     _draw_text(img, (250, y), "总资产", color=(180, 180, 180), size=18)
     _draw_text(img, (400, y), "累计盈亏", color=(180, 180, 180), size=18)
     _draw_text(img, (600, y), "收益率", color=(180, 180, 180), size=18)
+    _draw_text(img, (740, y), "最大回撤", color=(180, 180, 180), size=18)
     y += 35
 
-    for i, s in enumerate(snaps, 1):
+    for s in snaps:
         pnl_color = (100, 255, 120) if s.total_pnl >= 0 else (255, 120, 120)
-        _draw_text(img, (40, y), f"#{i}", color=(220, 220, 220), size=20)
+        _draw_text(img, (40, y), f"#{s.rank}", color=(220, 220, 220), size=20)
         acc_row = accounts.get(s.account_id)
         label = acc_row.name if acc_row is not None else f"#{s.account_id}"
         _draw_text(img, (100, y), label[:30], color=(220, 220, 220), size=20)
@@ -517,6 +503,7 @@ async def draw_leaderboard() -> bytes:
             color=pnl_color,
             size=22,
         )
+        _draw_text(img, (740, y), f"{s.max_drawdown_pct:.2f}%", color=(220, 220, 220), size=20)
         y += 32
 
     img = _paste_footer(img)
@@ -28,6 +28,7 @@ BOOK_WRITE_TOOLS: tuple[str, ...] = (
     "papertrade_trade_insert",
     "papertrade_position_upsert",
     "papertrade_match_order",
+    "papertrade_order_batch",
     "papertrade_candidate_refresh",
 )
 
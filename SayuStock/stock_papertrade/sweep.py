@@ -0,0 +1,225 @@
+"""模拟盘策略离线调参：参数空间展开 + 多进程回测 + 可续跑结果表。
+
+- 参数空间：:func:`grid` 笛卡尔积展开，:func:`random_space` 按区间 / 候选随机抽样；
+- 执行：每组参数跑一次 :func:`backtest.run_backtest`，``ProcessPoolExecutor`` 分发；
+  K 线面板先落成临时目录里的 ``.npy``，worker 启动时 ``np.load(mmap_mode="r")``
+  只读映射，各进程共享同一份页缓存，不按任务 pickle 整张面板；
+- 结果：每跑完一组就往 CSV 追加一行（``combo_id`` + 参数 JSON + 排行指标）。
+  中途中断后用同一个输出文件重跑，已完成的 ``combo_id`` 直接跳过。
+"""
+
+from __future__ import annotations
+
+import os
+import json
+import random
+import hashlib
+import tempfile
+import itertools
+from typing import Any, Dict, List, Tuple, Mapping, Optional, Sequence
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from gsuid_core.logger import logger
+
+from .backtest import BarPanel, run_backtest
+
+__all__ = [
+    "grid",
+    "random_space",
+    "combo_id",
+    "share_panel",
+    "open_shared_panel",
+    "load_results",
+    "run_sweep",
+]
+
+_FIELDS = ("open", "high", "low", "close", "volume", "turnover")
+
+# worker 进程里映射好的面板（initializer 设置，一个进程只打开一次）
+_PANEL: Optional[BarPanel] = None
+
+
+# ============================================================
+# 参数空间
+# ============================================================
+def grid(space: Mapping[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """笛卡尔积展开：``{"lookback_m": [40, 60], "bottom_pct": [0.1, 0.15]}`` → 4 组。"""
+    keys = list(space)
+    return [dict(zip(keys, values)) for values in itertools.product(*(space[k] for k in keys))]
+
+
+def random_space(space: Mapping[str, Any], n: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """随机抽 n 组：``(lo, hi)`` 元组按区间均匀抽（两端都是 int 则抽整数），列表按候选等概率抽。"""
+    rng = random.Random(seed)
+    out: List[Dict[str, Any]] = []
+    for _ in range(n):
+        combo: Dict[str, Any] = {}
+        for key, spec in space.items():
+            if isinstance(spec, tuple):
+                lo, hi = spec
+                if isinstance(lo, int) and isinstance(hi, int):
+                    combo[key] = rng.randint(lo, hi)
+                else:
+                    combo[key] = round(rng.uniform(float(lo), float(hi)), 4)
+            else:
+                combo[key] = rng.choice(list(spec))
+        out.append(combo)
+    return out
+
+
+def combo_id(strategy_id: str, mode: str, params: Mapping[str, Any]) -> str:
+    """一组参数的稳定指纹（续跑时判断是否已跑过）。"""
+    raw = json.dumps({"strategy": strategy_id, "mode": mode, "params": params}, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:12]
+
+
+# ============================================================
+# 只读共享面板
+# ============================================================
+def share_panel(panel: BarPanel, directory: Path | str) -> Path:
+    """把面板各字段和时间索引写成 ``.npy``，代码 / 股票名写进 ``meta.json``。"""
+    root = Path(directory)
+    root.mkdir(parents=True, exist_ok=True)
+    for name in _FIELDS:
+        frame: Optional[pd.DataFrame] = getattr(panel, name)
+        if frame is not None:
+            np.save(root / f"{name}.npy", frame.to_numpy(dtype=np.float64))
+    np.save(root / "dates.npy", panel.dates.to_numpy(dtype="datetime64[ns]"))
+    meta = {"codes": panel.codes, "names": panel.names}
+    (root / "meta.json").write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+    return root
+
+
+def open_shared_panel(directory: Path | str) -> BarPanel:
+    """只读映射 :func:`share_panel` 写出的目录，各宽表直接包在 memmap 上，不复制。"""
+    root = Path(directory)
+    meta = json.loads((root / "meta.json").read_text(encoding="utf-8"))
+    index = pd.DatetimeIndex(np.load(root / "dates.npy"))
+    columns = pd.Index(meta["codes"])
+
+    def _frame(name: str) -> pd.DataFrame:
+        return pd.DataFrame(np.load(root / f"{name}.npy", mmap_mode="r"), index=index, columns=columns, copy=False)
+
+    return BarPanel(
+        open=_frame("open"),
+        high=_frame("high"),
+        low=_frame("low"),
+        close=_frame("close"),
+        volume=_frame("volume"),
+        turnover=_frame("turnover") if (root / "turnover.npy").exists() else None,
+        names=dict(meta["names"]),
+    )
+
+
+def _init_worker(directory: str) -> None:
+    global _PANEL
+    _PANEL = open_shared_panel(directory)
+
+
+def _run_one(
+    cid: str,
+    strategy_id: str,
+    mode: str,
+    params: Dict[str, Any],
+    initial_cash: float,
+) -> Dict[str, Any]:
+    assert _PANEL is not None, "worker 未初始化共享面板"
+    result = run_backtest(_PANEL, strategy_id, params, mode=mode, initial_cash=initial_cash)
+    return {
+        "combo_id": cid,
+        "strategy_id": result.strategy_id,
+        "mode": mode,
+        "params": json.dumps(params, sort_keys=True, ensure_ascii=False, default=str),
+        **result.metrics(),
+    }
+
+
+# ============================================================
+# 结果表
+# ============================================================
+def load_results(path: Path | str) -> pd.DataFrame:
+    """读结果表；文件不存在返回空表。"""
+    path = Path(path)
+    if not path.exists() or path.stat().st_size == 0:
+        return pd.DataFrame(columns=["combo_id", "strategy_id", "mode", "params"])
+    return pd.read_csv(path, dtype={"combo_id": str})
+
+
+def _append(path: Path, row: Dict[str, Any]) -> None:
+    pd.DataFrame([row]).to_csv(path, mode="a", header=not path.exists() or path.stat().st_size == 0, index=False)
+
+
+def run_sweep(
+    panel: BarPanel,
+    strategy_id: str,
+    combos: Sequence[Mapping[str, Any]],
+    out_path: Path | str,
+    *,
+    mode: str = "balanced",
+    workers: Optional[int] = None,
+    initial_cash: float = 1_000_000.0,
+) -> pd.DataFrame:
+    """逐组回测并把结果追加到 ``out_path``，返回按 ``total_pnl_pct`` 降序的完整结果表。
+
+    Args:
+        panel: 回测面板，只在主进程落盘一次。
+        strategy_id: 策略 id。
+        combos: 参数组（:func:`grid` / :func:`random_space` 的输出）。
+        out_path: 结果 CSV；已存在时跳过其中已有的 ``combo_id``（续跑）。
+        mode: 风控模式。
+        workers: 进程数，默认 CPU 核数；1 则在当前进程里顺序跑（同样走 memmap 面板）。
+        initial_cash: 期初本金。
+    """
+    global _PANEL
+    out = Path(out_path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    done = set(load_results(out)["combo_id"].astype(str))
+    todo: List[Tuple[str, Dict[str, Any]]] = []
+    for combo in combos:
+        cid = combo_id(strategy_id, mode, combo)
+        if cid not in done:
+            done.add(cid)
+            todo.append((cid, dict(combo)))
+    if not todo:
+        return _ranked(load_results(out))
+
+    workers = workers or os.cpu_count() or 1
+    # Windows 下 memmap 未释放时删不掉临时文件，清理失败不影响结果
+    with tempfile.TemporaryDirectory(prefix="sayu_sweep_", ignore_cleanup_errors=True) as tmp:
+        share_panel(panel, tmp)
+        if workers == 1:
+            _init_worker(tmp)
+            try:
+                for cid, params in todo:
+                    try:
+                        row = _run_one(cid, strategy_id, mode, params, initial_cash)
+                    except Exception as e:
+                        logger.warning(f"[SayuStock][PaperTrade] 调参回测失败 {params}: {e}")
+                        continue
+                    _append(out, row)
+            finally:
+                _PANEL = None
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(tmp,)) as pool:
+                futures = {
+                    pool.submit(_run_one, cid, strategy_id, mode, params, initial_cash): params for cid, params in todo
+                }
+                for future in as_completed(futures):
+                    try:
+                        row = future.result()
+                    except Exception as e:
+                        # 失败的组不落表，下次续跑会重试
+                        logger.warning(f"[SayuStock][PaperTrade] 调参回测失败 {futures[future]}: {e}")
+                        continue
+                    _append(out, row)
+    return _ranked(load_results(out))
+
+
+def _ranked(table: pd.DataFrame) -> pd.DataFrame:
+    if table.empty or "total_pnl_pct" not in table.columns:
+        return table
+    return table.sort_values("total_pnl_pct", ascending=False, ignore_index=True)
@@ -14,18 +14,22 @@
   ``match``           → 定价 / 校验（返回 :class:`MatchResult`）
   ``record_trade``    → 写成交流水 + 维护现金（返回 :class:`RecordResult`）
   ``update_position`` → 落持仓（返回 position id）
+
+一次决策要下好几笔时用 ``execute_batch``：基类实现就是逐笔走上面三步；
+``PaperTradeExecutor`` 覆写成一次批量报价 + 内存里按顺序撮合（现金 / 持仓 / T+1
+逐笔滚动）+ 一个事务落库，结果与逐笔路径一致。
 """
 
 import datetime as _dt
 from abc import ABC, abstractmethod
-from typing import Optional
-from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple, Optional, Sequence
+from dataclasses import field, dataclass
 
 from gsuid_core.logger import logger as _gslogger
 
-from . import db
-from .matcher import MatchResult, match_order as _match_order
-from .quote_service import quote_service
+from . import db, valuation
+from .matcher import MatchResult, match_order as _match_order, calc_new_avg_cost, calc_realized_pnl
+from .quote_service import QuoteCacheEntry, quote_service
 from .trading_calendar import trading_day_summary, should_run_papertrade
 
 
@@ -42,6 +46,35 @@ class RecordResult:
     message: str = ""
 
 
+@dataclass(slots=True)
+class OrderRequest:
+    """批量下单里的一笔单（``execute_batch`` 的入参）。"""
+
+    side: str
+    stock_code: str
+    qty: int
+    stock_name: str = ""
+    # 参考价：实际成交永远按实时价，偏差写进撮合 reason
+    price: float = 0.0
+    reason: str = ""
+    snapshot: str = ""
+    decision_id: int = 0
+
+
+@dataclass(slots=True)
+class OrderOutcome:
+    """批量下单里一笔单的结果：撮合 + 落库 + 成交后的持仓。"""
+
+    order: OrderRequest
+    match: MatchResult
+    record: RecordResult = field(default_factory=lambda: RecordResult(ok=False))
+    realized_pnl: float = 0.0
+    # 成交后该股持仓（没成交时是原持仓）
+    position_qty: int = 0
+    avg_cost: float = 0.0
+    position_id: int = 0
+
+
 def _reject_match(side: str, code: str, qty: int, reason: str) -> MatchResult:
     """构造一个 ok=False 的撮合结果（价格/费用全 0）。"""
     return MatchResult(
@@ -59,6 +92,116 @@ def _reject_match(side: str, code: str, qty: int, reason: str) -> MatchResult:
     )
 
 
+# ============================================================
+# 撮合 / 记账口径（逐笔与批量共用）
+# ============================================================
+def _secid_of(stock_code: str) -> str:
+    # secid 格式：沪市(6开头) → "1.xxxxxx"；深市/北交所 → "0.xxxxxx"
+    return f"1.{stock_code}" if stock_code.startswith("6") else f"0.{stock_code}"
+
+
+def _today_cn() -> _dt.date:
+    # 用东八区当天日期（系统时钟如果漂移到 UTC，sell 拦截可能误判）
+    try:
+        from zoneinfo import ZoneInfo
+
+        return _dt.datetime.now(ZoneInfo("Asia/Shanghai")).date()
+    except Exception:
+        return _dt.date.today()
+
+
+def _off_hours_reason() -> str:
+    _, _, desc = trading_day_summary()
+    return f"非交易时段拒绝撮合（{desc}）——真实市场此刻无法成交，请改 hold 等开盘"
+
+
+def _match_live(
+    *,
+    side: str,
+    stock_code: str,
+    qty: int,
+    price: float,
+    cash_available: float,
+    position_qty: int,
+    entry: Optional[QuoteCacheEntry],
+) -> MatchResult:
+    """按一条实时行情撮合：行情不可达拒单，参考价偏差写进 reason。"""
+    live_price = entry.price if entry is not None else None
+    if entry is None or live_price is None or live_price <= 0:
+        return _reject_match(
+            side,
+            stock_code,
+            qty,
+            f"实时行情不可达（{stock_code}），拒绝撮合——不允许按参考价/旧价成交，请稍后重试或改 hold",
+        )
+
+    # ── 参考价偏差提示：LLM 传的旧价与实时价差过大时写进 reason 提醒 ──
+    deviation_note: str = ""
+    if price and price > 0:
+        dev_pct: float = (live_price - price) / price * 100.0
+        if abs(dev_pct) >= 0.5:
+            deviation_note = f"按实时价 {live_price:.2f} 成交（参考价 {price:.2f} 已过时，偏差 {dev_pct:+.2f}%）"
+
+    res = _match_order(
+        side=side,
+        code=stock_code,
+        qty=qty,
+        price=live_price,
+        cash_available=cash_available,
+        position_qty=position_qty,
+        last_close=entry.last_close,
+        change_pct=entry.change_pct,
+        name=entry.name,  # f57 名称，含 ST/*ST 前缀，供撮合层判风险警示股
+    )
+    if res.ok and deviation_note:
+        res.reason = deviation_note if not res.reason else f"{res.reason}；{deviation_note}"
+    return res
+
+
+def settle_fill(
+    side: str, qty: int, price: float, fee: float, held_qty: int, held_avg: float
+) -> Tuple[float, int, float]:
+    """一笔成交后的 ``(realized_pnl, 新持仓股数, 新均价)``。
+
+    buy 按 ``calc_new_avg_cost`` 加权（买费计入成本）；sell 按 ``calc_realized_pnl``
+    记已实现盈亏，均价不变，清仓时归零。
+    """
+    if side == "buy":
+        return 0.0, held_qty + qty, calc_new_avg_cost(held_qty, held_avg, qty, price, fee)
+    remaining = held_qty - qty
+    return calc_realized_pnl(held_avg, qty, price, fee), remaining, held_avg if remaining > 0 else 0.0
+
+
+def _cash_delta(side: str, amount: float, fee: float, realized_pnl: float) -> float:
+    return -(amount + fee) if side == "buy" else (amount - fee + realized_pnl)
+
+
+def _recorded(trade_id: int, side: str, amount: float, fee: float, realized_pnl: float) -> RecordResult:
+    """落库成功的 RecordResult（message 带现金公式，给 LLM 对账）。"""
+    cash_delta = _cash_delta(side, amount, fee, realized_pnl)
+    if side == "buy":
+        formula: str = "buy: cash -= amount+fee"
+    else:
+        formula = "sell: cash += amount-fee+realized_pnl, principal += realized_pnl"
+    return RecordResult(
+        ok=True,
+        trade_id=trade_id,
+        cash_delta=cash_delta,
+        message=f"ok trade_id={trade_id}  cash_delta={cash_delta:+,.2f}  ({formula})",
+    )
+
+
+def _t1_blocked(stock_code: str, stock_name: str, locked_qty: int) -> RecordResult:
+    return RecordResult(
+        ok=False,
+        message=(
+            f"⚠️ A 股 T+1 拦截：{stock_code} {stock_name or ''}今天已买入 "
+            f"{locked_qty} 股，按 A 股结算规则需留仓到下一交易日开盘前才可卖；"
+            f"请改 hold，或换一只非今天买入的标的卖。"
+        ),
+    )
+
+
 # ============================================================
 # 抽象接口
 # ============================================================
@@ -118,6 +261,75 @@ class TradeExecutor(ABC):
         """落持仓（qty=0 时删除记录），返回 position id（无则 0）。"""
         ...
 
+    async def execute_batch(
+        self,
+        account_id: int,
+        orders: Sequence[OrderRequest],
+        *,
+        mode: str = "balanced",
+    ) -> List[OrderOutcome]:
+        """按顺序执行一批单：逐笔 ``match`` → ``record_trade`` → ``update_position``。
+
+        每笔前重新读现金 / 持仓，前一笔的成交会影响后一笔的可用现金与可卖股数；
+        某笔被拒不影响后续。已实现盈亏与新均价按 :func:`settle_fill` 计算。
+        后端可以覆写成批量实现，但结果必须与这条逐笔路径一致。
+        """
+        out: List[OrderOutcome] = []
+        for order in orders:
+            acc = await db.PaperAccountRepo.get_by_id(account_id)
+            held = await db.PaperPositionRepo.get(account_id, order.stock_code)
+            held_qty = held.qty if held is not None else 0
+            held_avg = held.avg_cost if held is not None else 0.0
+            res = await self.match(
+                side=order.side,
+                stock_code=order.stock_code,
+                qty=order.qty,
+                price=order.price,
+                cash_available=acc.cash if acc is not None else 0.0,
+                position_qty=held_qty,
+            )
+            outcome = OrderOutcome(order=order, match=res, position_qty=held_qty, avg_cost=held_avg)
+            out.append(outcome)
+            if not res.ok:
+                outcome.record = RecordResult(ok=False, message=res.reason)
+                continue
+
+            stock_name = order.stock_name or (held.stock_name if held is not None else "")
+            realized_pnl, new_qty, new_avg = settle_fill(
+                res.side, res.actual_qty, res.price, res.fee_total, held_qty, held_avg
+            )
+            outcome.record = await self.record_trade(
+                account_id=account_id,
+                stock_code=order.stock_code,
+                stock_name=stock_name,
+                secid=_secid_of(order.stock_code),
+                side=res.side,
+                price=res.price,
+                qty=res.actual_qty,
+                amount=res.amount,
+                fee=res.fee_total,
+                realized_pnl=realized_pnl,
+                reason=order.reason,
+                snapshot=order.snapshot,
+                decision_id=order.decision_id,
+                mode=mode,
+            )
+            if not outcome.record.ok:
+                continue
+            outcome.position_id = await self.update_position(
+                account_id=account_id,
+                stock_code=order.stock_code,
+                stock_name=stock_name,
+                secid=_secid_of(order.stock_code),
+                qty=new_qty,
+                avg_cost=new_avg,
+                last_quote_price=res.price,
+            )
+            outcome.realized_pnl = realized_pnl
+            outcome.position_qty = new_qty
+            outcome.avg_cost = new_avg
+        return out
+
 
 # ============================================================
 # 模拟盘实现（现有逻辑）
@@ -139,60 +351,24 @@ class PaperTradeExecutor(TradeExecutor):
     ) -> MatchResult:
         # ── 交易时段守卫：非交易日 / 非交易时段一律拒单 ──
         if not should_run_papertrade():
-            _, _, desc = trading_day_summary()
-            return _reject_match(
-                side,
-                stock_code,
-                qty,
-                f"非交易时段拒绝撮合（{desc}）——真实市场此刻无法成交，请改 hold 等开盘",
-            )
+            return _reject_match(side, stock_code, qty, _off_hours_reason())
 
         # ── 拉实时行情：成交价 + 昨收 + 涨跌幅 + 名称（涨跌停 / ST 拦截用） ──
-        live_price: Optional[float] = None
-        last_close: Optional[float] = None
-        change_pct: Optional[float] = None
-        name: Optional[str] = None
+        entry: Optional[QuoteCacheEntry] = None
         try:
-            # secid 格式：沪市(6开头) → "1.xxxxxx"；深市/北交所 → "0.xxxxxx"
-            secid = f"1.{stock_code}" if stock_code.startswith("6") else f"0.{stock_code}"
-            entry = await quote_service.get_quote_detail(secid)
-            if entry is not None:
-                live_price = entry.price
-                last_close = entry.last_close
-                change_pct = entry.change_pct
-                name = entry.name  # f57 名称，含 ST/*ST 前缀，供撮合层判风险警示股
+            entry = await quote_service.get_quote_detail(_secid_of(stock_code))
         except Exception as e:
             _gslogger.debug(f"[SayuStock][PaperTrade] match_quote_fetch failed stock={stock_code}: {e}")
 
-        if live_price is None or live_price <= 0:
-            return _reject_match(
-                side,
-                stock_code,
-                qty,
-                f"实时行情不可达（{stock_code}），拒绝撮合——不允许按参考价/旧价成交，请稍后重试或改 hold",
-            )
-
-        # ── 参考价偏差提示：LLM 传的旧价与实时价差过大时写进 reason 提醒 ──
-        deviation_note: str = ""
-        if price and price > 0:
-            dev_pct: float = (live_price - price) / price * 100.0
-            if abs(dev_pct) >= 0.5:
-                deviation_note = f"按实时价 {live_price:.2f} 成交（参考价 {price:.2f} 已过时，偏差 {dev_pct:+.2f}%）"
-
-        res = _match_order(
+        return _match_live(
             side=side,
-            code=stock_code,
+            stock_code=stock_code,
             qty=qty,
-            price=live_price,
+            price=price,
             cash_available=cash_available,
             position_qty=position_qty,
-            last_close=last_close,
-            change_pct=change_pct,
-            name=name,
+            entry=entry,
         )
-        if res.ok and deviation_note:
-            res.reason = deviation_note if not res.reason else f"{res.reason}；{deviation_note}"
-        return res
 
     async def record_trade(
         self,
@@ -214,8 +390,7 @@ class PaperTradeExecutor(TradeExecutor):
     ) -> RecordResult:
         # ── 实时价偏差校验：拦截"按候选池入池旧价成交"的失真流水 ──
         try:
-            _secid = f"1.{stock_code}" if stock_code.startswith("6") else f"0.{stock_code}"
-            _live: Optional[float] = await quote_service.get_quote(_secid)
+            _live: Optional[float] = await quote_service.get_quote(_secid_of(stock_code))
         except Exception:
             _live = None
         if _live is not None and _live > 0 and price > 0:
@@ -232,26 +407,12 @@ class PaperTradeExecutor(TradeExecutor):
 
         # ── A 股 T+1 拦截 ──
         if side == "sell":
-            # 用东八区当天日期（系统时钟如果漂移到 UTC，sell 拦截可能误判）
-            try:
-                from zoneinfo import ZoneInfo
-
-                today_cn = _dt.datetime.now(ZoneInfo("Asia/Shanghai")).date()
-            except Exception:
-                today_cn = _dt.date.today()
             try:
-                locked_qty: int = await db.PaperTradeRepo.locked_qty_today(account_id, stock_code, today=today_cn)
+                locked_qty: int = await db.PaperTradeRepo.locked_qty_today(account_id, stock_code, today=_today_cn())
             except Exception:
                 locked_qty = 0  # 防御：DB 异常不要阻塞 sell，让撮合层兜底
             if locked_qty > 0:
-                return RecordResult(
-                    ok=False,
-                    message=(
-                        f"⚠️ A 股 T+1 拦截：{stock_code} {stock_name or ''}今天已买入 "
-                        f"{locked_qty} 股，按 A 股结算规则需留仓到下一交易日开盘前才可卖；"
-                        f"请改 hold，或换一只非今天买入的标的卖。"
-                    ),
-                )
+                return _t1_blocked(stock_code, stock_name, locked_qty)
 
         try:
             t = await db.PaperTradeRepo.append_with_cash_update(
@@ -274,17 +435,9 @@ class PaperTradeExecutor(TradeExecutor):
             # side 非法 / 账户不存在——不写库，明示错误给 LLM
             return RecordResult(ok=False, message=f"⚠️ trade_insert 失败: {e}")
 
-        cash_delta: float = -(amount + fee) if side == "buy" else (amount - fee + realized_pnl)
-        if side == "buy":
-            formula: str = "buy: cash -= amount+fee"
-        else:
-            formula = "sell: cash += amount-fee+realized_pnl, principal += realized_pnl"
-        return RecordResult(
-            ok=True,
-            trade_id=t.id,
-            cash_delta=cash_delta,
-            message=f"ok trade_id={t.id}  cash_delta={cash_delta:+,.2f}  ({formula})",
-        )
+        # 现金变了：本轮已算好的估值作废（持仓随后由 update_position 落库，同样会失效一次）
+        valuation.invalidate(account_id)
+        return _recorded(t.id or 0, side, amount, fee, realized_pnl)
 
     async def update_position(
         self,
@@ -307,8 +460,136 @@ class PaperTradeExecutor(TradeExecutor):
             last_quote_price=last_quote_price if last_quote_price > 0 else None,
             last_quote_at=_dt.datetime.now() if last_quote_price and last_quote_price > 0 else None,
         )
+        valuation.invalidate(account_id)
         return p.id if p else 0
 
+    async def execute_batch(
+        self,
+        account_id: int,
+        orders: Sequence[OrderRequest],
+        *,
+        mode: str = "balanced",
+    ) -> List[OrderOutcome]:
+        """批量版：读一次账户 / 持仓 / T+1 锁定、批量拉一次行情，内存里按顺序撮合，一个事务落库。
+
+        与基类逐笔路径的差别只在 I/O：交易时段只判一次，行情取同一份快照，
+        流水 + 现金 + 持仓整批原子提交（任一笔落库失败整批回滚，全部报失败）。
+        """
+        if not orders:
+            return []
+        if not should_run_papertrade():
+            reason = _off_hours_reason()
+            return [
+                OrderOutcome(
+                    order=o,
+                    match=_reject_match(o.side, o.stock_code, o.qty, reason),
+                    record=RecordResult(ok=False, message=reason),
+                )
+                for o in orders
+            ]
+
+        acc = await db.PaperAccountRepo.get_by_id(account_id)
+        if acc is None:
+            # 账户不存在时逐笔路径各笔的拒因不同（买 → 现金不足，卖 → 落库失败），照走一遍
+            return await super().execute_batch(account_id, orders, mode=mode)
+
+        codes = list(dict.fromkeys(o.stock_code for o in orders))
+        held = {p.stock_code: p for p in await db.PaperPositionRepo.list_by_account(account_id)}
+        try:
+            entries = await quote_service.get_details_batch([_secid_of(c) for c in codes])
+        except Exception as e:
+            _gslogger.debug(f"[SayuStock][PaperTrade] batch_quote_fetch failed: {e}")
+            entries = {}
+        try:
+            locked = await db.PaperTradeRepo.locked_qty_today_many(account_id, codes, today=_today_cn())
+        except Exception:
+            locked = {}  # 防御：DB 异常不要阻塞 sell，让撮合层兜底
+
+        cash: float = acc.cash
+        book: Dict[str, Tuple[int, float, str]] = {
+            code: (p.qty, p.avg_cost, p.stock_name) for code, p in held.items() if p.qty > 0
+        }
+        out: List[OrderOutcome] = []
+        fills: List[Dict[str, Any]] = []
+        filled: List[OrderOutcome] = []
+        for order in orders:
+            code = order.stock_code
+            held_qty, held_avg, held_name = book.get(code, (0, 0.0, ""))
+            res = _match_live(
+                side=order.side,
+                stock_code=code,
+                qty=order.qty,
+                price=order.price,
+                cash_available=cash,
+                position_qty=held_qty,
+                entry=entries.get(_secid_of(code)),
+            )
+            outcome = OrderOutcome(order=order, match=res, position_qty=held_qty, avg_cost=held_avg)
+            out.append(outcome)
+            if not res.ok:
+                outcome.record = RecordResult(ok=False, message=res.reason)
+                continue
+
+            stock_name = order.stock_name or held_name
+            if res.side == "sell" and locked.get(code, 0) > 0:
+                outcome.record = _t1_blocked(code, stock_name, locked[code])
+                continue
+
+            realized_pnl, new_qty, new_avg = settle_fill(
+                res.side, res.actual_qty, res.price, res.fee_total, held_qty, held_avg
+            )
+            cash += _cash_delta(res.side, res.amount, res.fee_total, realized_pnl)
+            if new_qty > 0:
+                book[code] = (new_qty, new_avg, stock_name)
+            else:
+                # 清仓即删行：逐笔路径随后读不到持仓，名字 / 均价都从零起
+                book.pop(code, None)
+            if res.side == "buy":
+                locked[code] = locked.get(code, 0) + res.actual_qty
+            outcome.realized_pnl = realized_pnl
+            outcome.position_qty = new_qty
+            outcome.avg_cost = new_avg
+            filled.append(outcome)
+            fills.append(
+                {
+                    "stock_code": code,
+                    "stock_name": stock_name,
+                    "secid": _secid_of(code),
+                    "side": res.side,
+                    "price": res.price,
+                    "qty": res.actual_qty,
+                    "amount": res.amount,
+                    "fee": res.fee_total,
+                    "realized_pnl": realized_pnl,
+                    "reason": order.reason,
+                    "snapshot": order.snapshot,
+                    "decision_id": order.decision_id if order.decision_id > 0 else None,
+                    "mode": mode,
+                    "position_qty": new_qty,
+                    "avg_cost": new_avg,
+                }
+            )
+
+        if not fills:
+            return out
+        try:
+            written = await db.PaperTradeRepo.append_batch(account_id, fills)
+        except (ValueError, RuntimeError) as e:
+            failed = RecordResult(ok=False, message=f"⚠️ trade_insert 失败: {e}")
+            for outcome in filled:
+                before = held.get(outcome.order.stock_code)
+                outcome.record = failed
+                outcome.realized_pnl = 0.0
+                outcome.position_qty = before.qty if before is not None else 0
+                outcome.avg_cost = before.avg_cost if before is not None else 0.0
+            return out
+        valuation.invalidate(account_id)
+        for outcome, (trade, position) in zip(filled, written):
+            res = outcome.match
+            outcome.record = _recorded(trade.id or 0, res.side, res.amount, res.fee_total, outcome.realized_pnl)
+            outcome.position_id = (position.id or 0) if position is not None else 0
+        return out
+
 
 # ============================================================
 # 实盘执行桩（接入券商 API 时实现）
@@ -3,13 +3,28 @@
 - :func:`is_a_share_trading_day`  判定今天是否是 A 股交易日（拉 1.000001 上证分时）
 - :func:`is_trading_time`  判定当前是否在 9:30-11:30 / 13:00-15:00 交易时段
 - :func:`next_decision_time`  返回下一个合理决策时间（用于日志和休眠）
+- :func:`next_trading_day` / :func:`prev_trading_day` / :func:`shift_trading_days` /
+  :func:`trading_days_between`  交易日推算，走编译好的 :class:`TradingCalendar`
 
 缓存：trading_calendar.json 在 data/ 目录，每天 0 点刷新一次即可。
+
+编译日历：1990-01-01 ~ 2035-12-31 每天一位（周末 + 节假日表置 0），附前缀和与
+"下一个 / 上一个开市日"下标表，所有查询都是查表，O(1)，并且接受日期数组做向量化查询。
+开市位图按节假日表的摘要缓存成 ``papertrade_trading_calendar_<摘要>.npy``，节假日表
+一改摘要就变，自动重建。
+
+节假日表只维护了少数几年：覆盖区间里其余年份只剔除了周末，节假日会被当成交易日。
+查询落到这些年份时打一条告警（每个年份只告警一次），提醒补节假日表。
 """
 
 import json
-from typing import Tuple, Optional
-from datetime import time, datetime, timedelta
+import hashlib
+from typing import Any, Tuple, Union, Optional
+from datetime import date, time, datetime, timedelta
+from functools import lru_cache
+
+import numpy as np
+from numpy.typing import NDArray
 
 from gsuid_core.logger import logger
 
@@ -102,6 +117,199 @@ def _is_holiday(d: datetime) -> bool:
     return d.strftime("%Y-%m-%d") in _HARDCODED_HOLIDAYS_2025_2026
 
 
+# ============================================================
+# 编译日历
+# ============================================================
+CALENDAR_START = date(1990, 1, 1)
+CALENDAR_END = date(2035, 12, 31)
+_CALENDAR_NPY_PREFIX = "papertrade_trading_calendar_"
+
+DateLike = Union[date, datetime, str, np.datetime64]
+
+
+def _holiday_digest() -> str:
+    """节假日表 + 覆盖区间的摘要，作为 .npy 缓存的版本号。"""
+    raw = ",".join(sorted(_HARDCODED_HOLIDAYS_2025_2026)) + f"|{CALENDAR_START}|{CALENDAR_END}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:12]
+
+
+def _holiday_years() -> Tuple[int, int]:
+    """节假日表覆盖的年份区间（含两端）。"""
+    years = [int(d[:4]) for d in _HARDCODED_HOLIDAYS_2025_2026]
+    return min(years), max(years)
+
+
+_warned_years: set[int] = set()
+
+
+def _warn_uncovered(*ds: Any) -> None:
+    """查询日期落在节假日表覆盖年份之外时告警：那些年份只按周末判断，结果不含节假日。"""
+    days = np.concatenate([np.atleast_1d(np.asarray(d).astype("datetime64[D]")) for d in ds])
+    queried = np.unique(days[~np.isnat(days)].astype("datetime64[Y]").astype(np.int64) + 1970)
+    first, last = _holiday_years()
+    missing = [int(y) for y in queried if not first <= y <= last and int(y) not in _warned_years]
+    if missing:
+        _warned_years.update(missing)
+        logger.warning(
+            f"[SayuStock][PaperTrade] 交易日历查询到 {'、'.join(map(str, missing))} 年，"
+            f"节假日表只覆盖 {first}~{last} 年，这些年份只剔除了周末，节假日会被当成交易日"
+        )
+
+
+def _build_open_mask() -> NDArray[np.bool_]:
+    """按"工作日且不在节假日表"逐日生成开市位（与 :func:`is_a_share_trading_day` 同口径）。"""
+    days = np.arange(np.datetime64(CALENDAR_START, "D"), np.datetime64(CALENDAR_END, "D") + np.timedelta64(1, "D"))
+    # 1970-01-01 是周四：(天数 + 3) % 7 得到 Monday=0 的星期
+    weekday = (days.astype(np.int64) + 3) % 7
+    mask = weekday < 5
+    holidays = np.array(sorted(_HARDCODED_HOLIDAYS_2025_2026), dtype="datetime64[D]")
+    idx = (holidays - days[0]).astype(np.int64)
+    mask[idx[(idx >= 0) & (idx < len(days))]] = False
+    return mask
+
+
+def _load_open_mask() -> NDArray[np.bool_]:
+    """读 .npy 位图缓存；缺失 / 损坏 / 长度不符就重建并写回。"""
+    n_days = (CALENDAR_END - CALENDAR_START).days + 1
+    path = DATA_PATH / f"{_CALENDAR_NPY_PREFIX}{_holiday_digest()}.npy"
+    if path.exists():
+        try:
+            packed = np.load(path, allow_pickle=False)
+            # 先校验类型和形状再解包：unpackbits 碰到非 uint8 数组会直接抛 TypeError
+            if packed.dtype == np.uint8 and packed.shape == ((n_days + 7) // 8,):
+                return np.unpackbits(packed, count=n_days).astype(bool)
+            logger.warning(f"[SayuStock][PaperTrade] 编译日历缓存格式不符（{packed.dtype} {packed.shape}），重建")
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"[SayuStock][PaperTrade] 读取编译日历缓存失败，重建: {e}")
+    mask = _build_open_mask()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.save(path, np.packbits(mask), allow_pickle=False)
+    except OSError as e:
+        logger.warning(f"[SayuStock][PaperTrade] 写编译日历缓存失败: {e}")
+    return mask
+
+
+class TradingCalendar:
+    """编译好的 A 股交易日历：日序号位图 + 前缀和，查询全是 O(1) 查表。
+
+    下标 ``i`` 表示 ``CALENDAR_START + i`` 天。预先算好：
+
+    - ``_cum[i]``：``[0, i)`` 内的开市天数（长度 n+1）
+    - ``_open_idx[k]``：第 k 个开市日的下标
+    - ``_next[i]`` / ``_prev[i]``：``>= i`` 的第一个 / ``<= i`` 的最后一个开市日下标（没有记 -1）
+
+    所有方法同时接受单个日期（返回 Python 标量 / ``date``）和日期数组
+    （返回 ``ndarray``，日期为 ``datetime64[D]``）。超出覆盖区间抛 ``ValueError``。
+    """
+
+    def __init__(self, open_mask: NDArray[np.bool_], start: date = CALENDAR_START):
+        self.start = np.datetime64(start, "D")
+        self.open_mask = np.asarray(open_mask, dtype=bool)
+        n = len(self.open_mask)
+        self.end = self.start + np.timedelta64(n - 1, "D")
+        self._cum = np.zeros(n + 1, dtype=np.int32)
+        np.cumsum(self.open_mask, out=self._cum[1:])
+        self._open_idx = np.flatnonzero(self.open_mask).astype(np.int32)
+        self._total = len(self._open_idx)
+        # i 之前有 _cum[i] 个开市日 → >= i 的第一个开市日就是 _open_idx[_cum[i]]
+        self._next = np.append(self._open_idx, -1)[self._cum[:-1]]
+        self._prev = np.where(self._cum[1:] > 0, self._open_idx[np.maximum(self._cum[1:] - 1, 0)], -1)
+
+    # ---------------- 内部 ----------------
+    def _index(self, d: Any) -> Tuple[NDArray[np.int64], bool]:
+        """日期（或数组）→ 下标数组；第二项标记入参是不是标量。"""
+        arr = np.asarray(d)
+        if arr.dtype.kind not in "OUSM":
+            raise TypeError(f"不支持的日期类型: {arr.dtype}")
+        arr = arr.astype("datetime64[D]")
+        idx = (arr - self.start).astype(np.int64)
+        if idx.size and (idx.min() < 0 or idx.max() >= len(self.open_mask)):
+            raise ValueError(f"日期超出编译日历覆盖区间 {self.start} ~ {self.end}")
+        return idx, arr.ndim == 0
+
+    def _dates(self, idx: NDArray[np.int64], scalar: bool) -> Union[Optional[date], NDArray[np.datetime64]]:
+        """下标 → 日期；-1（越界）标量返回 None，数组里记 NaT。"""
+        out = np.where(idx >= 0, self.start + idx.astype("timedelta64[D]"), np.datetime64("NaT"))
+        if scalar:
+            return None if idx < 0 else out.item()
+        return out
+
+    # ---------------- 查询 ----------------
+    def is_open(self, d: Any) -> Union[bool, NDArray[np.bool_]]:
+        """是否开市。"""
+        idx, scalar = self._index(d)
+        out = self.open_mask[idx]
+        return bool(out) if scalar else out
+
+    def next_open(self, d: Any, include_self: bool = False) -> Any:
+        """下一个开市日；``include_self`` 时当天开市就返回当天。"""
+        idx, scalar = self._index(d)
+        start = idx if include_self else idx + 1
+        inside = start < len(self.open_mask)
+        res = np.where(inside, self._next[np.minimum(start, len(self.open_mask) - 1)], -1)
+        return self._dates(res, scalar)
+
+    def prev_open(self, d: Any, include_self: bool = False) -> Any:
+        """上一个开市日；``include_self`` 时当天开市就返回当天。"""
+        idx, scalar = self._index(d)
+        start = idx if include_self else idx - 1
+        res = np.where(start >= 0, self._prev[np.maximum(start, 0)], -1)
+        return self._dates(res, scalar)
+
+    def offset(self, d: Any, n: Any) -> Any:
+        """往后（n>0）/ 往前（n<0）数第 |n| 个开市日，不含 d 本身；n=0 时 d 不开市则取下一个开市日。"""
+        idx, scalar = self._index(d)
+        n = np.asarray(n, dtype=np.int64)
+        # _cum[i+1] = 截至 d（含）的开市天数；_cum[i] = d 之前的开市天数
+        rank = np.where(n > 0, self._cum[idx + 1] + n - 1, self._cum[idx] + n)
+        inside = (rank >= 0) & (rank < self._total)
+        res = np.where(inside, self._open_idx[np.clip(rank, 0, max(self._total - 1, 0))], -1)
+        return self._dates(res, scalar and n.ndim == 0)
+
+    def count_between(self, start: Any, end: Any) -> Union[int, NDArray[np.int64]]:
+        """``[start, end)`` 内的开市天数；end 早于 start 时为负数。"""
+        a, scalar_a = self._index(start)
+        b, scalar_b = self._index(end)
+        out = self._cum[b].astype(np.int64) - self._cum[a]
+        return int(out) if scalar_a and scalar_b else out
+
+
+@lru_cache(maxsize=1)
+def get_calendar() -> TradingCalendar:
+    """进程内单例；节假日表改动后需要 ``get_calendar.cache_clear()``。"""
+    return TradingCalendar(_load_open_mask())
+
+
+def _in_calendar(d: DateLike) -> bool:
+    day = np.datetime64(d, "D") if not isinstance(d, datetime) else np.datetime64(d.date(), "D")
+    return np.datetime64(CALENDAR_START, "D") <= day <= np.datetime64(CALENDAR_END, "D")
+
+
+def next_trading_day(d: DateLike, include_self: bool = False) -> Optional[date]:
+    """d 之后（``include_self`` 时含 d）的第一个 A 股交易日。"""
+    _warn_uncovered(d)
+    return get_calendar().next_open(d, include_self=include_self)
+
+
+def prev_trading_day(d: DateLike, include_self: bool = False) -> Optional[date]:
+    """d 之前（``include_self`` 时含 d）的最后一个 A 股交易日。"""
+    _warn_uncovered(d)
+    return get_calendar().prev_open(d, include_self=include_self)
+
+
+def shift_trading_days(d: DateLike, n: int) -> Optional[date]:
+    """从 d 起往后 / 往前数 n 个交易日（不含 d）；超出覆盖区间返回 None。"""
+    _warn_uncovered(d)
+    return get_calendar().offset(d, n)
+
+
+def trading_days_between(start: DateLike, end: DateLike) -> int:
+    """``[start, end)`` 内的 A 股交易日数。"""
+    _warn_uncovered(start, end)
+    return get_calendar().count_between(start, end)
+
+
 def is_a_share_trading_day(dt: Optional[datetime] = None) -> bool:
     """判断给定时间（默认现在）是否是 A 股交易日。
 
@@ -112,8 +320,13 @@ def is_a_share_trading_day(dt: Optional[datetime] = None) -> bool:
 
     暂不实时拉大盘验证（避免每次心跳都发请求）；遇到节假日 cache miss 时
     拉一次上证分时数据写回 cache。
+
+    覆盖区间内直接查编译日历；区间外按上面的规则逐条判断。
     """
     d = dt or datetime.now()
+    _warn_uncovered(d.date())
+    if _in_calendar(d):
+        return get_calendar().is_open(d.date())
     if _is_weekend(d):
         return False
     if _is_holiday(d):
@@ -149,27 +362,34 @@ def next_decision_time(dt: Optional[datetime] = None) -> datetime:
     规则：
     - 当前是交易日 + 交易时段内 → 当前时间（立即）
     - 当前是交易日 + 午休（11:30~13:00）→ 13:00
-    - 当前是交易日 + 收盘后（>=15:00）→ 次日 9:30
+    - 当前是交易日 + 收盘后（>=15:00）→ 下一个交易日 9:30
     - 当前是非交易日 → 下一个交易日 9:30
     """
     now = dt or datetime.now()
     today = now.replace(hour=0, minute=0, second=0, microsecond=0)
 
-    if not is_a_share_trading_day(now):
-        # 找下一个交易日
+    def _next_open_at() -> datetime:
+        if _in_calendar(now):
+            nxt = next_trading_day(now.date())
+            if nxt is not None:
+                return datetime.combine(nxt, time(9, 30))
+        # 区间外：逐日找
         for offset in range(1, 15):
             candidate = today + timedelta(days=offset)
             if is_a_share_trading_day(candidate):
                 return candidate.replace(hour=9, minute=30)
         return now + timedelta(hours=24)  # fallback
 
+    if not is_a_share_trading_day(now):
+        return _next_open_at()
+
     t = now.time()
     if time(9, 30) <= t <= time(11, 30):
         return now
     if time(11, 30) < t < time(13, 0):
         return now.replace(hour=13, minute=0, second=0, microsecond=0)
     if t >= time(15, 0):
-        return (today + timedelta(days=1)).replace(hour=9, minute=30)
+        return _next_open_at()
     # 9:30 之前
     return now.replace(hour=9, minute=30, second=0, microsecond=0)
 
@@ -0,0 +1,366 @@
+"""模拟盘账户估值的轮次内备忘。
+
+一轮 Kanban 心跳里，同一个盘的持仓市值 / 浮盈 / 总资产会被算好几遍：
+``papertrade_account_query`` / ``papertrade_position_list`` 各算一次，收盘快照代理
+再算一次，播报文本又读一次持仓。每遍都重读持仓、重问 ``quote_service``，几遍之间
+报价还可能对不上（查账时 10.50，写快照时 10.52）。
+
+这里把一次估值收成 :class:`AccountValuation`：读一次账户与持仓、批量拉一次报价，
+算好逐只 enrichment 与合计，挂在本轮的 :class:`ValuationRound` 上，本轮后续的
+消费者直接复用同一份结果（同一份报价快照）。
+
+轮次怎么界定：
+
+- :func:`valuation_round` 显式开的作用域（contextvar，子任务继承）：立即决策 /
+  压测这类"跑一次 agent → 拼播报"的调用方自己包一层；
+- 没有显式作用域时按 Kanban ``root_task_id`` 归轮（工具体拿不到框架外层的
+  contextvar），空闲超过 ``ROUND_IDLE_SECONDS`` 视为新一轮；
+- 两者都没有（主 persona 直聊）就不缓存，每次现算。
+
+失效只有一个来源：``trade_executor`` 记成交 / 改持仓后调 :func:`invalidate`，
+把该盘在所有活着的轮次里的估值丢掉。轮内本身不按报价 TTL 自动刷新；消费者用
+``max_age_seconds`` 声明自己能接受多旧的估值（AI 工具按报价 TTL，收盘快照同理），
+超过就重算，免得旧估值里的 ``quote_source="live"`` 被当成现价。
+"""
+
+from __future__ import annotations
+
+import time
+import asyncio
+import weakref
+import datetime as _dt
+import contextlib
+from typing import Any, Dict, List, Tuple, Iterator, Optional
+from contextvars import ContextVar
+from dataclasses import field, dataclass
+
+from gsuid_core.logger import logger
+
+from . import db
+from .quote_service import quote_service
+from ..utils.database.papertrade_models import SayuPaperAccount, SayuPaperPosition
+
+__all__ = [
+    "ROUND_IDLE_SECONDS",
+    "AccountValuation",
+    "ValuationStats",
+    "ValuationRound",
+    "STATS",
+    "compute_valuation",
+    "valuation_round",
+    "current_round",
+    "get_valuation",
+    "invalidate",
+]
+
+# 按 root_task_id 归轮时的空闲上限：心跳间隔 30 分钟起，一轮内工具调用间隔远小于此
+ROUND_IDLE_SECONDS: float = 300.0
+
+Enriched = List[Tuple[SayuPaperPosition, Dict[str, Any]]]
+
+
+@dataclass(slots=True)
+class AccountValuation:
+    """一个盘某一时刻的估值（现金 + 逐只持仓 enrichment + 合计）。"""
+
+    account_id: int
+    cash: float
+    initial_cash: float
+    # ``[(position, enrichment), ...]``，enrichment 字段见 :func:`compute_valuation`
+    positions: Enriched
+    # 本次估值采用的报价 ``{secid: price}``：新拉到的 + 未超龄的库存报价
+    quotes: Dict[str, float]
+    position_value: float
+    total_unrealized_pnl: float
+    quote_stale_count: int
+    total_equity: float
+    valued_at: _dt.datetime
+    # monotonic 时刻，``max_age_seconds`` 判断用
+    computed_at: float = field(default_factory=time.monotonic)
+
+
+@dataclass(slots=True)
+class ValuationStats:
+    """估值计数。``reused`` 就是省掉的重算次数。"""
+
+    computed: int = 0
+    reused: int = 0
+    invalidated: int = 0
+    # 不在任何轮次里、只能现算的次数
+    uncached: int = 0
+
+    def summary(self) -> str:
+        return f"computed={self.computed} reused={self.reused} invalidated={self.invalidated} uncached={self.uncached}"
+
+
+# 进程级累计，各轮次的计数同时记一份
+STATS = ValuationStats()
+
+
+async def compute_valuation(
+    account_id: int,
+    *,
+    account: Optional[SayuPaperAccount] = None,
+    max_stale_seconds: int = 60,
+) -> AccountValuation:
+    """现算一次估值（不走备忘）。
+
+    1. 读持仓，``last_quote_at`` 超过 ``max_stale_seconds``（含 None）的算 stale；
+    2. stale 的 secid 喂 ``quote_service.get_quotes_batch``，拉到的
+       ``PaperPositionRepo.bulk_set_quote`` 写回 DB；
+    3. 拉不到的降级 ``last_quote_price → avg_cost``。
+
+    enrichment 字段：``current_price`` / ``market_value`` / ``unrealized_pnl`` /
+    ``unrealized_pnl_pct`` / ``quote_age_seconds`` / ``quote_source``
+    （"live"=本次新拉 / "db"=库里已有报价 / "cost"=从未刷过价，均价兜底）/
+    ``last_quote_at``。``quote_age_seconds`` 为 None 表示从未刷过价。
+
+    Args:
+        account_id: 账户 id。
+        account: 调用方手里已有的账户行，省一次查询；不传则按 id 读。
+        max_stale_seconds: 报价超过多少秒就算 stale，触发刷新。
+    """
+    if account is None:
+        account = await db.PaperAccountRepo.get_by_id(account_id)
+    cash = float(account.cash) if account is not None else 0.0
+    initial_cash = float(account.initial_cash) if account is not None else 0.0
+    positions: list[SayuPaperPosition] = await db.PaperPositionRepo.list_by_account(account_id)
+
+    now = _dt.datetime.now()
+    to_refresh: list[SayuPaperPosition] = []
+    for p in positions:
+        if not p.last_quote_at:
+            to_refresh.append(p)
+            continue
+        try:
+            age = (now - p.last_quote_at).total_seconds()
+        except TypeError:
+            # 老库 last_quote_at 是 None / 字符串乱码等异常情况
+            to_refresh.append(p)
+            continue
+        if age > max_stale_seconds:
+            to_refresh.append(p)
+
+    # 批量拉一次报价（缓存优先；缺失项并发穿透），结果同时用于写 DB 和组装 enrichment
+    secid_to_fresh: Dict[str, float] = {}
+    secids = [p.secid for p in to_refresh if p.secid]
+    if secids:
+        try:
+            fetched = await quote_service.get_quotes_batch(secids)
+        except Exception as e:
+            logger.debug(f"[SayuStock][PaperTrade] quote_service.get_quotes_batch 异常：{e}")
+            fetched = {}
+        secid_to_fresh = {secid: float(price) for secid, price in fetched.items() if price is not None}
+        writes: list[dict] = [
+            {"stock_code": p.stock_code, "price": secid_to_fresh[p.secid], "at": now}
+            for p in to_refresh
+            if p.secid in secid_to_fresh
+        ]
+        if writes:
+            try:
+                await db.PaperPositionRepo.bulk_set_quote(writes, account_id)
+            except Exception as e:
+                # 老库可能列未迁移完；这里 swallow 不影响主流程
+                logger.debug(f"[SayuStock][PaperTrade] bulk_set_quote 写 DB 失败（降级）：{e}")
+
+    stale_ids = {id(p) for p in to_refresh}
+    enriched: Enriched = []
+    quotes: Dict[str, float] = {}
+    position_value = total_unrealized_pnl = 0.0
+    quote_stale_count = 0
+    for p in positions:
+        fresh = secid_to_fresh.get(p.secid) if p.secid else None
+        quote_age: Optional[int]
+        if fresh is not None:
+            current_price = fresh
+            quote_source = "live"
+            quote_age = 0
+            last_quote_at: Optional[_dt.datetime] = now
+            quotes[p.secid] = fresh
+        elif p.last_quote_price is not None and p.last_quote_at is not None:
+            current_price = p.last_quote_price
+            quote_source = "db"
+            try:
+                quote_age = int((now - p.last_quote_at).total_seconds())
+            except TypeError:
+                quote_age = None
+            last_quote_at = p.last_quote_at
+            if p.secid and id(p) not in stale_ids:
+                quotes[p.secid] = float(current_price)
+        else:
+            current_price = p.avg_cost if p.avg_cost else 0.0
+            quote_source = "cost"
+            quote_age = None
+            last_quote_at = None
+
+        cost_basis = p.avg_cost * p.qty if p.avg_cost else 0.0
+        market_value = current_price * p.qty
+        unrealized_pnl = (current_price - p.avg_cost) * p.qty if p.avg_cost else 0.0
+        unrealized_pnl_pct = (unrealized_pnl / cost_basis * 100) if cost_basis else 0.0
+
+        enrichment: dict[str, Any] = {
+            "current_price": round(current_price, 4),
+            "market_value": round(market_value, 2),
+            "unrealized_pnl": round(unrealized_pnl, 2),
+            "unrealized_pnl_pct": round(unrealized_pnl_pct, 4),
+            "quote_age_seconds": quote_age,
+            "quote_source": quote_source,
+            "last_quote_at": last_quote_at.isoformat() if last_quote_at else None,
+        }
+        enriched.append((p, enrichment))
+        if quote_source != "live":
+            quote_stale_count += 1
+        position_value += enrichment["market_value"]
+        total_unrealized_pnl += enrichment["unrealized_pnl"]
+
+    position_value = round(position_value, 2)
+    return AccountValuation(
+        account_id=account_id,
+        cash=cash,
+        initial_cash=initial_cash,
+        positions=enriched,
+        quotes=quotes,
+        position_value=position_value,
+        total_unrealized_pnl=round(total_unrealized_pnl, 2),
+        quote_stale_count=quote_stale_count,
+        total_equity=round(cash + position_value, 2),
+        valued_at=now,
+    )
+
+
+class ValuationRound:
+    """一轮内的估值备忘：每个盘最多算一次，并发的同盘请求合并成一次计算。"""
+
+    def __init__(self, key: str = "") -> None:
+        self.key = key
+        self.stats = ValuationStats()
+        self.touched: float = time.monotonic()
+        self._memo: Dict[int, AccountValuation] = {}
+        self._inflight: Dict[int, "asyncio.Task[AccountValuation]"] = {}
+        _LIVE_ROUNDS.add(self)
+
+    def _count(self, name: str) -> None:
+        setattr(self.stats, name, getattr(self.stats, name) + 1)
+        setattr(STATS, name, getattr(STATS, name) + 1)
+
+    async def get(
+        self,
+        account_id: int,
+        *,
+        account: Optional[SayuPaperAccount] = None,
+        max_stale_seconds: int = 60,
+        max_age_seconds: Optional[float] = None,
+    ) -> AccountValuation:
+        """本轮的估值；没有（或比 ``max_age_seconds`` 旧）才现算。"""
+        now = time.monotonic()
+        self.touched = now
+        hit = self._memo.get(account_id)
+        if hit is not None and (max_age_seconds is None or now - hit.computed_at <= max_age_seconds):
+            self._count("reused")
+            return hit
+
+        task = self._inflight.get(account_id)
+        if task is not None:
+            self._count("reused")
+            return await asyncio.shield(task)
+
+        self._count("computed")
+        task = asyncio.ensure_future(
+            compute_valuation(account_id, account=account, max_stale_seconds=max_stale_seconds)
+        )
+        self._inflight[account_id] = task
+        # 结果在任务完成时落备忘：等待方被取消（shield 保住任务本身）也不白算
+        task.add_done_callback(lambda t: self._settle(account_id, t))
+        return await asyncio.shield(task)
+
+    def _settle(self, account_id: int, task: "asyncio.Task[AccountValuation]") -> None:
+        # 计算途中被 invalidate 过（inflight 已换人 / 被清掉）的结果不落备忘
+        if self._inflight.get(account_id) is not task:
+            return
+        self._inflight.pop(account_id, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        self._memo[account_id] = task.result()
+
+    def invalidate(self, account_id: int) -> bool:
+        """丢掉该盘的估值（含计算中的），返回是否真的丢了东西。"""
+        dropped = self._memo.pop(account_id, None) is not None
+        dropped = self._inflight.pop(account_id, None) is not None or dropped
+        if dropped:
+            self._count("invalidated")
+        return dropped
+
+
+_LIVE_ROUNDS: "weakref.WeakSet[ValuationRound]" = weakref.WeakSet()
+_CURRENT: ContextVar[Optional[ValuationRound]] = ContextVar("_sayustock_papertrade_valuation_round", default=None)
+_KEYED: Dict[str, ValuationRound] = {}
+
+
+def _log_round(rnd: ValuationRound) -> None:
+    if rnd.stats.computed or rnd.stats.reused:
+        logger.debug(f"[SayuStock][PaperTrade] 估值轮次 {rnd.key or '-'} 结束：{rnd.stats.summary()}")
+
+
+@contextlib.contextmanager
+def valuation_round(key: str = "") -> Iterator[ValuationRound]:
+    """显式开一轮；已在某轮里时复用外层那一轮（嵌套不另起）。"""
+    outer = _CURRENT.get()
+    if outer is not None:
+        yield outer
+        return
+    rnd = ValuationRound(key)
+    token = _CURRENT.set(rnd)
+    try:
+        yield rnd
+    finally:
+        _CURRENT.reset(token)
+        _log_round(rnd)
+
+
+def current_round(round_key: str = "") -> Optional[ValuationRound]:
+    """当前所在的轮次：显式作用域优先，其次按 ``round_key``（Kanban root_task_id）归轮。"""
+    rnd = _CURRENT.get()
+    if rnd is not None or not round_key:
+        return rnd
+    now = time.monotonic()
+    rnd = _KEYED.get(round_key)
+    if rnd is not None and now - rnd.touched <= ROUND_IDLE_SECONDS:
+        return rnd
+    for key in [k for k, r in _KEYED.items() if now - r.touched > ROUND_IDLE_SECONDS]:
+        _log_round(_KEYED.pop(key))
+    rnd = _KEYED[round_key] = ValuationRound(round_key)
+    return rnd
+
+
+async def get_valuation(
+    account_id: int,
+    *,
+    account: Optional[SayuPaperAccount] = None,
+    round_key: str = "",
+    max_stale_seconds: int = 60,
+    max_age_seconds: Optional[float] = None,
+) -> AccountValuation:
+    """拿账户估值：在轮次里走备忘，否则现算。
+
+    Args:
+        account_id: 账户 id。
+        account: 调用方已有的账户行（只在需要现算时用）。
+        round_key: Kanban ``root_task_id``；不在显式作用域里时据此归轮。
+        max_stale_seconds: 现算时报价超龄阈值，见 :func:`compute_valuation`。
+        max_age_seconds: 能接受的备忘最大年龄；None = 本轮内一直有效。
+    """
+    rnd = current_round(round_key)
+    if rnd is None:
+        STATS.uncached += 1
+        return await compute_valuation(account_id, account=account, max_stale_seconds=max_stale_seconds)
+    return await rnd.get(
+        account_id,
+        account=account,
+        max_stale_seconds=max_stale_seconds,
+        max_age_seconds=max_age_seconds,
+    )
+
+
+def invalidate(account_id: int) -> int:
+    """成交 / 持仓变动后丢掉该盘在所有活着的轮次里的估值，返回丢掉的轮次数。"""
+    return sum(1 for rnd in list(_LIVE_ROUNDS) if rnd.invalidate(account_id))
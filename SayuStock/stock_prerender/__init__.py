@@ -0,0 +1,37 @@
+from gsuid_core.sv import SV
+from gsuid_core.aps import scheduler
+from gsuid_core.bot import Bot
+from gsuid_core.logger import logger
+from gsuid_core.models import Event
+
+from ..utils.prerender import PRERENDER
+from ..stock_config.stock_config import STOCK_CONFIG
+from ..stock_papertrade.trading_calendar import is_trading_time, is_a_share_trading_day
+
+sv_stock_prerender = SV("预渲染", pm=1)
+
+
+# 每分钟检查一次；交易时段内每满一个刷新窗口预渲染一轮热门图
+@scheduler.scheduled_job("cron", minute="*")
+async def prerender_popular_charts() -> None:
+    top_n = int(STOCK_CONFIG.get_config("prerender_top_n").data)
+    if top_n <= 0 or not is_a_share_trading_day() or not is_trading_time():
+        return
+    if not PRERENDER.due():
+        return
+    budget = int(STOCK_CONFIG.get_config("prerender_budget_seconds").data)
+    try:
+        await PRERENDER.warm(top_n, budget)
+    except Exception as e:
+        logger.exception(f"[SayuStock] 预渲染任务异常: {e}")
+
+
+@sv_stock_prerender.on_fullmatch(("预渲染状态"))
+async def send_prerender_status(bot: Bot, ev: Event) -> None:
+    targets = PRERENDER.top(int(STOCK_CONFIG.get_config("prerender_top_n").data))
+    lines = [f"[预渲染] {PRERENDER.stats.summary()}"]
+    for key in targets:
+        entry = PRERENDER.fresh_entry(key)
+        state = f"已就绪（{entry.render_ms:.0f}ms）" if entry is not None else "未就绪"
+        lines.append(f"· {key.command} {' '.join(key.args)}：{state}")
+    await bot.send("\n".join(lines))
@@ -1,6 +1,5 @@
 import asyncio
 import datetime
-from io import BytesIO
 from typing import Any, Union, Literal, Optional, TypedDict
 from dataclasses import dataclass
 
@@ -10,7 +9,6 @@ import matplotlib
 from PIL import Image
 
 matplotlib.use("Agg")
-import matplotlib.pyplot as plt  # noqa: E402
 from matplotlib.axes import Axes  # noqa: E402
 from matplotlib.figure import Figure  # noqa: E402
 
@@ -29,6 +27,7 @@ from ..stock_stockinfo.chart_base import (  # noqa: E402
     FONT_W_DEMIBOLD,
     _setup_mpl,
     _pct_change,
+    _fig_to_image,
     _apply_detail_legend,
     _draw_end_point_labels,
     _paint_chart_background,
@@ -101,14 +100,6 @@ def _frame_column(df: pd.DataFrame, key: str) -> pd.Series:
     return column
 
 
-def _fig_to_image(fig: Figure, *, dpi: int = 180) -> Image.Image:
-    output = BytesIO()
-    fig.savefig(output, format="png", dpi=dpi, facecolor=fig.get_facecolor(), pad_inches=0.06)
-    plt.close(fig)
-    output.seek(0)
-    return Image.open(output).convert("RGB")
-
-
 class EastmoneyValueResult(TypedDict, total=False):
     data: list[dict[str, Any]]
 
@@ -2,8 +2,10 @@ from gsuid_core.subscribe import gs_subscribe
 from gsuid_core.status.plugin_status import register_status
 
 from ..utils.image import get_ICON
+from ..utils.prerender import PRERENDER
 from ..stock_news.__init__ import TASK_NAME
 from ..utils.database.models import SsBind
+from ..stock_papertrade.candidate_pool import SHARED_SOURCES
 
 
 async def get_subscribe_num() -> int:
@@ -16,11 +18,21 @@ async def get_add_num() -> int:
     return len(datas) if datas else 0
 
 
+async def get_prerender_hit_percent() -> int:
+    return round(PRERENDER.stats.hit_ratio * 100)
+
+
+async def get_shared_source_saved() -> int:
+    return SHARED_SOURCES.stats.saved
+
+
 register_status(
     get_ICON(),
     "SayuStock",
     {
         "启用订阅": get_subscribe_num,
         "自选账户": get_add_num,
+        "预渲染命中率(%)": get_prerender_hit_percent,
+        "候选源省下调用": get_shared_source_saved,
     },
 )
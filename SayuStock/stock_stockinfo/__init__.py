@@ -5,12 +5,16 @@ from gsuid_core.models import Event
 
 from ..utils.utils import convert_list, get_vix_name
 from .get_cloudmap import render_image
+from ..utils.prerender import PRERENDER
 from ..utils.time_range import parse_time_range
 from ..utils.database.models import SsBind
 
 sv_stock_stockinfo = SV("个股行情")
 sv_stock_compare = SV("对比个股", priority=3)
 
+# 「个股」「我的个股」共用 render_image(标的, 图种)；对比图带时间区间，不参与预渲染
+PRERENDER.register("个股", render_image)
+
 MS_MAP = {
     "5k": "5",
     "15k": "15",
@@ -57,10 +61,7 @@ async def send_my_stock_img(bot: Bot, ev: Event) -> list[str] | None:
         uid = uid[:5]
     txt = " ".join(uid)
 
-    im = await render_image(
-        txt,
-        "single-stock",
-    )
+    im = await PRERENDER.serve("个股", txt, "single-stock")
     await bot.send(im)
 
 
@@ -97,16 +98,10 @@ async def send_stock_img(bot: Bot, ev: Event) -> list[str] | None:
             vix_name = get_vix_name(content)
             if vix_name:
                 return await bot.send("[VIX] 仅支持使用 个股 300vix 方式调用, 暂时无法查看日K等数据")
-            im = await render_image(
-                content,
-                f"single-stock-kline-{kline_code}",
-            )
+            im = await PRERENDER.serve("个股", content, f"single-stock-kline-{kline_code}")
             break
     else:
-        im = await render_image(
-            content.replace("分时", "").strip(),
-            "single-stock",
-        )
+        im = await PRERENDER.serve("个股", content.replace("分时", "").strip(), "single-stock")
     await bot.send(im)
 
 
@@ -17,7 +17,6 @@
 """
 
 import asyncio
-from io import BytesIO
 from typing import TypeVar, Protocol, ParamSpec, cast, runtime_checkable
 from datetime import datetime
 from collections.abc import Callable, Sequence
@@ -37,6 +36,7 @@ from matplotlib.ticker import FuncFormatter  # noqa: E402
 from matplotlib.patches import Rectangle  # noqa: E402
 from matplotlib.offsetbox import HPacker, TextArea, AnnotationBbox  # noqa: E402
 from matplotlib.backend_bases import RendererBase  # noqa: E402
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # noqa: E402
 
 from gsuid_core.utils.fonts.fonts import FONT_ORIGIN_PATH
 
@@ -171,8 +171,14 @@ FONT_W_HEAVY = 700
 MPL_COLORS = ["#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd", "#17becf", "#e377c2"]
 
 
-def _setup_mpl() -> None:
-    """注册字体：优先静态 MiSans（Thin…Heavy），勿把 VF 放第一否则字重失效。"""
+_FONT_FAMILIES: list[str] | None = None
+
+
+def _font_families() -> list[str]:
+    """注册 MiSans 并算出字族优先级；每个进程只做一次（addfont 会重建 ttflist 查找缓存）。"""
+    global _FONT_FAMILIES
+    if _FONT_FAMILIES is not None:
+        return _FONT_FAMILIES
     if FONT_ORIGIN_PATH.exists():
         font_manager.fontManager.addfont(str(FONT_ORIGIN_PATH))
     families: list[str] = []
@@ -184,7 +190,13 @@ def _setup_mpl() -> None:
         if vf_name and vf_name not in families:
             families.append(vf_name)
     families.extend(FONT_CANDIDATES)
-    plt.rcParams["font.sans-serif"] = families
+    _FONT_FAMILIES = families
+    return families
+
+
+def _setup_mpl() -> None:
+    """注册字体：优先静态 MiSans（Thin…Heavy），勿把 VF 放第一否则字重失效。"""
+    plt.rcParams["font.sans-serif"] = list(_font_families())
     plt.rcParams["font.family"] = "sans-serif"
     plt.rcParams["font.weight"] = FONT_W_REG
     plt.rcParams["axes.unicode_minus"] = False
@@ -209,11 +221,20 @@ def _paint_chart_background(fig: Figure) -> None:
 
 
 def _fig_to_image(fig: Figure, *, dpi: int = 180) -> Image.Image:
-    output = BytesIO()
-    fig.savefig(output, format="png", dpi=dpi, facecolor=fig.get_facecolor(), pad_inches=0.06)
+    """直接取 Agg 画布的像素：``buffer_rgba`` 零拷贝交给 ``Image.frombuffer``。
+
+    旧做法是 savefig 成 PNG 再用 PIL 解码，大图白白多一轮编码 + 解码；编码只在
+    发送前做一次（``utils/image_encode``）。唯一剩下的一趟是 RGBA → RGB：图表背景
+    不透明，去掉 alpha 后画布缓冲区也能随 fig 一起释放。
+    """
+    fig.set_dpi(dpi)
+    canvas = fig.canvas if isinstance(fig.canvas, FigureCanvasAgg) else FigureCanvasAgg(fig)
+    canvas.draw()
+    buffer = np.asarray(canvas.buffer_rgba())
+    height, width = buffer.shape[:2]
+    image = Image.frombuffer("RGBA", (width, height), buffer, "raw", "RGBA", 0, 1).convert("RGB")
     plt.close(fig)
-    _ = output.seek(0)
-    return Image.open(output).convert("RGB")
+    return image
 
 
 async def _draw_in_thread(func: Callable[P, R], *args: P.args, **kwargs: P.kwargs) -> R:
@@ -434,8 +455,11 @@ def _apply_detail_legend(
 
 
 def _ensure_axes_renderer(ax: Axes) -> RendererBase:
-    """拿到可用于 ``get_window_extent(renderer=...)`` 的 renderer。
+    """拿到可用于 ``get_window_extent(renderer=...)`` / 量字宽的 renderer。
 
+    不再整图 ``canvas.draw()``：避让只需要坐标变换与轴框。mplchart 给 Figure 挂了
+    tight layout engine，轴框要等布局跑过才是最终位置，这里只执行布局（量刻度/标题
+    的外框，不栅格化任何图元）；``viewLim`` 取值时会补算挂起的自动缩放。
     stubs 里 ``Figure.canvas`` 可能是 ``None``，且 ``get_renderer`` 只在 Agg canvas 上；
     运行时 Agg 后端一定有这两个属性。
     """
@@ -445,11 +469,34 @@ def _ensure_axes_renderer(ax: Axes) -> RendererBase:
     canvas = fig.canvas
     if canvas is None:
         raise RuntimeError("Figure 未绑定 canvas，无法获取 renderer")
-    canvas.draw()
     get_renderer = getattr(canvas, "get_renderer", None)
     if not callable(get_renderer):
         raise RuntimeError("当前 canvas 不支持 get_renderer（需要 Agg 后端）")
-    return cast(RendererBase, get_renderer())
+    renderer = cast(RendererBase, get_renderer())
+    _ = ax.viewLim  # 触发挂起的 autoscale，之后刻度与 transData 才是最终值
+    engine = fig.get_layout_engine()
+    if engine is not None:
+        engine.execute(fig)
+    return renderer
+
+
+def _measure_text_heights_pts(
+    texts: Sequence[str],
+    fontsize: float,
+    renderer: RendererBase,
+    *,
+    weight: int = FONT_W_SEMIBOLD,
+    pad_pts: float = 4.0,
+) -> list[float]:
+    """用 renderer 实测每段文字的框高（points，含上下边距）；每个标签只量一次。"""
+    prop = font_manager.FontProperties(size=fontsize, weight=weight)
+    pt_per_px = 72.0 / float(renderer.points_to_pixels(72.0))
+    heights: list[float] = []
+    for text in texts:
+        lines = str(text).split("\n")
+        line_h = max(renderer.get_text_width_height_descent(line or " ", prop, ismath=False)[1] for line in lines)
+        heights.append(len(lines) * line_h * 1.2 * pt_per_px + pad_pts * 2.0)
+    return heights
 
 
 def _estimate_text_box_pts(text: str, fontsize: float, *, pad_pts: float = 4.0) -> tuple[float, float]:
@@ -483,6 +530,45 @@ def _leader_arrowprops(color: str, *, linewidth: float = 1.0, alpha: float = 0.8
     }
 
 
+def _pack_label_centers(
+    ys: NDArray[np.float64],
+    half: NDArray[np.float64],
+    gap: float,
+    lo: float,
+    hi: float,
+) -> NDArray[np.float64]:
+    """一维标签避让：ys 已升序，返回互不重叠且离原位平方和最小的中心，并收进 [lo, hi]。
+
+    相邻中心至少相距 ``half[i] + half[i+1] + gap``。记 s 为这些间距的前缀和，
+    令 q = p - s，约束变成 q 单调不减 —— 即对 ``ys - s`` 做保序回归（PAVA）：
+    从下往上扫，新块与前一块冲突就合并、取均值，一遍 O(n)。
+    收边界时 q 整体裁到 [lo, hi - s[-1]]；放不下则按比例压缩间距铺满。
+    """
+    n = len(ys)
+    sep = np.zeros(n)
+    sep[1:] = half[:-1] + half[1:] + gap
+    offsets = np.cumsum(sep)
+    targets = ys - offsets
+
+    # 块：(均值, 个数)，栈里均值严格递增
+    means: list[float] = []
+    counts: list[int] = []
+    for t in targets.tolist():
+        mean, count = t, 1
+        while means and means[-1] >= mean:
+            prev_mean, prev_count = means.pop(), counts.pop()
+            mean = (prev_mean * prev_count + mean * count) / (prev_count + count)
+            count += prev_count
+        means.append(mean)
+        counts.append(count)
+    q = np.repeat(np.asarray(means), counts)
+
+    span = float(offsets[-1])
+    if span <= hi - lo:
+        return np.clip(q, lo, hi - span) + offsets
+    return lo + offsets * ((hi - lo) / span) if span > 0 else np.full(n, lo)
+
+
 def _dodge_end_label_offsets(
     y_values: Sequence[float],
     ax: Axes,
@@ -495,7 +581,8 @@ def _dodge_end_label_offsets(
     """为曲线末端标签计算 (x_offset, y_offset)（单位：points），纵向 AABB 避让。
 
     返回值可直接用于 ``AnnotationBbox(..., xybox=offset, boxcoords="offset points")``。
-    标签框高度可用 ``heights_pts`` 传入；缺省时用 ``min_sep_pts`` 作为统一间距。
+    标签框高度可用 ``heights_pts`` 逐个传入（可不等高）；缺省时用 ``min_sep_pts`` 作为统一间距。
+    排序后一遍扫描求解（见 ``_pack_label_centers``），整体 O(n log n)。
     """
     n = len(y_values)
     if n == 0:
@@ -503,91 +590,37 @@ def _dodge_end_label_offsets(
     if n == 1:
         return [(x_base_pts, 0.0)]
 
-    renderer = _ensure_axes_renderer(ax)
+    _ensure_axes_renderer(ax)
     fig = ax.figure
     if fig is None:
         return [(x_base_pts, 0.0) for _ in range(n)]
-    dpi = float(fig.dpi)
-    px_per_pt = dpi / 72.0
+    px_per_pt = float(fig.dpi) / 72.0
 
     if heights_pts is None:
-        half_h = [min_sep_pts * 0.5 * px_per_pt for _ in range(n)]
+        half_h = np.full(n, min_sep_pts * 0.5 * px_per_pt)
     else:
         if len(heights_pts) != n:
             raise ValueError("heights_pts 与 y_values 长度必须一致")
-        half_h = [max(float(h), min_sep_pts) * 0.5 * px_per_pt for h in heights_pts]
+        half_h = np.maximum(np.asarray(heights_pts, dtype=float), min_sep_pts) * 0.5 * px_per_pt
     gap_px = 4.0 * px_per_pt  # 框与框之间最小空隙
 
-    display_ys = [float(ax.transData.transform((0.0, float(y)))[1]) for y in y_values]
-    order = sorted(range(n), key=lambda i: display_ys[i])
-    packed = [display_ys[i] for i in order]
-    half_sorted = [half_h[i] for i in order]
-
-    for i in range(1, n):
-        min_center = packed[i - 1] + half_sorted[i - 1] + half_sorted[i] + gap_px
-        if packed[i] < min_center:
-            packed[i] = min_center
-
-    cluster_start = 0
-    while cluster_start < n:
-        cluster_end = cluster_start
-        while cluster_end + 1 < n:
-            need = packed[cluster_end] + half_sorted[cluster_end] + half_sorted[cluster_end + 1] + gap_px
-            if abs(packed[cluster_end + 1] - need) < 1.0:
-                cluster_end += 1
-            else:
-                break
-        if cluster_end > cluster_start:
-            size = cluster_end - cluster_start + 1
-            orig_mean = sum(display_ys[order[k]] for k in range(cluster_start, cluster_end + 1)) / size
-            pack_mean = sum(packed[cluster_start : cluster_end + 1]) / size
-            shift = orig_mean - pack_mean
-            for k in range(cluster_start, cluster_end + 1):
-                packed[k] += shift
-        cluster_start = cluster_end + 1
-
-    for i in range(1, n):
-        min_center = packed[i - 1] + half_sorted[i - 1] + half_sorted[i] + gap_px
-        if packed[i] < min_center:
-            packed[i] = min_center
-    for i in range(n - 2, -1, -1):
-        max_center = packed[i + 1] - half_sorted[i + 1] - half_sorted[i] - gap_px
-        if packed[i] > max_center:
-            packed[i] = max_center
-
-    bbox = ax.get_window_extent(renderer=renderer)
-    y_lo = float(bbox.y0) + half_sorted[0] + gap_px
-    y_hi = float(bbox.y1) - half_sorted[-1] - gap_px
-    if packed[0] < y_lo:
-        shift = y_lo - packed[0]
-        packed = [p + shift for p in packed]
-    if packed[-1] > y_hi:
-        shift = packed[-1] - y_hi
-        packed = [p - shift for p in packed]
-    for i in range(1, n):
-        min_center = packed[i - 1] + half_sorted[i - 1] + half_sorted[i] + gap_px
-        if packed[i] < min_center:
-            packed[i] = min_center
-    if packed[-1] > y_hi:
-        for i in range(n - 2, -1, -1):
-            max_center = packed[i + 1] - half_sorted[i + 1] - half_sorted[i] - gap_px
-            if packed[i] > max_center:
-                packed[i] = max_center
-
-    span_need = packed[-1] - packed[0]
-    span_have = max(y_hi - y_lo, 1.0)
-    if span_need > span_have and n > 1:
-        scale = span_have / span_need
-        mid = (packed[0] + packed[-1]) / 2.0
-        packed = [mid + (p - mid) * scale for p in packed]
-        for i in range(1, n):
-            min_center = packed[i - 1] + half_sorted[i - 1] + half_sorted[i] + gap_px * 0.5
-            if packed[i] < min_center:
-                packed[i] = min_center
+    points = np.column_stack([np.zeros(n), np.asarray(y_values, dtype=float)])
+    display_ys = ax.transData.transform(points)[:, 1]
+    order = np.argsort(display_ys, kind="stable")
+    half_sorted = half_h[order]
+
+    bbox = ax.bbox
+    packed = _pack_label_centers(
+        display_ys[order],
+        half_sorted,
+        gap_px,
+        float(bbox.y0) + half_sorted[0] + gap_px,
+        float(bbox.y1) - half_sorted[-1] - gap_px,
+    )
 
     results: list[tuple[float, float]] = [(x_base_pts, 0.0) for _ in range(n)]
-    for rank, orig_i in enumerate(order):
-        y_offset_pts = (packed[rank] - display_ys[orig_i]) / px_per_pt
+    for rank, orig_i in enumerate(order.tolist()):
+        y_offset_pts = float(packed[rank] - display_ys[orig_i]) / px_per_pt
         stagger = (rank - (n - 1) / 2.0) * x_stagger_pts
         fan = min(abs(y_offset_pts) * 0.18, 28.0)
         density_fan = min(n * 1.2, 14.0)
@@ -799,11 +832,8 @@ def _draw_end_point_labels(
     if not entries:
         return
     fontsize = 11.0
-    heights: list[float] = []
-    for item in entries:
-        name, value_text = item[2], item[3]
-        _, h = _estimate_text_box_pts(f"{name}{value_text}", fontsize, pad_pts=5.0)
-        heights.append(h)
+    renderer = _ensure_axes_renderer(ax)
+    heights = _measure_text_heights_pts([f"{item[2]}{item[3]}" for item in entries], fontsize, renderer, pad_pts=5.0)
 
     offsets = _dodge_end_label_offsets(
         [item[1] for item in entries],
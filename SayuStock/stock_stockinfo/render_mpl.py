@@ -3,6 +3,7 @@
 绘图实现已按种类拆到 ``chart_*.py``，本模块只保留：
 
 - ``render_html`` / ``render_image_file`` / ``render_image``：拉数据 → 选图 → 出图
+  （出图交给 ``render_pool.RENDER_POOL``，可配置为常驻进程池）
 - ``_ai_return_*``：把图上的数据以**文字**发给 AI —— 部分模型看不到图，
   这段文字是它拿到的全部信息，实现在 ``utils/render_text.py``
 
@@ -15,12 +16,12 @@ from datetime import datetime, timedelta
 
 from gsuid_core.logger import logger
 from gsuid_core.utils.image.convert import convert_img
-from gsuid_core.ai_core.trigger_bridge import ai_return
 
 from .data import CLOUDMAP_DATA_SERVICE
 from ..utils import render_text
 from .chart_base import BotSendContent
 from .chart_kline import to_single_fig_kline, draw_single_kline_chart
+from .render_pool import RENDER_POOL, RenderJob
 from .chart_compare import to_compare_fig, draw_compare_chart
 from .chart_cloudmap import to_fig, draw_cloudmap_chart
 from .chart_intraday import (
@@ -30,7 +31,10 @@ from .chart_intraday import (
     draw_single_stock_chart,
 )
 from ..utils.constant import ErroText
+from ..utils.prerender import ai_return
 from ..utils.stock.utils import get_file
+from ..utils.image_encode import encode_options
+from ..utils.render_cache import RENDER_CACHE, stable_hash
 from ..utils.market.models import KlineSeries, BoardSnapshot, IntradaySeries
 from ..stock_config.stock_config import STOCK_CONFIG
 
@@ -57,7 +61,7 @@ async def render_html(
     start_time: datetime | None = None,
     end_time: datetime | None = None,
 ) -> str | Path:
-    """兼容旧入口名：mpl 版本不生成 HTML，实际缓存 PNG 图片。"""
+    """兼容旧入口名：mpl 版本不生成 HTML，实际缓存图片文件（格式见 ``chart_image_format``）。"""
     return await render_image_file(market, sector, start_time, end_time)
 
 
@@ -83,41 +87,60 @@ async def render_image_file(
         return raw_data
 
     # 文字必须在缓存判断**之前**发：部分模型看不到图，ai_return 的文字是它唯一的
-    # 输入，而命中 PNG 缓存会直接 return，绕过下面的绘图分支 —— 那样同一命令在
+    # 输入，而命中图片缓存会直接 return，绕过下面的绘图分支 —— 那样同一命令在
     # 刷新窗口内问第二次，AI 就一个字都收不到。
     _emit_ai_text(market, sector, raw_data, raw_datas)
 
-    file = get_file(market, "png", sector, data_result.special_cache_key)
+    options = encode_options()
+    file = get_file(market, options.ext, sector, data_result.special_cache_key)
     if file.exists():
         minutes = int(STOCK_CONFIG.get_config("mapcloud_refresh_minutes").data)
         file_mod_time = datetime.fromtimestamp(file.stat().st_mtime)
         if datetime.now() - file_mod_time < timedelta(minutes=minutes):
-            logger.info(f"[SayuStock] png文件在{minutes}分钟内，直接返回文件数据。")
+            logger.info(f"[SayuStock] {options.ext}文件在{minutes}分钟内，直接返回文件数据。")
             return file
 
+    job = _render_job(market, sector, raw_data, raw_datas)
+    if isinstance(job, str):
+        return job
+
+    # 过了刷新窗口但数据没变（收盘后、冷门板块）时，按内容哈希直接复用上次的图
+    cache_key = await asyncio.to_thread(stable_hash, job, options)
+    image = await RENDER_CACHE.get(cache_key, options.ext)
+    if image is None:
+        image = await RENDER_POOL.render(job, options)
+        if isinstance(image, str):
+            return image
+        await RENDER_CACHE.put(cache_key, image, options.ext)
+    else:
+        logger.info("[SayuStock] 出图输入未变化，复用内容缓存。")
+
+    await asyncio.to_thread(file.write_bytes, image)
+    return file
+
+
+def _render_job(
+    market: str,
+    sector: str | None,
+    raw_data: BoardSnapshot | IntradaySeries | KlineSeries,
+    raw_datas: list[IntradaySeries | KlineSeries],
+) -> RenderJob | str:
+    """按 sector 选图，打包成可交给出图进程池的任务。"""
     if sector == "single-stock":
         if raw_datas:
-            fig = await to_multi_fig([s for s in raw_datas if isinstance(s, IntradaySeries)])
-        elif isinstance(raw_data, IntradaySeries):
-            fig = await to_single_fig(raw_data)
-        else:
-            return ErroText["notData"]
-    elif sector == "compare-stock":
-        fig = await to_compare_fig([s for s in raw_datas if isinstance(s, KlineSeries)])
-    elif sector and sector.startswith("single-stock-kline"):
+            return RenderJob("multi", ([s for s in raw_datas if isinstance(s, IntradaySeries)],))
+        if isinstance(raw_data, IntradaySeries):
+            return RenderJob("single", (raw_data,))
+        return ErroText["notData"]
+    if sector == "compare-stock":
+        return RenderJob("compare", ([s for s in raw_datas if isinstance(s, KlineSeries)],))
+    if sector and sector.startswith("single-stock-kline"):
         if not isinstance(raw_data, KlineSeries):
             return ErroText["notData"]
-        fig = await to_single_fig_kline(raw_data)
-    else:
-        if not isinstance(raw_data, BoardSnapshot):
-            return ErroText["notData"]
-        fig = await to_fig(raw_data, market, sector, 2 if market == "大盘云图" else 1)
-
-    if isinstance(fig, str):
-        return fig
-
-    await asyncio.to_thread(fig.save, file, format="PNG")
-    return file
+        return RenderJob("kline", (raw_data,))
+    if not isinstance(raw_data, BoardSnapshot):
+        return ErroText["notData"]
+    return RenderJob("cloudmap", (raw_data, market, sector, 2 if market == "大盘云图" else 1))
 
 
 def _emit_ai_text(
@@ -0,0 +1,204 @@
+"""matplotlib 出图进程池。
+
+``_draw_in_thread`` 只是把绘图丢进 ``asyncio.to_thread``：pyplot 是进程级全局状态，
+又有 GIL，``个股`` / ``对比个股`` / K 线同时来几张图实际上还是一张一张画。这里改成
+常驻 worker 进程：
+
+- worker 启动时（``_worker_init``）一次性 import 各 chart_*、注册 MiSans、把 CJK
+  字形与字体缓存预热好，请求路径上不再付字体加载的钱；
+- 任务是可 pickle 的 ``RenderJob``：领域模型本身就是 frozen dataclass，
+  render-data 在 worker 里就地构建（``build_*`` 依赖 ``now()``，必须在出图时算）；
+- worker 直接回传编码好的图片字节（格式见 ``utils/image_encode``，编码参数由主进程
+  按配置生成、随任务带过去），主进程拿到就能落盘 / 发送，不再解码一遍。
+
+``render_pool_size`` 为 0 时不起进程，退回线程内绘图（行为与旧版一致）；大于 0 时
+core 启动后就把 worker 拉起并预热（不让第一个出图请求付 spawn + import + 预热的钱），
+core 关闭时一并结束；
+单任务超过 ``render_pool_timeout`` 秒视为卡死，整池重建；重建只针对任务提交时的那个池，
+同一个坏池上其它任务随后报的超时 / BrokenProcessPool 不会再把新池也拆掉。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from gsuid_core.logger import logger
+from gsuid_core.server import on_core_start, on_core_shutdown
+
+from ..utils.constant import ErroText
+from ..utils.image_encode import EncodeOptions, encode_image, encode_options
+from ..stock_config.stock_config import STOCK_CONFIG
+
+__all__ = [
+    "RENDER_POOL",
+    "RenderJob",
+    "RenderPool",
+    "RenderResult",
+]
+
+# str = 错误文本（与 DrawResult 一致），bytes = 编码好的图片
+RenderResult = str | bytes
+
+# 预热用：覆盖中文、数字与符号，让 FT2Font 与字形缓存都在 worker 启动时建好
+_WARMUP_TEXT = "个股分时日K对比 +1.23% -4.56% 成交额 亿万"
+
+
+@dataclass(frozen=True, slots=True)
+class RenderJob:
+    """一次出图任务。
+
+    ``kind`` 取 ``single`` / ``multi`` / ``kline`` / ``compare`` / ``cloudmap``，
+    ``args`` 原样传给对应的 ``draw_*_chart``，必须可 pickle。
+    """
+
+    kind: str
+    args: tuple[object, ...]
+
+
+def _draw_funcs():
+    from .chart_kline import draw_single_kline_chart
+    from .chart_compare import draw_compare_chart
+    from .chart_cloudmap import draw_cloudmap_chart
+    from .chart_intraday import draw_multi_stock_chart, draw_single_stock_chart
+
+    return {
+        "single": draw_single_stock_chart,
+        "multi": draw_multi_stock_chart,
+        "kline": draw_single_kline_chart,
+        "compare": draw_compare_chart,
+        "cloudmap": draw_cloudmap_chart,
+    }
+
+
+def _worker_init() -> None:
+    """worker 进程启动钩子：import 绘图栈、注册字体与样式，并画一张小图预热。"""
+    from .chart_base import FONT_W_REG, FONT_W_BOLD, plt, _setup_mpl
+
+    _ = _draw_funcs()
+    _setup_mpl()
+    fig = plt.figure(figsize=(2, 1), dpi=72)
+    fig.text(0.0, 0.5, _WARMUP_TEXT, fontweight=FONT_W_REG)
+    fig.text(0.0, 0.1, _WARMUP_TEXT, fontweight=FONT_W_BOLD)
+    fig.canvas.draw()
+    plt.close(fig)
+
+
+def _terminate_workers(executor: ProcessPoolExecutor) -> None:
+    """强制结束池里的 worker 进程。
+
+    ``ProcessPoolExecutor`` 没有公开的杀进程接口，卡死的 worker 又不会响应 cancel，
+    只能读私有的 ``_processes``；哪天 CPython 改掉了它就退化为只 ``shutdown``，
+    卡死的 worker 留到它自己画完再退出。
+    """
+    processes = getattr(executor, "_processes", None)
+    if not isinstance(processes, dict):
+        return
+    for process in list(processes.values()):
+        try:
+            process.terminate()
+        except (OSError, AttributeError) as e:
+            logger.debug(f"[SayuStock] 结束出图 worker 失败: {e}")
+
+
+def _run_job(job: RenderJob, options: EncodeOptions) -> RenderResult:
+    """在当前进程里画一张图并按 options 编码成字节（worker 与线程回退共用）。"""
+    draw = _draw_funcs().get(job.kind)
+    if draw is None:
+        return ErroText["notData"]
+    result = draw(*job.args)
+    if isinstance(result, str):
+        return result
+    return encode_image(result, options, label=job.kind).data
+
+
+class RenderPool:
+    """懒启动的出图进程池；池坏了 / 任务超时会整池重建。"""
+
+    def __init__(self, size: int | None = None, timeout: float | None = None) -> None:
+        self._size = size
+        self._timeout = timeout
+        self._executor: ProcessPoolExecutor | None = None
+
+    @property
+    def size(self) -> int:
+        if self._size is not None:
+            return max(0, self._size)
+        return max(0, int(STOCK_CONFIG.get_config("render_pool_size").data))
+
+    @property
+    def timeout(self) -> float:
+        if self._timeout is not None:
+            return self._timeout
+        return float(STOCK_CONFIG.get_config("render_pool_timeout").data)
+
+    def _ensure_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn：fork 会把主进程的事件循环、线程与 pyplot 状态一起复制过去
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.size,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_worker_init,
+            )
+            logger.info(f"[SayuStock] 出图进程池已启动，worker 数 {self.size}")
+        return self._executor
+
+    async def start(self) -> None:
+        """提前拉起全部 worker 并等它们预热完（否则首个请求才启动，要多等一次 import + 预热）。"""
+        if self.size <= 0:
+            return
+        executor = self._ensure_executor()
+        await asyncio.gather(*(asyncio.wrap_future(executor.submit(int, 0)) for _ in range(self.size)))
+
+    def shutdown(self, *, kill: bool = False) -> None:
+        if self._executor is not None:
+            self._discard(self._executor, kill=kill)
+
+    def _discard(self, executor: ProcessPoolExecutor, *, kill: bool) -> bool:
+        """关掉 ``executor``，下个任务重建；它已经不是当前池（别的任务先重建过）就什么都不做。"""
+        if self._executor is not executor:
+            return False
+        self._executor = None
+        if kill:
+            _terminate_workers(executor)
+        executor.shutdown(wait=False, cancel_futures=True)
+        return True
+
+    async def render(self, job: RenderJob, options: EncodeOptions | None = None) -> RenderResult:
+        if options is None:
+            options = encode_options()
+        if self.size <= 0:
+            return await asyncio.to_thread(_run_job, job, options)
+
+        executor = self._ensure_executor()
+        future = asyncio.wrap_future(executor.submit(_run_job, job, options))
+        try:
+            return await asyncio.wait_for(future, timeout=self.timeout)
+        except asyncio.TimeoutError:
+            if self._discard(executor, kill=True):
+                logger.warning(f"[SayuStock] 出图超时（{job.kind}，{self.timeout:.0f}s），重建进程池")
+            return ErroText["renderTimeout"]
+        except BrokenProcessPool:
+            if self._discard(executor, kill=True):
+                logger.warning(f"[SayuStock] 出图进程池异常退出（{job.kind}），重建后改在线程内重画")
+            return await asyncio.to_thread(_run_job, job, options)
+
+
+RENDER_POOL = RenderPool()
+
+
+@on_core_start
+async def _start_render_pool() -> None:
+    try:
+        await RENDER_POOL.start()
+    except Exception as e:
+        logger.warning(f"[SayuStock] 出图进程池预热失败，首个请求时再启动: {e}")
+        RENDER_POOL.shutdown(kill=True)
+
+
+@on_core_shutdown
+async def _stop_render_pool() -> None:
+    RENDER_POOL.shutdown(kill=True)
@@ -47,6 +47,7 @@ ErroText = {
     "notStock": "❌不存在该股票，暂无数据...",
     "notOpen": "❌该股票未开盘，暂无数据...",
     "notMarket": "❌请后跟股票代码使用, 例如：个股 证券ETF",
+    "renderTimeout": "❌图表生成超时, 请稍后再试...",
 }
 
 VIX_LIST = {
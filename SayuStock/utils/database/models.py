@@ -10,7 +10,7 @@ from gsuid_core.utils.database.base_models import Bind, Type, T_Bind
 from . import papertrade_migration  # noqa: F401,E402
 from ..utils import convert_list
 
-# 导入 模拟盘 8 张表 + WebConsole 注册
+# 导入 模拟盘 8 张表 + 排行物化表 + 归档汇总表 + WebConsole 注册
 from .papertrade_models import (  # noqa: F401
     SayuPaperTrade,
     SayuPaperAccount,
@@ -21,12 +21,16 @@ from .papertrade_models import (  # noqa: F401
     SayuPaperWatchlist,
     SayuPaperTradeAdmin,
     SayuPaperAccountAdmin,
+    SayuPaperAccountStats,
+    SayuPaperArchiveMonth,
     SayuPaperDecisionAdmin,
     SayuPaperPositionAdmin,
     SayuPaperSnapshotAdmin,
     SayuPaperAgentPoolAdmin,
     SayuPaperWatchlistAdmin,
     SayuPaperBroadcastTarget,
+    SayuPaperAccountStatsAdmin,
+    SayuPaperArchiveMonthAdmin,
     SayuPaperBroadcastTargetAdmin,
 )
 
@@ -21,6 +21,10 @@
 
 全程幂等：``schema_migrated_v2`` 标记 + ``WHERE account_id = 0`` 形态的 UPDATE，
 中途被 kill 下次启动继续跑，不会把用户改过的盘名改回去。
+
+另有一个独立的钩子（``priority=-60``）补建模型上声明的复合索引（2026-10，见
+``ensure_composite_indexes``）：``create_all`` 只给新表建索引，老库的流水 / 决策 /
+快照表要靠它补齐。
 """
 
 from __future__ import annotations
@@ -28,14 +32,21 @@ from __future__ import annotations
 import re
 from typing import List, Tuple, Optional
 
-from sqlalchemy import text
+from sqlalchemy import Index, text, inspect
+from sqlalchemy.schema import CreateIndex
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from gsuid_core.logger import logger
 from gsuid_core.server import on_core_start_before
 from gsuid_core.utils.database.base_models import async_maker
 
-from .papertrade_models import DEFAULT_STRATEGY_ID, DEFAULT_ACCOUNT_NAME
+from .papertrade_models import (
+    DEFAULT_STRATEGY_ID,
+    DEFAULT_ACCOUNT_NAME,
+    SayuPaperTrade,
+    SayuPaperDecision,
+    SayuPaperSnapshot,
+)
 
 _ACCOUNT_TABLE = "sayupaperaccount"
 _BROADCAST_TABLE = "sayupaperbroadcasttarget"
@@ -451,3 +462,53 @@ async def papertrade_migrate_v2() -> None:
         return
     if skipped:
         logger.warning(f"{_LOG} 跳过：{skipped}")
+
+
+# ============================================================
+# 复合索引（2026-10）
+#
+# 流水 / 决策 / 快照三张 append-only 表只有单列索引，按盘取"今日成交""最近决策"
+# "最新快照"时 SQLite 只能走 account_id 单列索引再逐行过滤时间。复合索引声明在
+# 模型的 ``__table_args__`` 上（新库由 create_all 建好），这里给老库补建：先用
+# inspector 看索引在不在，再按当前方言编译 CREATE INDEX，三方言通用。
+# ============================================================
+def _composite_indexes() -> List[Index]:
+    tables = (SayuPaperTrade, SayuPaperDecision, SayuPaperSnapshot)
+    found: dict[str, Index] = {}
+    for model in tables:
+        for index in model.__table__.indexes:  # type: ignore[attr-defined]
+            if len(index.columns) > 1 and index.name:
+                found.setdefault(str(index.name), index)
+    return list(found.values())
+
+
+async def ensure_composite_indexes(session: AsyncSession) -> List[str]:
+    """补建缺失的复合索引，返回本次新建的索引名；单条失败记 warning 不抛。"""
+    created: List[str] = []
+    for index in _composite_indexes():
+        table = index.table.name if index.table is not None else ""
+        if not table or not await _has_table(session, table):
+            continue
+        names = await session.run_sync(lambda s: {i["name"] for i in inspect(s.connection()).get_indexes(table)})
+        if index.name in names:
+            continue
+        try:
+            await session.execute(CreateIndex(index))
+            await session.commit()
+            created.append(str(index.name))
+        except Exception as e:
+            await session.rollback()
+            logger.warning(f"{_LOG} 建复合索引 {index.name} 失败: {type(e).__name__}: {e}")
+    return created
+
+
+@on_core_start_before(priority=-60)
+async def papertrade_ensure_indexes() -> None:
+    try:
+        async with async_maker() as session:
+            created = await ensure_composite_indexes(session)
+    except Exception as e:
+        logger.exception(f"{_LOG} 复合索引检查异常: {e}")
+        return
+    if created:
+        logger.info(f"{_LOG} 已补建复合索引: {', '.join(created)}")
@@ -1,6 +1,6 @@
 """SayuStock 模拟盘数据库表。
 
-8 张表全部继承 BaseIDModel（只 id 主键）。**账本主键是 ``account_id``**——
+8 张账本表 + 1 张排行物化表 + 1 张归档汇总表，全部继承 BaseIDModel（只 id 主键）。**账本主键是 ``account_id``**——
 模拟盘是"命名的盘"，不是"群的财产"，同一个盘可以推送到任意多个群。
 WebConsole admin 一次性挂到"SayuStock 模拟盘"菜单分组下。
 
@@ -14,7 +14,7 @@ from typing import Optional
 from datetime import date, datetime
 
 from sqlmodel import Field
-from sqlalchemy import UniqueConstraint
+from sqlalchemy import Index, UniqueConstraint
 
 from gsuid_core.webconsole.mount_app import PageSchema, GsAdminModel, site
 from gsuid_core.utils.database.startup import exec_list
@@ -97,9 +97,17 @@ class SayuPaperPosition(BaseIDModel, table=True):
 # 3) 交易流水表（append-only）
 # ============================================================
 class SayuPaperTrade(BaseIDModel, table=True):
-    """模拟盘交易流水（append-only；不可改、不可删）"""
+    """模拟盘交易流水（append-only；不可改、不可删）
 
-    __table_args__ = {"extend_existing": True}
+    复合索引对应两类热查询：按盘取今日成交 / 最近流水（``account_id`` + 时间区间），
+    以及 T+1 锁定股数（再加 ``stock_code``）。老库由 ``papertrade_migration`` 补建。
+    """
+
+    __table_args__ = (
+        Index("ix_sayupapertrade_acc_exec", "account_id", "executed_at"),
+        Index("ix_sayupapertrade_acc_code_exec", "account_id", "stock_code", "executed_at"),
+        {"extend_existing": True},
+    )
 
     account_id: int = Field(default=0, title="模拟盘账户 ID", index=True)
     group_id: str = Field(default="", title="创建原群（仅排障）", index=True)
@@ -127,7 +135,10 @@ class SayuPaperTrade(BaseIDModel, table=True):
 class SayuPaperDecision(BaseIDModel, table=True):
     """模拟盘决策日志（每次心跳每个标的写一条；action=hold 也写）"""
 
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        Index("ix_sayupaperdecision_acc_created", "account_id", "created_at"),
+        {"extend_existing": True},
+    )
 
     account_id: int = Field(default=0, title="模拟盘账户 ID", index=True)
     group_id: str = Field(default="", title="创建原群（仅排障）", index=True)
@@ -149,7 +160,10 @@ class SayuPaperDecision(BaseIDModel, table=True):
 class SayuPaperSnapshot(BaseIDModel, table=True):
     """模拟盘每日净值快照（15:30 收盘后写）"""
 
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        Index("ix_sayupapersnapshot_acc_date", "account_id", "trade_date"),
+        {"extend_existing": True},
+    )
 
     account_id: int = Field(default=0, title="模拟盘账户 ID", index=True)
     group_id: str = Field(default="", title="创建原群（仅排障）", index=True)
@@ -248,6 +262,59 @@ class SayuPaperBroadcastTarget(BaseIDModel, table=True):
     created_at: datetime = Field(default_factory=datetime.now, title="添加时间")
 
 
+# ============================================================
+# 9) 排行物化表（快照的派生数据，每盘一行）
+# ============================================================
+class SayuPaperAccountStats(BaseIDModel, table=True):
+    """每个盘最新一条快照的物化统计，``模拟盘排行`` 直接按 ``rank`` 读前 N。
+
+    纯派生数据：``PaperSnapshotRepo`` 写快照时在同一事务内增量维护，
+    ``模拟盘排行重建`` 可随时从快照表全量重算，删了也不丢任何账本信息。
+    """
+
+    __table_args__ = {"extend_existing": True}
+
+    account_id: int = Field(title="模拟盘账户 ID", unique=True, index=True)
+    snapshot_id: Optional[int] = Field(default=None, title="最新快照 ID")
+    trade_date: date = Field(title="最新快照交易日")
+    total_equity: float = Field(default=0.0, title="总资产")
+    total_pnl: float = Field(default=0.0, title="累计盈亏")
+    total_pnl_pct: float = Field(default=0.0, title="累计收益率 %", index=True)
+    peak_equity: float = Field(default=0.0, title="历史最高总资产")
+    drawdown_pct: float = Field(default=0.0, title="当前回撤 %（≤0）")
+    max_drawdown_pct: float = Field(default=0.0, title="最大回撤 %（≤0）")
+    snapshot_days: int = Field(default=0, title="快照天数")
+    rank: int = Field(default=0, title="收益率排名（1 起）", index=True)
+    updated_at: datetime = Field(default_factory=datetime.now, title="更新时间")
+
+
+class SayuPaperArchiveMonth(BaseIDModel, table=True):
+    """已归档到冷文件的流水 / 决策，按 (盘, 类别, 月) 一行汇总。
+
+    老于保留期的整月流水 / 决策由 ``stock_papertrade/archive.py`` 搬到
+    ``papertrade_archive/{kind}/{YYYY-MM}/acc_{id}.jsonl.zst``，热表只留这行汇总：
+    ``aggregate_pnl`` 直接加这里的合计，历史列表按这里登记的月份去读冷文件。
+    没有汇总行的冷文件视为无效（写到一半 / 盘已清），读路径不看、下次归档清掉。
+    """
+
+    __table_args__ = (
+        UniqueConstraint("account_id", "kind", "month", name="ux_sayupaperarchivemonth_acc_kind_month"),
+        {"extend_existing": True},
+    )
+
+    account_id: int = Field(title="模拟盘账户 ID", index=True)
+    kind: str = Field(title="trade / decision")
+    month: str = Field(title="月份 YYYY-MM")
+    row_count: int = Field(default=0, title="归档行数")
+    realized_pnl: float = Field(default=0.0, title="已实现盈亏合计（仅 trade）")
+    amount: float = Field(default=0.0, title="成交额合计（仅 trade）")
+    fee: float = Field(default=0.0, title="手续费合计（仅 trade）")
+    first_at: Optional[datetime] = Field(default=None, title="最早一行时间")
+    last_at: Optional[datetime] = Field(default=None, title="最晚一行时间")
+    file_bytes: int = Field(default=0, title="冷文件字节数")
+    archived_at: datetime = Field(default_factory=datetime.now, title="归档时间")
+
+
 # ============================================================
 # WebConsole 注册（一次性挂到 "SayuStock 模拟盘" 菜单分组）
 # ============================================================
@@ -331,6 +398,26 @@ class SayuPaperBroadcastTargetAdmin(GsAdminModel):
     model = SayuPaperBroadcastTarget
 
 
+@site.register_admin
+class SayuPaperAccountStatsAdmin(GsAdminModel):
+    pk_name = "id"
+    page_schema = PageSchema(
+        label="模拟盘·排行统计",
+        icon="fa fa-bullhorn",
+    )
+    model = SayuPaperAccountStats
+
+
+@site.register_admin
+class SayuPaperArchiveMonthAdmin(GsAdminModel):
+    pk_name = "id"
+    page_schema = PageSchema(
+        label="模拟盘·归档汇总",
+        icon="fa fa-bullhorn",
+    )
+    model = SayuPaperArchiveMonth
+
+
 # ============================================================
 # 迁移 SQL（在 on_core_start_before 阶段的 trans_adapter 内执行）
 # 全部幂等：trans_adapter 对每条都 try/except pass，所以 SQLite/MySQL/PG
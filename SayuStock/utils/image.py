@@ -6,6 +6,7 @@ from playwright.async_api import async_playwright
 
 from gsuid_core.utils.image.convert import convert_img
 
+from .render_assets import FOOTER_PATH, texture_copy
 from ..stock_config.stock_config import STOCK_CONFIG
 
 TEXT_PATH = Path(__file__).parent / "texture2d"
@@ -15,7 +16,7 @@ scale: int = STOCK_CONFIG.get_config("mapcloud_scale").data
 
 
 def get_footer() -> Image.Image:
-    return Image.open(TEXT_PATH / "footer.png")
+    return texture_copy(FOOTER_PATH)
 
 
 def get_ICON() -> Image.Image:
@@ -30,7 +31,11 @@ def is_plotly_html(html: str) -> bool:
 async def render_image_by_pw(html_path: Path, w: int, h: int, _scale: int) -> Union[str, bytes]:
     if isinstance(html_path, str):
         return html_path
+    return await convert_img(await screenshot_html(html_path, w, h, _scale))
 
+
+async def screenshot_html(html_path: Path, w: int, h: int, _scale: int) -> bytes:
+    """用 Playwright 截 plotly 页面，返回原始 PNG 字节（未经 convert_img）。"""
     async with async_playwright() as p:
         browser = await p.chromium.launch(headless=True)
         if w == 0 or h == 0:
@@ -51,4 +56,4 @@ async def render_image_by_pw(html_path: Path, w: int, h: int, _scale: int) -> Un
         await page.wait_for_selector(".plot-container")
         png_bytes = await page.screenshot(type="png")
         await browser.close()
-        return await convert_img(png_bytes)
+        return png_bytes
@@ -0,0 +1,94 @@
+"""出图编码：PNG（可调压缩级别）/ 无损 WebP / 限定质量的 JPEG。
+
+个股、K 线、对比、云图最后都落到这里编码成字节再发出去，格式由配置决定：
+
+- ``png``：无损，``chart_png_compress_level`` 控制 zlib 级别。图表大片纯色，
+  低级别就能压得不错，级别越高越慢、收益越小；
+- ``webp``：无损 WebP，同样无损、通常比 PNG 小不少；
+- ``jpeg``：有损，质量由 ``chart_jpeg_quality`` 约束；关掉色度抽样，
+  红绿细字不糊。
+
+每张图都会记一行编码耗时与字节数，调参时直接看日志。
+"""
+
+from __future__ import annotations
+
+import time
+from io import BytesIO
+from dataclasses import dataclass
+
+from PIL import Image
+
+from gsuid_core.logger import logger
+
+from ..stock_config.stock_config import STOCK_CONFIG
+
+__all__ = [
+    "IMAGE_FORMATS",
+    "EncodeOptions",
+    "EncodedImage",
+    "encode_image",
+    "encode_options",
+]
+
+# 配置值 → (PIL 格式名, 文件扩展名)
+IMAGE_FORMATS: dict[str, tuple[str, str]] = {
+    "png": ("PNG", "png"),
+    "webp": ("WEBP", "webp"),
+    "jpeg": ("JPEG", "jpg"),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class EncodeOptions:
+    format: str = "png"
+    png_compress_level: int = 6
+    jpeg_quality: int = 90
+
+    @property
+    def ext(self) -> str:
+        return IMAGE_FORMATS.get(self.format, IMAGE_FORMATS["png"])[1]
+
+    def save_kwargs(self) -> dict[str, object]:
+        if self.format == "webp":
+            return {"format": "WEBP", "lossless": True}
+        if self.format == "jpeg":
+            return {"format": "JPEG", "quality": self.jpeg_quality, "subsampling": 0}
+        return {"format": "PNG", "compress_level": self.png_compress_level}
+
+
+@dataclass(frozen=True, slots=True)
+class EncodedImage:
+    data: bytes
+    ext: str
+    size: tuple[int, int]
+    encode_ms: float
+
+
+def encode_options() -> EncodeOptions:
+    """按当前配置生成编码参数（可 pickle，随出图任务一起交给 worker）。"""
+    fmt = str(STOCK_CONFIG.get_config("chart_image_format").data).lower()
+    return EncodeOptions(
+        format=fmt if fmt in IMAGE_FORMATS else "png",
+        png_compress_level=int(STOCK_CONFIG.get_config("chart_png_compress_level").data),
+        jpeg_quality=int(STOCK_CONFIG.get_config("chart_jpeg_quality").data),
+    )
+
+
+def encode_image(img: Image.Image, options: EncodeOptions | None = None, *, label: str = "chart") -> EncodedImage:
+    """把 PIL 图编码成字节，并记录耗时与大小。"""
+    if options is None:
+        options = EncodeOptions()
+    if options.format == "jpeg" and img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+
+    start = time.perf_counter()
+    output = BytesIO()
+    img.save(output, **options.save_kwargs())
+    encode_ms = (time.perf_counter() - start) * 1000
+    data = output.getvalue()
+    logger.info(
+        f"[SayuStock] 出图编码 {label}: {options.ext} {img.width}x{img.height}, "
+        f"{encode_ms:.1f}ms, {len(data) / 1024:.0f}KiB"
+    )
+    return EncodedImage(data=data, ext=options.ext, size=img.size, encode_ms=encode_ms)
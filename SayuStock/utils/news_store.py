@@ -0,0 +1,125 @@
+"""定长 + 过期的去重存储：双端队列记插入顺序，dict 按 id 索引。
+
+老的全局 ``NEWS`` 只增不减，每次拉新闻都从整张列表重建 ``seen_ids``，去重成本随
+开机以来见过的新闻总数线性增长；这里换成：
+
+- ``deque[(插入时间, key)]`` + ``dict[key → value]``：插入、去重、按 key 查都是 O(1)；
+- 超过 ``capacity`` 或早于 ``ttl_seconds`` 的条目从队首淘汰，内存不随运行时长增长；
+- 给了 ``path`` 就能 :meth:`save` / 启动时自动载入，重启后不会把旧新闻当新的再推一遍。
+
+插入时间用墙钟（``time.time``），持久化后跨进程仍然有效。
+"""
+
+import json
+import time
+from typing import Any, Dict, List, Deque, Tuple, Hashable, Iterator, Optional
+from pathlib import Path
+from collections import deque
+
+from gsuid_core.logger import logger
+
+
+class NewsStore:
+    """定长 + 过期的 key → value 存储（value 可省略，只做去重）。"""
+
+    def __init__(
+        self,
+        capacity: int = 1000,
+        ttl_seconds: float = 2 * 86400,
+        *,
+        path: Optional[Path] = None,
+    ):
+        self.capacity = max(1, capacity)
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+        self.meta: Dict[str, Any] = {}
+        self._order: Deque[Tuple[float, Hashable]] = deque()
+        self._by_key: Dict[Hashable, Any] = {}
+        self._dirty = False
+        if path is not None:
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._by_key)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._by_key
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._by_key)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        return self._by_key.get(key, default)
+
+    def add(self, key: Hashable, value: Any = None, *, now: Optional[float] = None) -> bool:
+        """插入一条；已存在返回 False（不刷新位置）。顺带淘汰超量 / 过期的队首。"""
+        if key in self._by_key:
+            return False
+        now = time.time() if now is None else now
+        self._order.append((now, key))
+        self._by_key[key] = value
+        self._dirty = True
+        self.expire(now)
+        return True
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """从队首淘汰超出容量或早于 TTL 的条目，返回淘汰条数。"""
+        now = time.time() if now is None else now
+        cutoff = now - self.ttl_seconds
+        dropped = 0
+        while self._order and (len(self._order) > self.capacity or self._order[0][0] < cutoff):
+            _, key = self._order.popleft()
+            self._by_key.pop(key, None)
+            dropped += 1
+        if dropped:
+            self._dirty = True
+        return dropped
+
+    def values(self) -> List[Any]:
+        """按插入顺序返回所有 value。"""
+        return [self._by_key[key] for _, key in self._order]
+
+    def clear(self) -> None:
+        self._order.clear()
+        self._by_key.clear()
+        self.meta.clear()
+        self._dirty = True
+
+    # ---------------- 持久化 ----------------
+    def save(self, force: bool = False) -> None:
+        """有改动时原子写回 ``path``（先写临时文件再替换）；失败只记日志。"""
+        if self.path is None or not (self._dirty or force):
+            return
+        payload = {
+            "meta": self.meta,
+            "entries": [[at, key, self._by_key[key]] for at, key in self._order],
+        }
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+            tmp.replace(self.path)
+            self._dirty = False
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"[SayuStock] 写新闻缓存失败 {self.path}: {e}")
+
+    def load(self) -> None:
+        """从 ``path`` 载入；文件不存在 / 损坏就当空库，载入后立即按当前时间淘汰。"""
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+            entries = payload["entries"]
+            meta = payload.get("meta") or {}
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"[SayuStock] 读新闻缓存失败 {self.path}，按空库处理: {e}")
+            return
+        self.clear()
+        self.meta.update(meta)
+        for at, key, value in entries:
+            key = tuple(key) if isinstance(key, list) else key
+            if key not in self._by_key:
+                self._order.append((float(at), key))
+                self._by_key[key] = value
+        self.expire()
+        self._dirty = False
@@ -0,0 +1,246 @@
+"""热门图预渲染：开盘 / 收盘前后很多群同时发同一条命令，每个都要付一遍拉数据 + 出图。
+
+- 命令层经 ``PRERENDER.serve(command, *args)`` 出图：按 (命令, 参数) 记请求频次；
+  若该目标有未过期的预渲染结果，直接返回，否则照常现渲染。结果的有效期是
+  刷新窗口（``mapcloud_refresh_minutes``）+ 单轮预算 + 一个调度间隔：下一轮要等
+  窗口满后的下一次定时触发才开始，再花至多一个预算才轮到它，有效期短于这段
+  时间的话，热门图在被新结果替换之前就会先过期、回落到现渲染；
+- 交易时段由定时任务调 ``PRERENDER.warm``：按频次取前 N 个目标**串行**重渲染一遍，
+  单轮总时长受预算约束（超时的单次出图也会被打断），没轮到的目标记下来，下一轮
+  排在最前面先补；每轮结束后频次衰减，旧热点自然退场；
+- 预渲染时发给 AI 的文字（``ai_return``）一并录下，命中时原样补发 ——
+  部分模型看不到图，文字是它唯一的输入，不能因为走了缓存就丢掉；
+- ``PRERENDER.stats`` 记命中率与命中时结果的「陈旧度」（距渲染完成的秒数）。
+
+只缓存 ``bytes``：字符串结果是错误提示（或非图内容），不预存。
+"""
+
+from __future__ import annotations
+
+import time
+import asyncio
+from typing import Callable, Awaitable
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from gsuid_core.logger import logger
+from gsuid_core.ai_core.trigger_bridge import ai_return as _ai_return
+
+from ..stock_config.stock_config import STOCK_CONFIG
+
+__all__ = [
+    "PRERENDER",
+    "PrerenderEntry",
+    "PrerenderKey",
+    "PrerenderStats",
+    "Prerenderer",
+    "ai_return",
+]
+
+Renderer = Callable[..., Awaitable[bytes | str]]
+
+# 跟踪的 (命令, 参数) 上限；超过后丢弃频次最低的
+_MAX_TRACKED = 256
+# 每轮预渲染后频次乘以该系数
+_SCORE_DECAY = 0.5
+# 定时任务的触发间隔（每分钟检查一次 ``due``），即窗口满后最多再晚这么久才开始下一轮
+_SCHEDULE_SLACK = 60.0
+
+_captured_texts: ContextVar[list[str] | None] = ContextVar("sayustock_prerender_texts", default=None)
+
+
+def ai_return(text: str) -> None:
+    """``ai_return`` 的透传包装：预渲染期间顺带记下文字，命中缓存时补发。"""
+    captured = _captured_texts.get()
+    if captured is not None:
+        captured.append(text)
+    _ai_return(text)
+
+
+@dataclass(frozen=True, slots=True)
+class PrerenderKey:
+    command: str
+    args: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True, slots=True)
+class PrerenderEntry:
+    data: bytes
+    texts: tuple[str, ...]
+    rendered_at: float
+    render_ms: float
+
+
+@dataclass(slots=True)
+class PrerenderStats:
+    hits: int = 0
+    misses: int = 0
+    warm_runs: int = 0
+    warmed: int = 0
+    warm_failures: int = 0
+    budget_skips: int = 0
+    stale_seconds_total: float = 0.0
+    stale_seconds_max: float = 0.0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    @property
+    def mean_stale_seconds(self) -> float:
+        return self.stale_seconds_total / self.hits if self.hits else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"命中 {self.hits}/{self.hits + self.misses} ({self.hit_ratio:.0%})，"
+            f"陈旧度 均值 {self.mean_stale_seconds:.0f}s / 最大 {self.stale_seconds_max:.0f}s，"
+            f"预渲染 {self.warmed} 次（失败 {self.warm_failures}，预算顺延 {self.budget_skips}），"
+            f"共 {self.warm_runs} 轮"
+        )
+
+
+def refresh_seconds() -> float:
+    return int(STOCK_CONFIG.get_config("mapcloud_refresh_minutes").data) * 60.0
+
+
+class Prerenderer:
+    """请求频次统计 + 预渲染结果存放处。"""
+
+    def __init__(
+        self,
+        *,
+        ttl: Callable[[], float] = refresh_seconds,
+        clock: Callable[[], float] = time.monotonic,
+        max_tracked: int = _MAX_TRACKED,
+    ) -> None:
+        self.ttl = ttl
+        self.clock = clock
+        self.max_tracked = max_tracked
+        self.stats = PrerenderStats()
+        self._renderers: dict[str, Renderer] = {}
+        self._scores: dict[PrerenderKey, float] = {}
+        self._entries: dict[PrerenderKey, PrerenderEntry] = {}
+        self._last_warm: float | None = None
+        # 最近一轮的预算（秒），结果有效期要覆盖下一轮把它重渲染完的时间
+        self._budget = 0.0
+        # 上一轮因预算没轮到的目标，下一轮先渲染
+        self._deferred: list[PrerenderKey] = []
+        self._lock = asyncio.Lock()
+
+    def register(self, command: str, renderer: Renderer) -> None:
+        """登记命令的出图函数，``renderer(*args)`` 须与命令层现渲染时的调用一致。"""
+        self._renderers[command] = renderer
+
+    def record(self, key: PrerenderKey) -> None:
+        self._scores[key] = self._scores.get(key, 0.0) + 1.0
+        if len(self._scores) > self.max_tracked:
+            coldest = min(self._scores, key=self._scores.__getitem__)
+            del self._scores[coldest]
+
+    def top(self, n: int) -> list[PrerenderKey]:
+        """按频次从高到低取前 n 个可预渲染的目标。"""
+        keys = [key for key in self._scores if key.command in self._renderers]
+        keys.sort(key=self._scores.__getitem__, reverse=True)
+        return keys[:n]
+
+    def entry_lifetime(self) -> float:
+        """预渲染结果的有效期：刷新窗口 + 单轮预算 + 调度间隔，保证下一轮替换前不断档。"""
+        return self.ttl() + self._budget + _SCHEDULE_SLACK
+
+    def fresh_entry(self, key: PrerenderKey) -> PrerenderEntry | None:
+        entry = self._entries.get(key)
+        if entry is None or self.clock() - entry.rendered_at >= self.entry_lifetime():
+            return None
+        return entry
+
+    async def serve(self, command: str, *args: str) -> bytes | str:
+        """命令层出图入口：有新鲜的预渲染结果就直接用，否则现渲染。"""
+        key = PrerenderKey(command, args)
+        self.record(key)
+        entry = self.fresh_entry(key)
+        if entry is None:
+            self.stats.misses += 1
+            return await self._renderers[command](*args)
+
+        age = self.clock() - entry.rendered_at
+        self.stats.hits += 1
+        self.stats.stale_seconds_total += age
+        self.stats.stale_seconds_max = max(self.stats.stale_seconds_max, age)
+        logger.info(f"[SayuStock] 预渲染命中 {command} {' '.join(args)}（{age:.0f}s 前渲染）")
+        for text in entry.texts:
+            _ai_return(text)
+        return entry.data
+
+    async def _render(self, key: PrerenderKey) -> PrerenderEntry | str:
+        token = _captured_texts.set([])
+        start = self.clock()
+        try:
+            data = await self._renderers[key.command](*key.args)
+            texts = tuple(_captured_texts.get() or ())
+        finally:
+            _captured_texts.reset(token)
+        if not isinstance(data, bytes):
+            return data if isinstance(data, str) else "非图片结果"
+        end = self.clock()
+        return PrerenderEntry(data, texts, end, (end - start) * 1000)
+
+    def due(self) -> bool:
+        """距上一轮预渲染是否已满一个刷新窗口。"""
+        return self._last_warm is None or self.clock() - self._last_warm >= self.ttl()
+
+    async def warm(self, top_n: int, budget_seconds: float) -> int:
+        """按频次串行预渲染前 top_n 个目标，总时长不超过 budget_seconds；返回成功个数。
+
+        上一轮没轮到的目标（仍在前 top_n 里的）排在最前；本轮没轮到的留给下一轮。
+        """
+        if self._lock.locked():
+            return 0
+        async with self._lock:
+            self._last_warm = self.clock()
+            self._budget = float(budget_seconds)
+            deadline = self._last_warm + budget_seconds
+            targets = self.top(top_n)
+            deferred = [key for key in self._deferred if key in targets]
+            order = deferred + [key for key in targets if key not in deferred]
+            self._deferred = []
+            warmed = 0
+            for index, key in enumerate(order):
+                remaining = deadline - self.clock()
+                if remaining <= 0:
+                    self._deferred = order[index:]
+                    self.stats.budget_skips += len(self._deferred)
+                    break
+                try:
+                    result = await asyncio.wait_for(self._render(key), timeout=remaining)
+                except asyncio.TimeoutError:
+                    # 单次出图把预算用完了：放到下一轮的最后，别让它一直挡着后面的目标
+                    self._deferred = order[index + 1 :] + [key]
+                    self.stats.budget_skips += len(self._deferred)
+                    logger.warning(f"[SayuStock] 预渲染超出预算 {key.command} {' '.join(key.args)}，顺延到下一轮")
+                    break
+                except Exception as e:
+                    result = repr(e)
+                if isinstance(result, str):
+                    self.stats.warm_failures += 1
+                    self._entries.pop(key, None)
+                    logger.warning(f"[SayuStock] 预渲染失败 {key.command} {' '.join(key.args)}: {result[:80]}")
+                    continue
+                self._entries[key] = result
+                warmed += 1
+
+            # 掉出前 N 的目标不再保留结果；频次衰减，让热点随时间更替
+            for key in [k for k in self._entries if k not in targets]:
+                del self._entries[key]
+            for key in list(self._scores):
+                self._scores[key] *= _SCORE_DECAY
+                if self._scores[key] < 0.01:
+                    del self._scores[key]
+
+            self.stats.warm_runs += 1
+            self.stats.warmed += warmed
+            logger.info(f"[SayuStock] 预渲染 {warmed}/{len(targets)}，{self.stats.summary()}")
+            return warmed
+
+
+PRERENDER = Prerenderer()
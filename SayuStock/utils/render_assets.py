@@ -0,0 +1,118 @@
+"""PIL 卡片的渲染素材层：字体、纹理、预合成的静态底图，以及按行 / 按格贴图。
+
+大盘概览、我的自选、全天候、模拟盘持仓这几张卡片原先每画一行就 ``Image.open``
+一次纹理（PNG 重新解码）、每写一段字就 ``ss_font`` 一次（重新打开字体文件），
+整张底图（底色 + 各栏标题条 + footer）也每次从零拼。这里把不变的东西只做一次：
+
+- ``font(size, family)``：按 (字族, 字号) 缓存 FreeType 字体；
+- ``texture(path)``：解码后的纹理常驻内存，**只读共享**，要往上画字请用
+  ``texture_copy``；
+- ``static_layer(key, build)``：把与数据无关的底图预合成一次，每次请求拿一份拷贝，
+  卡片只画动态内容；
+- ``stamp`` / ``stamp_rows`` / ``stamp_grid``：按 alpha 贴卡片、列表行、指数格。
+
+叠放顺序有讲究：只有不透明像素与动态内容互不重叠的元素才能放进静态底图
+（先画后画结果才一致）；随数据变化的纹理（例如标题情绪图）仍按请求用缓存纹理贴。
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Hashable, Iterable
+from pathlib import Path
+from functools import lru_cache
+from collections import OrderedDict
+
+from PIL import Image, ImageFont
+
+from gsuid_core.utils.fonts.fonts import core_font as ss_font
+
+__all__ = [
+    "FOOTER_PATH",
+    "clear_assets",
+    "font",
+    "stamp",
+    "stamp_grid",
+    "stamp_rows",
+    "static_layer",
+    "texture",
+    "texture_copy",
+]
+
+FOOTER_PATH = Path(__file__).parent / "texture2d" / "footer.png"
+
+# 默认字族即 gsuid_core 的 MiSans（core_font）；其它字族传字体文件路径
+CORE_FAMILY = "core"
+
+# 底图动辄 1700x2860 RGBA（约 19MB），按条数 / 尺寸分键，数量必须有上限
+_STATIC_LAYER_MAX = 16
+_static_layers: OrderedDict[Hashable, Image.Image] = OrderedDict()
+
+
+@lru_cache(maxsize=None)
+def font(size: int, family: str = CORE_FAMILY) -> ImageFont.FreeTypeFont:
+    """按 (字族, 字号) 缓存字体；字体对象本身无状态，可跨卡片共享。"""
+    if family == CORE_FAMILY:
+        return ss_font(size)
+    return ImageFont.truetype(family, size)
+
+
+@lru_cache(maxsize=64)
+def texture(path: Path) -> Image.Image:
+    """解码好的纹理（只读共享，直接 paste / 当 mask 用）。"""
+    img = Image.open(path)
+    img.load()
+    return img
+
+
+def texture_copy(path: Path, mode: str | None = None) -> Image.Image:
+    """纹理的私有拷贝，可以在上面写字；mode 非空时顺带转换。"""
+    img = texture(path)
+    if mode is not None and img.mode != mode:
+        return img.convert(mode)
+    return img.copy()
+
+
+def static_layer(key: Hashable, build: Callable[[], Image.Image]) -> Image.Image:
+    """取预合成静态底图的一份拷贝；首次（或被淘汰后）用 build 现合成。"""
+    layer = _static_layers.get(key)
+    if layer is None:
+        layer = build()
+        _static_layers[key] = layer
+        while len(_static_layers) > _STATIC_LAYER_MAX:
+            _static_layers.popitem(last=False)
+    else:
+        _static_layers.move_to_end(key)
+    return layer.copy()
+
+
+def clear_assets() -> None:
+    """丢掉全部缓存（换了纹理 / 字体文件后调用）。"""
+    font.cache_clear()
+    texture.cache_clear()
+    _static_layers.clear()
+
+
+def stamp(canvas: Image.Image, tile: Image.Image, xy: tuple[int, int]) -> None:
+    """按 tile 自身的 alpha 贴到 canvas 上（无 alpha 的整块覆盖）。"""
+    canvas.paste(tile, xy, tile if tile.mode in ("RGBA", "LA") else None)
+
+
+def stamp_rows(canvas: Image.Image, tiles: Iterable[Image.Image], x: int, y: int, step: int) -> None:
+    """自上而下逐行贴，行距 step。"""
+    for index, tile in enumerate(tiles):
+        stamp(canvas, tile, (x, y + step * index))
+
+
+def stamp_grid(
+    canvas: Image.Image,
+    tiles: Iterable[Image.Image],
+    x: int,
+    y: int,
+    *,
+    cols: int,
+    dx: int,
+    dy: int,
+) -> None:
+    """按 cols 列从左到右、从上到下贴格子。"""
+    for index, tile in enumerate(tiles):
+        stamp(canvas, tile, (x + dx * (index % cols), y + dy * (index // cols)))
@@ -0,0 +1,255 @@
+"""按内容哈希缓存出图结果（编码好的图片字节）。
+
+``mapcloud_refresh_minutes`` 那套按文件 mtime 判断的缓存只管「多久内不重画」，
+过了窗口就算数据一模一样（收盘后、冷门板块）也要再跑一遍 matplotlib / Playwright。
+这里换个维度：**输入没变，图就没变**。
+
+- 键：``stable_hash`` 对出图输入（领域模型 / render-data dataclass / DataFrame）
+  逐字段做 blake2b，外加图表种类与尺寸参数，跨进程、跨重启稳定（不用 ``hash()``）；
+- 内存层：按字节预算淘汰的 LRU，热门图直接返回；
+- 磁盘层：``DATA_PATH/render_<key>.<ext>``，重启后仍可命中。盘中数据一变键就变，
+  每次刷新都会落一张新图，所以磁盘层同样按总字节数 / 文件数做 LRU（命中时刷新
+  mtime，重启后按 mtime 重建顺序），超出就删最久没用的；每日的
+  ``stock_cache_retention_days`` 清理任务照旧兜底。
+
+``RENDER_CACHE_VERSION`` 随绘图样式变更递增，旧图自然失效。
+"""
+
+from __future__ import annotations
+
+import os
+import enum
+import math
+import asyncio
+import hashlib
+import dataclasses
+from pathlib import Path
+from datetime import date, time, datetime, timedelta
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from gsuid_core.logger import logger
+
+from .resource_path import DATA_PATH
+
+__all__ = [
+    "RENDER_CACHE",
+    "RENDER_CACHE_VERSION",
+    "RenderCache",
+    "stable_hash",
+]
+
+# 绘图样式 / 编码参数有变化时递增，让旧缓存整体失效
+RENDER_CACHE_VERSION = 1
+
+_MEMORY_BUDGET_BYTES = 64 * 1024 * 1024
+_MEMORY_MAX_ENTRIES = 128
+_DISK_BUDGET_BYTES = 256 * 1024 * 1024
+_DISK_MAX_FILES = 2000
+
+
+def _feed(h: "hashlib.blake2b", obj: object) -> None:
+    """把 obj 以「类型标签 + 规范化内容」喂给哈希；同值同序列化，跨进程稳定。"""
+    if obj is None:
+        h.update(b"N")
+    elif isinstance(obj, bool):
+        h.update(b"B1" if obj else b"B0")
+    elif isinstance(obj, enum.Enum):
+        h.update(f"E{type(obj).__name__}.{obj.name};".encode())
+    elif isinstance(obj, int):
+        h.update(f"I{obj};".encode())
+    elif isinstance(obj, float):
+        # NaN 各种位模式统一成一个；-0.0 与 0.0 视为同值
+        h.update(b"Fnan;" if math.isnan(obj) else f"F{(obj + 0.0).hex()};".encode())
+    elif isinstance(obj, str):
+        data = obj.encode()
+        h.update(f"S{len(data)}:".encode())
+        h.update(data)
+    elif isinstance(obj, bytes):
+        h.update(f"Y{len(obj)}:".encode())
+        h.update(obj)
+    elif isinstance(obj, (datetime, date, time)):
+        h.update(f"T{obj.isoformat()};".encode())
+    elif isinstance(obj, timedelta):
+        h.update(f"D{obj.total_seconds()!r};".encode())
+    elif isinstance(obj, pd.DataFrame):
+        h.update(b"P")
+        _feed(h, [str(c) for c in obj.columns])
+        h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    elif isinstance(obj, (pd.Series, pd.Index)):
+        h.update(b"Q")
+        h.update(pd.util.hash_pandas_object(obj, index=isinstance(obj, pd.Series)).to_numpy().tobytes())
+    elif obj is pd.NaT:
+        h.update(b"NaT")
+    elif isinstance(obj, np.ndarray):
+        h.update(f"A{obj.dtype.str}{obj.shape};".encode())
+        if obj.dtype == object:
+            _feed(h, obj.tolist())
+        else:
+            h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, np.generic):
+        _feed(h, obj.item())
+    elif dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        h.update(f"C{type(obj).__name__}(".encode())
+        for field in dataclasses.fields(obj):
+            h.update(f"{field.name}=".encode())
+            _feed(h, getattr(obj, field.name))
+        h.update(b")")
+    elif isinstance(obj, (list, tuple)):
+        h.update(f"L{len(obj)}[".encode())
+        for item in obj:
+            _feed(h, item)
+        h.update(b"]")
+    elif isinstance(obj, dict):
+        h.update(f"M{len(obj)}{{".encode())
+        for key in sorted(obj, key=repr):
+            _feed(h, key)
+            _feed(h, obj[key])
+        h.update(b"}")
+    elif isinstance(obj, (set, frozenset)):
+        _feed(h, sorted(obj, key=repr))
+    else:
+        raise TypeError(f"stable_hash 不支持的类型: {type(obj).__name__}")
+
+
+def stable_hash(*parts: object) -> str:
+    """对任意个出图输入计算稳定的内容哈希（32 位十六进制）。"""
+    h = hashlib.blake2b(digest_size=16)
+    _feed(h, RENDER_CACHE_VERSION)
+    for part in parts:
+        _feed(h, part)
+    return h.hexdigest()
+
+
+class RenderCache:
+    """内存 LRU + 磁盘两级的图片字节缓存。"""
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        memory_budget: int = _MEMORY_BUDGET_BYTES,
+        max_entries: int = _MEMORY_MAX_ENTRIES,
+        disk_budget: int = _DISK_BUDGET_BYTES,
+        disk_max_files: int = _DISK_MAX_FILES,
+    ) -> None:
+        self.directory = directory
+        self.memory_budget = memory_budget
+        self.max_entries = max_entries
+        self.disk_budget = disk_budget
+        self.disk_max_files = disk_max_files
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._memory_bytes = 0
+        # 磁盘层 LRU：路径 → 字节数，最久未用在前；首次用到时按 mtime 扫目录建好
+        self._disk: OrderedDict[Path, int] | None = None
+        self._disk_bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.disk_evictions = 0
+
+    def _path(self, key: str, ext: str) -> Path:
+        return self.directory / f"render_{key}.{ext}"
+
+    def _remember(self, key: str, data: bytes) -> None:
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= len(old)
+        if len(data) > self.memory_budget:
+            return
+        self._memory[key] = data
+        self._memory_bytes += len(data)
+        while self._memory and (self._memory_bytes > self.memory_budget or len(self._memory) > self.max_entries):
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def _scan_disk(self) -> OrderedDict[Path, int]:
+        """按 mtime 从旧到新列出已有的 ``render_*`` 文件（跳过写了一半的 .tmp）。"""
+        found: list[tuple[float, Path, int]] = []
+        try:
+            paths = list(self.directory.glob("render_*"))
+        except OSError:
+            paths = []
+        for path in paths:
+            if path.suffix == ".tmp":
+                continue
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            found.append((st.st_mtime, path, st.st_size))
+        found.sort(key=lambda item: item[0])
+        return OrderedDict((path, size) for _, path, size in found)
+
+    async def _disk_index(self) -> OrderedDict[Path, int]:
+        if self._disk is None:
+            index = await asyncio.to_thread(self._scan_disk)
+            if self._disk is None:
+                self._disk = index
+                self._disk_bytes = sum(index.values())
+        return self._disk
+
+    async def _track_disk(self, path: Path, size: int) -> None:
+        """记一次磁盘层写入 / 命中，超出字节数或文件数时删掉最久没用的文件。"""
+        index = await self._disk_index()
+        self._disk_bytes += size - index.pop(path, 0)
+        index[path] = size
+        victims: list[Path] = []
+        while len(index) > 1 and (self._disk_bytes > self.disk_budget or len(index) > self.disk_max_files):
+            victim, victim_size = index.popitem(last=False)
+            self._disk_bytes -= victim_size
+            victims.append(victim)
+        if victims:
+            self.disk_evictions += len(victims)
+            await asyncio.to_thread(_unlink_all, victims)
+
+    async def get(self, key: str, ext: str = "png") -> bytes | None:
+        data = self._memory.get(key)
+        if data is not None:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return data
+        path = self._path(key, ext)
+        try:
+            data = await asyncio.to_thread(path.read_bytes)
+        except OSError:
+            self.misses += 1
+            return None
+        self.disk_hits += 1
+        self._remember(key, data)
+        try:
+            # 刷新 mtime：重启后按 mtime 重建 LRU，清理任务也不会先删常用的图
+            await asyncio.to_thread(os.utime, path)
+        except OSError:
+            pass
+        await self._track_disk(path, len(data))
+        return data
+
+    async def put(self, key: str, data: bytes, ext: str = "png") -> None:
+        self._remember(key, data)
+        path = self._path(key, ext)
+        tmp = path.with_suffix(f".{ext}.tmp")
+        try:
+            await asyncio.to_thread(tmp.write_bytes, data)
+            await asyncio.to_thread(tmp.replace, path)
+        except OSError as e:
+            logger.warning(f"[SayuStock] 出图缓存落盘失败: {e}")
+            return
+        await self._track_disk(path, len(data))
+
+    def clear_memory(self) -> None:
+        self._memory.clear()
+        self._memory_bytes = 0
+
+
+def _unlink_all(paths: list[Path]) -> None:
+    for path in paths:
+        try:
+            path.unlink(missing_ok=True)
+        except OSError as e:
+            logger.debug(f"[SayuStock] 删除出图缓存失败: {e}")
+
+
+RENDER_CACHE = RenderCache(DATA_PATH)
@@ -13,6 +13,9 @@ from playwright.async_api import async_playwright
 from gsuid_core.logger import logger
 
 from .models import XueQiu7x24
+from .news_store import NewsStore
+from .resource_path import DATA_PATH
+from .xueqiu_cookie import XueqiuCookieManager
 
 UA = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"  # noqa: E501
 
@@ -24,16 +27,17 @@ _HEADER: Dict[str, str] = {
 
 NEWS_API = "https://xueqiu.com/statuses/livenews/list.json"
 
-NEWS: XueQiu7x24 = {
-    "next_max_id": 0,
-    "items": [],
-    "next_id": 0,
-}
+# 雪球 7x24：定长 + 2 天过期，落盘到 data/，重启不丢去重状态
+NEWS_STORE_CAPACITY = 1000
+NEWS_STORE_TTL_SECONDS = 2 * 86400
+NEWS_STORE = NewsStore(NEWS_STORE_CAPACITY, NEWS_STORE_TTL_SECONDS, path=DATA_PATH / "xueqiu_news.json")
 XUEQIU_TOKEN = ""
+# Cookie 的过期时间取这一项的；拿不到时由 XueqiuCookieManager 按 default_ttl（12 小时）估
+_XUEQIU_COOKIE_KEY = "xq_a_token"
 
 
-async def get_token() -> object:
-    global XUEQIU_TOKEN
+async def _fetch_cookie_with_browser() -> Tuple[str, Optional[float]]:
+    """起一个 Chromium 打开雪球首页，返回 (Cookie 串, xq_a_token 过期时间戳)。"""
     async with async_playwright() as p:
         # 启动浏览器（默认 Chromium）
         browser = await p.chromium.launch(
@@ -55,21 +59,65 @@ async def get_token() -> object:
             cookies = await context.cookies()
             logger.debug(f"[SayuStock] 获取Cookie: {cookies}")
             cl = [f"{cookie['name']}={cookie['value']}" for cookie in cookies if "name" in cookie and "value" in cookie]
-            XUEQIU_TOKEN = ";".join(cl)
-            _HEADER["Cookie"] = XUEQIU_TOKEN
-            logger.debug(f"[SayuStock] 设置Cookie: {XUEQIU_TOKEN}")
-            return XUEQIU_TOKEN
+            # 会话 Cookie 的 expires 是 -1，不参与估算
+            expires = [
+                float(c["expires"]) for c in cookies if c.get("name") == _XUEQIU_COOKIE_KEY and c.get("expires", -1) > 0
+            ]
+            return ";".join(cl), (min(expires) if expires else None)
         finally:
             await browser.close()
 
 
+async def _probe_cookie(cookie: str) -> bool:
+    """用一条最小的快讯请求探活：不报 400016 即视为可用。"""
+    async with ClientSession(connector=TCPConnector(verify_ssl=True)) as client:
+        async with client.get(
+            NEWS_API,
+            headers={**_HEADER, "Cookie": cookie},
+            params={"count": 1, "max_id": 0},
+            timeout=ClientTimeout(total=10),
+        ) as resp:
+            try:
+                raw_data = await resp.json()
+            except (ContentTypeError, json.decoder.JSONDecodeError):
+                return resp.status == 200
+            return resp.status == 200 and not (isinstance(raw_data, dict) and raw_data.get("error_code") == "400016")
+
+
+def _apply_cookie(cookie: str) -> None:
+    global XUEQIU_TOKEN
+    XUEQIU_TOKEN = cookie
+    _HEADER["Cookie"] = cookie
+    logger.debug(f"[SayuStock] 设置Cookie: {XUEQIU_TOKEN}")
+
+
+XUEQIU_COOKIE = XueqiuCookieManager(
+    DATA_PATH / "xueqiu_cookie.json",
+    _fetch_cookie_with_browser,
+    _probe_cookie,
+    on_change=_apply_cookie,
+)
+
+
+async def get_token() -> object:
+    """强制刷新雪球 Cookie（并发调用只起一次浏览器）。"""
+    return await XUEQIU_COOKIE.refresh("手动刷新")
+
+
 async def clean_news() -> None:
-    global NEWS
-    NEWS = {
-        "next_max_id": 0,
-        "items": [],
-        "next_id": 0,
-    }
+    """淘汰过期新闻并落盘（不再整表清空：清空会丢掉去重状态）。"""
+    NEWS_STORE.expire()
+    NEWS_STORE.save()
+
+
+def _news_snapshot() -> XueQiu7x24:
+    """按 id 从新到旧排好的新闻视图（与雪球接口单页顺序一致）。"""
+    items = sorted(NEWS_STORE.values(), key=lambda item: item["id"], reverse=True)
+    return XueQiu7x24(
+        next_max_id=NEWS_STORE.meta.get("next_max_id", 0),
+        items=items,
+        next_id=NEWS_STORE.meta.get("next_id", 0),
+    )
 
 
 async def get_news_list(
@@ -93,11 +141,8 @@ async def get_news_list(
 async def get_news(
     max_id: int = 0,
 ) -> Union[int, Tuple[int, XueQiu7x24]]:
-    global NEWS
     _max_id = max_id
     return_max_id = max_id
-    # 用 seen_ids 防止同一新闻被反复 append 进全局 NEWS
-    seen_ids: set = {item["id"] for item in NEWS["items"]}
 
     for i in range(3):
         data = await get_news_list(max_id=_max_id)
@@ -113,16 +158,17 @@ async def get_news(
         if data["items"][0]["id"] <= max_id:
             break
 
+        # NEWS_STORE 按 id 去重，O(1)
         for item in data["items"]:
-            if item["id"] > max_id and item["id"] not in seen_ids:
-                NEWS["items"].append(item)
-                seen_ids.add(item["id"])
+            if item["id"] > max_id:
+                NEWS_STORE.add(item["id"], item)
 
-        NEWS["next_id"] = data["next_id"]
-        NEWS["next_max_id"] = data["next_max_id"]
+        NEWS_STORE.meta["next_id"] = data["next_id"]
+        NEWS_STORE.meta["next_max_id"] = data["next_max_id"]
         _max_id = data["next_max_id"]
 
-    return return_max_id, NEWS
+    NEWS_STORE.save()
+    return return_max_id, _news_snapshot()
 
 
 async def stock_request(
@@ -133,6 +179,9 @@ async def stock_request(
     _json: Optional[Dict[str, Any]] = None,
     data: Optional[FormData] = None,
 ) -> Union[Dict, int]:
+    if header is _HEADER:
+        # 磁盘上的 Cookie 还有效就不起浏览器；临期会在后台刷新
+        await XUEQIU_COOKIE.get()
     async with ClientSession(connector=TCPConnector(verify_ssl=True)) as client:
         for _ in range(2):
             async with client.request(
@@ -151,7 +200,8 @@ async def stock_request(
                     raw_data = {"code": -999, "data": _raw_data}
                 logger.debug(raw_data)
                 if "error_code" in raw_data and raw_data["error_code"] == "400016":
-                    await get_token()
+                    # 并发请求一起报失效时只刷新一次；别人刚刷过就直接用新的
+                    header["Cookie"] = await XUEQIU_COOKIE.invalidate(header.get("Cookie", ""))
                     continue
 
                 if resp.status != 200:
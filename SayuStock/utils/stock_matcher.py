@@ -0,0 +1,166 @@
+"""新闻 → 个股关联：Aho-Corasick 多模式匹配，一遍扫完文本。
+
+老做法是逐个名字 ``name in text``，成本是"名字数 × 文本长度"；名字一多（全 A 股
+5000+ 只）就没法对每条新闻都跑。这里把 ``chinese_stocks.json`` 里的全称、
+6 位代码，再加上调用方给的别名，一次性编译成自动机，每条文本只扫一遍：
+
+- 全称：``贵州茅台``；代码：``600519``（前后紧挨数字 / 英文字母时不算，避免吃进金额、编号）；
+- 别名：调用方传入（如 ``茅台``、``宁德``），优先级最高。
+
+简称不自动派生：去掉 ``股份`` / ``集团`` / ``控股`` 之类后缀剩下的两字简称上千个都是
+常用词（``武汉``、``统一``、``美的``、``龙头``），"武汉发布暴雨预警" 会被当成武汉控股。
+要认的简称由调用方作为别名逐个列出。
+
+同一段文字命中多个模式时取"最左、最长"：``平安银行`` 不会再被拆成别名 ``平安`` →
+中国平安。纯 Python 实现，不依赖第三方库。
+"""
+
+from typing import Dict, List, Tuple, Generic, Mapping, TypeVar, Iterable, Iterator, Optional, NamedTuple
+from functools import lru_cache
+
+from .constant import chinese_stocks
+
+V = TypeVar("V")
+
+
+class AhoCorasick(Generic[V]):
+    """字典树 + 失败指针 + 输出链接的多模式匹配自动机。"""
+
+    def __init__(self, patterns: Mapping[str, V]):
+        self._goto: List[Dict[str, int]] = [{}]
+        # 以该状态结尾的模式：(长度, 值)；没有记 None
+        self._out: List[Optional[Tuple[int, V]]] = [None]
+        self._fail: List[int] = [0]
+        # 沿失败链第一个带输出的状态（不含自身），没有记 0
+        self._dict_link: List[int] = [0]
+        for pattern, value in patterns.items():
+            if pattern:
+                self._insert(pattern, value)
+        self._link()
+
+    def __len__(self) -> int:
+        return sum(1 for out in self._out if out is not None)
+
+    def _insert(self, pattern: str, value: V) -> None:
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._out.append(None)
+                self._fail.append(0)
+                self._dict_link.append(0)
+            state = nxt
+        self._out[state] = (len(pattern), value)
+
+    def _link(self) -> None:
+        # 按 BFS 顺序补失败指针：子节点的失败指针 = 父节点失败链上第一个有同字符边的状态
+        queue: List[int] = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for ch, child in self._goto[state].items():
+                queue.append(child)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                fail = self._fail[child]
+                self._dict_link[child] = fail if self._out[fail] is not None else self._dict_link[fail]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, V]]:
+        """逐个产出所有命中（可重叠）：``(起, 止, 值)``，按结束位置递增。"""
+        goto, fail, out, dict_link = self._goto, self._fail, self._out, self._dict_link
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            node = state if out[state] is not None else dict_link[state]
+            while node:
+                length, value = out[node]  # type: ignore[misc]
+                yield i + 1 - length, i + 1, value
+                node = dict_link[node]
+
+
+class StockMention(NamedTuple):
+    code: str
+    name: str
+    start: int
+    end: int
+    matched: str
+
+
+def _is_code_char(ch: str) -> bool:
+    return ch.isascii() and ch.isalnum()
+
+
+def _leftmost_longest(matches: Iterable[Tuple[int, int, V]]) -> List[Tuple[int, int, V]]:
+    """重叠的命中只留最左、最长的那个。"""
+    picked: List[Tuple[int, int, V]] = []
+    last_end = -1
+    for start, end, value in sorted(matches, key=lambda m: (m[0], m[0] - m[1])):
+        if start >= last_end:
+            picked.append((start, end, value))
+            last_end = end
+    return picked
+
+
+class StockMatcher:
+    """全 A 股名字 / 代码 + 别名的匹配器；建一次，之后每条文本一遍扫完。"""
+
+    def __init__(self, stocks: Mapping[str, Mapping[str, str]], aliases: Optional[Mapping[str, str]] = None):
+        self.names: Dict[str, str] = {code: info.get("name", "") for code, info in stocks.items()}
+        patterns: Dict[str, str] = {}
+        # 全称：重名取先出现的
+        for code, name in self.names.items():
+            if len(name) >= 2:
+                patterns.setdefault(name, code)
+        for code in self.names:
+            patterns.setdefault(code, code)
+        for alias, code in (aliases or {}).items():
+            patterns[alias] = code
+        self._automaton: AhoCorasick[str] = AhoCorasick(patterns)
+
+    def __len__(self) -> int:
+        return len(self._automaton)
+
+    def find(self, text: str) -> List[StockMention]:
+        """文本里提到的股票（按出现位置，重叠取最左最长，代码要求前后不挨数字 / 字母）。"""
+        if not text:
+            return []
+        raw = (
+            (start, end, code)
+            for start, end, code in self._automaton.iter_matches(text)
+            if not text[start].isdigit()
+            or (
+                (start == 0 or not _is_code_char(text[start - 1]))
+                and (end == len(text) or not _is_code_char(text[end]))
+            )
+        )
+        return [
+            StockMention(code, self.names.get(code, ""), start, end, text[start:end])
+            for start, end, code in _leftmost_longest(raw)
+        ]
+
+    def codes(self, text: str) -> List[str]:
+        """去重后的股票代码，按首次出现顺序。"""
+        return list(dict.fromkeys(m.code for m in self.find(text)))
+
+    def tag_news(self, items: Iterable[Mapping[str, object]]) -> List[List[str]]:
+        """给每条新闻打上它提到的股票代码（取 ``text``，没有再取 ``desc``）。"""
+        return [self.codes(str(item.get("text") or item.get("desc") or "")) for item in items]
+
+
+@lru_cache(maxsize=4)
+def _cached_matcher(aliases: Tuple[Tuple[str, str], ...]) -> StockMatcher:
+    return StockMatcher(chinese_stocks, dict(aliases))
+
+
+def get_stock_matcher(aliases: Optional[Mapping[str, str]] = None) -> StockMatcher:
+    """按 ``chinese_stocks.json`` + 别名建好的进程内单例（同一组别名只建一次）。"""
+    return _cached_matcher(tuple(sorted((aliases or {}).items())))
@@ -3,6 +3,10 @@ import datetime
 import zoneinfo
 from enum import Enum, auto
 from typing import Dict, List, Tuple, Optional
+from functools import lru_cache
+
+import numpy as np
+from numpy.typing import NDArray
 
 
 class Market(Enum):
@@ -239,33 +243,64 @@ def _parse_em_code(code: str) -> Market:
     return Market.UNKNOWN
 
 
-def _generate_datetime_array(sessions: List[Tuple[str, str]]) -> List[datetime.datetime]:
-    """
-    一个健壮的函数，根据给定的时间段列表生成分钟级别的完整时间数组。
-    能够正确处理跨天的时间段，并保持正确的时间顺序。
+# 分钟模板的基准日：与旧实现里 strptime("%H:%M") 得到的 1900-01-01 保持一致
+_TEMPLATE_EPOCH = np.datetime64("1900-01-01", "m")
+
+
+@lru_cache(maxsize=64)
+def _session_minute_offsets(sessions: Tuple[Tuple[str, str], ...]) -> NDArray[np.timedelta64]:
     """
-    full_datetime_array: List[datetime.datetime] = []
-    delta = datetime.timedelta(minutes=1)
+    把一组交易时段编译成「距基准日 00:00 的分钟偏移」模板（``timedelta64[m]``）。
 
+    时段布局不随日期变化，按布局缓存；跨天时段（结束 <= 开始）结束时间进位一天，
+    重叠的分钟只保留第一次出现的位置，与逐分钟生成的顺序一致。
+    """
+    parts: List[NDArray[np.int64]] = []
     for start_str, end_str in sessions:
         try:
-            # 使用一个固定的日期（如1900-01-01）来创建datetime对象，以便进行时间运算
-            # 这样做可以在跨天交易中保留日期顺序，例如 21:30 -> 次日 04:00。
-            start_dt = datetime.datetime.strptime(start_str, "%H:%M")
-            end_dt = datetime.datetime.strptime(end_str, "%H:%M")
-
-            # 如果结束时间小于等于开始时间，说明是跨天交易，将结束日期加一天
-            if end_dt <= start_dt:
-                end_dt += datetime.timedelta(days=1)
-
-            current_dt = start_dt
-            while current_dt <= end_dt:
-                full_datetime_array.append(current_dt)
-                current_dt += delta
+            start = datetime.datetime.strptime(start_str, "%H:%M")
+            end = datetime.datetime.strptime(end_str, "%H:%M")
         except ValueError:
             continue
+        start_min = start.hour * 60 + start.minute
+        end_min = end.hour * 60 + end.minute
+        if end_min <= start_min:
+            end_min += 24 * 60
+        parts.append(np.arange(start_min, end_min + 1, dtype=np.int64))
+    if not parts:
+        return np.empty(0, dtype="timedelta64[m]")
+    minutes = np.concatenate(parts)
+    _, first = np.unique(minutes, return_index=True)
+    offsets = minutes[np.sort(first)].astype("timedelta64[m]")
+    offsets.setflags(write=False)
+    return offsets
+
+
+def _minute_template(
+    sessions: List[Tuple[str, str]],
+    base_day: Optional[datetime.date] = None,
+) -> NDArray[np.datetime64]:
+    """取缓存的分钟模板，一次向量加法平移到 ``base_day``（默认 1900-01-01）。"""
+    offsets = _session_minute_offsets(tuple((start, end) for start, end in sessions))
+    base = _TEMPLATE_EPOCH if base_day is None else np.datetime64(base_day, "D").astype("datetime64[m]")
+    return base + offsets
+
+
+@lru_cache(maxsize=64)
+def _template_strings(sessions: Tuple[Tuple[str, str], ...]) -> Tuple[str, ...]:
+    """1900-01-01 基准模板的 'YYYY-MM-DD HH:MM' 文本，按时段布局缓存。"""
+    stamps = np.datetime_as_string(_minute_template(list(sessions)), unit="m")
+    return tuple(np.char.replace(stamps, "T", " ").tolist())
+
+
+def _generate_datetime_array(sessions: List[Tuple[str, str]]) -> List[datetime.datetime]:
+    """
+    根据给定的时间段列表生成分钟级别的完整时间数组。
+    能够正确处理跨天的时间段，并保持正确的时间顺序。
 
-    return list(dict.fromkeys(full_datetime_array))
+    以 1900-01-01 为基准日，跨天部分落在 1900-01-02；分钟序列来自缓存模板。
+    """
+    return _minute_template(sessions).tolist()
 
 
 def _generate_time_array(sessions: List[Tuple[str, str]]) -> List[str]:
@@ -286,28 +321,7 @@ def _generate_datetime_array_with_base(
     与 `_generate_datetime_array` 区别：基准日期可调，用于多市场对比场景下把不同
     跨天时段都拼接到同一个 X 轴（今天 00:00 BJT 起到次日几点）。
     """
-    full_datetime_array: List[datetime.datetime] = []
-    delta = datetime.timedelta(minutes=1)
-    base = datetime.datetime.combine(base_day, datetime.time(0, 0))
-
-    for start_str, end_str in sessions:
-        try:
-            start_dt = datetime.datetime.strptime(start_str, "%H:%M").replace(
-                year=base.year, month=base.month, day=base.day
-            )
-            end_dt = datetime.datetime.strptime(end_str, "%H:%M").replace(
-                year=base.year, month=base.month, day=base.day
-            )
-            if end_dt <= start_dt:
-                end_dt += datetime.timedelta(days=1)
-            current_dt = start_dt
-            while current_dt <= end_dt:
-                full_datetime_array.append(current_dt)
-                current_dt += delta
-        except ValueError:
-            continue
-
-    return list(dict.fromkeys(full_datetime_array))
+    return _minute_template(sessions, base_day).tolist()
 
 
 def get_trading_minutes(code: Optional[str] = None) -> List[str]:
@@ -346,7 +360,7 @@ def get_trading_datetimes(code: Optional[str] = None) -> List[str]:
 
     sessions = MARKET_SESSIONS.get(market, MARKET_SESSIONS[Market.A_SHARE])
 
-    return [item.strftime("%Y-%m-%d %H:%M") for item in _generate_datetime_array(sessions)]
+    return list(_template_strings(tuple((start, end) for start, end in sessions)))
 
 
 def get_session_anchor_date(
@@ -0,0 +1,105 @@
+"""矩形树图布局（squarified）与涨跌配色。
+
+``stock_stockinfo/chart_cloudmap._split_rect`` 是按总量对半切的二分布局，块数一多
+就会切出大量细长条，放不下字；这里实现 Bruls 等人的 squarified 算法：逐行贪心地
+往当前行里加块，只要行内最差长宽比不变坏就继续加，否则另起一行，整体 O(n)。
+
+配色与 plotly 版云图的 ``color_continuous_scale`` 完全一致（-10% 纯绿、0 深灰、
++10% 纯红，分段线性插值），一次性对整个数组算完。
+"""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+
+__all__ = [
+    "Rect",
+    "diff_colors",
+    "squarify",
+]
+
+# (x, y, w, h)
+Rect = tuple[float, float, float, float]
+
+_COLOR_LOW = np.array([0.0, 255.0, 0.0])
+_COLOR_MID = np.array([61.0, 61.0, 59.0])
+_COLOR_HIGH = np.array([255.0, 0.0, 0.0])
+_COLOR_RANGE = 10.0
+
+
+def diff_colors(diffs: Sequence[float] | np.ndarray) -> np.ndarray:
+    """涨跌幅 → RGB（uint8，形状 ``(n, 3)``）；NaN 按 0 处理，超出 ±10% 截断。"""
+    ratio = np.clip(np.nan_to_num(np.asarray(diffs, dtype=float)), -_COLOR_RANGE, _COLOR_RANGE) / _COLOR_RANGE
+    ratio = ratio[:, None]
+    rgb = np.where(
+        ratio >= 0,
+        _COLOR_MID + (_COLOR_HIGH - _COLOR_MID) * ratio,
+        _COLOR_MID + (_COLOR_LOW - _COLOR_MID) * -ratio,
+    )
+    return np.rint(rgb).astype(np.uint8)
+
+
+def _worst_ratio(total: float, smallest: float, largest: float, side: float) -> float:
+    """一行块沿长度为 side 的边排开时，行内最差的长宽比（≥ 1）。"""
+    side_sq = side * side
+    total_sq = total * total
+    return max(side_sq * largest / total_sq, total_sq / (side_sq * smallest))
+
+
+def squarify(values: Sequence[float], x: float, y: float, w: float, h: float) -> list[Rect]:
+    """把 values 按面积比例铺进矩形 (x, y, w, h)。
+
+    values 须已按降序排好（越大越先铺，长宽比越好）；非正值得到零面积矩形。
+    返回的矩形与 values 一一对应、顺序相同。
+    """
+    n = len(values)
+    rects: list[Rect] = [(x, y, 0.0, 0.0)] * n
+    total = float(sum(v for v in values if v > 0))
+    if n == 0 or total <= 0 or w <= 0 or h <= 0:
+        return rects
+
+    scale = w * h / total
+    areas = [v * scale if v > 0 else 0.0 for v in values]
+    i = 0
+    while i < n and areas[i] > 0:
+        side = min(w, h)
+        row_total = smallest = largest = areas[i]
+        worst = _worst_ratio(row_total, smallest, largest, side)
+        j = i + 1
+        while j < n and areas[j] > 0:
+            area = areas[j]
+            candidate = _worst_ratio(row_total + area, min(smallest, area), max(largest, area), side)
+            if candidate > worst:
+                break
+            row_total += area
+            smallest = min(smallest, area)
+            largest = max(largest, area)
+            worst = candidate
+            j += 1
+
+        if w >= h:
+            # 竖着排在左侧一列
+            col_w = min(row_total / h, w)
+            cursor = y
+            for k in range(i, j):
+                cell_h = areas[k] / col_w
+                rects[k] = (x, cursor, col_w, cell_h)
+                cursor += cell_h
+            x += col_w
+            w -= col_w
+        else:
+            # 横着排在顶部一行
+            row_h = min(row_total / w, h)
+            cursor = x
+            for k in range(i, j):
+                cell_w = areas[k] / row_h
+                rects[k] = (cursor, y, cell_w, row_h)
+                cursor += cell_w
+            y += row_h
+            h -= row_h
+        i = j
+        if w <= 0 or h <= 0:
+            break
+    return rects
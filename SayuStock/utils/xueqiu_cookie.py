@@ -0,0 +1,156 @@
+"""雪球 Cookie 管理：落盘、探活、临期后台刷新、并发只刷一次。
+
+雪球接口要带首页下发的 Cookie（``xq_a_token`` 等），拿它得起一个 Chromium 打开首页，
+动辄好几秒。老做法 Cookie 只在内存里，每次重启、每次过期都要重新起浏览器。这里：
+
+- Cookie 和过期时间写进 ``data/xueqiu_cookie.json``，重启后先用磁盘上的；
+- 载入后用一次轻量请求（``probe``）探活，失效才真去刷新；
+- 离过期不足 ``refresh_margin`` 时，:meth:`XueqiuCookieManager.get` 先返回当前 Cookie，
+  同时在后台刷新（不让调用方等浏览器）；
+- 无论多少个协程同时要刷新（临期、接口报 400016、启动探活失败），都只跑一次 ``fetcher``，
+  其它人等同一个结果；拿着旧 Cookie 报失效的，如果已经被别人刷新过就直接用新的。
+
+真正拿 Cookie（``fetcher``）和探活（``probe``）由调用方注入，见 ``utils/request.py``。
+"""
+
+import json
+import time
+import asyncio
+from typing import Any, Dict, Tuple, Callable, Optional, Awaitable
+from pathlib import Path
+
+from gsuid_core.logger import logger
+
+# fetcher 返回 (cookie, 过期时间戳)；拿不到过期时间时返回 None，按 default_ttl 估
+CookieFetcher = Callable[[], Awaitable[Tuple[str, Optional[float]]]]
+CookieProbe = Callable[[str], Awaitable[bool]]
+
+
+class XueqiuCookieManager:
+    """持久化的雪球 Cookie；``get`` 拿可用 Cookie，``invalidate`` 报告失效。"""
+
+    def __init__(
+        self,
+        path: Optional[Path],
+        fetcher: CookieFetcher,
+        probe: Optional[CookieProbe] = None,
+        *,
+        refresh_margin: float = 30 * 60,
+        default_ttl: float = 12 * 3600,
+        on_change: Optional[Callable[[str], None]] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = path
+        self.fetcher = fetcher
+        self.probe = probe
+        self.refresh_margin = refresh_margin
+        self.default_ttl = default_ttl
+        self.on_change = on_change
+        self._clock = clock
+        self.cookie = ""
+        self.expires_at = 0.0
+        self.fetch_count = 0
+        self._loaded = False
+        self._probed = False
+        self._inflight: Optional[asyncio.Task] = None
+        self._background: Optional[asyncio.Task] = None
+
+    # ---------------- 对外 ----------------
+    async def get(self) -> str:
+        """返回可用的 Cookie。
+
+        - 首次调用：读磁盘，探活一次，失效就同步刷新；
+        - 已过期：同步刷新（大家共用一次）；
+        - 临期：返回当前的，后台刷新；
+        刷新失败时返回手上的旧 Cookie（可能为空），交给接口自己报错。
+        """
+        self._ensure_loaded()
+        now = self._clock()
+        if not self.cookie or now >= self.expires_at:
+            return await self.refresh("已过期" if self.cookie else "无 Cookie")
+        if not self._probed and self.probe is not None:
+            self._probed = True
+            if not await self._probe(self.cookie):
+                return await self.refresh("探活失败")
+        if self.expires_at - now < self.refresh_margin and (self._background is None or self._background.done()):
+            self._background = asyncio.create_task(self.refresh("临期"))
+        return self.cookie
+
+    async def invalidate(self, stale: str) -> str:
+        """接口报 Cookie 失效（400016）。``stale`` 是那次请求用的 Cookie。
+
+        若手上的已经不是它（别的协程刚刷新过），直接返回新的；否则刷新一次。
+        """
+        self._ensure_loaded()
+        if self.cookie and self.cookie != stale and self._clock() < self.expires_at:
+            return self.cookie
+        return await self.refresh("接口报失效")
+
+    async def refresh(self, reason: str = "") -> str:
+        """刷新 Cookie；并发调用共用同一次 ``fetcher``。"""
+        task = self._inflight
+        if task is None or task.done():
+            task = self._inflight = asyncio.create_task(self._do_refresh(reason))
+        # shield：某个等待方被取消不能连带取消别人都在等的刷新
+        return await asyncio.shield(task)
+
+    # ---------------- 内部 ----------------
+    async def _do_refresh(self, reason: str) -> str:
+        logger.info(f"[SayuStock] 刷新雪球 Cookie（{reason}）")
+        try:
+            cookie, expires_at = await self.fetcher()
+        except Exception as e:
+            logger.warning(f"[SayuStock] 获取雪球 Cookie 失败，沿用旧 Cookie: {e}")
+            return self.cookie
+        self.fetch_count += 1
+        if not cookie:
+            logger.warning("[SayuStock] 雪球 Cookie 为空，沿用旧 Cookie")
+            return self.cookie
+        now = self._clock()
+        self._set(cookie, expires_at if expires_at and expires_at > now else now + self.default_ttl)
+        self._probed = True
+        self._save()
+        return self.cookie
+
+    async def _probe(self, cookie: str) -> bool:
+        assert self.probe is not None
+        try:
+            return await self.probe(cookie)
+        except Exception as e:
+            # 探活本身失败（网络抖动）不算 Cookie 失效，交给接口自己报 400016
+            logger.debug(f"[SayuStock] 雪球 Cookie 探活异常，先按可用处理: {e}")
+            return True
+
+    def _set(self, cookie: str, expires_at: float) -> None:
+        changed = cookie != self.cookie
+        self.cookie = cookie
+        self.expires_at = expires_at
+        if changed and self.on_change is not None:
+            self.on_change(cookie)
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            payload: Dict[str, Any] = json.loads(self.path.read_text(encoding="utf-8"))
+            cookie, expires_at = str(payload["cookie"]), float(payload["expires_at"])
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"[SayuStock] 读雪球 Cookie 缓存失败，重新获取: {e}")
+            return
+        if cookie and expires_at > self._clock():
+            self._set(cookie, expires_at)
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        payload = {"cookie": self.cookie, "expires_at": self.expires_at, "fetched_at": self._clock()}
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+            tmp.replace(self.path)
+        except OSError as e:
+            logger.warning(f"[SayuStock] 写雪球 Cookie 缓存失败: {e}")
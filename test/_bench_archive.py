@@ -0,0 +1,164 @@
+"""冷归档基准：归档前后的库大小、常用查询延迟，以及走冷文件的历史查询延迟。
+
+不属于测试套件，只在调 ``stock_papertrade/archive.py`` / ``cold_store.py`` 时手动跑
+（需要嵌套布局下的 gsuid_core 环境来导入 ``db.py``）：
+
+    python test/_bench_archive.py               # 20 个盘 × 24 个月
+    python test/_bench_archive.py 100 36        # 盘数 × 月数
+
+在临时目录的 SQLite 文件库上灌合成数据：每盘每月 200 笔流水、200 条决策（决策
+带 ~1.5KB 的推理文本，接近线上 LLM 输出的体量）。把 ``base_models.async_maker``
+指到这个库，原样调 ``archive_before``（保留最近 6 个月，带 VACUUM），打印归档报告，
+再对比归档前后：
+
+- 热表全表 ``COUNT(*)``（VACUUM / 备份时间的代理）；
+- 最近 50 笔流水 / 50 条决策（热表命中，不应变慢）；
+- 全历史 ``aggregate_pnl``（热表 + 汇总行，结果必须一致）；
+- 取 2000 条决策（超出热表，落到冷文件补齐）。
+"""
+
+import sys
+import time
+import random
+import asyncio
+import tempfile
+import statistics
+from types import ModuleType
+from typing import Any, List, Callable, Awaitable
+from pathlib import Path
+from datetime import datetime, timedelta
+
+_PLUGIN_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_PLUGIN_ROOT))
+if len(_PLUGIN_ROOT.parents) > 2:
+    sys.path.insert(0, str(_PLUGIN_ROOT.parents[2]))
+
+for _sub in ("", ".utils", ".stock_papertrade"):
+    _name = f"SayuStock{_sub}"
+    if _name not in sys.modules:
+        _mod = ModuleType(_name)
+        _mod.__path__ = [str(_PLUGIN_ROOT / _name.replace(".", "/"))]  # type: ignore[attr-defined]
+        sys.modules[_name] = _mod
+
+from sqlalchemy import text, insert  # noqa: E402
+from sqlalchemy.schema import CreateTable  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+
+from gsuid_core.utils.database import base_models  # noqa: E402
+from SayuStock.stock_papertrade import db, archive, cold_store  # noqa: E402
+from SayuStock.utils.database.papertrade_models import (  # noqa: E402
+    SayuPaperTrade,
+    SayuPaperDecision,
+    SayuPaperArchiveMonth,
+)
+
+TRADES_PER_MONTH = 200
+DECISIONS_PER_MONTH = 200
+KEEP_MONTHS = 6
+REPEAT = 20
+REASONING = "均线多头排列，量能温和放大，MACD 金叉后回踩不破，按计划分批建仓。" * 15
+
+
+async def _setup(engine, accounts: int, months: int, now: datetime) -> None:
+    rng = random.Random(13)
+    async with engine.begin() as conn:
+        for model in (SayuPaperTrade, SayuPaperDecision, SayuPaperArchiveMonth):
+            table = model.__table__  # type: ignore[attr-defined]
+            await conn.execute(CreateTable(table))
+            for index in table.indexes:
+                await conn.run_sync(index.create)
+        start = datetime(now.year, now.month, 1) - timedelta(days=31 * (months - 1))
+        start = datetime(start.year, start.month, 1)
+        for account_id in range(1, accounts + 1):
+            trades, decisions = [], []
+            for m in range(months):
+                base = start + timedelta(days=31 * m)
+                base = datetime(base.year, base.month, 1)
+                for _ in range(TRADES_PER_MONTH):
+                    at = base + timedelta(days=rng.randint(0, 27), seconds=rng.randint(34200, 54000))
+                    trades.append(
+                        {
+                            "account_id": account_id,
+                            "stock_code": f"{600000 + rng.randrange(300)}",
+                            "side": rng.choice(("buy", "sell")),
+                            "price": 10.0,
+                            "qty": 100,
+                            "amount": 1000.0,
+                            "fee": 1.0,
+                            "realized_pnl": round(rng.gauss(0, 50), 2),
+                            "reason": REASONING[:200],
+                            "decided_at": at,
+                            "executed_at": at,
+                        }
+                    )
+                for _ in range(DECISIONS_PER_MONTH):
+                    at = base + timedelta(days=rng.randint(0, 27), seconds=rng.randint(34200, 54000))
+                    decisions.append(
+                        {"account_id": account_id, "action": "hold", "reason": REASONING, "created_at": at}
+                    )
+            await conn.execute(insert(SayuPaperTrade), trades)
+            await conn.execute(insert(SayuPaperDecision), decisions)
+
+
+async def _median(fn: Callable[[], Awaitable[Any]]) -> float:
+    samples: List[float] = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+async def _measure(maker, label: str) -> dict:
+    async def count_all():
+        async with maker() as session:
+            await session.execute(text("SELECT COUNT(*), SUM(length(reason)) FROM sayupaperdecision"))
+
+    timings = {
+        "全表扫描": await _median(count_all),
+        "最近 50 笔流水": await _median(lambda: db.PaperTradeRepo.list_by_account(1, limit=50)),
+        "最近 50 条决策": await _median(lambda: db.PaperDecisionRepo.list_recent(1, limit=50)),
+        "全历史盈亏": await _median(lambda: db.PaperTradeRepo.aggregate_pnl(1)),
+        "2000 条决策": await _median(lambda: db.PaperDecisionRepo.list_recent(1, limit=2000)),
+    }
+    print(f"\n== {label} ==")
+    for name, ms in timings.items():
+        print(f"  {name:<12} 中位 {ms:8.2f} ms")
+    return {
+        "pnl": {k: round(v, 2) for k, v in (await db.PaperTradeRepo.aggregate_pnl(1)).items()},
+        "decisions": [d.id for d in await db.PaperDecisionRepo.list_recent(1, limit=2000)],
+    }
+
+
+async def main() -> None:
+    accounts = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    months = int(sys.argv[2]) if len(sys.argv) > 2 else 24
+    now = datetime.now()
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+        maker = async_sessionmaker(engine, expire_on_commit=False)
+        base_models.async_maker = maker  # type: ignore[attr-defined]
+        cold_store.ARCHIVE_ROOT = Path(tmp) / "archive"
+
+        started = time.perf_counter()
+        await _setup(engine, accounts, months, now)
+        trades = accounts * months * TRADES_PER_MONTH
+        decisions = accounts * months * DECISIONS_PER_MONTH
+        print(
+            f"{accounts} 个盘 × {months} 个月：流水 {trades} 行，决策 {decisions} 行，"
+            f"灌数 {time.perf_counter() - started:.1f}s，压缩 {'zstd' if cold_store.zstandard else 'gzip'}"
+        )
+
+        before = await _measure(maker, "归档前")
+        cutoff = archive.archive_cutoff(KEEP_MONTHS * 31, now.date())
+        report = await archive.archive_before(cutoff, vacuum=True)
+        print(f"\n== 归档（保留 {KEEP_MONTHS} 个月）==\n{report.summary()}")
+        after = await _measure(maker, "归档后")
+
+        print(f"\n全历史盈亏一致：{before['pnl'] == after['pnl']}")
+        print(f"2000 条决策一致：{before['decisions'] == after['decisions']}")
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,71 @@
+"""离线回测基准：500 只 × 3 年日 K，两个策略各跑一遍。
+
+不属于测试套件，只在调 ``stock_papertrade/backtest.py`` 时手动跑：
+
+    python test/_bench_backtest.py             # 500 只 × 750 根
+    python test/_bench_backtest.py 1000 1500   # 标的数 × 根数
+
+用 ``kline_fixtures.make_klines`` 造随机游走日 K（每只不同种子、不同上市日），
+分三栏计时：拼面板（``BarPanel.from_frames``）、算信号、整段回测（含信号 + 逐根撮合），
+并打印排行口径的收益指标。
+"""
+
+import sys
+import time
+from types import ModuleType
+from pathlib import Path
+
+_PLUGIN_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_PLUGIN_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+if len(_PLUGIN_ROOT.parents) > 2:
+    sys.path.insert(0, str(_PLUGIN_ROOT.parents[2]))
+
+for _sub in ("", ".utils", ".stock_papertrade"):
+    _name = f"SayuStock{_sub}"
+    if _name not in sys.modules:
+        _mod = ModuleType(_name)
+        _mod.__path__ = [str(_PLUGIN_ROOT / _name.replace(".", "/"))]  # type: ignore[attr-defined]
+        sys.modules[_name] = _mod
+
+from kline_fixtures import make_klines  # noqa: E402
+
+from SayuStock.utils.kline import klines_to_df  # noqa: E402
+from SayuStock.stock_papertrade import backtest as bt  # noqa: E402
+
+
+def main() -> None:
+    symbols = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    bars = int(sys.argv[2]) if len(sys.argv) > 2 else 750
+    frames = {}
+    for i in range(symbols):
+        late = (i * 7) % 120  # 部分标的晚上市，面板前段为空
+        frames[f"{600000 + i}"] = klines_to_df(make_klines(bars, seed=i, vol=0.025))[late:]
+
+    start = time.perf_counter()
+    panel = bt.BarPanel.from_frames(frames)
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"{symbols} 只 × {bars} 根  拼面板 {build_ms:7.1f} ms")
+
+    results = []
+    for sid, builder in bt.SIGNAL_BUILDERS.items():
+        params = bt.resolve_with_params(sid)[1]
+        start = time.perf_counter()
+        builder(panel, params, "balanced")
+        signal_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        result = bt.run_backtest(panel, sid)
+        total_ms = (time.perf_counter() - start) * 1000
+        results.append(result)
+        m = result.metrics()
+        print(
+            f"{sid:<16} 信号 {signal_ms:7.1f} ms  回测 {total_ms:7.1f} ms  "
+            f"成交 {int(m['trade_count']):>5} 笔  收益 {m['total_pnl_pct']:+7.2f}%  "
+            f"最大回撤 {m['max_drawdown_pct']:6.2f}%"
+        )
+    print(bt.summarize(results).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
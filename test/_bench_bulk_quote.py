@@ -0,0 +1,147 @@
+"""持仓报价批量写基准：50 个账户 × 20 只持仓，逐条 UPDATE vs 分块 CASE UPDATE。
+
+不属于测试套件，只在调 ``PaperPositionRepo`` 报价写回时手动跑（需要嵌套布局下的
+gsuid_core 环境来导入 ``db.py``）：
+
+    python test/_bench_bulk_quote.py           # 每种写法重复 10 轮
+    python test/_bench_bulk_quote.py 30        # 重复轮数
+
+在临时目录的 SQLite 文件库上建持仓表，三种写法各把全部持仓标记一次市值：
+
+- 逐条：旧 ``bulk_set_quote`` 的写法，每个账户一个事务、每只持仓一条 UPDATE；
+- 按账户：新 ``bulk_set_quote``，每个账户一个事务、一条 CASE UPDATE；
+- 全盘：``mark_to_market``，全部账户一个事务、按 secid 分块 CASE UPDATE。
+
+三种写法直接拿同一个 session 工厂调 ``db._update_quotes``（旧写法内联），
+不经 ``@with_session``；取各轮中位数，并核对写回行数一致。
+"""
+
+import sys
+import time
+import random
+import asyncio
+import tempfile
+import statistics
+from types import ModuleType
+from typing import Dict, List, Tuple
+from pathlib import Path
+from datetime import datetime
+
+_PLUGIN_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_PLUGIN_ROOT))
+if len(_PLUGIN_ROOT.parents) > 2:
+    sys.path.insert(0, str(_PLUGIN_ROOT.parents[2]))
+
+for _sub in ("", ".utils", ".stock_papertrade"):
+    _name = f"SayuStock{_sub}"
+    if _name not in sys.modules:
+        _mod = ModuleType(_name)
+        _mod.__path__ = [str(_PLUGIN_ROOT / _name.replace(".", "/"))]  # type: ignore[attr-defined]
+        sys.modules[_name] = _mod
+
+from sqlmodel import col  # noqa: E402
+from sqlalchemy import and_, update  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+
+from SayuStock.stock_papertrade import db  # noqa: E402
+from SayuStock.utils.database.papertrade_models import SayuPaperPosition  # noqa: E402
+
+ACCOUNTS = 50
+POSITIONS = 20
+UNIVERSE = 400  # 账户之间会重仓同一批股票
+
+
+async def _setup(session_maker: async_sessionmaker[AsyncSession]) -> Dict[int, List[Tuple[str, str]]]:
+    rng = random.Random(7)
+    universe = [(f"{600000 + i}", f"1.{600000 + i}") for i in range(UNIVERSE)]
+    holdings: Dict[int, List[Tuple[str, str]]] = {}
+    async with session_maker() as session, session.begin():
+        for account_id in range(1, ACCOUNTS + 1):
+            picks = rng.sample(universe, POSITIONS)
+            holdings[account_id] = picks
+            for code, secid in picks:
+                session.add(
+                    SayuPaperPosition(
+                        account_id=account_id,
+                        stock_code=code,
+                        stock_name=code,
+                        secid=secid,
+                        qty=100,
+                        avg_cost=10.0,
+                    )
+                )
+    return holdings
+
+
+async def _legacy(session_maker, holdings, price: float) -> int:
+    at = datetime.now()
+    affected = 0
+    for account_id, picks in holdings.items():
+        async with session_maker() as session, session.begin():
+            for code, _ in picks:
+                stmt = (
+                    update(SayuPaperPosition)
+                    .where(
+                        and_(
+                            col(SayuPaperPosition.account_id) == account_id,
+                            col(SayuPaperPosition.stock_code) == code,
+                        )
+                    )
+                    .values(last_quote_price=price, last_quote_at=at)
+                )
+                result = await session.execute(stmt)
+                affected += db._rowcount(result)
+            await session.flush()
+    return affected
+
+
+async def _per_account(session_maker, holdings, price: float) -> int:
+    at = datetime.now()
+    affected = 0
+    for account_id, picks in holdings.items():
+        async with session_maker() as session, session.begin():
+            affected += await db._update_quotes(
+                session,
+                col(SayuPaperPosition.stock_code),
+                [(code, price, at) for code, _ in picks],
+                col(SayuPaperPosition.account_id) == account_id,
+            )
+    return affected
+
+
+async def _whole_book(session_maker, holdings, price: float) -> int:
+    at = datetime.now()
+    secids = {secid for picks in holdings.values() for _, secid in picks}
+    async with session_maker() as session, session.begin():
+        return await db._update_quotes(
+            session,
+            col(SayuPaperPosition.secid),
+            [(secid, price, at) for secid in secids],
+            col(SayuPaperPosition.qty) > 0,
+        )
+
+
+async def main() -> None:
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+        async with engine.begin() as conn:
+            table = SayuPaperPosition.__table__  # type: ignore[attr-defined]
+            await conn.run_sync(lambda c: SayuPaperPosition.metadata.create_all(c, tables=[table]))
+        session_maker = async_sessionmaker(engine, expire_on_commit=False)
+        holdings = await _setup(session_maker)
+        print(f"{ACCOUNTS} 个账户 × {POSITIONS} 只持仓，重复 {repeat} 轮")
+
+        for label, writer in (("逐条", _legacy), ("按账户", _per_account), ("全盘", _whole_book)):
+            samples: List[float] = []
+            rows = 0
+            for r in range(repeat):
+                start = time.perf_counter()
+                rows = await writer(session_maker, holdings, 10.0 + r)
+                samples.append((time.perf_counter() - start) * 1000)
+            print(f"{label:<6} 中位 {statistics.median(samples):8.1f} ms  写回 {rows} 行")
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
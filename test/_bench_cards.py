@@ -0,0 +1,151 @@
+"""PIL 卡片渲染基准：大盘概览 / 全天候，行情全部假数据，只计绘制。
+
+不属于测试套件，只在调卡片绘制（素材层、静态底图）时手动跑：
+
+    python test/_bench_cards.py        # 每张卡片重复 20 次
+    python test/_bench_cards.py 50     # 重复次数
+
+行情、涨跌分布、资金流图都换成本地假数据，``convert_img`` 换成直接返回 PIL 图，
+所以数字只包含取字体 / 解码纹理 / 合成底图 / 写字贴图；「首张」含冷启动加载，
+「稳态」取其余各次的中位数。我的自选、模拟盘持仓依赖数据库，不在这里跑。
+"""
+
+import sys
+import time
+import random
+import asyncio
+import statistics
+from types import ModuleType
+from pathlib import Path
+
+_PLUGIN_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_PLUGIN_ROOT))
+if len(_PLUGIN_ROOT.parents) > 2:
+    sys.path.insert(0, str(_PLUGIN_ROOT.parents[2]))
+
+for _sub in ("", ".utils", ".stock_info"):
+    _name = f"SayuStock{_sub}"
+    if _name not in sys.modules:
+        _mod = ModuleType(_name)
+        _mod.__path__ = [str(_PLUGIN_ROOT / _name.replace(".", "/"))]  # type: ignore[attr-defined]
+        sys.modules[_name] = _mod
+
+from PIL import Image  # noqa: E402
+
+from SayuStock.stock_info import draw_info, draw_future  # noqa: E402
+from SayuStock.utils.market import DisplayItem  # noqa: E402
+from SayuStock.utils.constant import i_code  # noqa: E402
+from SayuStock.utils.market.enums import BoardKind  # noqa: E402
+from SayuStock.utils.market.models import BoardRow, BoardSnapshot  # noqa: E402
+
+_INDEX_NAMES = [
+    "上证指数",
+    "中证全指",
+    "创业板指",
+    "科创综指",
+    "沪深300",
+    "中证500",
+    "中证1000",
+    "中证2000",
+    "中证A500",
+    "北证50",
+]
+
+
+def _rows(names: list[str], rng: random.Random) -> tuple[BoardRow, ...]:
+    return tuple(
+        BoardRow(
+            code=f"{i:06d}",
+            name=name,
+            price=round(rng.uniform(5, 5000), 2),
+            change_pct=round(rng.gauss(0, 2), 2),
+            amount=1e9,
+            market_cap=None,
+            industry=None,
+            lead_name=f"领涨{i:02d}",
+            lead_change_pct=round(rng.uniform(-10, 10), 2),
+        )
+        for i, name in enumerate(names)
+    )
+
+
+class _FakeMarket:
+    def __init__(self) -> None:
+        self.rng = random.Random(20261019)
+
+    async def board(self, name: str, limit: int = 100, sort_asc: bool = False) -> BoardSnapshot:
+        if name == "主要指数":
+            names = _INDEX_NAMES
+        elif name == "国际市场":
+            names = list(i_code.keys())
+        else:
+            names = [f"{name[:2]}{i:02d}" for i in range(limit)]
+        return BoardSnapshot(BoardKind.HOTMAP, name, _rows(names, self.rng))
+
+    async def quote(self, code: str) -> str:
+        return "跳过"
+
+
+def _items(keys: list[str]) -> dict[str, DisplayItem]:
+    rng = random.Random(len(keys))
+    return {
+        k: DisplayItem(name=k, price=round(rng.uniform(1, 100), 2), change_pct=round(rng.gauss(0, 2), 2)) for k in keys
+    }
+
+
+async def _fake_get_items(_d: dict[str, str], other_call=None) -> dict[str, DisplayItem]:
+    return _items(list(_d.keys()))
+
+
+async def _fake_bar() -> dict[str, object]:
+    return {"2": list(range(300, 1300, 100)), "3": list(range(200, 1200, 100)), "5": 80, "6": 12}
+
+
+async def _fake_hours() -> tuple[float, float, None]:
+    return 1.2e12, 8.5e10, None
+
+
+async def _fake_em_image(size=None) -> Image.Image:
+    return Image.new("RGB", size or (500, 274), (240, 240, 240))
+
+
+async def _identity(img, *args, **kwargs):
+    return img
+
+
+def _install_fakes() -> None:
+    market = _FakeMarket()
+    for module in (draw_info, draw_future):
+        module.get_market = lambda: market  # type: ignore[attr-defined]
+        module.convert_img = _identity  # type: ignore[attr-defined]
+    draw_info.get_bar = _fake_bar
+    draw_info.get_hours_from_em = _fake_hours
+    draw_info.get_image_from_em = _fake_em_image
+    draw_future._get_items = _fake_get_items
+    for module in (draw_info, draw_future):
+        module.ai_return = lambda *a, **k: None  # type: ignore[attr-defined]
+
+
+async def _time_card(draw, repeat: int) -> tuple[float, float, tuple[int, int]]:
+    timings: list[float] = []
+    size = (0, 0)
+    for _ in range(repeat):
+        start = time.perf_counter()
+        img = await draw()
+        timings.append((time.perf_counter() - start) * 1000)
+        assert isinstance(img, Image.Image), img
+        size = img.size
+    return timings[0], statistics.median(timings[1:]), size
+
+
+async def main(repeat: int) -> None:
+    _install_fakes()
+    cards = [("大盘概览", draw_info.draw_info_img), ("全天候", draw_future.draw_future_img)]
+    print(f"卡片          尺寸          首张        稳态(中位数, {repeat - 1} 次)")
+    for label, draw in cards:
+        first, steady, size = await _time_card(draw, repeat)
+        print(f"  {label:<8}{size[0]:>5}x{size[1]:<6}{first:8.1f} ms{steady:10.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 20))
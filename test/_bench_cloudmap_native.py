@@ -0,0 +1,132 @@
+"""云图原生渲染基准：5000 只 A 股的全市场矩形树图，分阶段计时。
+
+不属于测试套件（单张图就是几千万像素），只在调云图渲染时手动跑：
+
+    python test/_bench_cloudmap_native.py              # 5000 只、2500 x 2
+    python test/_bench_cloudmap_native.py 5000 2000 1  # 股票数、viewport、scale
+
+用 ``概念云图`` 口径（layer 1、不截断每个板块的成分股），保证 5000 只全部上图。
+plotly 一栏只算 ``to_fig`` + ``write_html``，浏览器排版与截图另计（这里没有 Chromium）。
+"""
+
+import sys
+import time
+import random
+import asyncio
+import tempfile
+from io import BytesIO
+from types import ModuleType
+from pathlib import Path
+
+_PLUGIN_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_PLUGIN_ROOT))
+if len(_PLUGIN_ROOT.parents) > 2:
+    sys.path.insert(0, str(_PLUGIN_ROOT.parents[2]))
+
+for _sub in ("", ".utils", ".stock_cloudmap"):
+    _name = f"SayuStock{_sub}"
+    if _name not in sys.modules:
+        _mod = ModuleType(_name)
+        _mod.__path__ = [str(_PLUGIN_ROOT / _name.replace(".", "/"))]  # type: ignore[attr-defined]
+        sys.modules[_name] = _mod
+
+from SayuStock.utils.render_data import build_cloudmap_render_data  # noqa: E402
+from SayuStock.utils.market.enums import BoardKind  # noqa: E402
+from SayuStock.utils.market.models import BoardRow, BoardSnapshot  # noqa: E402
+from SayuStock.stock_cloudmap.render_native import (  # noqa: E402
+    BG_COLOR,
+    Image,
+    ImageDraw,
+    _draw_text,
+    build_tree,
+    layout_tree,
+    _paint_tiles,
+)
+
+_INDUSTRIES = 90
+
+
+def _snapshot(n: int, seed: int = 20260723) -> BoardSnapshot:
+    rng = random.Random(seed)
+    rows = tuple(
+        BoardRow(
+            code=f"{i:06d}",
+            name=f"样本{i:04d}",
+            price=10.0,
+            change_pct=round(rng.gauss(0, 3), 2),
+            amount=1e8,
+            # 市值长尾：少数大票占大头，与真实 A 股分布接近
+            market_cap=rng.lognormvariate(23, 1.2),
+            industry=f"行业{i % _INDUSTRIES:02d}",
+            lead_name=None,
+            lead_change_pct=None,
+        )
+        for i in range(n)
+    )
+    return BoardSnapshot(kind=BoardKind.HOTMAP, title="概念云图", rows=rows)
+
+
+def _timed(label: str, func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    print(f"  {label:<16}{(time.perf_counter() - start) * 1000:9.1f} ms")
+    return result
+
+
+def main(n: int, view_port: int, scale: int) -> None:
+    snap = _snapshot(n)
+    size = view_port * scale
+    print(f"{n} 只股票，{size} x {size} 像素")
+
+    total = time.perf_counter()
+    data = _timed("render-data", build_cloudmap_render_data, snap, "概念云图", None, 1)
+    roots = _timed("建树", build_tree, data.df, data.treemap_path, data.title)
+    placed = _timed("squarify 布局", layout_tree, roots, size, size, scale)
+
+    def _fill() -> Image.Image:
+        img = Image.new("RGB", (size, size), BG_COLOR)
+        _paint_tiles(ImageDraw.Draw(img), placed, scale)
+        return img
+
+    img = _timed("配色 + 填色", _fill)
+
+    def _text() -> int:
+        draw = ImageDraw.Draw(img)
+        for node in placed:
+            _draw_text(draw, node, scale)
+        return len(placed)
+
+    _timed("文字", _text)
+
+    def _encode() -> int:
+        output = BytesIO()
+        img.save(output, format="PNG")
+        return len(output.getvalue())
+
+    png_size = _timed("PNG 编码", _encode)
+    print(f"  {'合计':<16}{(time.perf_counter() - total) * 1000:9.1f} ms  PNG {png_size / 1024 / 1024:.1f} MiB")
+
+    try:
+        from SayuStock.stock_cloudmap.render import to_fig
+    except ImportError as e:
+        print(f"  （跳过 plotly 对照：{e}）")
+        return
+    start = time.perf_counter()
+    try:
+        fig = asyncio.run(to_fig(snap, "概念云图", None, 1))
+    except ValueError as e:
+        # sector 为空时 plotly 的路径里有 None 父节点，px.treemap 直接拒绝
+        print(f"  （plotly 画不了这张图：{e}）")
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        fig.write_html(Path(tmp) / "cloudmap.html")
+    print(f"  plotly to_fig + write_html {(time.perf_counter() - start) * 1000:9.1f} ms（不含浏览器截图）")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:4]]
+    main(
+        args[0] if args else 5000,
+        args[1] if len(args) > 1 else 2500,
+        args[2] if len(args) > 2 else 2,
+    )
@@ -0,0 +1,216 @@
+"""模拟盘热查询基准：``func.date`` 过滤 vs 半开区间，补建复合索引前后。
+
+不属于测试套件，只在调 ``papertrade_models`` 上的复合索引或 ``db.py`` 里的时间过滤时手动跑
+（需要嵌套布局下的 gsuid_core 环境来导入 ``db.py`` / ``papertrade_migration.py``）：
+
+    python test/_bench_db_indexes.py                 # 100 万条流水 / 200 个盘
+    python test/_bench_db_indexes.py 300000 100      # 流水条数 × 盘数
+
+在临时目录的 SQLite 文件库上按"老库"的样子建流水 / 决策 / 快照表——只有单列索引，
+再灌入合成数据（流水平均铺在 500 个交易日上，决策是流水的 1/5，每盘每天一条快照）。
+之后分两轮计时：
+
+- 老库：只有单列索引；
+- 补建后：跑一遍 ``ensure_composite_indexes``（启动钩子的同一段逻辑）再测。
+
+每轮对每条查询打印 ``EXPLAIN QUERY PLAN`` 和 50 次随机盘查询的中位延迟，并核对
+``func.date`` 与半开区间两种写法的结果一致。
+"""
+
+import sys
+import time
+import random
+import asyncio
+import tempfile
+import statistics
+from types import ModuleType
+from typing import Any, Dict, List, Tuple
+from pathlib import Path
+from datetime import date, datetime, timedelta
+
+_PLUGIN_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_PLUGIN_ROOT))
+if len(_PLUGIN_ROOT.parents) > 2:
+    sys.path.insert(0, str(_PLUGIN_ROOT.parents[2]))
+
+for _sub in ("", ".utils", ".utils.database", ".stock_papertrade"):
+    _name = f"SayuStock{_sub}"
+    if _name not in sys.modules:
+        _mod = ModuleType(_name)
+        _mod.__path__ = [str(_PLUGIN_ROOT / _name.replace(".", "/"))]  # type: ignore[attr-defined]
+        sys.modules[_name] = _mod
+
+from sqlmodel import col  # noqa: E402
+from sqlalchemy import and_, func, insert, select  # noqa: E402
+from sqlalchemy.schema import CreateIndex, CreateTable  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncConnection, async_sessionmaker, create_async_engine  # noqa: E402
+
+from SayuStock.stock_papertrade import db  # noqa: E402
+from SayuStock.utils.database.papertrade_models import (  # noqa: E402
+    SayuPaperTrade,
+    SayuPaperDecision,
+    SayuPaperSnapshot,
+)
+from SayuStock.utils.database.papertrade_migration import ensure_composite_indexes  # noqa: E402
+
+DAYS = 500
+CODES = [f"{600000 + i}" for i in range(300)]
+START = date(2024, 10, 8)
+REPEAT = 50
+CHUNK = 50_000
+
+
+def _trade_day(i: int) -> date:
+    return START + timedelta(days=i)
+
+
+async def _setup(engine, trades: int, accounts: int) -> None:
+    rng = random.Random(11)
+    models = (SayuPaperTrade, SayuPaperDecision, SayuPaperSnapshot)
+    async with engine.begin() as conn:
+        for model in models:
+            table = model.__table__  # type: ignore[attr-defined]
+            await conn.execute(CreateTable(table))
+            # 老库只有 Field(index=True) 的单列索引
+            for index in table.indexes:
+                if len(index.columns) == 1:
+                    await conn.execute(CreateIndex(index))
+
+        per_day = max(1, trades // (accounts * DAYS))
+        rows: List[Dict[str, Any]] = []
+        written = 0
+        for d in range(DAYS):
+            day = datetime.combine(_trade_day(d), datetime.min.time())
+            for account_id in range(1, accounts + 1):
+                for _ in range(per_day):
+                    if written >= trades:
+                        break
+                    rows.append(
+                        {
+                            "account_id": account_id,
+                            "stock_code": rng.choice(CODES),
+                            "stock_name": "",
+                            "secid": "",
+                            "side": "buy" if rng.random() < 0.55 else "sell",
+                            "price": 10.0,
+                            "qty": 100 * rng.randint(1, 20),
+                            "amount": 0.0,
+                            "fee": 0.0,
+                            "executed_at": day + timedelta(hours=9, minutes=30, seconds=rng.randint(0, 19800)),
+                        }
+                    )
+                    written += 1
+            if len(rows) >= CHUNK:
+                await conn.execute(insert(SayuPaperTrade), rows)
+                decisions = [
+                    {
+                        "account_id": r["account_id"],
+                        "stock_code": r["stock_code"],
+                        "action": "hold",
+                        "created_at": r["executed_at"],
+                    }
+                    for r in rows[::5]
+                ]
+                await conn.execute(insert(SayuPaperDecision), decisions)
+                rows = []
+        if rows:
+            await conn.execute(insert(SayuPaperTrade), rows)
+        snapshots = [
+            {
+                "account_id": account_id,
+                "trade_date": _trade_day(d),
+                "cash": 1e6,
+                "position_value": 0.0,
+                "total_equity": 1e6,
+            }
+            for account_id in range(1, accounts + 1)
+            for d in range(DAYS)
+        ]
+        for i in range(0, len(snapshots), CHUNK):
+            await conn.execute(insert(SayuPaperSnapshot), snapshots[i : i + CHUNK])
+
+
+def _queries(account_id: int, day: date, code: str) -> List[Tuple[str, Any]]:
+    trade_acc = col(SayuPaperTrade.account_id) == account_id
+    executed_at = col(SayuPaperTrade.executed_at)
+    count_stmt = select(func.count(col(SayuPaperTrade.id)))
+    locked = select(func.coalesce(func.sum(SayuPaperTrade.qty), 0))
+    locked_where = (trade_acc, col(SayuPaperTrade.stock_code) == code, col(SayuPaperTrade.side) == "buy")
+    return [
+        ("今日成交数 func.date", count_stmt.where(and_(trade_acc, func.date(executed_at) == day))),
+        ("今日成交数 半开区间", count_stmt.where(and_(trade_acc, db._day_range(executed_at, day)))),
+        ("T+1 锁定 func.date", locked.where(and_(*locked_where, func.date(executed_at) == day))),
+        ("T+1 锁定 半开区间", locked.where(and_(*locked_where, db._day_range(executed_at, day)))),
+        (
+            "最近 50 条决策",
+            select(SayuPaperDecision)
+            .where(col(SayuPaperDecision.account_id) == account_id)
+            .order_by(col(SayuPaperDecision.created_at).desc())
+            .limit(50),
+        ),
+        (
+            "最新一条快照",
+            select(SayuPaperSnapshot)
+            .where(col(SayuPaperSnapshot.account_id) == account_id)
+            .order_by(col(SayuPaperSnapshot.trade_date).desc())
+            .limit(1),
+        ),
+    ]
+
+
+async def _plan(conn: AsyncConnection, stmt: Any) -> str:
+    compiled = stmt.compile(dialect=conn.dialect)
+    # 计划与参数值无关，日期参数按字符串传即可
+    params = tuple(str(v) if isinstance(v, date) else v for v in (compiled.params[k] for k in compiled.positiontup))
+    rows = (await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params)).all()
+    return " | ".join(str(r[-1]) for r in rows)
+
+
+async def _round(session_maker: async_sessionmaker[AsyncSession], accounts: int, label: str) -> Dict[str, List]:
+    rng = random.Random(5)
+    probes = [(rng.randint(1, accounts), _trade_day(rng.randrange(DAYS)), rng.choice(CODES)) for _ in range(REPEAT)]
+    samples: Dict[str, List[float]] = {}
+    results: Dict[str, List] = {}
+    async with session_maker() as session:
+        conn = await session.connection()
+        print(f"\n== {label} ==")
+        for name, stmt in _queries(*probes[0]):
+            print(f"  {name:<16} {await _plan(conn, stmt)}")
+        for probe in probes:
+            for name, stmt in _queries(*probe):
+                start = time.perf_counter()
+                rows = (await session.execute(stmt)).all()
+                samples.setdefault(name, []).append((time.perf_counter() - start) * 1000)
+                results.setdefault(name, []).append([tuple(r) for r in rows])
+    for name, values in samples.items():
+        print(f"  {name:<16} 中位 {statistics.median(values):8.3f} ms")
+    return results
+
+
+async def main() -> None:
+    trades = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    accounts = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+        start = time.perf_counter()
+        await _setup(engine, trades, accounts)
+        print(f"{trades} 条流水 / {accounts} 个盘 / {DAYS} 个交易日，灌数 {time.perf_counter() - start:.1f}s")
+        session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+        before = await _round(session_maker, accounts, "老库（仅单列索引）")
+        start = time.perf_counter()
+        async with session_maker() as session:
+            created = await ensure_composite_indexes(session)
+        print(f"\n补建 {', '.join(created)}，耗时 {time.perf_counter() - start:.1f}s")
+        after = await _round(session_maker, accounts, "补建复合索引后")
+
+        same = all(
+            before[f"{q} func.date"] == before[f"{q} 半开区间"] == after[f"{q} 半开区间"]
+            for q in ("今日成交数", "T+1 锁定")
+        )
+        print(f"\n两种写法结果一致：{same}")
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
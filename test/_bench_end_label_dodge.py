@@ -0,0 +1,106 @@
+"""末端标签避让基准：13 / 50 / 200 条曲线的 ``_draw_end_point_labels`` 排版耗时。
+
+不属于测试套件，只在调末端标签避让时手动跑：
+
+    python test/_bench_end_label_dodge.py          # 每档重复 10 次
+    python test/_bench_end_label_dodge.py 30       # 重复次数
+
+每次新建一张与多股对比图同尺寸、同样挂 tight layout engine 的 Figure 画好 n 条
+随机游走线，分两栏计时（均取中位数、不含最终出图）：
+
+- 求解：单独调 ``_dodge_end_label_offsets``（框高按 ``_estimate_text_box_pts`` 给定）；
+- 整体：``_draw_end_point_labels``（量字高 + 避让求解 + 添加圆点 / 标签图元）。
+
+另统计整体画完后相邻标签框仍重叠的对数（应为 0，除非轴高放不下、被整体压缩）。
+"""
+
+import sys
+import time
+import random
+import statistics
+from types import ModuleType
+from pathlib import Path
+
+_PLUGIN_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_PLUGIN_ROOT))
+if len(_PLUGIN_ROOT.parents) > 2:
+    sys.path.insert(0, str(_PLUGIN_ROOT.parents[2]))
+
+for _sub in ("", ".utils", ".stock_stockinfo"):
+    _name = f"SayuStock{_sub}"
+    if _name not in sys.modules:
+        _mod = ModuleType(_name)
+        _mod.__path__ = [str(_PLUGIN_ROOT / _name.replace(".", "/"))]  # type: ignore[attr-defined]
+        sys.modules[_name] = _mod
+
+import matplotlib  # noqa: E402
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+from matplotlib.offsetbox import AnnotationBbox  # noqa: E402
+
+from SayuStock.stock_stockinfo.chart_base import (  # noqa: E402
+    MPL_COLORS,
+    _draw_end_point_labels,
+    _estimate_text_box_pts,
+    _dodge_end_label_offsets,
+)
+
+
+def _figure(n: int, seed: int):
+    rng = random.Random(seed)
+    fig, ax = plt.subplots(figsize=(25.5, 16.5), dpi=100)
+    fig.set_layout_engine("tight")
+    entries = []
+    for i in range(n):
+        y = 0.0
+        ys = []
+        for _ in range(240):
+            y += rng.gauss(0.1, 2.0)
+            ys.append(y)
+        color = MPL_COLORS[i % len(MPL_COLORS)]
+        ax.plot(range(240), ys, color=color, linewidth=1.5)
+        entries.append((239.0, ys[-1], f"股票{i}", f" {ys[-1]:+.2f}%", color))
+    ax.set_title("多股对比")
+    return fig, ax, entries
+
+
+def _overlaps(ax) -> int:
+    boxes = sorted(
+        (a.get_window_extent() for a in ax.artists if isinstance(a, AnnotationBbox)),
+        key=lambda b: b.y0,
+    )
+    return sum(1 for lo, hi in zip(boxes, boxes[1:]) if hi.y0 < lo.y1 - 0.5)
+
+
+def main() -> None:
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    for n in (13, 50, 200):
+        solve: list[float] = []
+        samples: list[float] = []
+        overlaps = 0
+        for r in range(repeat):
+            fig, ax, entries = _figure(n, seed=r)
+            heights = [_estimate_text_box_pts(f"{e[2]}{e[3]}", 11.0, pad_pts=5.0)[1] for e in entries]
+            start = time.perf_counter()
+            _dodge_end_label_offsets([e[1] for e in entries], ax, min_sep_pts=22.0, heights_pts=heights)
+            solve.append((time.perf_counter() - start) * 1000)
+            plt.close(fig)
+
+            fig, ax, entries = _figure(n, seed=r)
+            start = time.perf_counter()
+            _draw_end_point_labels(ax, entries)
+            samples.append((time.perf_counter() - start) * 1000)
+            if r == 0:
+                fig.canvas.draw()
+                overlaps = _overlaps(ax)
+            plt.close(fig)
+        print(
+            f"{n:>4} 条: 求解 {statistics.median(solve):7.2f} ms  "
+            f"整体 {statistics.median(samples):7.1f} ms  重叠 {overlaps} 对"
+        )
+
+
+if __name__ == "__main__":
+    main()
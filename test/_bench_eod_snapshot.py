@@ -0,0 +1,164 @@
+"""收盘快照基准：200 个盘 × 20 只持仓，逐盘写 vs 批量写。
+
+不属于测试套件，只在调 ``stock_papertrade/eod_snapshot.py`` 时手动跑（需要嵌套布局下的
+gsuid_core 环境来导入 ``db.py``）：
+
+    python test/_bench_eod_snapshot.py            # 200 个盘，每种写法重复 5 轮
+    python test/_bench_eod_snapshot.py 500 10     # 盘数 × 重复轮数
+
+在临时目录的 SQLite 文件库上建账户 / 持仓 / 快照表，并预置 20 个交易日的历史快照：
+
+- 逐盘：旧 ``papertrade_snapshot_write`` 的写法，每个盘读持仓、查上一条快照、
+  upsert 当天快照，各自一个事务；
+- 批量：``write_eod_snapshots`` 的写法，一条查询取全部持仓、一条查询取全部基准，
+  ``compute_snapshots`` 聚合后一个事务写完。
+
+报价用固定价格表代替（两种写法拉报价的次数差异不计入）。直接拿同一个 session 工厂
+调 ``db._equity_before`` / ``db._upsert_snapshots``，不经 ``@with_session``；取各轮中位数，
+并核对两种写法算出的净值一致、重跑后每盘当天只有一条快照。
+"""
+
+import sys
+import time
+import random
+import asyncio
+import tempfile
+import statistics
+from types import ModuleType
+from typing import Dict, List
+from pathlib import Path
+from datetime import date, timedelta
+
+_PLUGIN_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_PLUGIN_ROOT))
+if len(_PLUGIN_ROOT.parents) > 2:
+    sys.path.insert(0, str(_PLUGIN_ROOT.parents[2]))
+
+for _sub in ("", ".utils", ".stock_papertrade"):
+    _name = f"SayuStock{_sub}"
+    if _name not in sys.modules:
+        _mod = ModuleType(_name)
+        _mod.__path__ = [str(_PLUGIN_ROOT / _name.replace(".", "/"))]  # type: ignore[attr-defined]
+        sys.modules[_name] = _mod
+
+from sqlmodel import col  # noqa: E402
+from sqlalchemy import and_, func, select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+
+from SayuStock.stock_papertrade import db  # noqa: E402
+from SayuStock.stock_papertrade.eod_snapshot import AccountSnapshot, compute_snapshots  # noqa: E402
+from SayuStock.utils.database.papertrade_models import (  # noqa: E402
+    SayuPaperAccount,
+    SayuPaperPosition,
+    SayuPaperSnapshot,
+    SayuPaperAccountStats,
+)
+
+POSITIONS = 20
+UNIVERSE = 800
+HISTORY_DAYS = 20
+TODAY = date(2026, 10, 19)
+
+
+async def _setup(session_maker: async_sessionmaker[AsyncSession], accounts: int) -> Dict[str, float]:
+    rng = random.Random(7)
+    universe = [f"{600000 + i}" for i in range(UNIVERSE)]
+    prices = {f"1.{code}": round(rng.uniform(3, 80), 2) for code in universe}
+    async with session_maker() as session, session.begin():
+        for account_id in range(1, accounts + 1):
+            session.add(SayuPaperAccount(id=account_id, name=f"盘{account_id}", group_id="g", bot_id="b", cash=2e5))
+            for code in rng.sample(universe, POSITIONS):
+                session.add(
+                    SayuPaperPosition(
+                        account_id=account_id,
+                        stock_code=code,
+                        stock_name=code,
+                        secid=f"1.{code}",
+                        qty=100 * rng.randint(1, 50),
+                        avg_cost=round(rng.uniform(3, 80), 2),
+                    )
+                )
+            for d in range(HISTORY_DAYS, 0, -1):
+                equity = 1e6 * (1 + rng.uniform(-0.1, 0.1))
+                session.add(
+                    SayuPaperSnapshot(
+                        account_id=account_id,
+                        trade_date=TODAY - timedelta(days=d),
+                        cash=2e5,
+                        position_value=equity - 2e5,
+                        total_equity=equity,
+                    )
+                )
+    return prices
+
+
+async def _per_account(session_maker, prices: Dict[str, float]) -> List[AccountSnapshot]:
+    async with session_maker() as session:
+        accounts = list((await session.execute(select(SayuPaperAccount))).scalars().all())
+    out: List[AccountSnapshot] = []
+    for acc in accounts:
+        async with session_maker() as session, session.begin():
+            stmt = select(SayuPaperPosition).where(
+                and_(col(SayuPaperPosition.account_id) == acc.id, col(SayuPaperPosition.qty) > 0)
+            )
+            positions = list((await session.execute(stmt)).scalars().all())
+        async with session_maker() as session, session.begin():
+            stmt = (
+                select(SayuPaperSnapshot)
+                .where(and_(col(SayuPaperSnapshot.account_id) == acc.id, col(SayuPaperSnapshot.trade_date) < TODAY))
+                .order_by(col(SayuPaperSnapshot.trade_date).desc())
+                .limit(1)
+            )
+            prev = (await session.execute(stmt)).scalars().first()
+        baselines = {acc.id: prev.total_equity} if prev is not None else {}
+        snap = compute_snapshots([acc], positions, prices, baselines)[0]
+        async with session_maker() as session, session.begin():
+            await db._upsert_snapshots(session, TODAY, [snap.row()])
+        out.append(snap)
+    return out
+
+
+async def _batch(session_maker, prices: Dict[str, float]) -> List[AccountSnapshot]:
+    async with session_maker() as session:
+        accounts = list((await session.execute(select(SayuPaperAccount))).scalars().all())
+        stmt = select(SayuPaperPosition).where(col(SayuPaperPosition.qty) > 0)
+        positions = list((await session.execute(stmt)).scalars().all())
+        baselines = await db._equity_before(session, TODAY)
+    snapshots = compute_snapshots(accounts, positions, prices, baselines)
+    async with session_maker() as session, session.begin():
+        await db._upsert_snapshots(session, TODAY, [s.row() for s in snapshots])
+    return snapshots
+
+
+async def main() -> None:
+    accounts = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+        async with engine.begin() as conn:
+            models = (SayuPaperAccount, SayuPaperPosition, SayuPaperSnapshot, SayuPaperAccountStats)
+            tables = [m.__table__ for m in models]  # type: ignore[attr-defined]
+            await conn.run_sync(lambda c: SayuPaperSnapshot.metadata.create_all(c, tables=tables))
+        session_maker = async_sessionmaker(engine, expire_on_commit=False)
+        prices = await _setup(session_maker, accounts)
+        print(f"{accounts} 个盘 × {POSITIONS} 只持仓，历史快照 {HISTORY_DAYS} 天，重复 {repeat} 轮")
+
+        equities = {}
+        for label, writer in (("逐盘", _per_account), ("批量", _batch)):
+            samples: List[float] = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                snapshots = await writer(session_maker, prices)
+                samples.append((time.perf_counter() - start) * 1000)
+            equities[label] = {s.account_id: s.total_equity for s in snapshots}
+            print(f"{label:<6} 中位 {statistics.median(samples):8.1f} ms")
+
+        async with session_maker() as session:
+            stmt = select(func.count()).select_from(SayuPaperSnapshot).where(col(SayuPaperSnapshot.trade_date) == TODAY)
+            rows = (await session.execute(stmt)).scalar_one()
+        print(f"净值一致：{equities['逐盘'] == equities['批量']}  当天快照 {rows} 行")
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
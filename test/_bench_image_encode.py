@@ -0,0 +1,138 @@
+"""出图导出基准：2400 根日 K，对比 savefig → PNG → 解码 与 Agg 画布直出，再比各编码参数。
+
+不属于测试套件，只在调 ``chart_image_format`` / ``chart_png_compress_level`` /
+``chart_jpeg_quality`` 时手动跑：
+
+    python test/_bench_image_encode.py          # 2400 根、每项取 3 次最快
+    python test/_bench_image_encode.py 4800 5   # 根数、重复次数
+
+第一段只计「画布 → PIL 图」：两条路径绘制本身一样，差别全在导出；
+第二段是同一张图在各编码参数下的耗时与字节数。
+"""
+
+import sys
+import time
+from io import BytesIO
+from types import ModuleType
+from pathlib import Path
+from datetime import datetime
+
+_PLUGIN_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_PLUGIN_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+if len(_PLUGIN_ROOT.parents) > 2:
+    sys.path.insert(0, str(_PLUGIN_ROOT.parents[2]))
+
+for _sub in ("", ".utils", ".stock_stockinfo"):
+    _name = f"SayuStock{_sub}"
+    if _name not in sys.modules:
+        _mod = ModuleType(_name)
+        _mod.__path__ = [str(_PLUGIN_ROOT / _name.replace(".", "/"))]  # type: ignore[attr-defined]
+        sys.modules[_name] = _mod
+
+from PIL import Image  # noqa: E402
+from kline_fixtures import make_klines  # noqa: E402
+
+from SayuStock.stock_stockinfo import chart_kline  # noqa: E402
+from SayuStock.utils.image_encode import EncodeOptions, encode_image  # noqa: E402
+from SayuStock.utils.market.enums import AssetClass, KlinePeriod  # noqa: E402
+from SayuStock.utils.market.models import Bar, SymbolRef, KlineSeries  # noqa: E402
+from SayuStock.stock_stockinfo.chart_base import plt, _fig_to_image  # noqa: E402
+
+_OPTIONS = [
+    EncodeOptions("png", png_compress_level=1),
+    EncodeOptions("png", png_compress_level=3),
+    EncodeOptions("png", png_compress_level=6),
+    EncodeOptions("png", png_compress_level=9),
+    EncodeOptions("webp"),
+    EncodeOptions("jpeg", jpeg_quality=85),
+    EncodeOptions("jpeg", jpeg_quality=90),
+    EncodeOptions("jpeg", jpeg_quality=95),
+]
+
+
+def _kline_series(n: int) -> KlineSeries:
+    bars: list[Bar] = []
+    for line in make_klines(n, seed=2400):
+        parts = line.split(",")
+        bars.append(
+            Bar(
+                ts=datetime.strptime(parts[0][:10], "%Y-%m-%d"),
+                open=float(parts[1]),
+                close=float(parts[2]),
+                high=float(parts[3]),
+                low=float(parts[4]),
+                volume=float(parts[5]),
+                amount=float(parts[6]),
+                amplitude=float(parts[7]),
+                change_pct=float(parts[8]),
+                change_amount=float(parts[9]),
+                turnover_rate=float(parts[10]),
+            )
+        )
+    return KlineSeries(
+        symbol=SymbolRef("600000", "基准股", AssetClass.EQUITY, "SSE", "1.600000"),
+        period=KlinePeriod.D1,
+        bars=tuple(bars),
+        adjusted=True,
+    )
+
+
+def _savefig_decode(fig, *, dpi: int = 180) -> Image.Image:
+    """改造前的导出：savefig 成 PNG 再解码。"""
+    output = BytesIO()
+    fig.savefig(output, format="png", dpi=dpi, facecolor=fig.get_facecolor(), pad_inches=0.06)
+    plt.close(fig)
+    output.seek(0)
+    return Image.open(output).convert("RGB")
+
+
+def _export_ms(series: KlineSeries, export, repeat: int) -> tuple[float, Image.Image]:
+    """只计导出那一步：把 chart_kline 里的 _fig_to_image 换成计时包装。"""
+    timings: list[float] = []
+    image: Image.Image | None = None
+
+    def timed(fig, **kwargs):
+        nonlocal image
+        start = time.perf_counter()
+        image = export(fig, **kwargs)
+        timings.append((time.perf_counter() - start) * 1000)
+        return image
+
+    original = chart_kline._fig_to_image
+    chart_kline._fig_to_image = timed
+    try:
+        for _ in range(repeat):
+            result = chart_kline.draw_single_kline_chart(series)
+            assert not isinstance(result, str), result
+    finally:
+        chart_kline._fig_to_image = original
+    assert image is not None
+    return min(timings), image
+
+
+def main(n: int, repeat: int) -> None:
+    series = _kline_series(n)
+    chart_kline.draw_single_kline_chart(series)  # 预热字体与 import
+
+    legacy_ms, legacy = _export_ms(series, _savefig_decode, repeat)
+    direct_ms, image = _export_ms(series, _fig_to_image, repeat)
+    print(f"{n} 根日 K，{image.width}x{image.height}")
+    print(f"  savefig → PNG → 解码   {legacy_ms:8.1f} ms")
+    print(f"  Agg buffer_rgba 直出   {direct_ms:8.1f} ms  ({legacy_ms / direct_ms:.1f}x)")
+    assert legacy.tobytes() == image.tobytes(), "两条导出路径像素不一致"
+
+    print("  编码                    耗时        大小")
+    for options in _OPTIONS:
+        best = min((encode_image(image, options) for _ in range(repeat)), key=lambda e: e.encode_ms)
+        label = options.format
+        if options.format == "png":
+            label += f" level={options.png_compress_level}"
+        elif options.format == "jpeg":
+            label += f" q={options.jpeg_quality}"
+        print(f"  {label:<20}{best.encode_ms:8.1f} ms  {len(best.data) / 1024:8.0f} KiB")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(args[0] if args else 2400, args[1] if len(args) > 1 else 3)
@@ -0,0 +1,118 @@
+"""跨盘排行读取基准：全历史 group by vs 排行物化表。
+
+不属于测试套件，只在调 ``SayuPaperAccountStats`` 维护逻辑时手动跑（需要嵌套布局下的
+gsuid_core 环境来导入 ``db.py``）：
+
+    python test/_bench_leaderboard.py              # 200 个盘 × 750 个交易日
+    python test/_bench_leaderboard.py 500 1500     # 盘数 × 交易日数
+
+在临时目录的 SQLite 文件库上建好快照表（带模型上的索引），再用 ``_recompute_stats``
+建物化表。两种读法各取前 20 名、重复 50 轮取中位数，并核对两边的名单一致；
+另外计时一次全量重建和一次新交易日的增量写入（200 个盘一个事务）。
+"""
+
+import sys
+import time
+import random
+import asyncio
+import tempfile
+import statistics
+from types import ModuleType
+from typing import List
+from pathlib import Path
+from datetime import date, timedelta
+
+_PLUGIN_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_PLUGIN_ROOT))
+if len(_PLUGIN_ROOT.parents) > 2:
+    sys.path.insert(0, str(_PLUGIN_ROOT.parents[2]))
+
+for _sub in ("", ".utils", ".stock_papertrade"):
+    _name = f"SayuStock{_sub}"
+    if _name not in sys.modules:
+        _mod = ModuleType(_name)
+        _mod.__path__ = [str(_PLUGIN_ROOT / _name.replace(".", "/"))]  # type: ignore[attr-defined]
+        sys.modules[_name] = _mod
+
+from sqlmodel import col  # noqa: E402
+from sqlalchemy import insert, select  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+
+from SayuStock.stock_papertrade import db  # noqa: E402
+from SayuStock.utils.database.papertrade_models import SayuPaperSnapshot, SayuPaperAccountStats  # noqa: E402
+
+TOP_N = 20
+START = date(2023, 1, 2)
+
+
+async def main() -> None:
+    accounts = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 750
+    rng = random.Random(3)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+        async with engine.begin() as conn:
+            tables = [m.__table__ for m in (SayuPaperSnapshot, SayuPaperAccountStats)]  # type: ignore[attr-defined]
+            await conn.run_sync(lambda c: SayuPaperSnapshot.metadata.create_all(c, tables=tables))
+            for account_id in range(1, accounts + 1):
+                equity = 1e6
+                rows = []
+                for d in range(days):
+                    equity *= 1 + rng.gauss(0.0003, 0.015)
+                    pnl = equity - 1e6
+                    rows.append(
+                        {
+                            "account_id": account_id,
+                            "trade_date": START + timedelta(days=d),
+                            "cash": equity,
+                            "position_value": 0.0,
+                            "total_equity": equity,
+                            "total_pnl": pnl,
+                            "total_pnl_pct": pnl / 1e4,
+                        }
+                    )
+                await conn.execute(insert(SayuPaperSnapshot), rows)
+        session_maker = async_sessionmaker(engine, expire_on_commit=False)
+        print(f"{accounts} 个盘 × {days} 个交易日 = {accounts * days} 条快照")
+
+        start = time.perf_counter()
+        async with session_maker() as session, session.begin():
+            await db._recompute_stats(session)
+            await db._rerank_stats(session)
+        print(f"全量重建      {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+        group_by = db._latest_snapshots_stmt().order_by(col(SayuPaperSnapshot.total_pnl_pct).desc()).limit(TOP_N)
+        materialized = (
+            select(SayuPaperAccountStats)
+            .order_by(col(SayuPaperAccountStats.rank), col(SayuPaperAccountStats.account_id))
+            .limit(TOP_N)
+        )
+        tops = {}
+        for label, stmt in (("group by", group_by), ("物化表", materialized)):
+            samples: List[float] = []
+            for _ in range(50):
+                start = time.perf_counter()
+                async with session_maker() as session:
+                    rows = list((await session.execute(stmt)).scalars().all())
+                samples.append((time.perf_counter() - start) * 1000)
+            tops[label] = [r.account_id for r in rows]
+            print(f"{label:<10} 前 {TOP_N} 中位 {statistics.median(samples):8.2f} ms")
+        print(f"名单一致：{tops['group by'] == tops['物化表']}")
+
+        next_day = START + timedelta(days=days)
+        rows = [
+            {"account_id": i, "cash": 1e6, "position_value": 0.0, "total_equity": 1e6 + i, "total_pnl": float(i)}
+            for i in range(1, accounts + 1)
+        ]
+        start = time.perf_counter()
+        async with session_maker() as session, session.begin():
+            await db._upsert_snapshots(session, next_day, rows)
+        print(f"新交易日增量  {(time.perf_counter() - start) * 1000:8.1f} ms")
+        async with session_maker() as session:
+            problems = await db._check_stats(session)
+        print(f"校验不一致项：{len(problems)}")
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,100 @@
+"""出图吞吐基准：8 张 K 线并发，线程内绘图 vs 常驻进程池。
+
+不属于测试套件（耗时、且吃满多核），只在调 ``render_pool_size`` 时手动跑：
+
+    python test/_bench_render_pool.py            # 默认 8 并发、进程池 4 worker
+    python test/_bench_render_pool.py 16 8       # 16 并发、8 worker
+
+进程池一栏不含 worker 启动与预热（``RenderPool.start`` 提前完成），
+与线上常驻池的稳态一致；首张图的冷启动耗时单独打印。
+"""
+
+import sys
+import time
+import asyncio
+from types import ModuleType
+from pathlib import Path
+from datetime import datetime
+
+_PLUGIN_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_PLUGIN_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+if len(_PLUGIN_ROOT.parents) > 2:
+    sys.path.insert(0, str(_PLUGIN_ROOT.parents[2]))
+
+# 与 conftest 一样只挂包壳、不执行 SayuStock/__init__.py；放在模块顶层，
+# spawn 出来的 worker 重新 import 本脚本时也会先挂好。
+for _sub in ("", ".utils", ".stock_stockinfo"):
+    _name = f"SayuStock{_sub}"
+    if _name not in sys.modules:
+        _mod = ModuleType(_name)
+        _mod.__path__ = [str(_PLUGIN_ROOT / _name.replace(".", "/"))]  # type: ignore[attr-defined]
+        sys.modules[_name] = _mod
+
+from kline_fixtures import make_klines  # noqa: E402
+
+from SayuStock.utils.market.enums import AssetClass, KlinePeriod  # noqa: E402
+from SayuStock.utils.market.models import Bar, SymbolRef, KlineSeries  # noqa: E402
+from SayuStock.stock_stockinfo.render_pool import RenderJob, RenderPool  # noqa: E402
+
+
+def _kline_series(index: int, n: int = 240) -> KlineSeries:
+    bars: list[Bar] = []
+    for line in make_klines(n, seed=index + 1):
+        parts = line.split(",")
+        bars.append(
+            Bar(
+                ts=datetime.strptime(parts[0][:10], "%Y-%m-%d"),
+                open=float(parts[1]),
+                close=float(parts[2]),
+                high=float(parts[3]),
+                low=float(parts[4]),
+                volume=float(parts[5]),
+                amount=float(parts[6]),
+                amplitude=float(parts[7]),
+                change_pct=float(parts[8]),
+                change_amount=float(parts[9]),
+                turnover_rate=float(parts[10]),
+            )
+        )
+    code = f"{600000 + index}"
+    return KlineSeries(
+        symbol=SymbolRef(code, f"基准股{index}", AssetClass.EQUITY, "SSE", f"1.{code}"),
+        period=KlinePeriod.D1,
+        bars=tuple(bars),
+        adjusted=True,
+    )
+
+
+async def _burst(pool: RenderPool, jobs: list[RenderJob]) -> float:
+    start = time.perf_counter()
+    results = await asyncio.gather(*(pool.render(job) for job in jobs))
+    elapsed = time.perf_counter() - start
+    failed = [r for r in results if isinstance(r, str)]
+    assert not failed, failed[0]
+    return elapsed
+
+
+async def main(concurrency: int, workers: int) -> None:
+    jobs = [RenderJob("kline", (_kline_series(i),)) for i in range(concurrency)]
+
+    thread_pool = RenderPool(size=0, timeout=300)
+    await thread_pool.render(jobs[0])  # 线程路径也先画一张，排除 import / 字体注册
+    thread_s = await _burst(thread_pool, jobs)
+
+    process_pool = RenderPool(size=workers, timeout=300)
+    cold = time.perf_counter()
+    await process_pool.start()
+    cold_s = time.perf_counter() - cold
+    process_s = await _burst(process_pool, jobs)
+    process_pool.shutdown()
+
+    print(f"{concurrency} 张 K 线并发")
+    print(f"  线程内绘图      {thread_s:6.2f}s  {concurrency / thread_s:5.2f} 张/s")
+    print(f"  进程池 x{workers:<2}      {process_s:6.2f}s  {concurrency / process_s:5.2f} 张/s")
+    print(f"  进程池冷启动    {cold_s:6.2f}s（import + 字体预热，仅首次）")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    asyncio.run(main(args[0] if args else 8, args[1] if len(args) > 1 else 4))
@@ -0,0 +1,98 @@
+"""新闻 → 个股匹配基准：逐名 ``name in text`` 朴素扫描 vs Aho-Corasick 自动机。
+
+不属于测试套件，只在调 ``utils/stock_matcher.py`` 时手动跑：
+
+    python test/_bench_stock_matcher.py          # 1000 条标题
+    python test/_bench_stock_matcher.py 5000     # 标题条数
+
+标题用 ``chinese_stocks.json`` 里随机的全称 / 代码拼上财经套话合成，长度接近
+雪球 7x24 的单条快讯。朴素扫描对全部全称 + 代码逐个 ``in``；自动机先计一次
+构建耗时，再一遍扫完每条标题。朴素扫描不做重叠消歧，所以它找到的代码是自动机结果
+的超集，这里核对"自动机 ⊆ 朴素"，并打印两边的差额。
+"""
+
+import sys
+import time
+import random
+from types import ModuleType
+from typing import Set, Dict, List
+from pathlib import Path
+
+_PLUGIN_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_PLUGIN_ROOT))
+if len(_PLUGIN_ROOT.parents) > 2:
+    sys.path.insert(0, str(_PLUGIN_ROOT.parents[2]))
+
+for _sub in ("", ".utils"):
+    _name = f"SayuStock{_sub}"
+    if _name not in sys.modules:
+        _mod = ModuleType(_name)
+        _mod.__path__ = [str(_PLUGIN_ROOT / _name.replace(".", "/"))]  # type: ignore[attr-defined]
+        sys.modules[_name] = _mod
+
+from SayuStock.utils.constant import chinese_stocks  # noqa: E402
+from SayuStock.utils.stock_matcher import StockMatcher  # noqa: E402
+
+FILLERS = [
+    "公告称拟以自有资金回购股份，回购价格上限为每股",
+    "午后拉升翻红，成交额突破 10 亿元，主力资金净流入",
+    "发布 2026 年三季度业绩预告，预计净利润同比增长",
+    "获北向资金连续 5 日加仓，机构上调目标价至",
+    "与多家头部客户签订战略合作协议，订单金额约",
+    "盘中触及涨停，换手率 12.3%，所属板块集体走强",
+]
+
+
+def _headlines(n: int, rng: random.Random) -> List[str]:
+    codes = list(chinese_stocks)
+    out = []
+    for _ in range(n):
+        parts = []
+        for _ in range(rng.randint(1, 3)):
+            code = rng.choice(codes)
+            name = chinese_stocks[code]["name"]
+            parts.append(rng.choice([name, code, f"{name}({code})"]))
+            parts.append(rng.choice(FILLERS))
+        out.append(
+            f"【{rng.randint(1, 99)}:{rng.randint(10, 59)}】" + "，".join(parts) + f" {rng.random() * 100:.2f} 元。"
+        )
+    return out
+
+
+def _naive_patterns() -> Dict[str, str]:
+    patterns: Dict[str, str] = {}
+    for code, info in chinese_stocks.items():
+        patterns.setdefault(info["name"], code)
+        patterns.setdefault(code, code)
+    return patterns
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    headlines = _headlines(n, random.Random(11))
+
+    start = time.perf_counter()
+    matcher = StockMatcher(chinese_stocks)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    patterns = _naive_patterns()
+    start = time.perf_counter()
+    naive: List[Set[str]] = [{code for p, code in patterns.items() if p in text} for text in headlines]
+    naive_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    tagged = matcher.tag_news({"text": text} for text in headlines)
+    ac_ms = (time.perf_counter() - start) * 1000
+
+    assert all(set(codes) <= found for codes, found in zip(tagged, naive))
+    extra = sum(len(found) - len(codes) for codes, found in zip(tagged, naive))
+    avg_len = sum(map(len, headlines)) / n
+    print(f"{n} 条标题（平均 {avg_len:.0f} 字），{len(patterns)} 个模式，自动机 {len(matcher)} 个模式")
+    print(f"  自动机构建   {build_ms:9.1f} ms（一次性）")
+    print(f"  朴素扫描     {naive_ms:9.1f} ms  每条 {naive_ms / n * 1000:8.1f} µs")
+    print(f"  自动机扫描   {ac_ms:9.1f} ms  每条 {ac_ms / n * 1000:8.1f} µs  加速 {naive_ms / ac_ms:.1f}x")
+    print(f"  朴素多出的命中（子串重叠 / 紧挨数字的代码）：{extra}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""离线调参扩展性基准：同一批参数组分别用 1 ~ N 个进程跑，看墙钟时间和加速比。
+
+不属于测试套件，只在调 ``stock_papertrade/sweep.py`` 时手动跑：
+
+    python test/_bench_sweep.py              # 300 只 × 750 根，16 组，1 ~ CPU 核数
+    python test/_bench_sweep.py 8 32         # 最多 8 个进程，32 组参数
+
+面板用 ``kline_fixtures.make_klines`` 造，参数组是 ``volume_extremum`` 的网格。
+每一档都写到一个新的临时结果表（不续跑），并核对各档结果表逐行一致。
+"""
+
+import os
+import sys
+import time
+import tempfile
+from types import ModuleType
+from pathlib import Path
+
+_PLUGIN_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_PLUGIN_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+if len(_PLUGIN_ROOT.parents) > 2:
+    sys.path.insert(0, str(_PLUGIN_ROOT.parents[2]))
+
+for _sub in ("", ".utils", ".stock_papertrade"):
+    _name = f"SayuStock{_sub}"
+    if _name not in sys.modules:
+        _mod = ModuleType(_name)
+        _mod.__path__ = [str(_PLUGIN_ROOT / _name.replace(".", "/"))]  # type: ignore[attr-defined]
+        sys.modules[_name] = _mod
+
+from kline_fixtures import make_klines  # noqa: E402
+
+from SayuStock.utils.kline import klines_to_df  # noqa: E402
+from SayuStock.stock_papertrade import sweep  # noqa: E402
+from SayuStock.stock_papertrade.backtest import BarPanel  # noqa: E402
+
+
+def main() -> None:
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else (os.cpu_count() or 1)
+    n_combos = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    frames = {f"{600000 + i}": klines_to_df(make_klines(750, seed=i, vol=0.025)) for i in range(300)}
+    panel = BarPanel.from_frames(frames)
+    combos = sweep.grid(
+        {
+            "lookback_m": [40, 60, 80, 120],
+            "bottom_pct": [0.10, 0.15, 0.20, 0.25],
+            "vol_ratio_min": [1.5, 2.0],
+        }
+    )[:n_combos]
+    print(f"300 只 × 750 根，{len(combos)} 组参数，CPU {os.cpu_count()} 核")
+
+    baseline = None
+    reference = None
+    for workers in range(1, max_workers + 1):
+        with tempfile.TemporaryDirectory() as tmp:
+            start = time.perf_counter()
+            table = sweep.run_sweep(panel, "volume_extremum", combos, Path(tmp) / "sweep.csv", workers=workers)
+            elapsed = time.perf_counter() - start
+        table = table.sort_values("combo_id", ignore_index=True)
+        if reference is None:
+            reference = table
+        same = table.drop(columns="params").equals(reference.drop(columns="params"))
+        baseline = baseline or elapsed
+        print(
+            f"{workers:>2} 进程  {elapsed:7.2f} s  每组 {elapsed / len(combos) * 1000:7.1f} ms  "
+            f"加速 {baseline / elapsed:5.2f}×  结果一致 {same}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""分钟时间轴基准：逐分钟 strptime / timedelta 旧生成器 vs 缓存模板 + 向量平移。
+
+不属于测试套件，只在调 ``utils/time_range.py`` 时手动跑：
+
+    python test/_bench_time_range.py          # 每个市场重复 200 次
+    python test/_bench_time_range.py 1000     # 重复次数
+
+每个市场跑三条路径并核对结果一致：
+
+- 旧生成器（逐分钟循环，基准日 = 当天）；
+- ``_generate_datetime_array_with_base``（模板平移到当天，转 datetime 列表）；
+- ``get_trading_datetimes``（1900-01-01 基准的 'YYYY-MM-DD HH:MM' 文本，整份缓存）。
+
+第一次调用含编译模板，计时取其余各次的中位数。
+"""
+
+import sys
+import time
+import datetime
+import statistics
+from types import ModuleType
+from typing import Any, List, Tuple, Callable
+from pathlib import Path
+
+_PLUGIN_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_PLUGIN_ROOT))
+if len(_PLUGIN_ROOT.parents) > 2:
+    sys.path.insert(0, str(_PLUGIN_ROOT.parents[2]))
+
+for _sub in ("", ".utils"):
+    _name = f"SayuStock{_sub}"
+    if _name not in sys.modules:
+        _mod = ModuleType(_name)
+        _mod.__path__ = [str(_PLUGIN_ROOT / _name.replace(".", "/"))]  # type: ignore[attr-defined]
+        sys.modules[_name] = _mod
+
+from SayuStock.utils.time_range import (  # noqa: E402
+    MARKET_SESSIONS,
+    Market,
+    get_trading_datetimes,
+    _generate_datetime_array_with_base,
+)
+
+# 每个市场挑一个代表代码给 get_trading_datetimes
+CODES = {
+    Market.A_SHARE: "1.600519",
+    Market.HK_STOCK: "116.00700",
+    Market.US_STOCK: "106.BABA",
+    Market.CN_FUTURE_DAY: "IF2508",
+    Market.CN_FUTURE_NIGHT: "rb2510",
+    Market.US_FUTURE: "103.NQ00Y",
+    Market.CRYPTO: "crypto_btc",
+}
+
+
+def _legacy(sessions: List[Tuple[str, str]], base_day: datetime.date) -> List[datetime.datetime]:
+    """改造前的生成器：逐分钟 strptime + timedelta。"""
+    full: List[datetime.datetime] = []
+    delta = datetime.timedelta(minutes=1)
+    base = datetime.datetime.combine(base_day, datetime.time(0, 0))
+    for start_str, end_str in sessions:
+        try:
+            start_dt = datetime.datetime.strptime(start_str, "%H:%M").replace(
+                year=base.year, month=base.month, day=base.day
+            )
+            end_dt = datetime.datetime.strptime(end_str, "%H:%M").replace(
+                year=base.year, month=base.month, day=base.day
+            )
+            if end_dt <= start_dt:
+                end_dt += datetime.timedelta(days=1)
+            current_dt = start_dt
+            while current_dt <= end_dt:
+                full.append(current_dt)
+                current_dt += delta
+        except ValueError:
+            continue
+    return list(dict.fromkeys(full))
+
+
+def _median_us(fn: Callable[[], Any], repeat: int) -> float:
+    fn()
+    samples: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    today = datetime.date.today()
+    print(f"{'市场':<16}{'分钟数':>8}{'旧生成器':>12}{'模板平移':>12}{'文本缓存':>12}{'加速':>8}")
+    for market, code in CODES.items():
+        sessions = MARKET_SESSIONS[market]
+        old = _legacy(sessions, today)
+        new = _generate_datetime_array_with_base(sessions, today)
+        assert old == new, market
+        assert get_trading_datetimes(code) == [
+            d.strftime("%Y-%m-%d %H:%M") for d in _legacy(sessions, datetime.date(1900, 1, 1))
+        ]
+
+        t_old = _median_us(lambda: _legacy(sessions, today), repeat)
+        t_new = _median_us(lambda: _generate_datetime_array_with_base(sessions, today), repeat)
+        t_str = _median_us(lambda: get_trading_datetimes(code), repeat)
+        print(f"{market.name:<16}{len(old):>8}{t_old:>10.1f}µs{t_new:>10.1f}µs{t_str:>10.1f}µs{t_old / t_new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
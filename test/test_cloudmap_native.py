@@ -0,0 +1,157 @@
+"""云图原生渲染：squarify 布局、配色，以及与 plotly 版（``to_fig``）的逐节点对比。
+
+plotly 版要靠 Chromium 截图，CI 里拿不到像素；这里对比的是它交给浏览器之前的
+图形描述 —— 每个节点的层级、面积值与 ``marker.colors``，再用 plotly 自己的
+colorscale 取色，和原生渲染出的像素逐块比对。
+"""
+
+from __future__ import annotations
+
+import random
+import asyncio
+import itertools
+
+import pytest
+from plotly.colors import find_intermediate_color
+
+from SayuStock.utils.treemap import squarify, diff_colors
+from SayuStock.utils.render_data import build_cloudmap_render_data
+from SayuStock.utils.market.enums import BoardKind
+from SayuStock.utils.market.models import BoardRow, BoardSnapshot
+from SayuStock.stock_cloudmap.render import to_fig
+from SayuStock.stock_cloudmap.render_native import build_tree, layout_tree, draw_cloudmap_native
+
+
+def _snapshot(n: int = 60, seed: int = 7) -> BoardSnapshot:
+    rng = random.Random(seed)
+    industries = ["银行", "半导体", "白酒", "光伏", "医药"]
+    rows = tuple(
+        BoardRow(
+            code=f"{i:06d}",
+            name=f"股{i}",
+            price=10.0,
+            change_pct=round(rng.uniform(-12, 12), 2),
+            amount=1e8,
+            market_cap=rng.uniform(5e9, 5e11),
+            industry=industries[i % len(industries)],
+            lead_name=None,
+            lead_change_pct=None,
+        )
+        for i in range(n)
+    )
+    return BoardSnapshot(kind=BoardKind.HOTMAP, title="大盘云图", rows=rows)
+
+
+def test_squarify_fills_rect_proportionally_without_overlap() -> None:
+    values = sorted((random.Random(1).uniform(1, 100) for _ in range(40)), reverse=True)
+    rects = squarify(values, 10.0, 20.0, 300.0, 200.0)
+    total = sum(values)
+    for value, (x, y, w, h) in zip(values, rects):
+        assert w * h == pytest.approx(value / total * 300 * 200, rel=1e-6)
+        assert x >= 10 - 1e-6 and y >= 20 - 1e-6
+        assert x + w <= 310 + 1e-6 and y + h <= 220 + 1e-6
+    for (ax, ay, aw, ah), (bx, by, bw, bh) in itertools.combinations(rects, 2):
+        overlap_w = min(ax + aw, bx + bw) - max(ax, bx)
+        overlap_h = min(ay + ah, by + bh) - max(ay, by)
+        assert overlap_w <= 1e-6 or overlap_h <= 1e-6
+
+
+def test_squarify_keeps_tiles_close_to_square() -> None:
+    values = [1.0] * 64
+    ratios = [max(w / h, h / w) for _, _, w, h in squarify(values, 0, 0, 800, 800)]
+    assert max(ratios) < 1.5
+
+
+def test_squarify_zero_values_get_empty_rects() -> None:
+    rects = squarify([5.0, 0.0], 0, 0, 10, 10)
+    assert rects[0][2] * rects[0][3] == pytest.approx(100)
+    assert rects[1][2] * rects[1][3] == 0
+
+
+def _rgb(color: str) -> tuple[float, float, float]:
+    r, g, b = (float(v) for v in color[color.index("(") + 1 : -1].split(",")[:3])
+    return r, g, b
+
+
+def _plotly_color(colorscale, diff: float) -> tuple[float, float, float]:
+    """按 plotly.js 的做法在 colorscale 的相邻两档之间线性插值。"""
+    t = (min(max(diff, -10.0), 10.0) + 10.0) / 20.0
+    for (lo, lo_color), (hi, hi_color) in itertools.pairwise(colorscale):
+        if lo <= t <= hi:
+            ratio = (t - lo) / (hi - lo) if hi > lo else 0.0
+            return find_intermediate_color(_rgb(lo_color), _rgb(hi_color), ratio)
+    raise AssertionError(t)
+
+
+def test_diff_colors_match_plotly_colorscale() -> None:
+    fig = asyncio.run(to_fig(_snapshot(), "大盘云图"))
+    colorscale = fig.layout.coloraxis.colorscale
+    diffs = [-15.0, -10.0, -7.3, -2.5, -0.01, 0.0, 0.5, 3.3, 9.99, 10.0, 20.0]
+    for diff, got in zip(diffs, diff_colors(diffs)):
+        ref = _plotly_color(colorscale, diff)
+        assert max(abs(int(g) - r) for g, r in zip(got, ref)) <= 1, (diff, got, ref)
+
+
+@pytest.mark.parametrize(("market", "sector", "layer"), [("大盘云图", None, 2), ("行业云图", "半导体", 1)])
+def test_hierarchy_and_colors_match_plotly_figure(market: str, sector: str | None, layer: int) -> None:
+    snap = _snapshot()
+    trace = asyncio.run(to_fig(snap, market, sector, layer)).data[0]
+    plotly_nodes = {
+        tuple(node_id.replace("<b>", "").replace("</b>", "").split("/")): (value, color)
+        for node_id, value, color in zip(trace.ids, trace.values, trace.marker.colors)
+    }
+
+    data = build_cloudmap_render_data(snap, market, sector, layer)
+    native_nodes: dict[tuple[str, ...], tuple[float, float]] = {}
+
+    def _walk(nodes, prefix: tuple[str, ...]) -> None:
+        for node in nodes:
+            key = (*prefix, node.label)
+            native_nodes[key] = (node.value, node.diff)
+            _walk(node.children, key)
+
+    _walk(build_tree(data.df, data.treemap_path, data.title), ())
+    assert native_nodes.keys() == plotly_nodes.keys()
+    for key, (value, diff) in native_nodes.items():
+        assert value == pytest.approx(plotly_nodes[key][0])
+        assert diff == pytest.approx(plotly_nodes[key][1])
+
+
+def test_rendered_tiles_use_plotly_colors() -> None:
+    snap = _snapshot()
+    img = draw_cloudmap_native(snap, "大盘云图", view_port=600, scale=1)
+    assert not isinstance(img, str)
+    assert img.size == (600, 600)
+
+    data = build_cloudmap_render_data(snap, "大盘云图")
+    placed = layout_tree(build_tree(data.df, data.treemap_path, data.title), 600, 600)
+    leaves = [node for node in placed if not node.children]
+    assert len(leaves) == len(data.df)
+    checked = 0
+    for node, color in zip(leaves, diff_colors([node.diff for node in leaves])):
+        x, y, w, h = node.rect
+        if w < 8 or h < 8:
+            continue
+        # 取方块左上角内侧一点：避开边框，也避开居中的文字
+        assert img.getpixel((round(x) + 3, round(y) + 3)) == tuple(int(c) for c in color)
+        checked += 1
+    assert checked >= len(leaves) // 2
+
+
+def test_children_stay_inside_parent_header_padding() -> None:
+    data = build_cloudmap_render_data(_snapshot(), "大盘云图")
+    placed = layout_tree(build_tree(data.df, data.treemap_path, data.title), 1000, 1000, scale=2)
+    for parent in (node for node in placed if node.children):
+        px_, py_, pw, ph = parent.rect
+        for child in parent.children:
+            cx, cy, cw, ch = child.rect
+            if cw * ch == 0:
+                continue
+            assert cy >= py_ + 120 - 1e-6
+            assert cx >= px_ + 10 - 1e-6 and cx + cw <= px_ + pw - 10 + 1e-6
+            assert cy + ch <= py_ + ph - 10 + 1e-6
+
+
+def test_not_enough_data_returns_error_text() -> None:
+    empty = BoardSnapshot(kind=BoardKind.HOTMAP, title="大盘云图", rows=())
+    assert isinstance(draw_cloudmap_native(empty, "大盘云图", view_port=100, scale=1), str)
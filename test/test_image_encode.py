@@ -0,0 +1,66 @@
+"""Agg 画布直出与出图编码：像素与旧的 savefig → PNG → 解码路径一致，各格式可还原。"""
+
+from __future__ import annotations
+
+from io import BytesIO
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from SayuStock.utils.image_encode import EncodeOptions, encode_image
+from SayuStock.stock_stockinfo.chart_base import plt, _setup_mpl, _fig_to_image
+
+
+def _figure():
+    _setup_mpl()
+    fig = plt.figure(figsize=(4, 2.5))
+    ax = fig.add_subplot(1, 1, 1)
+    ax.plot(np.arange(50), np.sin(np.arange(50) / 5), color="#e74c3c")
+    ax.bar(np.arange(50), np.cos(np.arange(50) / 7), color="#00b050")
+    ax.set_title("日K 成交额 +1.23%")
+    return fig
+
+
+def _savefig_decode(fig, dpi: int) -> Image.Image:
+    output = BytesIO()
+    fig.savefig(output, format="png", dpi=dpi, facecolor=fig.get_facecolor(), pad_inches=0.06)
+    output.seek(0)
+    return Image.open(output).convert("RGB")
+
+
+@pytest.mark.parametrize("dpi", [72, 180])
+def test_fig_to_image_matches_savefig_pixels(dpi: int) -> None:
+    reference = _savefig_decode(_figure(), dpi)
+    image = _fig_to_image(_figure(), dpi=dpi)
+    assert image.mode == "RGB"
+    assert image.size == reference.size == (round(4 * dpi), round(2.5 * dpi))
+    assert np.array_equal(np.asarray(image), np.asarray(reference))
+
+
+def test_lossless_formats_round_trip() -> None:
+    image = _fig_to_image(_figure(), dpi=72)
+    pixels = np.asarray(image)
+    for options in (EncodeOptions("png", png_compress_level=1), EncodeOptions("webp")):
+        encoded = encode_image(image, options)
+        assert encoded.size == image.size
+        assert encoded.encode_ms >= 0
+        assert np.array_equal(np.asarray(Image.open(BytesIO(encoded.data)).convert("RGB")), pixels)
+
+
+def test_png_level_and_jpeg_quality_change_size() -> None:
+    image = _fig_to_image(_figure(), dpi=120)
+    fast = encode_image(image, EncodeOptions("png", png_compress_level=1))
+    small = encode_image(image, EncodeOptions("png", png_compress_level=9))
+    assert len(small.data) <= len(fast.data)
+
+    low = encode_image(image, EncodeOptions("jpeg", jpeg_quality=60))
+    high = encode_image(image, EncodeOptions("jpeg", jpeg_quality=95))
+    assert low.ext == high.ext == "jpg"
+    assert len(low.data) < len(high.data)
+    assert Image.open(BytesIO(high.data)).format == "JPEG"
+
+
+def test_jpeg_accepts_rgba_input() -> None:
+    encoded = encode_image(Image.new("RGBA", (16, 16), (255, 0, 0, 128)), EncodeOptions("jpeg"))
+    assert Image.open(BytesIO(encoded.data)).mode == "RGB"
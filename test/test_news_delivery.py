@@ -0,0 +1,164 @@
+"""新闻推送投递引擎单测：各群并发排空、群内保序限速、全局在途上限、重试退避、延迟直方图。
+
+用假 bot（每次发送耗时固定）代替真实连接，间隔 / 退避都缩到毫秒级。
+"""
+
+import sys
+import time
+import asyncio
+import importlib.util
+from typing import Dict, List, Tuple
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent.parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+_spec = importlib.util.spec_from_file_location(
+    "_news_delivery_test", Path(__file__).resolve().parent.parent / "SayuStock" / "stock_news" / "delivery.py"
+)
+assert _spec is not None and _spec.loader is not None
+delivery = importlib.util.module_from_spec(_spec)
+sys.modules[_spec.name] = delivery
+_spec.loader.exec_module(delivery)
+
+
+class _FakeBot:
+    """每次发送耗时 ``latency`` 秒；记下发送顺序、同时在发的峰值，可按 (群, 条) 指定失败次数。"""
+
+    def __init__(self, latency: float = 0.005, fail_times: Dict[Tuple[str, int], int] | None = None):
+        self.latency = latency
+        self.fail_times = dict(fail_times or {})
+        self.sent: Dict[str, List[int]] = {}
+        self.in_flight = 0
+        self.peak = 0
+
+    def sender(self, group: str, item: int):
+        async def send():
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            try:
+                await asyncio.sleep(self.latency)
+                if self.fail_times.get((group, item), 0) > 0:
+                    self.fail_times[(group, item)] -= 1
+                    raise ConnectionError("bot 掉线")
+                self.sent.setdefault(group, []).append(item)
+            finally:
+                self.in_flight -= 1
+
+        return send
+
+
+def _engine(**kwargs):
+    opts = {"max_in_flight": 16, "min_interval": 0.01, "jitter": 0.0, "retries": 2, "backoff_base": 0.001}
+    opts.update(kwargs)
+    return delivery.NewsDeliveryEngine(**opts)
+
+
+# ============================================================
+# 端到端：100 个群
+# ============================================================
+def test_hundred_groups_drain_concurrently():
+    groups, items = 100, 10
+    bot = _FakeBot(latency=0.005)
+
+    async def run():
+        engine = _engine()
+        start = time.monotonic()
+        for item in range(items):
+            for g in range(groups):
+                engine.submit(f"g{g}", bot.sender(f"g{g}", item))
+        stats = await engine.join()
+        return stats, time.monotonic() - start
+
+    stats, elapsed = asyncio.run(run())
+
+    assert stats.sent == groups * items and stats.failed == 0
+    # 群内保序
+    assert all(bot.sent[f"g{g}"] == list(range(items)) for g in range(groups))
+    assert bot.peak <= 16
+    # 串行（老做法）至少要 groups × items × (发送 + 间隔) ≈ 15s；并发下由单群节奏决定
+    serial = groups * items * (0.005 + 0.01)
+    single_group = items * (0.005 + 0.01)
+    assert elapsed < serial / 5
+    assert stats.max_latency >= single_group * 0.8
+    assert sum(stats.buckets) == stats.sent and stats.quantile(0.95) <= 1.0
+    print(f"\n[100 群 × {items} 条] 用时 {elapsed:.2f}s（串行估算 {serial:.1f}s）；{stats.summary()}")
+
+
+def test_global_in_flight_cap():
+    bot = _FakeBot(latency=0.01)
+
+    async def run():
+        engine = _engine(max_in_flight=3)
+        for g in range(20):
+            engine.submit(f"g{g}", bot.sender(f"g{g}", 0))
+        return await engine.join()
+
+    stats = asyncio.run(run())
+    assert stats.sent == 20 and bot.peak == 3
+
+
+# ============================================================
+# 重试 / 跳过
+# ============================================================
+def test_retry_with_backoff_then_give_up():
+    bot = _FakeBot(latency=0.0, fail_times={("a", 0): 1, ("b", 0): 5})
+    marked: List[str] = []
+
+    async def run():
+        engine = _engine(retries=2)
+        engine.submit("a", bot.sender("a", 0), on_sent=lambda: marked.append("a0"))
+        engine.submit("a", bot.sender("a", 1), on_sent=lambda: marked.append("a1"))
+        engine.submit("b", bot.sender("b", 0), on_sent=lambda: marked.append("b0"))
+        engine.submit("b", bot.sender("b", 1), on_sent=lambda: marked.append("b1"))
+        return await engine.join()
+
+    stats = asyncio.run(run())
+    # a0 第二次成功；b0 三次都失败，不挡住 b1
+    assert bot.sent == {"a": [0, 1], "b": [1]}
+    assert sorted(marked) == ["a0", "a1", "b1"]
+    assert (stats.sent, stats.failed, stats.retried) == (3, 1, 3)
+
+
+def test_skipped_sends_are_not_paced_or_counted():
+    calls: List[int] = []
+
+    def sender(i: int, skip: bool):
+        async def send():
+            calls.append(i)
+            return False if skip else None
+
+        return send
+
+    async def run():
+        engine = _engine(min_interval=0.2)
+        start = time.monotonic()
+        for i in range(5):
+            engine.submit("g", sender(i, skip=i < 4))
+        stats = await engine.join()
+        return stats, time.monotonic() - start
+
+    stats, elapsed = asyncio.run(run())
+    assert calls == [0, 1, 2, 3, 4]
+    assert (stats.sent, stats.skipped) == (1, 4)
+    assert elapsed < 0.2
+
+
+def test_histogram_buckets_and_global_stats():
+    stats = delivery.DeliveryStats()
+    for latency in (0.5, 3.0, 3.0, 70.0, 400.0):
+        stats.observe(latency)
+    hist = stats.histogram()
+    assert hist["<=1s"] == 1 and hist["<=5s"] == 2 and hist["<=120s"] == 1 and hist[">300s"] == 1
+    assert stats.quantile(0.5) == 5.0 and stats.quantile(1.0) == 400.0
+
+    before = delivery.STATS.sent
+    bot = _FakeBot(latency=0.0)
+
+    async def run():
+        engine = _engine()
+        engine.submit("g", bot.sender("g", 0))
+        await engine.join()
+
+    asyncio.run(run())
+    assert delivery.STATS.sent == before + 1
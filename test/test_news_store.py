@@ -0,0 +1,93 @@
+"""定长 + 过期新闻存储单测：去重、容量淘汰、TTL 淘汰、落盘重启、长跑内存不涨。"""
+
+import sys
+import json
+import importlib.util
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent.parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+_spec = importlib.util.spec_from_file_location(
+    "_news_store_test", Path(__file__).resolve().parent.parent / "SayuStock" / "utils" / "news_store.py"
+)
+assert _spec is not None and _spec.loader is not None
+news_store = importlib.util.module_from_spec(_spec)
+sys.modules[_spec.name] = news_store
+_spec.loader.exec_module(news_store)
+NewsStore = news_store.NewsStore
+
+
+def _item(news_id: int) -> dict:
+    return {"id": news_id, "text": f"新闻 {news_id}", "mark": 1, "created_at": news_id * 1000}
+
+
+def test_dedup_and_lookup():
+    store = NewsStore(capacity=10, ttl_seconds=3600)
+    assert store.add(1, _item(1), now=0.0) is True
+    assert store.add(1, {"id": 1, "text": "改过"}, now=1.0) is False
+    assert 1 in store and 2 not in store
+    assert store.get(1)["text"] == "新闻 1"
+    assert len(store) == 1
+
+
+def test_capacity_and_ttl_evict_from_head():
+    store = NewsStore(capacity=3, ttl_seconds=100)
+    for i in range(5):
+        store.add(i, _item(i), now=float(i))
+    assert list(store) == [2, 3, 4]
+    # 被淘汰的 id 可以重新进来
+    assert store.add(0, _item(0), now=10.0) is True
+    assert list(store) == [3, 4, 0]
+
+    assert store.expire(now=104.5) == 2
+    assert list(store) == [0] and [v["id"] for v in store.values()] == [0]
+
+
+def test_persist_and_reload(tmp_path):
+    path = tmp_path / "news.json"
+    store = NewsStore(capacity=5, ttl_seconds=3600, path=path)
+    store.add(7, _item(7))
+    store.add(("g1", 7))
+    store.meta["next_max_id"] = 42
+    store.save()
+
+    again = NewsStore(capacity=5, ttl_seconds=3600, path=path)
+    assert 7 in again and ("g1", 7) in again
+    assert again.get(7) == _item(7) and again.meta == {"next_max_id": 42}
+
+    # 过了 TTL 的不会被载回来
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    payload["entries"][0][0] -= 7200
+    path.write_text(json.dumps(payload), encoding="utf-8")
+    assert list(NewsStore(capacity=5, ttl_seconds=3600, path=path)) == [("g1", 7)]
+
+    path.write_text("{broken", encoding="utf-8")
+    assert len(NewsStore(capacity=5, ttl_seconds=3600, path=path)) == 0
+
+
+def test_save_only_when_dirty(tmp_path):
+    path = tmp_path / "news.json"
+    store = NewsStore(capacity=5, path=path)
+    store.save()
+    assert not path.exists()
+    store.add(1, _item(1))
+    store.save()
+    mtime = path.stat().st_mtime_ns
+    store.add(1, _item(1))
+    store.save()
+    assert path.stat().st_mtime_ns == mtime
+
+
+def test_memory_stays_flat_over_long_uptime():
+    """模拟几周不停机：每 5 分钟一轮、每轮 45 条（3 页），大部分与上一轮重复。"""
+    store = NewsStore(capacity=1000, ttl_seconds=2 * 86400)
+    news_id = 0
+    for tick in range(12 * 24 * 21):  # 3 周
+        now = tick * 300.0
+        news_id += 5
+        for i in range(45):
+            store.add(news_id - i, _item(news_id - i), now=now)
+        assert len(store) <= 1000
+    assert len(store) == 1000 and len(store._order) == 1000
+    assert news_id in store and news_id - 1000 not in store
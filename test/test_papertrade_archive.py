@@ -0,0 +1,163 @@
+"""AI 模拟盘冷归档单测：分区文件读写、整月合并去重、热 + 冷的透明读路径。"""
+
+import sys
+import asyncio
+import importlib.util
+from types import ModuleType
+from pathlib import Path
+from datetime import datetime
+
+from sqlalchemy.schema import CreateTable
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent.parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+PKG_ROOT = Path(__file__).resolve().parent.parent / "SayuStock"
+PKG_NAME = "_papertrade_archive_test"
+
+
+def _ensure_pkg():
+    if PKG_NAME in sys.modules:
+        return
+    pkg_spec = importlib.util.spec_from_file_location(
+        PKG_NAME,
+        PKG_ROOT / "__init__.py",
+        submodule_search_locations=[str(PKG_ROOT)],
+    )
+    assert pkg_spec is not None
+    pkg = importlib.util.module_from_spec(pkg_spec)
+    pkg.__path__ = [str(PKG_ROOT)]
+    sys.modules[PKG_NAME] = pkg
+    sub_spec = importlib.util.spec_from_file_location(
+        f"{PKG_NAME}.stock_papertrade",
+        PKG_ROOT / "stock_papertrade" / "__init__.py",
+        submodule_search_locations=[str(PKG_ROOT / "stock_papertrade")],
+    )
+    assert sub_spec is not None
+    sub = importlib.util.module_from_spec(sub_spec)
+    sub.__path__ = [str(PKG_ROOT / "stock_papertrade")]
+    sys.modules[f"{PKG_NAME}.stock_papertrade"] = sub
+
+
+def _load(name: str, file_name: str) -> ModuleType:
+    _ensure_pkg()
+    spec = importlib.util.spec_from_file_location(
+        f"{PKG_NAME}.stock_papertrade.{name}",
+        PKG_ROOT / "stock_papertrade" / file_name,
+    )
+    assert spec is not None and spec.loader is not None
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = mod
+    spec.loader.exec_module(mod)
+    return mod
+
+
+db = _load("db", "db.py")
+archive = _load("archive", "archive.py")
+cold_store = db.cold_store
+models = sys.modules[f"{PKG_NAME}.utils.database.papertrade_models"]
+
+
+def _trade(trade_id: int, account_id: int, at: datetime, pnl: float = 0.0, code: str = "600000") -> dict:
+    return {
+        "id": trade_id,
+        "account_id": account_id,
+        "stock_code": code,
+        "side": "sell",
+        "price": 10.0,
+        "qty": 100,
+        "amount": 1000.0,
+        "fee": 1.0,
+        "realized_pnl": pnl,
+        "reason": "长文本" * 50,
+        "executed_at": at,
+    }
+
+
+# ============================================================
+# 分区文件
+# ============================================================
+def test_partition_roundtrip_with_gzip_fallback(tmp_path, monkeypatch):
+    rows = [{"id": 1, "reason": "理由", "executed_at": datetime(2025, 3, 4, 10, 0).isoformat()}]
+    monkeypatch.setattr(cold_store, "zstandard", None)
+    path, packed, raw = cold_store.write_partition("trade", "2025-03", 7, rows, tmp_path)
+    assert path.name == "acc_7.jsonl.gz" and 0 < packed and raw > 0
+    assert cold_store.read_partition("trade", "2025-03", 7, tmp_path) == rows
+    assert cold_store.read_partition("trade", "2025-03", 8, tmp_path) == []
+    assert [(m, a) for m, a, _ in cold_store.iter_partitions("trade", tmp_path)] == [("2025-03", 7)]
+    assert cold_store.month_bounds("2025-12") == (datetime(2025, 12, 1), datetime(2026, 1, 1))
+
+
+def test_write_month_merges_valid_partition_and_summarizes(tmp_path):
+    month = "2025-03"
+    first = [_trade(1, 1, datetime(2025, 3, 3, 10), pnl=5.0), _trade(2, 2, datetime(2025, 3, 4, 10), pnl=1.0)]
+    archive._write_month("trade", month, first, set(), tmp_path)
+
+    # 重跑同一个月：盘 1 的老分区有效 → 合并去重；盘 2 的没登记 → 直接覆盖
+    again = [_trade(1, 1, datetime(2025, 3, 3, 10), pnl=5.0), _trade(3, 1, datetime(2025, 3, 20, 10), pnl=-2.0)]
+    again.append(_trade(4, 2, datetime(2025, 3, 21, 10), pnl=7.0))
+    summaries, packed, raw = archive._write_month("trade", month, again, {1}, tmp_path)
+    by_acc = {s["account_id"]: s for s in summaries}
+
+    assert [r["id"] for r in cold_store.read_partition("trade", month, 1, tmp_path)] == [1, 3]
+    assert [r["id"] for r in cold_store.read_partition("trade", month, 2, tmp_path)] == [4]
+    assert by_acc[1]["row_count"] == 2 and by_acc[1]["realized_pnl"] == 3.0 and by_acc[1]["fee"] == 2.0
+    assert (by_acc[1]["first_at"], by_acc[1]["last_at"]) == (datetime(2025, 3, 3, 10), datetime(2025, 3, 20, 10))
+    assert by_acc[2]["row_count"] == 1 and packed < raw
+
+
+def test_archive_cutoff_is_month_aligned():
+    assert archive.archive_cutoff(180, datetime(2026, 10, 19).date()) == datetime(2026, 4, 1)
+
+
+# ============================================================
+# 透明读路径
+# ============================================================
+async def _read_path(tmp_path: Path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'pt.db'}")
+    async with engine.begin() as conn:
+        for model in (models.SayuPaperTrade, models.SayuPaperArchiveMonth):
+            await conn.execute(CreateTable(model.__table__))
+    maker = async_sessionmaker(engine, expire_on_commit=False)
+
+    cold = {
+        "2025-02": [_trade(1, 1, datetime(2025, 2, 10, 10), pnl=10.0)],
+        "2025-03": [
+            _trade(2, 1, datetime(2025, 3, 5, 10), pnl=20.0, code="000001"),
+            _trade(3, 1, datetime(2025, 3, 25, 10), pnl=40.0),
+        ],
+    }
+    async with maker() as session, session.begin():
+        for month, rows in cold.items():
+            summaries, _, _ = archive._write_month("trade", month, rows, set(), None)
+            for s in summaries:
+                session.add(models.SayuPaperArchiveMonth(kind="trade", month=month, **s))
+        # 热表：一条近期成交 + 一条"写完冷文件、没删掉热行"的重复
+        for row in (_trade(9, 1, datetime(2026, 10, 1, 10), pnl=1.0), _trade(3, 1, datetime(2025, 3, 25, 10), 40.0)):
+            session.add(models.SayuPaperTrade(**row))
+
+    async with maker() as session:
+        hot = [await session.get(models.SayuPaperTrade, 9), await session.get(models.SayuPaperTrade, 3)]
+        recent = await db._with_archived(session, "trade", 1, hot, limit=10)
+        only_code = await db._with_archived(session, "trade", 1, [], limit=10, stock_code="000001")
+        enough = await db._with_archived(session, "trade", 1, hot[:1], limit=1)
+        total = await db._archived_pnl(session, 1, None)
+        since_mid_march = await db._archived_pnl(session, 1, datetime(2025, 3, 15))
+        other = await db._archived_pnl(session, 2, None)
+    await engine.dispose()
+    return recent, only_code, enough, total, since_mid_march, other
+
+
+def test_history_reads_fall_through_to_cold_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(cold_store, "ARCHIVE_ROOT", tmp_path / "archive")
+    recent, only_code, enough, total, since_mid_march, other = asyncio.run(_read_path(tmp_path))
+
+    assert [t.id for t in recent] == [9, 3, 2, 1]
+    assert isinstance(recent[-1].executed_at, datetime)
+    assert [t.id for t in only_code] == [2]
+    assert [t.id for t in enough] == [9]
+    assert total == {"total_pnl": 70.0, "total_amount": 3000.0, "total_fee": 3.0, "trade_count": 3}
+    # 跨 since 的 3 月读冷文件逐条过滤，2 月整月早于 since 不计
+    assert since_mid_march["total_pnl"] == 40.0 and since_mid_march["trade_count"] == 1
+    assert other["trade_count"] == 0
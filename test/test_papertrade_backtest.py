@@ -0,0 +1,218 @@
+"""AI 模拟盘离线回测单测：信号与实盘评分 / 区位口径一致、成交走撮合规则、T+1、快照指标。"""
+
+import sys
+import importlib.util
+from types import ModuleType
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from kline_fixtures import make_klines
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent.parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+PKG_ROOT = Path(__file__).resolve().parent.parent / "SayuStock"
+PKG_NAME = "_papertrade_backtest_test"
+
+
+def _ensure_pkg():
+    if PKG_NAME in sys.modules:
+        return
+    pkg_spec = importlib.util.spec_from_file_location(
+        PKG_NAME,
+        PKG_ROOT / "__init__.py",
+        submodule_search_locations=[str(PKG_ROOT)],
+    )
+    assert pkg_spec is not None
+    pkg = importlib.util.module_from_spec(pkg_spec)
+    pkg.__path__ = [str(PKG_ROOT)]
+    sys.modules[PKG_NAME] = pkg
+    sub_spec = importlib.util.spec_from_file_location(
+        f"{PKG_NAME}.stock_papertrade",
+        PKG_ROOT / "stock_papertrade" / "__init__.py",
+        submodule_search_locations=[str(PKG_ROOT / "stock_papertrade")],
+    )
+    assert sub_spec is not None
+    sub = importlib.util.module_from_spec(sub_spec)
+    sub.__path__ = [str(PKG_ROOT / "stock_papertrade")]
+    sys.modules[f"{PKG_NAME}.stock_papertrade"] = sub
+
+
+def _load(name: str, file_name: str) -> ModuleType:
+    _ensure_pkg()
+    spec = importlib.util.spec_from_file_location(
+        f"{PKG_NAME}.stock_papertrade.{name}",
+        PKG_ROOT / "stock_papertrade" / file_name,
+    )
+    assert spec is not None and spec.loader is not None
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = mod
+    spec.loader.exec_module(mod)
+    return mod
+
+
+bt = _load("backtest", "backtest.py")
+ind = _load("indicators", "indicators.py")
+st = _load("strategy", "strategy.py")
+matcher = _load("matcher", "matcher.py")
+
+
+def _frame(n: int, seed: int) -> pd.DataFrame:
+    return ind.klines_to_df(make_klines(n, seed=seed))
+
+
+def _bars(closes: list, opens: list | None = None, *, start: str = "2025-03-03", freq: str = "D") -> pd.DataFrame:
+    opens = opens if opens is not None else closes
+    return pd.DataFrame(
+        {
+            "date": pd.date_range(start, periods=len(closes), freq=freq),
+            "open": opens,
+            "high": [max(o, c) * 1.01 for o, c in zip(opens, closes)],
+            "low": [min(o, c) * 0.99 for o, c in zip(opens, closes)],
+            "close": closes,
+            "volume": [1e5] * len(closes),
+        }
+    )
+
+
+def _scripted(monkeypatch, entry: dict, exit_: dict | None = None) -> None:
+    """把 multi_factor 的信号换成脚本：``{(根, 代码): 仓位倍数}``。"""
+
+    def build(panel, params, mode):
+        zeros = pd.DataFrame(0.0, index=panel.close.index, columns=panel.close.columns)
+        weights = zeros.copy()
+        for (t, code), w in entry.items():
+            weights.iloc[t, weights.columns.get_loc(code)] = w
+        sells = zeros.astype(bool)
+        for t, code in exit_ or {}:
+            sells.iloc[t, sells.columns.get_loc(code)] = True
+        return bt.Signals(score=weights, entry=weights, add=zeros, exit=sells)
+
+    monkeypatch.setitem(bt.SIGNAL_BUILDERS, "multi_factor", build)
+
+
+# ============================================================
+# 信号口径
+# ============================================================
+def test_multi_factor_score_matches_score_stock():
+    """面板评分逐根等于实盘 score_stock（基本面 / 舆情为空）"""
+    df = _frame(160, seed=11)
+    panel = bt.BarPanel.from_frames({"600000": df})
+    signals = bt.multi_factor_signals(panel, {}, "balanced")
+    for t in (40, 61, 90, 125, 159):
+        tech = st.tech_from_indicators(ind.compute_indicators(df.iloc[: t + 1]))
+        expected, _ = st.score_stock(tech, st.FundSignals(), st.NewsSignals())
+        assert abs(signals.score.iloc[t, 0] - expected) < 1e-9, t
+
+
+def test_month_percentile_matches_monthly_close_percentile():
+    """月 K 分位 = 近 N 年月收盘（当月取当根）里的位置"""
+    df = _frame(500, seed=3)
+    panel = bt.BarPanel.from_frames({"600000": df})
+    pct = bt._month_percentile(panel.close, years=1)
+    close = panel.close["600000"]
+    for t in (200, 333, 499):
+        monthly = close.iloc[: t + 1].groupby(close.index[: t + 1].to_period("M")).last().tail(12)
+        expected = ind.calc_close_percentile(monthly, len(monthly))
+        assert abs(pct.iloc[t, 0] - expected) < 1e-9, t
+
+
+# ============================================================
+# 成交规则
+# ============================================================
+def test_fills_use_match_order_lots_and_fees(monkeypatch):
+    _scripted(monkeypatch, {(0, "600000"): 1.0}, {(2, "600000")})
+    panel = bt.BarPanel.from_frames({"600000": _bars([10.0, 10.3, 10.5, 10.2, 10.1])})
+    result = bt.run_backtest(panel, "multi_factor", mode="balanced", initial_cash=100_000.0)
+
+    buy, sell = result.trades.itertuples(index=False)
+    # 25% 仓位上限 → 2500 元 / 10 元 → 2400 股整手（留 5% 现金缓冲后的整手下取整）
+    assert buy.side == "buy" and buy.qty % matcher.LOT_SIZE == 0 and buy.price == 10.3
+    assert buy.fee == matcher.calc_fee("buy", buy.qty * buy.price)[2]
+    assert sell.side == "sell" and sell.qty == buy.qty and sell.price == 10.2
+    assert sell.fee == matcher.calc_fee("sell", sell.qty * sell.price)[2]
+
+    cash = 100_000.0 - buy.qty * buy.price - buy.fee + sell.qty * sell.price - sell.fee
+    assert abs(result.snapshots["total_equity"].iloc[-1] - cash) < 1e-6
+
+
+def test_limit_up_open_blocks_the_buy(monkeypatch):
+    """次日一字涨停开盘：按实盘涨停拦截拒单，不成交"""
+    _scripted(monkeypatch, {(0, "600000"): 1.0, (0, "300001"): 1.0})
+    panel = bt.BarPanel.from_frames(
+        {
+            "600000": _bars([10.0, 11.0, 11.0], opens=[10.0, 11.0, 11.0]),
+            # 创业板 ±20%，+10% 开盘不算涨停
+            "300001": _bars([10.0, 11.0, 11.0], opens=[10.0, 11.0, 11.0]),
+        }
+    )
+    result = bt.run_backtest(panel, "multi_factor", initial_cash=1_000_000.0)
+    assert list(result.trades["stock_code"]) == ["300001"]
+    assert result.rejected.get("涨停板买入拦截") == 1
+
+
+def test_intraday_sell_waits_for_next_session(monkeypatch):
+    """分钟 K：当天买的股当天卖不掉，次日第一根才成交"""
+    _scripted(monkeypatch, {(0, "600000"): 1.0}, {(1, "600000")})
+    frame = pd.concat(
+        [
+            _bars([10.0, 10.1, 10.2], start="2025-03-03 10:00", freq="min"),
+            _bars([10.3, 10.4], start="2025-03-04 10:00", freq="min"),
+        ],
+        ignore_index=True,
+    )
+    result = bt.run_backtest(bt.BarPanel.from_frames({"600000": frame}), "multi_factor")
+
+    assert list(result.trades["side"]) == ["buy", "sell"]
+    assert result.trades["trade_date"].iloc[1] == pd.Timestamp("2025-03-04 10:00")
+    assert result.rejected["T+1"] >= 1
+    assert len(result.snapshots) == 2
+
+
+def test_stop_loss_exits_without_a_sell_signal(monkeypatch):
+    _scripted(monkeypatch, {(0, "600000"): 1.0})
+    closes = [10.0, 10.0, 9.0, 8.9, 8.8]
+    result = bt.run_backtest(bt.BarPanel.from_frames({"600000": _bars(closes)}), "multi_factor")
+    assert list(result.trades["side"]) == ["buy", "sell"]
+    assert result.trades["realized_pnl"].iloc[1] < 0
+
+
+# ============================================================
+# 端到端
+# ============================================================
+def test_run_on_fixture_panel_produces_leaderboard_metrics():
+    frames = {f"{600000 + i}": _frame(300, seed=i) for i in range(20)}
+    panel = bt.BarPanel.from_frames(frames)
+    results = [bt.run_backtest(panel, sid) for sid in ("multi_factor", "volume_extremum")]
+
+    for r in results:
+        snaps = r.snapshots
+        assert list(snaps.columns) == [
+            "cash",
+            "position_value",
+            "total_equity",
+            "day_pnl",
+            "total_pnl",
+            "total_pnl_pct",
+        ]
+        assert (snaps["cash"] >= 0).all()
+        assert np.isclose(snaps["day_pnl"].sum(), snaps["total_pnl"].iloc[-1])
+        m = r.metrics()
+        assert np.isclose(m["total_pnl_pct"], snaps["total_pnl_pct"].iloc[-1])
+        assert m["max_drawdown_pct"] <= 0
+        if not r.trades.empty:
+            assert (r.trades["qty"] % matcher.LOT_SIZE == 0).all()
+
+    table = bt.summarize(results)
+    assert list(table["total_pnl_pct"]) == sorted(table["total_pnl_pct"], reverse=True)
+
+
+def test_factor_weights_are_tunable_offline():
+    """多因子权重可按 w_* 覆盖，并记进结果参数；全为 0 时不产生任何交易"""
+    frames = {f"{600000 + i}": _frame(200, seed=i) for i in range(5)}
+    panel = bt.BarPanel.from_frames(frames)
+    zero = {k: 0.0 for k in bt.MULTI_FACTOR_WEIGHTS}
+    result = bt.run_backtest(panel, "multi_factor", zero)
+    assert result.params["w_macd_cross"] == 0.0 and "min_buy_score" in result.params
+    assert result.trades.empty
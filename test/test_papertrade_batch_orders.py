@@ -0,0 +1,375 @@
+"""AI 模拟盘批量下单单测：批量路径与逐笔路径结果一致、报价只拉一次、整批落库原子、T+1 与回测同口径。"""
+
+import sys
+import copy
+import asyncio
+import importlib.util
+from types import ModuleType
+from pathlib import Path
+from datetime import datetime
+
+import pandas as pd
+from sqlalchemy.schema import CreateTable
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent.parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+PKG_ROOT = Path(__file__).resolve().parent.parent / "SayuStock"
+PKG_NAME = "_papertrade_batch_orders_test"
+
+
+def _ensure_pkg():
+    if PKG_NAME in sys.modules:
+        return
+    pkg_spec = importlib.util.spec_from_file_location(
+        PKG_NAME,
+        PKG_ROOT / "__init__.py",
+        submodule_search_locations=[str(PKG_ROOT)],
+    )
+    assert pkg_spec is not None
+    pkg = importlib.util.module_from_spec(pkg_spec)
+    pkg.__path__ = [str(PKG_ROOT)]
+    sys.modules[PKG_NAME] = pkg
+    sub_spec = importlib.util.spec_from_file_location(
+        f"{PKG_NAME}.stock_papertrade",
+        PKG_ROOT / "stock_papertrade" / "__init__.py",
+        submodule_search_locations=[str(PKG_ROOT / "stock_papertrade")],
+    )
+    assert sub_spec is not None
+    sub = importlib.util.module_from_spec(sub_spec)
+    sub.__path__ = [str(PKG_ROOT / "stock_papertrade")]
+    sys.modules[f"{PKG_NAME}.stock_papertrade"] = sub
+
+
+def _load(name: str, file_name: str) -> ModuleType:
+    _ensure_pkg()
+    spec = importlib.util.spec_from_file_location(
+        f"{PKG_NAME}.stock_papertrade.{name}",
+        PKG_ROOT / "stock_papertrade" / file_name,
+    )
+    assert spec is not None and spec.loader is not None
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = mod
+    spec.loader.exec_module(mod)
+    return mod
+
+
+executor_mod = _load("trade_executor", "trade_executor.py")
+bt = _load("backtest", "backtest.py")
+db = executor_mod.db
+quote_mod = sys.modules[f"{PKG_NAME}.stock_papertrade.quote_service"]
+models = sys.modules[f"{PKG_NAME}.utils.database.papertrade_models"]
+OrderRequest = executor_mod.OrderRequest
+
+QUOTES = {
+    "1.600000": quote_mod.QuoteCacheEntry("1.600000", 10.0, name="浦发银行", last_close=9.9),
+    "0.000001": quote_mod.QuoteCacheEntry("0.000001", 12.5, name="平安银行", last_close=12.4),
+    # 涨停：买入被撮合层拦下
+    "0.000002": quote_mod.QuoteCacheEntry("0.000002", 11.0, name="万科A", last_close=10.0),
+    "1.600519": quote_mod.QuoteCacheEntry("1.600519", 1500.0, name="贵州茅台", last_close=1490.0),
+}
+
+
+class _NullSession:
+    def add(self, obj):
+        pass
+
+
+class _Ledger:
+    """替身账本：Repo 接口的内存实现，现金口径走 ``db._append_trade``。"""
+
+    def __init__(self):
+        self.account = models.SayuPaperAccount(
+            id=1, name="测试盘", group_id="g", bot_id="b", cash=60_000.0, initial_cash=100_000.0, principal=100_000.0
+        )
+        self.positions = {
+            "000001": models.SayuPaperPosition(
+                account_id=1, stock_code="000001", stock_name="平安银行", secid="0.000001", qty=2000, avg_cost=11.0
+            ),
+            # 今天刚买的：T+1 不能卖
+            "600000": models.SayuPaperPosition(
+                account_id=1, stock_code="600000", stock_name="浦发银行", secid="1.600000", qty=300, avg_cost=9.5
+            ),
+        }
+        self.today_buys = {"600000": 300}
+        self.trades = []
+        self.next_id = 100
+        self.calls = {"quote": 0, "detail_batch": 0, "append": 0, "append_batch": 0}
+
+    def _append(self, fields):
+        self.calls["append"] += 1
+        trade = db._append_trade(_NullSession(), self.account, **fields)
+        self.next_id += 1
+        trade.id = self.next_id
+        self.trades.append(trade)
+        if fields["side"] == "buy":
+            self.today_buys[fields["stock_code"]] = self.today_buys.get(fields["stock_code"], 0) + fields["qty"]
+        return trade
+
+    def _upsert(self, stock_code, stock_name, secid, qty, avg_cost):
+        if qty <= 0:
+            self.positions.pop(stock_code, None)
+            return None
+        pos = self.positions.get(stock_code)
+        if pos is None:
+            self.next_id += 1
+            pos = models.SayuPaperPosition(id=self.next_id, account_id=1, stock_code=stock_code)
+            self.positions[stock_code] = pos
+        pos.stock_name, pos.secid, pos.qty, pos.avg_cost = stock_name, secid, qty, avg_cost
+        return pos
+
+    def state(self):
+        trades = [
+            (t.stock_code, t.stock_name, t.side, t.price, t.qty, t.amount, t.fee, t.realized_pnl) for t in self.trades
+        ]
+        positions = {c: (p.stock_name, p.qty, p.avg_cost) for c, p in self.positions.items()}
+        return trades, positions, self.account.cash, self.account.principal
+
+    def install(self, monkeypatch):
+        ledger = self
+
+        async def get_by_id(account_id):
+            return ledger.account
+
+        async def get(account_id, stock_code):
+            return ledger.positions.get(stock_code)
+
+        async def list_by_account(account_id):
+            return [p for p in ledger.positions.values() if p.qty > 0]
+
+        async def locked_qty_today(account_id, stock_code, today=None):
+            return ledger.today_buys.get(stock_code, 0)
+
+        async def locked_qty_today_many(account_id, stock_codes, today=None):
+            return {c: ledger.today_buys.get(c, 0) for c in stock_codes}
+
+        async def append_with_cash_update(account_id, **fields):
+            return ledger._append(fields)
+
+        async def upsert(account_id, stock_code, stock_name, secid, qty, avg_cost, **kwargs):
+            return ledger._upsert(stock_code, stock_name, secid, qty, avg_cost)
+
+        async def append_batch(account_id, fills):
+            ledger.calls["append_batch"] += 1
+            out = []
+            for fill in fills:
+                fields = {k: v for k, v in fill.items() if k not in db._FILL_POSITION_FIELDS}
+                trade = ledger._append(fields)
+                pos = ledger._upsert(
+                    fill["stock_code"], fill["stock_name"], fill["secid"], fill["position_qty"], fill["avg_cost"]
+                )
+                out.append((trade, pos))
+            return out
+
+        async def get_quote_detail(secid):
+            ledger.calls["quote"] += 1
+            return QUOTES.get(secid)
+
+        async def get_quote(secid):
+            ledger.calls["quote"] += 1
+            entry = QUOTES.get(secid)
+            return entry.price if entry else None
+
+        async def get_details_batch(secids):
+            ledger.calls["detail_batch"] += 1
+            return {s: QUOTES.get(s) for s in secids}
+
+        for name, fn in (("get_by_id", get_by_id),):
+            monkeypatch.setattr(db.PaperAccountRepo, name, staticmethod(fn))
+        for name, fn in (("get", get), ("list_by_account", list_by_account), ("upsert", upsert)):
+            monkeypatch.setattr(db.PaperPositionRepo, name, staticmethod(fn))
+        for name, fn in (
+            ("locked_qty_today", locked_qty_today),
+            ("locked_qty_today_many", locked_qty_today_many),
+            ("append_with_cash_update", append_with_cash_update),
+            ("append_batch", append_batch),
+        ):
+            monkeypatch.setattr(db.PaperTradeRepo, name, staticmethod(fn))
+        service = executor_mod.quote_service
+        monkeypatch.setattr(service, "get_quote_detail", get_quote_detail)
+        monkeypatch.setattr(service, "get_quote", get_quote)
+        monkeypatch.setattr(service, "get_details_batch", get_details_batch)
+        monkeypatch.setattr(executor_mod, "should_run_papertrade", lambda: True)
+        return self
+
+
+ORDERS = [
+    OrderRequest("sell", "000001", 1000, reason="减仓"),
+    OrderRequest("buy", "600519", 100),  # 现金不够一手
+    OrderRequest("buy", "000002", 500, stock_name="万科A"),  # 涨停拦截
+    OrderRequest("sell", "600000", 300),  # T+1 拦截
+    OrderRequest("sell", "000001", 5000),  # 按剩余持仓截断，清仓
+    OrderRequest("buy", "000001", 800, price=12.0),  # 清仓后再买：均价从零算，参考价偏差写进 reason
+    OrderRequest("sell", "000001", 100),  # 本批刚买的：T+1 拦截
+    OrderRequest("buy", "600000", 200_000),  # 现金不足降档
+]
+
+
+def _summary(outcomes):
+    return [
+        (
+            o.match.ok,
+            o.match.actual_qty,
+            o.match.price,
+            o.match.fee_total,
+            o.match.reason,
+            o.record.ok,
+            o.record.cash_delta,
+            o.record.message.split("trade_id=")[0],
+            o.realized_pnl,
+            o.position_qty,
+            o.avg_cost,
+        )
+        for o in outcomes
+    ]
+
+
+def _run(monkeypatch, batched: bool):
+    ledger = _Ledger().install(monkeypatch)
+    executor = executor_mod.PaperTradeExecutor()
+    run = executor.execute_batch if batched else super(executor_mod.PaperTradeExecutor, executor).execute_batch
+    outcomes = asyncio.run(run(1, copy.deepcopy(ORDERS)))
+    return ledger, outcomes
+
+
+def test_batch_matches_sequential_path(monkeypatch):
+    seq_ledger, seq = _run(monkeypatch, batched=False)
+    batch_ledger, batch = _run(monkeypatch, batched=True)
+
+    assert _summary(batch) == _summary(seq)
+    assert batch_ledger.state() == seq_ledger.state()
+    assert [o.record.ok for o in batch] == [True, False, False, False, True, True, False, True]
+    assert "T+1" in batch[3].record.message and "T+1" in batch[6].record.message
+    assert batch[4].match.actual_qty == 1000 and batch[4].position_qty == 0
+    assert "参考价 12.00" in batch[5].match.reason
+    assert batch[5].avg_cost == executor_mod.calc_new_avg_cost(0, 0.0, 800, 12.5, batch[5].match.fee_total)
+
+    # 逐笔：每笔撮合 + 每笔落库前各问一次报价；批量：一次批量报价、一次落库
+    assert seq_ledger.calls["quote"] == len(ORDERS) + 6 and seq_ledger.calls["append_batch"] == 0
+    assert batch_ledger.calls == {"quote": 0, "detail_batch": 1, "append": 4, "append_batch": 1}
+
+
+def test_batch_rejects_everything_off_hours(monkeypatch):
+    ledger = _Ledger().install(monkeypatch)
+    monkeypatch.setattr(executor_mod, "should_run_papertrade", lambda: False)
+    monkeypatch.setattr(executor_mod, "trading_day_summary", lambda: (False, False, "周末休市"))
+    outcomes = asyncio.run(executor_mod.PaperTradeExecutor().execute_batch(1, ORDERS[:2]))
+    assert [o.record.ok for o in outcomes] == [False, False]
+    assert all("周末休市" in o.record.message for o in outcomes)
+    assert ledger.calls["detail_batch"] == 0 and not ledger.trades
+
+
+# ============================================================
+# 整批落库
+# ============================================================
+def _minute_bars(closes: list, start: str) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "date": pd.date_range(start, periods=len(closes), freq="min"),
+            "open": closes,
+            "high": [c * 1.01 for c in closes],
+            "low": [c * 0.99 for c in closes],
+            "close": closes,
+            "volume": [1e5] * len(closes),
+        }
+    )
+
+
+def test_t1_rule_matches_backtest(monkeypatch):
+    """持有老仓、当天又买了同一只，再卖：实盘与回测都整单拒卖，不拆成只卖老仓"""
+    orders = [OrderRequest("buy", "000001", 500), OrderRequest("sell", "000001", 1000)]
+    for batched in (False, True):
+        _Ledger().install(monkeypatch)
+        executor = executor_mod.PaperTradeExecutor()
+        run = executor.execute_batch if batched else super(executor_mod.PaperTradeExecutor, executor).execute_batch
+        buy, sell = asyncio.run(run(1, copy.deepcopy(orders)))
+        assert buy.record.ok and not sell.record.ok and "T+1" in sell.record.message
+
+    # 回测同一场景：第 1 天建仓，第 2 天加仓后出卖出信号 → 当天整单拒卖，第 3 天开盘全数卖出
+    frame = pd.concat(
+        [
+            _minute_bars([12.0, 12.0, 12.0], "2025-03-03 10:00"),
+            _minute_bars([12.0, 12.0, 12.0, 12.0], "2025-03-04 10:00"),
+            _minute_bars([12.0, 12.0], "2025-03-05 10:00"),
+        ],
+        ignore_index=True,
+    )
+
+    def build(panel, params, mode):
+        zeros = pd.DataFrame(0.0, index=panel.close.index, columns=panel.close.columns)
+        entry, add = zeros.copy(), zeros.copy()
+        entry.iloc[0, 0], add.iloc[3, 0] = 0.5, 1.0
+        sells = zeros.astype(bool)
+        sells.iloc[4, 0] = True
+        return bt.Signals(score=entry + add, entry=entry, add=add, exit=sells)
+
+    monkeypatch.setitem(bt.SIGNAL_BUILDERS, "multi_factor", build)
+    result = bt.run_backtest(bt.BarPanel.from_frames({"000001": frame}), "multi_factor", initial_cash=100_000.0)
+    trades = result.trades
+    assert list(trades["side"]) == ["buy", "buy", "sell"]
+    assert result.rejected["T+1"] == 2
+    assert trades["trade_date"].iloc[2] == pd.Timestamp("2025-03-05 10:00")
+    assert trades["qty"].iloc[2] == trades["qty"].iloc[0] + trades["qty"].iloc[1]
+
+
+def _fill(side: str, qty: int, price: float, position_qty: int, avg_cost: float, realized_pnl: float = 0.0):
+    return {
+        "stock_code": "600000",
+        "stock_name": "浦发银行",
+        "secid": "1.600000",
+        "side": side,
+        "price": price,
+        "qty": qty,
+        "amount": qty * price,
+        "fee": 5.0,
+        "realized_pnl": realized_pnl,
+        "position_qty": position_qty,
+        "avg_cost": avg_cost,
+    }
+
+
+async def _append_fills(tmp_path: Path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'pt.db'}")
+    async with engine.begin() as conn:
+        for model in (models.SayuPaperAccount, models.SayuPaperTrade, models.SayuPaperPosition):
+            await conn.execute(CreateTable(model.__table__))
+    maker = async_sessionmaker(engine, expire_on_commit=False)
+    async with maker() as session, session.begin():
+        session.add(
+            models.SayuPaperAccount(
+                id=1, name="测试盘", group_id="g", bot_id="b", cash=10_000.0, initial_cash=10_000.0, principal=10_000.0
+            )
+        )
+
+    fills = [_fill("buy", 200, 10.0, 200, 10.025), _fill("sell", 200, 11.0, 0, 0.0, realized_pnl=190.0)]
+    async with maker() as session, session.begin():
+        written = await db._append_fills(session, 1, fills)
+    async with maker() as session:
+        acc = await session.get(models.SayuPaperAccount, 1)
+        trades = (await session.execute(models.SayuPaperTrade.__table__.select())).all()
+        positions = (await session.execute(models.SayuPaperPosition.__table__.select())).all()
+
+    # 中途出错：整批回滚，账户不动
+    bad = [_fill("buy", 100, 10.0, 100, 10.05), _fill("hold", 100, 10.0, 100, 10.0)]
+    try:
+        async with maker() as session, session.begin():
+            await db._append_fills(session, 1, bad)
+    except ValueError:
+        pass
+    async with maker() as session:
+        after = await session.get(models.SayuPaperAccount, 1)
+        trade_count = len((await session.execute(models.SayuPaperTrade.__table__.select())).all())
+    await engine.dispose()
+    return written, acc, trades, positions, after, trade_count
+
+
+def test_append_fills_is_one_transaction(tmp_path):
+    written, acc, trades, positions, after, trade_count = asyncio.run(_append_fills(tmp_path))
+
+    assert [(t.side, p.qty if p else None) for t, p in written] == [("buy", 200), ("sell", None)]
+    assert len(trades) == 2 and positions == []
+    assert acc.cash == 10_000.0 - 2005.0 + (2200.0 - 5.0 + 190.0)
+    assert acc.principal == 10_190.0
+    assert isinstance(acc.last_decided_at, datetime)
+    assert (after.cash, trade_count) == (acc.cash, 2)
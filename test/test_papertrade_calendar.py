@@ -4,7 +4,9 @@ import sys
 import importlib.util
 from types import ModuleType
 from pathlib import Path
-from datetime import datetime
+from datetime import date, datetime, timedelta
+
+import numpy as np
 
 REPO_ROOT = Path(__file__).resolve().parent.parent.parent.parent.parent
 sys.path.insert(0, str(REPO_ROOT))
@@ -191,6 +193,114 @@ def test_next_decision_time_holiday_to_next_trading_day():
     print(f"[OK] 节假日 → 下一个交易日 {nxt.date().isoformat()}")
 
 
+# ============================================================
+# 编译日历
+# ============================================================
+def _brute_open(d: date) -> bool:
+    return d.weekday() < 5 and d.isoformat() not in cal._HARDCODED_HOLIDAYS_2025_2026
+
+
+def test_compiled_calendar_matches_day_by_day_rules():
+    """编译日历的各项查询与逐日推算一致"""
+    tc = cal.get_calendar()
+    start = date(2024, 12, 20)
+    days = [start + timedelta(days=i) for i in range(500)]
+    assert [tc.is_open(d) for d in days] == [_brute_open(d) for d in days]
+
+    for d in days[:-30]:
+        nxt = d + timedelta(days=1)
+        while not _brute_open(nxt):
+            nxt += timedelta(days=1)
+        prev = d - timedelta(days=1)
+        while not _brute_open(prev):
+            prev -= timedelta(days=1)
+        assert tc.next_open(d) == nxt and tc.prev_open(d) == prev
+        assert tc.offset(d, 1) == nxt and tc.offset(d, -1) == prev
+        assert tc.next_open(d, include_self=True) == (d if _brute_open(d) else nxt)
+
+    # 2025 国庆：9-30（周二）之后第一个交易日是 10-09，往后 3 个交易日是 10-13
+    assert cal.next_trading_day(date(2025, 9, 30)) == date(2025, 10, 9)
+    assert cal.shift_trading_days(date(2025, 9, 30), 3) == date(2025, 10, 13)
+    assert cal.shift_trading_days(date(2025, 10, 9), -1) == date(2025, 9, 30)
+    assert cal.prev_trading_day(datetime(2026, 2, 28, 10)) == date(2026, 2, 13)
+    # [start, end) 半开
+    expected = sum(_brute_open(d) for d in days)
+    assert cal.trading_days_between(days[0], days[-1] + timedelta(days=1)) == expected
+    assert cal.trading_days_between(date(2025, 10, 1), date(2025, 10, 9)) == 0
+    # 节前收盘后：下一次决策跳过整个长假
+    assert next_decision_time(datetime(2025, 9, 30, 16)) == datetime(2025, 10, 9, 9, 30)
+    print("[OK] 编译日历与逐日推算一致")
+
+
+def test_compiled_calendar_vectorized_queries():
+    """日期数组一次查完，越界记 NaT / 抛错"""
+    tc = cal.get_calendar()
+    dates = np.array(["2025-09-30", "2025-10-01", "2025-10-04", "2025-10-09"], dtype="datetime64[D]")
+    assert tc.is_open(dates).tolist() == [True, False, False, True]
+    assert tc.next_open(dates).astype(str).tolist() == ["2025-10-09", "2025-10-09", "2025-10-09", "2025-10-10"]
+    assert tc.offset(dates, [0, 0, 1, -1]).astype(str).tolist() == [
+        "2025-09-30",
+        "2025-10-09",
+        "2025-10-09",
+        "2025-09-30",
+    ]
+    assert tc.count_between(dates[:1], dates).tolist() == [0, 1, 1, 1]
+    assert np.isnat(tc.next_open(np.array([cal.CALENDAR_END], dtype="datetime64[D]")))[0]
+    assert tc.prev_open(cal.CALENDAR_START) is None
+    try:
+        tc.is_open(date(1989, 12, 31))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("越界日期应当抛 ValueError")
+    print("[OK] 向量化查询")
+
+
+def test_compiled_calendar_npy_cache(tmp_path, monkeypatch):
+    """位图按节假日表摘要缓存成 .npy，坏文件自动重建"""
+    monkeypatch.setattr(cal, "DATA_PATH", tmp_path)
+    built = cal._load_open_mask()
+    files = list(tmp_path.glob("papertrade_trading_calendar_*.npy"))
+    assert len(files) == 1 and cal._holiday_digest() in files[0].name
+    assert np.array_equal(cal._load_open_mask(), built)
+
+    files[0].write_bytes(b"broken")
+    assert np.array_equal(cal._load_open_mask(), built)
+    assert len(np.load(files[0])) == (len(built) + 7) // 8
+
+    # 合法 .npy 但类型 / 形状不对：不能让 unpackbits 抛 TypeError，照样重建
+    for bad in (np.zeros((len(built) + 7) // 8, dtype=np.float64), np.zeros((2, 8), dtype=np.uint8)):
+        np.save(files[0], bad, allow_pickle=False)
+        assert np.array_equal(cal._load_open_mask(), built)
+        restored = np.load(files[0])
+        assert restored.dtype == np.uint8 and restored.shape == ((len(built) + 7) // 8,)
+
+    monkeypatch.setattr(cal, "_HARDCODED_HOLIDAYS_2025_2026", cal._HARDCODED_HOLIDAYS_2025_2026 | {"2026-03-02"})
+    changed = cal._load_open_mask()
+    assert len(list(tmp_path.glob("papertrade_trading_calendar_*.npy"))) == 2
+    assert int(built.sum()) - int(changed.sum()) == 1
+
+
+def test_queries_outside_holiday_years_warn_once(monkeypatch):
+    """节假日表没覆盖的年份只按周末判断，查询时每个年份告警一次"""
+    warnings: list[str] = []
+    monkeypatch.setattr(cal, "logger", type("_Logger", (), {"warning": staticmethod(warnings.append)}))
+    monkeypatch.setattr(cal, "_warned_years", set())
+    first, last = cal._holiday_years()
+    assert (first, last) == (2025, 2026)
+
+    cal.next_trading_day(date(2025, 9, 30))
+    is_a_share_trading_day(datetime(2026, 3, 2, 10))
+    assert warnings == []
+
+    cal.shift_trading_days(date(2024, 12, 31), 1)
+    cal.trading_days_between(date(2024, 1, 2), date(2027, 1, 4))
+    is_a_share_trading_day(datetime(2027, 1, 4, 10))
+    cal.next_trading_day(date(2024, 6, 3))
+    assert len(warnings) == 2
+    assert "2024" in warnings[0] and "2027" in warnings[1] and "2025~2026" in warnings[1]
+
+
 if __name__ == "__main__":
     test_weekday_is_trading_day()
     test_weekend_is_not_trading_day()
@@ -206,4 +316,6 @@ if __name__ == "__main__":
     test_next_decision_time_lunch_break()
     test_next_decision_time_after_close()
     test_next_decision_time_holiday_to_next_trading_day()
-    print("\n[SUCCESS] calendar 全部 13 个测试通过！")
+    test_compiled_calendar_matches_day_by_day_rules()
+    test_compiled_calendar_vectorized_queries()
+    print("\n[SUCCESS] calendar 全部 15 个测试通过！")
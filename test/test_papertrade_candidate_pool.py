@@ -3,7 +3,7 @@
 import sys
 import importlib.util
 from types import ModuleType
-from typing import List
+from typing import Dict, List
 from pathlib import Path
 
 REPO_ROOT = Path(__file__).resolve().parent.parent.parent.parent.parent
@@ -511,6 +511,130 @@ def test_post_decision_pool_update_hold_weak_no_action():
     asyncio.run(_check())
 
 
+# ============================================================
+# 全市场源跨账户共享
+# ============================================================
+def test_shared_sources_fetch_once_across_accounts():
+    """多个账户连着建池：全市场源各只拉一次，账户源照常逐个读"""
+    import asyncio
+
+    calls: Dict[str, int] = {}
+
+    def _counting(label: str, codes: List[str]):
+        async def _fn(*a, **kw):
+            calls[label] = calls.get(label, 0) + 1
+            return list(codes)
+
+        return _fn
+
+    fake = _make_fake_sources()
+    fake["_from_position"] = _counting("position", [])
+    fake["_from_hotmap_top_n"] = _counting("hotmap", ["600519", "000858"])
+    fake["_from_market_gainers"] = _counting("gainer", ["300750"])
+    for name, fn in fake.items():
+        setattr(pool, name, fn)
+
+    saved_before = pool.SHARED_SOURCES.stats.saved
+    outs = [asyncio.run(build_candidate_pool(account_id)) for account_id in (1, 2, 3)]
+    assert outs == [["600519", "000858", "300750"]] * 3
+    assert calls == {"position": 3, "hotmap": 1, "gainer": 1}
+    assert pool.SHARED_SOURCES.stats.saved - saved_before == 4
+
+
+def test_shared_sources_ttl_and_empty_results():
+    """过 TTL 重拉；空结果（源内部失败）不缓存"""
+    import asyncio
+
+    now = [0.0]
+    cache = pool.SharedSourceCache({"news": 60.0}, clock=lambda: now[0])
+    results = [[], ["600519"], ["000858"]]
+    calls: List[int] = []
+
+    async def _news():
+        calls.append(1)
+        return results[len(calls) - 1]
+
+    assert asyncio.run(cache.get("news", _news)) == []
+    assert asyncio.run(cache.get("news", _news)) == ["600519"]
+    now[0] = 30.0
+    assert asyncio.run(cache.get("news", _news)) == ["600519"]
+    now[0] = 61.0
+    assert asyncio.run(cache.get("news", _news)) == ["000858"]
+    assert len(calls) == 3
+    assert cache.stats.calls == 3 and cache.stats.saved == 1
+    assert cache.stats.by_source["news"] == [3, 1]
+
+
+def test_shared_sources_single_flight():
+    """同一时刻多个账户并发请求同一源，只跑一次"""
+    import asyncio
+
+    cache = pool.SharedSourceCache()
+    calls: List[int] = []
+
+    async def _slow(n: int = 8):
+        calls.append(n)
+        await asyncio.sleep(0.01)
+        return ["600519"]
+
+    async def _run():
+        return await asyncio.gather(*(cache.get("gainer", _slow, n=8) for _ in range(5)))
+
+    assert asyncio.run(_run()) == [["600519"]] * 5
+    assert calls == [8]
+    assert cache.stats.saved == 4
+
+
+# ============================================================
+# 并发拉取：单路超时丢弃、合并顺序与串行一致、计时
+# ============================================================
+def test_concurrent_sources_keep_priority_order():
+    """后返回的高优先级源仍排在前面（合并顺序只看优先级，不看完成先后）"""
+    import asyncio
+
+    async def _slow_position(account_id):
+        await asyncio.sleep(0.05)
+        return ["600519"]
+
+    async def _fast_news(*a, **kw):
+        return ["000858", "600519"]
+
+    fake = _make_fake_sources()
+    fake["_from_position"] = _slow_position
+    fake["_from_news_extract_tickers"] = _fast_news
+    for name, fn in fake.items():
+        setattr(pool, name, fn)
+
+    timings = {}
+    out = asyncio.run(build_candidate_pool(1, timings=timings))
+    assert out == ["600519", "000858"]
+    assert timings["position"].status == "ok" and timings["position"].ms >= 40
+    assert timings["news"].count == 2
+
+
+def test_slow_source_is_dropped(monkeypatch):
+    """超时的源整路丢弃，其它源照常入池，总耗时不被拖住"""
+    import time
+    import asyncio
+
+    async def _stuck(*a, **kw):
+        await asyncio.sleep(5)
+        return ["300750"]
+
+    fake = _make_fake_sources(position=["600519"], gainer=["000858"])
+    fake["_from_hotmap_top_n"] = _stuck
+    for name, fn in fake.items():
+        setattr(pool, name, fn)
+    monkeypatch.setattr(pool, "DEFAULT_SOURCE_TIMEOUT_S", 0.05)
+
+    timings = {}
+    start = time.perf_counter()
+    out = asyncio.run(build_candidate_pool(1, timings=timings))
+    assert time.perf_counter() - start < 1.0
+    assert out == ["600519", "000858"]
+    assert timings["hotmap"].status == "timeout"
+
+
 if __name__ == "__main__":
     test_pool_empty()
     test_pool_single_source()
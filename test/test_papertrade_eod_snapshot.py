@@ -0,0 +1,163 @@
+"""AI 模拟盘收盘批量快照单测：聚合口径、报价兜底顺序、同日重跑幂等。"""
+
+import sys
+import asyncio
+import tempfile
+import importlib.util
+from types import ModuleType
+from pathlib import Path
+from datetime import date, datetime
+
+from sqlalchemy import select
+from sqlalchemy.schema import CreateTable
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent.parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+PKG_ROOT = Path(__file__).resolve().parent.parent / "SayuStock"
+PKG_NAME = "_papertrade_eod_snapshot_test"
+
+
+def _ensure_pkg():
+    if PKG_NAME in sys.modules:
+        return
+    pkg_spec = importlib.util.spec_from_file_location(
+        PKG_NAME,
+        PKG_ROOT / "__init__.py",
+        submodule_search_locations=[str(PKG_ROOT)],
+    )
+    assert pkg_spec is not None
+    pkg = importlib.util.module_from_spec(pkg_spec)
+    pkg.__path__ = [str(PKG_ROOT)]
+    sys.modules[PKG_NAME] = pkg
+    sub_spec = importlib.util.spec_from_file_location(
+        f"{PKG_NAME}.stock_papertrade",
+        PKG_ROOT / "stock_papertrade" / "__init__.py",
+        submodule_search_locations=[str(PKG_ROOT / "stock_papertrade")],
+    )
+    assert sub_spec is not None
+    sub = importlib.util.module_from_spec(sub_spec)
+    sub.__path__ = [str(PKG_ROOT / "stock_papertrade")]
+    sys.modules[f"{PKG_NAME}.stock_papertrade"] = sub
+
+
+def _load(name: str, file_name: str) -> ModuleType:
+    _ensure_pkg()
+    spec = importlib.util.spec_from_file_location(
+        f"{PKG_NAME}.stock_papertrade.{name}",
+        PKG_ROOT / "stock_papertrade" / file_name,
+    )
+    assert spec is not None and spec.loader is not None
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = mod
+    spec.loader.exec_module(mod)
+    return mod
+
+
+db = _load("db", "db.py")
+eod = _load("eod_snapshot", "eod_snapshot.py")
+models = sys.modules[f"{PKG_NAME}.utils.database.papertrade_models"]
+
+
+def _account(account_id: int, cash: float, initial_cash: float = 100_000.0):
+    return models.SayuPaperAccount(
+        id=account_id,
+        name=f"盘{account_id}",
+        group_id="g",
+        bot_id="b",
+        cash=cash,
+        initial_cash=initial_cash,
+    )
+
+
+def _snap(account_id: int, trade_date: date, equity: float):
+    return models.SayuPaperSnapshot(
+        account_id=account_id, trade_date=trade_date, cash=equity, position_value=0.0, total_equity=equity
+    )
+
+
+def _position(account_id: int, code: str, qty: int, avg_cost: float, last_quote=None):
+    return models.SayuPaperPosition(
+        account_id=account_id,
+        stock_code=code,
+        stock_name=code,
+        secid=f"1.{code}",
+        qty=qty,
+        avg_cost=avg_cost,
+        last_quote_price=last_quote,
+        last_quote_at=datetime(2026, 10, 16, 15, 0) if last_quote is not None else None,
+    )
+
+
+# ============================================================
+# 聚合口径
+# ============================================================
+def test_compute_snapshots_aggregates_per_account():
+    accounts = [_account(1, 50_000.0), _account(2, 100_000.0), _account(3, 20_000.0)]
+    positions = [
+        _position(1, "600000", 1000, 10.0, last_quote=10.5),  # 有新报价
+        _position(1, "600001", 300, 20.0, last_quote=19.0),  # 库里旧报价兜底
+        _position(1, "600002", 200, 5.0),  # 均价兜底
+        _position(3, "600000", 100, 9.0),
+        _position(9, "600000", 500, 9.0),  # 不在本批的盘，忽略
+    ]
+    prices = {"1.600000": 11.11}
+    snaps = {s.account_id: s for s in eod.compute_snapshots(accounts, positions, prices, {1: 60_000.0})}
+
+    one = snaps[1]
+    assert one.position_value == round(11110.0 + 5700.0 + 1000.0, 2)
+    assert one.total_equity == round(50_000.0 + one.position_value, 2)
+    assert one.day_pnl == round(one.total_equity - 60_000.0, 2)
+    assert one.day_pnl_pct == round(one.day_pnl / 60_000.0 * 100, 4)
+    assert one.total_pnl_pct == round((one.total_equity - 100_000.0) / 100_000.0 * 100, 4)
+    assert (one.position_count, one.stale_count) == (3, 2)
+
+    # 无持仓、无历史快照：day_pnl 相对期初本金
+    two = snaps[2]
+    assert (two.position_value, two.total_equity, two.day_pnl, two.position_count) == (0.0, 100_000.0, 0.0, 0)
+    assert snaps[3].position_value == 1111.0 and snaps[3].stale_count == 0
+
+
+# ============================================================
+# 落库幂等
+# ============================================================
+async def _roundtrip(path: Path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        # 只建表不建索引：别的用例以另一个包名导入过同一批模型时，同名索引会在表上登记两次
+        for model in (models.SayuPaperSnapshot, models.SayuPaperAccountStats):
+            await conn.execute(CreateTable(model.__table__))
+    maker = async_sessionmaker(engine, expire_on_commit=False)
+    day, prev = date(2026, 10, 19), date(2026, 10, 16)
+
+    async with maker() as session, session.begin():
+        # 老版本 append 留下的同日重复行 + 上一交易日快照
+        for equity in (1.0, 2.0):
+            session.add(_snap(1, day, equity))
+        session.add(_snap(1, prev, 99_000.0))
+        session.add(_snap(2, date(2026, 10, 1), 101_000.0))
+
+    async with maker() as session, session.begin():
+        baselines = await db._equity_before(session, day)
+    for equity in (100.0, 200.0):
+        rows = [{"account_id": i, "cash": 1.0, "position_value": 0.0, "total_equity": equity + i} for i in (1, 2, 3)]
+        async with maker() as session, session.begin():
+            written = await db._upsert_snapshots(session, day, rows)
+        assert all(s.id is not None for s in written)
+
+    async with maker() as session:
+        result = await session.execute(
+            select(models.SayuPaperSnapshot).where(models.SayuPaperSnapshot.trade_date == day)
+        )
+        stored = {(s.account_id, s.total_equity) for s in result.scalars().all()}
+    await engine.dispose()
+    return baselines, stored
+
+
+def test_upsert_snapshots_is_idempotent_per_trade_date():
+    """同一交易日重跑只更新，遗留的重复行合并成一条；基准取各盘上一条快照"""
+    with tempfile.TemporaryDirectory() as tmp:
+        baselines, stored = asyncio.run(_roundtrip(Path(tmp) / "snap.db"))
+    assert baselines == {1: 99_000.0, 2: 101_000.0}
+    assert stored == {(1, 201.0), (2, 202.0), (3, 203.0)}
@@ -0,0 +1,172 @@
+"""AI 模拟盘排行物化表单测：写快照时增量维护、同日重写回退重算、名次、与全量查询一致。"""
+
+import sys
+import asyncio
+import tempfile
+import importlib.util
+from types import ModuleType
+from pathlib import Path
+from datetime import date, timedelta
+
+from sqlalchemy import delete, select
+from sqlalchemy.schema import CreateTable
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent.parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+PKG_ROOT = Path(__file__).resolve().parent.parent / "SayuStock"
+PKG_NAME = "_papertrade_leaderboard_stats_test"
+
+
+def _ensure_pkg():
+    if PKG_NAME in sys.modules:
+        return
+    pkg_spec = importlib.util.spec_from_file_location(
+        PKG_NAME,
+        PKG_ROOT / "__init__.py",
+        submodule_search_locations=[str(PKG_ROOT)],
+    )
+    assert pkg_spec is not None
+    pkg = importlib.util.module_from_spec(pkg_spec)
+    pkg.__path__ = [str(PKG_ROOT)]
+    sys.modules[PKG_NAME] = pkg
+    sub_spec = importlib.util.spec_from_file_location(
+        f"{PKG_NAME}.stock_papertrade",
+        PKG_ROOT / "stock_papertrade" / "__init__.py",
+        submodule_search_locations=[str(PKG_ROOT / "stock_papertrade")],
+    )
+    assert sub_spec is not None
+    sub = importlib.util.module_from_spec(sub_spec)
+    sub.__path__ = [str(PKG_ROOT / "stock_papertrade")]
+    sys.modules[f"{PKG_NAME}.stock_papertrade"] = sub
+
+
+def _load(name: str, file_name: str) -> ModuleType:
+    _ensure_pkg()
+    spec = importlib.util.spec_from_file_location(
+        f"{PKG_NAME}.stock_papertrade.{name}",
+        PKG_ROOT / "stock_papertrade" / file_name,
+    )
+    assert spec is not None and spec.loader is not None
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = mod
+    spec.loader.exec_module(mod)
+    return mod
+
+
+db = _load("db", "db.py")
+models = sys.modules[f"{PKG_NAME}.utils.database.papertrade_models"]
+Stats = models.SayuPaperAccountStats
+
+DAY0 = date(2026, 10, 12)
+
+
+def _rows(day: int, equities: dict) -> list:
+    return [
+        {
+            "account_id": account_id,
+            "cash": equity,
+            "position_value": 0.0,
+            "total_equity": equity,
+            "total_pnl": equity - 100.0,
+            "total_pnl_pct": equity - 100.0,
+        }
+        for account_id, equity in equities.items()
+    ]
+
+
+async def _with_db(scenario):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'stats.db'}")
+        async with engine.begin() as conn:
+            # 只建表不建索引：别的用例以另一个包名导入过同一批模型时，同名索引会在表上登记两次
+            for model in (models.SayuPaperSnapshot, Stats):
+                await conn.execute(CreateTable(model.__table__))
+        maker = async_sessionmaker(engine, expire_on_commit=False)
+        try:
+            return await scenario(maker)
+        finally:
+            await engine.dispose()
+
+
+async def _write(maker, day: int, equities: dict) -> None:
+    async with maker() as session, session.begin():
+        await db._upsert_snapshots(session, DAY0 + timedelta(days=day), _rows(day, equities))
+
+
+async def _stats(maker) -> dict:
+    async with maker() as session:
+        return {st.account_id: st for st in (await session.execute(select(Stats))).scalars().all()}
+
+
+async def _check(maker) -> list:
+    async with maker() as session, session.begin():
+        return await db._check_stats(session)
+
+
+# ============================================================
+# Tests
+# ============================================================
+def test_snapshot_writes_maintain_stats_incrementally():
+    async def scenario(maker):
+        for day, equities in enumerate(({1: 100.0, 2: 100.0}, {1: 120.0, 2: 95.0}, {1: 90.0, 2: 110.0})):
+            await _write(maker, day, equities)
+        return await _stats(maker), await _check(maker)
+
+    stats, problems = asyncio.run(_with_db(scenario))
+    assert problems == []
+    one, two = stats[1], stats[2]
+    assert (one.trade_date, one.total_equity, one.peak_equity, one.snapshot_days) == (
+        DAY0 + timedelta(2),
+        90.0,
+        120.0,
+        3,
+    )
+    assert abs(one.drawdown_pct - (-25.0)) < 1e-9 and abs(one.max_drawdown_pct - (-25.0)) < 1e-9
+    assert abs(two.max_drawdown_pct - (-5.0)) < 1e-9 and two.drawdown_pct == 0.0
+    assert (two.rank, one.rank) == (1, 2)
+
+
+def test_same_day_rewrite_recomputes_peak():
+    """同日重写把峰值日改低：增量无法回退，必须按历史重算"""
+
+    async def scenario(maker):
+        await _write(maker, 0, {1: 100.0})
+        await _write(maker, 1, {1: 150.0})
+        await _write(maker, 1, {1: 105.0})
+        return await _stats(maker), await _check(maker)
+
+    stats, problems = asyncio.run(_with_db(scenario))
+    assert problems == []
+    assert (stats[1].peak_equity, stats[1].max_drawdown_pct, stats[1].snapshot_days) == (105.0, 0.0, 2)
+
+
+def test_ties_share_rank():
+    async def scenario(maker):
+        await _write(maker, 0, {1: 110.0, 2: 120.0, 3: 110.0, 4: 90.0})
+        return await _stats(maker)
+
+    stats = asyncio.run(_with_db(scenario))
+    assert {k: v.rank for k, v in stats.items()} == {2: 1, 1: 2, 3: 2, 4: 4}
+
+
+def test_check_reports_drift_and_rebuild_repairs_it():
+    async def scenario(maker):
+        await _write(maker, 0, {1: 100.0, 2: 105.0})
+        await _write(maker, 1, {1: 130.0, 2: 101.0})
+        async with maker() as session, session.begin():
+            await session.execute(delete(Stats).where(Stats.account_id == 2))
+            st = (await session.execute(select(Stats))).scalars().one()
+            st.total_equity = 1.0
+            session.add(st)
+        before = await _check(maker)
+        async with maker() as session, session.begin():
+            await db._recompute_stats(session)
+            await db._rerank_stats(session)
+        return before, await _check(maker), await _stats(maker)
+
+    before, after, stats = asyncio.run(_with_db(scenario))
+    assert len(before) == 2
+    assert after == []
+    assert stats[1].total_equity == 130.0 and stats[2].snapshot_days == 2
@@ -429,5 +429,46 @@ def test_name_collision_with_existing_default_gets_suffixed(tmp_path):
     assert dict(rows)[first] != DEFAULT or names.count(DEFAULT) == 1
 
 
+# ============================================================
+# 5) 复合索引补建
+# ============================================================
+_COMPOSITE = {
+    "ix_sayupapertrade_acc_exec",
+    "ix_sayupapertrade_acc_code_exec",
+    "ix_sayupaperdecision_acc_created",
+    "ix_sayupapersnapshot_acc_date",
+}
+
+
+def test_composite_indexes_are_backfilled_once(tmp_path):
+    """老库补建模型上声明的复合索引；第二次启动什么都不做。"""
+
+    async def body(fx: _Fixture):
+        async with fx.maker() as s:
+            await s.execute(text("ALTER TABLE sayupapertrade ADD COLUMN executed_at TIMESTAMP"))
+            await s.execute(text("ALTER TABLE sayupaperdecision ADD COLUMN created_at TIMESTAMP"))
+            await s.execute(text("ALTER TABLE sayupapersnapshot ADD COLUMN trade_date DATE"))
+            await s.commit()
+            first = await mig.ensure_composite_indexes(s)
+            second = await mig.ensure_composite_indexes(s)
+        names = await fx.rows("SELECT name FROM sqlite_master WHERE type='index' AND name LIKE 'ix_%'")
+        return first, second, {r[0] for r in names}
+
+    first, second, names = _run(tmp_path, body)
+    assert set(first) == _COMPOSITE
+    assert second == []
+    assert _COMPOSITE <= names
+
+
+def test_composite_index_failure_does_not_raise(tmp_path):
+    """时间列缺失（半迁移的老库）时跳过该索引，不炸启动。"""
+
+    async def body(fx: _Fixture):
+        async with fx.maker() as s:
+            return await mig.ensure_composite_indexes(s)
+
+    assert _run(tmp_path, body) == []
+
+
 if __name__ == "__main__":
     raise SystemExit(pytest.main([__file__, "-v"]))
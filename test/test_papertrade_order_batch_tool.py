@@ -0,0 +1,95 @@
+"""``papertrade_order_batch`` 工具单测：解析订单、过落库硬闸、整批交给 ``execute_batch``、逐笔回报与冒泡。"""
+
+import sys
+import json
+import asyncio
+from types import SimpleNamespace
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent.parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from SayuStock.stock_papertrade import ai_tools, trade_executor  # noqa: E402
+from SayuStock.stock_papertrade.matcher import MatchResult  # noqa: E402
+
+
+def _match(side: str, code: str, qty: int, price: float, ok: bool = True, reason: str = "") -> MatchResult:
+    return MatchResult(
+        ok=ok,
+        side=side,
+        code=code,
+        requested_qty=qty,
+        actual_qty=qty if ok else 0,
+        price=price,
+        amount=qty * price if ok else 0.0,
+        commission=5.0 if ok else 0.0,
+        stamp_tax=0.0,
+        fee_total=5.0 if ok else 0.0,
+        reason=reason,
+    )
+
+
+class _FakeExecutor:
+    def __init__(self) -> None:
+        self.batches: list = []
+
+    async def execute_batch(self, account_id, orders, *, mode="balanced"):
+        self.batches.append((account_id, list(orders), mode))
+        sell, buy = orders
+        return [
+            trade_executor.OrderOutcome(
+                order=sell,
+                match=_match("sell", sell.stock_code, sell.qty, 12.5),
+                record=trade_executor.RecordResult(ok=True, trade_id=7, message="ok trade_id=7"),
+                realized_pnl=120.0,
+                position_qty=1000,
+                avg_cost=11.0,
+            ),
+            trade_executor.OrderOutcome(
+                order=buy,
+                match=_match("buy", buy.stock_code, buy.qty, 11.0, ok=False, reason="涨停板买入拦截"),
+                record=trade_executor.RecordResult(ok=False, message="涨停板买入拦截"),
+            ),
+        ]
+
+
+def test_order_batch_routes_through_execute_batch(monkeypatch):
+    account = SimpleNamespace(id=3, name="测试盘")
+    executor = _FakeExecutor()
+    fills: list = []
+
+    async def write_account(account_name=""):
+        return account, ""
+
+    async def deny_write(acc):
+        return ""
+
+    async def gate_entry(acc, *, stock_code, indicators, score, source, side):
+        return "" if side == "sell" or indicators.get("plan_stop_pct") else "⚠️ 缺止损"
+
+    async def broadcast_fill(acc, **kwargs):
+        fills.append(kwargs)
+        return 1
+
+    monkeypatch.setattr(ai_tools, "_write_account", write_account)
+    monkeypatch.setattr(ai_tools, "_deny_write", deny_write)
+    monkeypatch.setattr(ai_tools, "_gate_entry", gate_entry)
+    monkeypatch.setattr(ai_tools.broadcast, "broadcast_fill", broadcast_fill)
+    monkeypatch.setattr(trade_executor, "get_executor", lambda backend=None: executor)
+
+    orders = [
+        {"side": "sell", "stock_code": "000001", "qty": 1000, "stock_name": "平安银行"},
+        {"side": "buy", "stock_code": "600000", "qty": 500},  # 缺止损：过不了硬闸，不进撮合
+        {"side": "buy", "stock_code": "000002", "qty": 500, "snapshot": json.dumps({"plan_stop_pct": -0.05})},
+    ]
+    out = json.loads(asyncio.run(ai_tools.papertrade_order_batch(None, json.dumps(orders))))
+
+    ((account_id, sent, mode),) = executor.batches
+    assert account_id == 3 and mode == "balanced"
+    assert [(o.side, o.stock_code, o.qty) for o in sent] == [("sell", "000001", 1000), ("buy", "000002", 500)]
+    assert [r["ok"] for r in out] == [True, False, False]
+    assert out[0]["trade_id"] == 7 and out[0]["realized_pnl"] == 120.0 and out[0]["position_qty"] == 1000
+    assert out[1]["message"] == "⚠️ 缺止损" and out[2]["message"] == "涨停板买入拦截"
+    assert [(f["stock_code"], f["qty"], f["price"]) for f in fills] == [("000001", 1000, 12.5)]
+
+    assert "JSON" in asyncio.run(ai_tools.papertrade_order_batch(None, "not json"))
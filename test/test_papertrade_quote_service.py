@@ -0,0 +1,220 @@
+"""AI 模拟盘报价服务单测：LRU 上限、持仓常驻不阻塞、后台刷新、staleness。"""
+
+import sys
+import asyncio
+import importlib.util
+from types import ModuleType
+from typing import List, Optional
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent.parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+PKG_ROOT = Path(__file__).resolve().parent.parent / "SayuStock"
+PKG_NAME = "_papertrade_quote_test"
+
+
+def _ensure_pkg():
+    if PKG_NAME in sys.modules:
+        return
+    pkg_spec = importlib.util.spec_from_file_location(
+        PKG_NAME,
+        PKG_ROOT / "__init__.py",
+        submodule_search_locations=[str(PKG_ROOT)],
+    )
+    assert pkg_spec is not None
+    pkg = importlib.util.module_from_spec(pkg_spec)
+    pkg.__path__ = [str(PKG_ROOT)]
+    sys.modules[PKG_NAME] = pkg
+    sub_spec = importlib.util.spec_from_file_location(
+        f"{PKG_NAME}.stock_papertrade",
+        PKG_ROOT / "stock_papertrade" / "__init__.py",
+        submodule_search_locations=[str(PKG_ROOT / "stock_papertrade")],
+    )
+    assert sub_spec is not None
+    sub = importlib.util.module_from_spec(sub_spec)
+    sub.__path__ = [str(PKG_ROOT / "stock_papertrade")]
+    sys.modules[f"{PKG_NAME}.stock_papertrade"] = sub
+
+
+def _load(name: str, file_name: str) -> ModuleType:
+    _ensure_pkg()
+    spec = importlib.util.spec_from_file_location(
+        f"{PKG_NAME}.stock_papertrade.{name}",
+        PKG_ROOT / "stock_papertrade" / file_name,
+    )
+    assert spec is not None and spec.loader is not None
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = mod
+    spec.loader.exec_module(mod)
+    return mod
+
+
+qs = _load("quote_service", "quote_service.py")
+
+
+class _FakeFetch:
+    """替换 ``_fetch_one``：记录调用；``prices`` 里没有的 secid 视为拉取失败。"""
+
+    def __init__(self, prices: dict) -> None:
+        self.prices = prices
+        self.calls: List[str] = []
+
+    async def __call__(self, secid: str):
+        self.calls.append(secid)
+        price: Optional[float] = self.prices.get(secid)
+        return (price, None, None, None)
+
+
+def _service(prices: dict, max_keys: int = 1024):
+    service = qs.QuoteService(max_keys=max_keys)
+    fetch = _FakeFetch(prices)
+    service._fetch_one = fetch
+    return service, fetch
+
+
+def _age(service, secid: str, seconds: float) -> None:
+    service._cache[secid].fetched_at -= seconds
+
+
+# ============================================================
+# Tests
+# ============================================================
+def test_cache_and_lock_maps_are_bounded():
+    """查过的 secid 超过容量后按 LRU 淘汰，锁表同样有上限"""
+    service, _ = _service({f"1.{i}": float(i) for i in range(10)}, max_keys=4)
+    for i in range(10):
+        asyncio.run(service.get_quote(f"1.{i}"))
+    assert list(service._cache) == ["1.6", "1.7", "1.8", "1.9"]
+    assert len(service._locks) <= 4
+    assert service.stats()["evictions"] == 6
+    assert service._lock_refs == {}
+
+
+def test_lock_handed_to_waiter_is_not_evicted():
+    """锁释放后、排队的协程还没跑到时，淘汰不能换掉这把锁，否则同一 secid 会有两个协程同时进临界区"""
+    service, _ = _service({}, max_keys=2)
+    inside: List[str] = []
+    overlaps: List[str] = []
+
+    async def enter(secid: str, hold: Optional[asyncio.Event] = None) -> None:
+        async with service._key_lock(secid):
+            if secid in inside:
+                overlaps.append(secid)
+            inside.append(secid)
+            if hold is not None:
+                await hold.wait()
+            else:
+                await asyncio.sleep(0)
+            inside.remove(secid)
+
+    async def first(hold: asyncio.Event) -> None:
+        await enter("1.0", hold)
+        # 刚放掉 1.0，排队的 second 已被唤醒但还没跑：紧接着查别的股票触发淘汰，再回来拿 1.0
+        for secid in ("1.1", "1.2", "1.3"):
+            async with service._key_lock(secid):
+                pass
+        await enter("1.0")
+
+    async def run() -> None:
+        hold = asyncio.Event()
+        a = asyncio.create_task(first(hold))
+        await asyncio.sleep(0)
+        b = asyncio.create_task(enter("1.0"))
+        await asyncio.sleep(0)
+        hold.set()
+        await asyncio.gather(a, b)
+
+    asyncio.run(run())
+    assert overlaps == []
+    assert len(service._locks) <= 2 and service._lock_refs == {}
+
+
+def test_recently_read_entry_survives_eviction():
+    """命中会刷新 LRU 位置"""
+    service, _ = _service({f"1.{i}": 1.0 for i in range(5)}, max_keys=3)
+    for secid in ("1.0", "1.1", "1.2"):
+        asyncio.run(service.get_quote(secid))
+    asyncio.run(service.get_quote("1.0"))
+    asyncio.run(service.get_quote("1.3"))
+    assert "1.0" in service._cache and "1.1" not in service._cache
+
+
+def test_held_quotes_never_block_after_ttl():
+    """常驻持仓过了 TTL 仍直接返回缓存，不再打网络；staleness 反映报价年龄"""
+    service, fetch = _service({"0.000001": 10.0, "1.600000": 20.0})
+    assert asyncio.run(service.refresh_held(["0.000001"], interval=120)) == 1
+    asyncio.run(service.get_quote("1.600000"))
+    _age(service, "0.000001", 300)
+    _age(service, "1.600000", 300)
+    fetch.calls.clear()
+
+    entry = asyncio.run(service.get_quote_detail("0.000001"))
+    assert entry is not None and entry.price == 10.0
+    assert entry.staleness >= 300
+    assert fetch.calls == []
+
+    # 非持仓过期照常穿透
+    asyncio.run(service.get_quote("1.600000"))
+    assert fetch.calls == ["1.600000"]
+
+
+def test_held_quotes_older_than_cap_are_refetched():
+    """常驻报价超过「刷新间隔 × 倍数」就不再复用；刷新任务停了清常驻后按普通 TTL"""
+    service, fetch = _service({"0.000001": 10.0, "1.600000": 20.0})
+    asyncio.run(service.refresh_held(["0.000001", "1.600000"], interval=30))
+    cap = qs.QUOTE_HELD_STALENESS_FACTOR * 30
+    _age(service, "0.000001", cap + 1)
+    fetch.calls.clear()
+
+    fetch.prices["0.000001"] = 11.0
+    assert asyncio.run(service.get_quote("0.000001")) == 11.0
+    assert fetch.calls == ["0.000001"]
+
+    service.release_held()
+    _age(service, "1.600000", qs.QUOTE_CACHE_TTL + 1)
+    assert asyncio.run(service.get_quote("1.600000")) == 20.0
+    assert fetch.calls == ["0.000001", "1.600000"]
+    assert service.stats()["held_keys"] == 0
+
+
+def test_forced_refresh_leaves_held_set_alone():
+    """收盘快照的强制重拉不替换常驻集合；失败的 secid 不算新报价"""
+    service, fetch = _service({"0.000001": 10.0, "1.600000": 20.0})
+    asyncio.run(service.refresh_held(["0.000001"]))
+    fetch.prices["0.000001"] = 10.5
+    refreshed = asyncio.run(service.refresh(["1.600000", "0.000001", "1.999999"]))
+    assert {s: e.price for s, e in refreshed.items()} == {"1.600000": 20.0, "0.000001": 10.5}
+    assert list(service.held_quotes()) == ["0.000001"]
+
+
+def test_held_entries_are_not_evicted():
+    service, _ = _service({f"1.{i}": 1.0 for i in range(6)}, max_keys=2)
+    asyncio.run(service.refresh_held(["1.0"]))
+    for i in range(1, 6):
+        asyncio.run(service.get_quote(f"1.{i}"))
+    assert "1.0" in service._cache
+
+
+def test_refresh_keeps_last_good_price_and_drops_sold_symbols():
+    """刷新失败保留上一条有效报价；清仓后的 secid 退出常驻"""
+    service, fetch = _service({"1.600000": 20.0})
+    asyncio.run(service.refresh_held(["1.600000"]))
+    del fetch.prices["1.600000"]
+    assert asyncio.run(service.refresh_held(["1.600000"])) == 0
+    assert asyncio.run(service.get_quote("1.600000")) == 20.0
+
+    assert list(service.held_quotes()) == ["1.600000"]
+
+    asyncio.run(service.refresh_held([]))
+    assert service.held_quotes() == {}
+    _age(service, "1.600000", 300)
+    assert asyncio.run(service.get_quote("1.600000")) is None
+
+
+def test_batch_dedupes_and_returns_entries():
+    service, fetch = _service({"1.1": 1.0, "1.2": 2.0})
+    details = asyncio.run(service.get_details_batch(["1.1", "1.2", "1.1"]))
+    assert sorted(fetch.calls) == ["1.1", "1.2"]
+    assert details["1.2"] is not None and details["1.2"].price == 2.0
+    assert details["1.1"] is not None and details["1.1"].staleness < qs.QUOTE_CACHE_TTL
@@ -0,0 +1,108 @@
+"""AI 模拟盘离线调参单测：参数空间展开、memmap 共享面板、结果表续跑。"""
+
+import sys
+import importlib.util
+from types import ModuleType
+from pathlib import Path
+
+import numpy as np
+from kline_fixtures import make_klines
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent.parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+PKG_ROOT = Path(__file__).resolve().parent.parent / "SayuStock"
+PKG_NAME = "_papertrade_sweep_test"
+
+
+def _ensure_pkg():
+    if PKG_NAME in sys.modules:
+        return
+    pkg_spec = importlib.util.spec_from_file_location(
+        PKG_NAME,
+        PKG_ROOT / "__init__.py",
+        submodule_search_locations=[str(PKG_ROOT)],
+    )
+    assert pkg_spec is not None
+    pkg = importlib.util.module_from_spec(pkg_spec)
+    pkg.__path__ = [str(PKG_ROOT)]
+    sys.modules[PKG_NAME] = pkg
+    sub_spec = importlib.util.spec_from_file_location(
+        f"{PKG_NAME}.stock_papertrade",
+        PKG_ROOT / "stock_papertrade" / "__init__.py",
+        submodule_search_locations=[str(PKG_ROOT / "stock_papertrade")],
+    )
+    assert sub_spec is not None
+    sub = importlib.util.module_from_spec(sub_spec)
+    sub.__path__ = [str(PKG_ROOT / "stock_papertrade")]
+    sys.modules[f"{PKG_NAME}.stock_papertrade"] = sub
+
+
+def _load(name: str, file_name: str) -> ModuleType:
+    _ensure_pkg()
+    spec = importlib.util.spec_from_file_location(
+        f"{PKG_NAME}.stock_papertrade.{name}",
+        PKG_ROOT / "stock_papertrade" / file_name,
+    )
+    assert spec is not None and spec.loader is not None
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = mod
+    spec.loader.exec_module(mod)
+    return mod
+
+
+ind = _load("indicators", "indicators.py")
+sw = _load("sweep", "sweep.py")
+
+
+def _panel(symbols: int = 4, bars: int = 260):
+    frames = {f"{600000 + i}": ind.klines_to_df(make_klines(bars, seed=i)) for i in range(symbols)}
+    return sys.modules[f"{PKG_NAME}.stock_papertrade.backtest"].BarPanel.from_frames(frames)
+
+
+def test_grid_and_random_space():
+    combos = sw.grid({"lookback_m": [40, 60, 80], "bottom_pct": [0.1, 0.2]})
+    assert len(combos) == 6 and {"lookback_m": 80, "bottom_pct": 0.2} in combos
+
+    space = {"lookback_m": (20, 120), "bottom_pct": (0.05, 0.3), "require_bullish_close": [True, False]}
+    drawn = sw.random_space(space, 20, seed=1)
+    assert drawn == sw.random_space(space, 20, seed=1)
+    assert all(20 <= c["lookback_m"] <= 120 and isinstance(c["lookback_m"], int) for c in drawn)
+    assert all(0.05 <= c["bottom_pct"] <= 0.3 for c in drawn)
+
+
+def test_shared_panel_is_a_read_only_view(tmp_path):
+    panel = _panel()
+    shared = sw.open_shared_panel(sw.share_panel(panel, tmp_path))
+    assert (shared.dates == panel.dates).all() and shared.codes == panel.codes
+    assert np.array_equal(shared.close.to_numpy(), panel.close.to_numpy(), equal_nan=True)
+    assert shared.turnover is not None
+    view = shared.close.to_numpy()
+    assert not view.flags.writeable
+    while view is not None and not isinstance(view, np.memmap):
+        view = view.base
+    assert view is not None
+
+
+def test_sweep_resumes_from_existing_table(tmp_path, monkeypatch):
+    calls = []
+    real = sw.run_backtest
+
+    def counting(panel, strategy_id, params, **kwargs):
+        calls.append(dict(params))
+        return real(panel, strategy_id, params, **kwargs)
+
+    monkeypatch.setattr(sw, "run_backtest", counting)
+    panel = _panel()
+    out = tmp_path / "sweep.csv"
+
+    first = sw.grid({"lookback_m": [40, 60], "vol_ratio_min": [1.5]})
+    table = sw.run_sweep(panel, "volume_extremum", first, out, workers=1)
+    assert len(table) == 2 and len(calls) == 2
+
+    calls.clear()
+    more = sw.grid({"lookback_m": [40, 60, 80], "vol_ratio_min": [1.5]})
+    table = sw.run_sweep(panel, "volume_extremum", more, out, workers=1)
+    assert calls == [{"lookback_m": 80, "vol_ratio_min": 1.5}]
+    assert len(table) == 3 and table["combo_id"].is_unique
+    assert list(table["total_pnl_pct"]) == sorted(table["total_pnl_pct"], reverse=True)
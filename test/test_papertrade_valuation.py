@@ -0,0 +1,228 @@
+"""AI 模拟盘轮次估值备忘单测：同轮复用、并发合并、按 root_task_id 归轮、成交后失效。"""
+
+import sys
+import asyncio
+import importlib.util
+from types import ModuleType
+from pathlib import Path
+from datetime import datetime, timedelta
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent.parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+PKG_ROOT = Path(__file__).resolve().parent.parent / "SayuStock"
+PKG_NAME = "_papertrade_valuation_test"
+
+
+def _ensure_pkg():
+    if PKG_NAME in sys.modules:
+        return
+    pkg_spec = importlib.util.spec_from_file_location(
+        PKG_NAME,
+        PKG_ROOT / "__init__.py",
+        submodule_search_locations=[str(PKG_ROOT)],
+    )
+    assert pkg_spec is not None
+    pkg = importlib.util.module_from_spec(pkg_spec)
+    pkg.__path__ = [str(PKG_ROOT)]
+    sys.modules[PKG_NAME] = pkg
+    sub_spec = importlib.util.spec_from_file_location(
+        f"{PKG_NAME}.stock_papertrade",
+        PKG_ROOT / "stock_papertrade" / "__init__.py",
+        submodule_search_locations=[str(PKG_ROOT / "stock_papertrade")],
+    )
+    assert sub_spec is not None
+    sub = importlib.util.module_from_spec(sub_spec)
+    sub.__path__ = [str(PKG_ROOT / "stock_papertrade")]
+    sys.modules[f"{PKG_NAME}.stock_papertrade"] = sub
+
+
+def _load(name: str, file_name: str) -> ModuleType:
+    _ensure_pkg()
+    spec = importlib.util.spec_from_file_location(
+        f"{PKG_NAME}.stock_papertrade.{name}",
+        PKG_ROOT / "stock_papertrade" / file_name,
+    )
+    assert spec is not None and spec.loader is not None
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = mod
+    spec.loader.exec_module(mod)
+    return mod
+
+
+valuation = _load("valuation", "valuation.py")
+trade_executor = _load("trade_executor", "trade_executor.py")
+db = valuation.db
+models = sys.modules[f"{PKG_NAME}.utils.database.papertrade_models"]
+
+
+class _Ledger:
+    """替身账本：记下读持仓 / 拉报价的次数。"""
+
+    def __init__(self):
+        self.account = models.SayuPaperAccount(
+            id=1, name="测试盘", group_id="g", bot_id="b", cash=50_000.0, initial_cash=100_000.0
+        )
+        stale = datetime.now() - timedelta(hours=1)
+        self.positions = [
+            models.SayuPaperPosition(
+                account_id=1,
+                stock_code="600000",
+                stock_name="浦发银行",
+                secid="1.600000",
+                qty=1000,
+                avg_cost=10.0,
+                last_quote_price=10.2,
+                last_quote_at=stale,
+            ),
+            # 拉不到报价：按库里旧报价兜底
+            models.SayuPaperPosition(
+                account_id=1,
+                stock_code="000001",
+                stock_name="平安银行",
+                secid="0.000001",
+                qty=500,
+                avg_cost=12.0,
+                last_quote_price=11.0,
+                last_quote_at=stale,
+            ),
+        ]
+        self.prices = {"1.600000": 11.0}
+        self.position_reads = 0
+        self.quote_calls = 0
+
+    def install(self, monkeypatch):
+        async def get_by_id(account_id):
+            return self.account
+
+        async def list_by_account(account_id):
+            self.position_reads += 1
+            await asyncio.sleep(0)
+            return list(self.positions)
+
+        async def bulk_set_quote(writes, account_id):
+            return len(writes)
+
+        async def upsert(account_id, **kwargs):
+            return self.positions[0]
+
+        async def get_quotes_batch(secids):
+            self.quote_calls += 1
+            await asyncio.sleep(0)
+            return {s: self.prices.get(s) for s in secids}
+
+        monkeypatch.setattr(db.PaperAccountRepo, "get_by_id", staticmethod(get_by_id))
+        monkeypatch.setattr(db.PaperPositionRepo, "list_by_account", staticmethod(list_by_account))
+        monkeypatch.setattr(db.PaperPositionRepo, "bulk_set_quote", staticmethod(bulk_set_quote))
+        monkeypatch.setattr(db.PaperPositionRepo, "upsert", staticmethod(upsert))
+        monkeypatch.setattr(valuation.quote_service, "get_quotes_batch", get_quotes_batch)
+        return self
+
+
+# ============================================================
+# 估值口径
+# ============================================================
+def test_compute_valuation_totals_and_quote_snapshot(monkeypatch):
+    ledger = _Ledger().install(monkeypatch)
+    val = asyncio.run(valuation.compute_valuation(1))
+
+    sources = [e["quote_source"] for _, e in val.positions]
+    assert sources == ["live", "db"]
+    assert val.position_value == 11_000.0 + 5_500.0
+    assert val.total_unrealized_pnl == 1_000.0 - 500.0
+    assert val.total_equity == 50_000.0 + 16_500.0
+    assert val.quote_stale_count == 1
+    # 超龄没拉到的旧报价不进报价快照（收盘快照据此计 stale）
+    assert val.quotes == {"1.600000": 11.0}
+    assert (ledger.position_reads, ledger.quote_calls) == (1, 1)
+
+
+# ============================================================
+# 轮次复用
+# ============================================================
+async def _within_round():
+    with valuation.valuation_round("kick") as rnd:
+        first = await valuation.get_valuation(1)
+        again, parallel = await asyncio.gather(valuation.get_valuation(1), valuation.get_valuation(1))
+        # 嵌套不另起一轮
+        with valuation.valuation_round() as inner:
+            nested = await valuation.get_valuation(1)
+    return rnd, inner, first, again, parallel, nested
+
+
+def test_round_computes_once_and_coalesces(monkeypatch):
+    ledger = _Ledger().install(monkeypatch)
+    rnd, inner, first, again, parallel, nested = asyncio.run(_within_round())
+
+    assert inner is rnd
+    assert first is again is parallel is nested
+    assert (ledger.position_reads, ledger.quote_calls) == (1, 1)
+    assert (rnd.stats.computed, rnd.stats.reused) == (1, 3)
+
+    # 不在任何轮次里：每次现算
+    before = valuation.STATS.uncached
+    asyncio.run(valuation.get_valuation(1))
+    asyncio.run(valuation.get_valuation(1))
+    assert valuation.STATS.uncached == before + 2 and ledger.quote_calls == 3
+
+
+def test_keyed_round_expires_when_idle(monkeypatch):
+    _Ledger().install(monkeypatch)
+
+    async def run():
+        first = await valuation.get_valuation(1, round_key="root_a")
+        same = await valuation.get_valuation(1, round_key="root_a")
+        other = await valuation.get_valuation(1, round_key="root_b")
+        valuation.current_round("root_a").touched -= valuation.ROUND_IDLE_SECONDS + 1
+        fresh = await valuation.get_valuation(1, round_key="root_a")
+        aged = await valuation.get_valuation(1, round_key="root_a", max_age_seconds=0.0)
+        return first, same, other, fresh, aged
+
+    first, same, other, fresh, aged = asyncio.run(run())
+    assert same is first
+    assert other is not first
+    assert fresh is not first
+    assert aged is not fresh
+
+
+def test_memo_older_than_quote_ttl_is_recomputed(monkeypatch):
+    """AI 工具按报价 TTL 传 max_age_seconds：备忘超龄就重算，不把旧价当 live 返回"""
+    ledger = _Ledger().install(monkeypatch)
+
+    async def run():
+        first = await valuation.get_valuation(1, round_key="root_ttl", max_age_seconds=60.0)
+        valuation.current_round("root_ttl")._memo[1].computed_at -= 61
+        again = await valuation.get_valuation(1, round_key="root_ttl", max_age_seconds=60.0)
+        return first, again
+
+    first, again = asyncio.run(run())
+    assert again is not first and ledger.quote_calls == 2
+    assert again.valued_at >= first.valued_at
+
+
+# ============================================================
+# 失效
+# ============================================================
+async def _trade_in_round():
+    executor = trade_executor.PaperTradeExecutor()
+    with valuation.valuation_round() as rnd:
+        before = await valuation.get_valuation(1)
+        await executor.update_position(
+            account_id=1, stock_code="600000", stock_name="浦发银行", secid="1.600000", qty=2000, avg_cost=10.5
+        )
+        after = await valuation.get_valuation(1)
+        again = await valuation.get_valuation(1)
+        # 别的盘成交不影响本盘
+        valuation.invalidate(2)
+        untouched = await valuation.get_valuation(1)
+    return rnd, before, after, again, untouched
+
+
+def test_executor_invalidates_account_valuation(monkeypatch):
+    ledger = _Ledger().install(monkeypatch)
+    rnd, before, after, again, untouched = asyncio.run(_trade_in_round())
+
+    assert after is not before
+    assert again is after is untouched
+    assert (rnd.stats.computed, rnd.stats.reused, rnd.stats.invalidated) == (2, 2, 1)
+    assert ledger.position_reads == 2
@@ -0,0 +1,175 @@
+"""热门图预渲染：频次排序、命中 / 过期、AI 文字补发、预算与失败处理、指标。"""
+
+from __future__ import annotations
+
+import time
+import asyncio
+
+import pytest
+
+from SayuStock.utils import prerender
+from SayuStock.utils.prerender import Prerenderer, PrerenderKey
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> _Clock:
+    return _Clock()
+
+
+@pytest.fixture
+def sent(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    got: list[str] = []
+    monkeypatch.setattr(prerender, "_ai_return", got.append)
+    return got
+
+
+def _service(clock: _Clock, calls: list[tuple[str, ...]]) -> Prerenderer:
+    service = Prerenderer(ttl=lambda: 180.0, clock=clock)
+
+    async def render(*args: str) -> bytes | str:
+        calls.append(args)
+        if args and args[0] == "坏":
+            return "数据获取失败"
+        prerender.ai_return(f"文字:{' '.join(args)}")
+        return f"图:{' '.join(args)}".encode()
+
+    service.register("个股", render)
+    return service
+
+
+def test_top_targets_follow_request_frequency(clock: _Clock, sent: list[str]) -> None:
+    service = _service(clock, [])
+    for args, n in ((("a",), 1), (("b",), 3), (("c",), 2)):
+        for _ in range(n):
+            asyncio.run(service.serve("个股", *args))
+    assert service.top(2) == [PrerenderKey("个股", ("b",)), PrerenderKey("个股", ("c",))]
+    assert service.stats.misses == 6 and service.stats.hits == 0
+
+
+def test_warmed_entry_is_served_until_stale(clock: _Clock, sent: list[str]) -> None:
+    calls: list[tuple[str, ...]] = []
+    service = _service(clock, calls)
+    asyncio.run(service.serve("个股", "x"))
+    assert asyncio.run(service.warm(5, 30)) == 1
+    calls.clear()
+    sent.clear()
+
+    clock.now += 60
+    assert asyncio.run(service.serve("个股", "x")) == b"\xe5\x9b\xbe:x"
+    assert calls == []
+    # 命中时补发预渲染时录下的 AI 文字
+    assert sent == ["文字:x"]
+    assert service.stats.hits == 1
+    assert service.stats.mean_stale_seconds == pytest.approx(60)
+
+    # 有效期 = 窗口 180 + 预算 30 + 调度间隔 60
+    clock.now += 200
+    assert service.fresh_entry(PrerenderKey("个股", ("x",))) is not None
+    clock.now += 10
+    asyncio.run(service.serve("个股", "x"))
+    assert calls == [("x",)]
+    assert service.stats.hit_ratio == pytest.approx(1 / 3)
+    assert service.stats.stale_seconds_max == pytest.approx(60)
+
+
+def test_entry_outlives_warm_cadence(clock: _Clock, sent: list[str]) -> None:
+    service = Prerenderer(ttl=lambda: 180.0, clock=clock)
+    # 每次重渲染开始时，该目标上一轮的结果是否还能命中
+    still_fresh: list[bool] = []
+
+    async def slow(*args: str) -> bytes:
+        if service._last_warm is not None and service.stats.warm_runs:
+            still_fresh.append(service.fresh_entry(PrerenderKey("云图", args)) is not None)
+        clock.now += 20
+        return b"img"
+
+    service.register("云图", slow)
+    for name in ("a", "b", "c"):
+        asyncio.run(service.serve("云图", name))
+    asyncio.run(service.warm(3, 60))
+
+    # 窗口满后定时任务晚一拍才触发，新一轮排在最后的目标直到被替换都不断档
+    clock.now = service._last_warm + 180 + 59
+    assert service.due()
+    assert asyncio.run(service.warm(3, 60)) == 3
+    assert still_fresh == [True, True, True]
+
+
+def test_error_results_are_not_stored(clock: _Clock, sent: list[str]) -> None:
+    service = _service(clock, [])
+    asyncio.run(service.serve("个股", "坏"))
+    assert asyncio.run(service.warm(5, 30)) == 0
+    assert service.stats.warm_failures == 1
+    assert service.fresh_entry(PrerenderKey("个股", ("坏",))) is None
+
+
+def test_budget_defers_remaining_targets(clock: _Clock, sent: list[str]) -> None:
+    service = Prerenderer(ttl=lambda: 180.0, clock=clock)
+
+    calls: list[str] = []
+
+    async def slow(*args: str) -> bytes:
+        calls.extend(args)
+        clock.now += 20
+        return b"img"
+
+    service.register("云图", slow)
+    for name in ("a", "b", "c"):
+        asyncio.run(service.serve("云图", name))
+    calls.clear()
+    assert asyncio.run(service.warm(3, 30)) == 2
+    assert service.stats.budget_skips == 1 and calls == ["a", "b"]
+
+    # 下一轮先补上轮没轮到的 c
+    clock.now += 180
+    assert asyncio.run(service.warm(3, 30)) == 2
+    assert calls[2:] == ["c", "a"] and service.fresh_entry(PrerenderKey("云图", ("c",))) is not None
+    assert service.stats.budget_skips == 2
+
+
+def test_budget_interrupts_slow_render(clock: _Clock, sent: list[str]) -> None:
+    service = Prerenderer(ttl=lambda: 180.0, clock=time.monotonic)
+
+    async def render(*args: str) -> bytes:
+        if args == ("慢",):
+            await asyncio.sleep(5)
+        return b"img"
+
+    service.register("云图", render)
+    for name in ("慢", "慢", "快"):
+        asyncio.run(service.serve("云图", name))
+    start = time.monotonic()
+    assert asyncio.run(service.warm(2, 0.2)) == 0
+    assert time.monotonic() - start < 2
+    # 被打断的慢目标排到下一轮最后，快的先画
+    assert service._deferred == [PrerenderKey("云图", ("快",)), PrerenderKey("云图", ("慢",))]
+
+
+def test_due_and_decay(clock: _Clock, sent: list[str]) -> None:
+    service = _service(clock, [])
+    assert service.due()
+    asyncio.run(service.serve("个股", "old"))
+    asyncio.run(service.warm(5, 30))
+    assert not service.due()
+    clock.now += 180
+    assert service.due()
+
+    # 旧热点每轮衰减，新请求很快超过它；掉出前 N 的结果随之丢弃
+    asyncio.run(service.serve("个股", "new"))
+    asyncio.run(service.warm(1, 30))
+    assert service.top(1) == [PrerenderKey("个股", ("new",))]
+    assert service.fresh_entry(PrerenderKey("个股", ("old",))) is None
+
+
+def test_untracked_commands_are_ignored_by_top(clock: _Clock, sent: list[str]) -> None:
+    service = _service(clock, [])
+    service.record(PrerenderKey("未登记", ()))
+    assert service.top(5) == []
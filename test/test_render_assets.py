@@ -0,0 +1,109 @@
+"""渲染素材层：字体 / 纹理只加载一次，静态底图给拷贝且有上限，贴图助手位置正确。"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from SayuStock.utils import render_assets
+from SayuStock.utils.render_assets import (
+    FOOTER_PATH,
+    font,
+    stamp,
+    texture,
+    stamp_grid,
+    stamp_rows,
+    clear_assets,
+    static_layer,
+    texture_copy,
+)
+
+TEXT_PATH = Path(render_assets.__file__).parent.parent / "stock_info" / "texture2d"
+
+
+@pytest.fixture(autouse=True)
+def _fresh_assets():
+    clear_assets()
+    yield
+    clear_assets()
+
+
+def test_font_and_texture_are_loaded_once() -> None:
+    assert font(30) is font(30)
+    assert font(30) is not font(24)
+    assert texture(FOOTER_PATH) is texture(FOOTER_PATH)
+
+
+def test_texture_copy_is_private() -> None:
+    shared = texture(TEXT_PATH / "myup.png")
+    before = shared.tobytes()
+    bar = texture_copy(TEXT_PATH / "myup.png")
+    bar.paste((255, 255, 255, 255), (0, 0, bar.width, bar.height))
+    assert shared.tobytes() == before
+
+    rgba = texture_copy(TEXT_PATH / "bg1.jpg", "RGBA")
+    assert rgba.mode == "RGBA"
+    assert texture(TEXT_PATH / "bg1.jpg").mode != "RGBA"
+
+
+def test_static_layer_builds_once_and_returns_copies() -> None:
+    calls: list[int] = []
+
+    def build() -> Image.Image:
+        calls.append(1)
+        return Image.new("RGBA", (8, 8), (7, 9, 27, 255))
+
+    first = static_layer("k", build)
+    first.paste((255, 0, 0, 255), (0, 0, 8, 8))
+    second = static_layer("k", build)
+    assert len(calls) == 1
+    assert second.getpixel((0, 0)) == (7, 9, 27, 255)
+
+
+def test_static_layer_evicts_least_recent() -> None:
+    built: list[int] = []
+
+    def builder(i: int):
+        def build() -> Image.Image:
+            built.append(i)
+            return Image.new("L", (1, 1), i)
+
+        return build
+
+    limit = render_assets._STATIC_LAYER_MAX
+    for i in range(limit):
+        static_layer(i, builder(i))
+    static_layer(0, builder(0))  # 0 变成最近使用
+    static_layer(limit, builder(limit))  # 挤掉 1
+    built.clear()
+    static_layer(0, builder(0))
+    static_layer(1, builder(1))
+    assert built == [1]
+
+
+def test_stamp_helpers_match_manual_paste() -> None:
+    tiles = [Image.new("RGBA", (20, 10), (i * 30, 0, 0, 128 + i * 10)) for i in range(6)]
+
+    expected = Image.new("RGBA", (100, 100), (7, 9, 27, 255))
+    for i, tile in enumerate(tiles):
+        expected.paste(tile, (5 + 30 * (i % 3), 7 + 15 * (i // 3)), tile)
+    grid = Image.new("RGBA", (100, 100), (7, 9, 27, 255))
+    stamp_grid(grid, tiles, 5, 7, cols=3, dx=30, dy=15)
+    assert np.array_equal(np.asarray(grid), np.asarray(expected))
+
+    expected = Image.new("RGBA", (100, 100), (7, 9, 27, 255))
+    for i, tile in enumerate(tiles):
+        expected.paste(tile, (3, 2 + 12 * i), tile)
+    rows = Image.new("RGBA", (100, 100), (7, 9, 27, 255))
+    stamp_rows(rows, tiles, 3, 2, 12)
+    assert np.array_equal(np.asarray(rows), np.asarray(expected))
+
+
+def test_stamp_without_alpha_overwrites() -> None:
+    canvas = Image.new("RGBA", (4, 4), (0, 0, 0, 255))
+    stamp(canvas, Image.new("RGB", (2, 2), (1, 2, 3)), (1, 1))
+    assert canvas.getpixel((1, 1)) == (1, 2, 3, 255)
+    assert canvas.getpixel((0, 0)) == (0, 0, 0, 255)
@@ -0,0 +1,108 @@
+"""出图内容哈希缓存：键的稳定性 / 敏感性，内存 LRU 与磁盘层。"""
+
+from __future__ import annotations
+
+import os
+import asyncio
+from pathlib import Path
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from SayuStock.utils.render_data import CompareStockItem, CompareRenderData
+from SayuStock.utils.market.enums import AssetClass, KlinePeriod
+from SayuStock.utils.render_cache import RenderCache, stable_hash
+from SayuStock.utils.market.models import Bar, SymbolRef, KlineSeries
+
+
+def _series(close: float = 10.0) -> KlineSeries:
+    bar = Bar(
+        ts=datetime(2026, 7, 23),
+        open=10.0,
+        high=10.5,
+        low=9.5,
+        close=close,
+        volume=1000.0,
+        amount=None,
+        amplitude=None,
+        change_pct=float("nan"),
+        change_amount=None,
+        turnover_rate=1.2,
+    )
+    symbol = SymbolRef("600000", "浦发银行", AssetClass.EQUITY, "SSE", "1.600000")
+    return KlineSeries(symbol=symbol, period=KlinePeriod.D1, bars=(bar,), adjusted=True)
+
+
+def test_stable_hash_equal_inputs_equal_keys() -> None:
+    assert stable_hash("kline", _series()) == stable_hash("kline", _series())
+    assert len(stable_hash(_series())) == 32
+
+
+def test_stable_hash_sensitive_to_values_and_kind() -> None:
+    base = stable_hash("kline", _series())
+    assert stable_hash("kline", _series(close=10.01)) != base
+    assert stable_hash("compare", _series()) != base
+    assert stable_hash(1) != stable_hash(1.0) != stable_hash("1")
+
+
+def test_stable_hash_render_data_with_dataframe() -> None:
+    df = pd.DataFrame({"日期": pd.date_range("2026-01-01", periods=3), "收盘": [1.0, np.nan, 3.0]})
+    first = CompareRenderData(items=[CompareStockItem(name="甲", df=df)])
+    second = CompareRenderData(items=[CompareStockItem(name="甲", df=df.copy())])
+    assert stable_hash(first) == stable_hash(second)
+    changed = df.copy()
+    changed.loc[2, "收盘"] = 3.5
+    assert stable_hash(CompareRenderData(items=[CompareStockItem(name="甲", df=changed)])) != stable_hash(first)
+
+
+def test_memory_lru_evicts_oldest(tmp_path: Path) -> None:
+    cache = RenderCache(tmp_path, memory_budget=10, max_entries=8)
+
+    async def run() -> None:
+        await cache.put("a", b"12345")
+        await cache.put("b", b"12345")
+        assert await cache.get("a") == b"12345"  # a 变成最新
+        await cache.put("c", b"12345")  # 超预算 → 淘汰最久未用的 b
+        assert "b" not in cache._memory and "a" in cache._memory and "c" in cache._memory
+
+    asyncio.run(run())
+
+
+def test_disk_tier_survives_new_instance(tmp_path: Path) -> None:
+    async def run() -> None:
+        await RenderCache(tmp_path).put("k", b"png-bytes")
+        fresh = RenderCache(tmp_path)
+        assert await fresh.get("k") == b"png-bytes"
+        assert fresh.disk_hits == 1
+        assert await fresh.get("k") == b"png-bytes"
+        assert fresh.hits == 1
+        assert await fresh.get("missing") is None
+        assert fresh.misses == 1
+
+    asyncio.run(run())
+    assert (tmp_path / "render_k.png").is_file()
+
+
+def test_disk_tier_is_capped_lru(tmp_path: Path) -> None:
+    async def run() -> None:
+        old = RenderCache(tmp_path)
+        await old.put("a", b"1234")
+        await old.put("b", b"1234")
+        # 让 a、b 的 mtime 有先后，再用新实例（按 mtime 重建顺序）读一次 a
+        os.utime(tmp_path / "render_a.png", (1_000, 1_000))
+        os.utime(tmp_path / "render_b.png", (2_000, 2_000))
+        cache = RenderCache(tmp_path, disk_budget=10, disk_max_files=8)
+        assert await cache.get("a") == b"1234"
+        assert (tmp_path / "render_a.png").stat().st_mtime > 2_000
+        # 超过 10 字节 → 删最久没用的 b，刚读过的 a 留下
+        await cache.put("c", b"1234")
+        assert not (tmp_path / "render_b.png").exists()
+        assert (tmp_path / "render_a.png").exists() and (tmp_path / "render_c.png").exists()
+        assert cache.disk_evictions == 1
+
+        counted = RenderCache(tmp_path, disk_max_files=2)
+        await counted.put("d", b"1")
+        assert sorted(p.name for p in tmp_path.glob("render_*")) == ["render_c.png", "render_d.png"]
+
+    asyncio.run(run())
@@ -0,0 +1,53 @@
+"""出图进程池单测：一个坏池上的多个失败只重建一次，不会拆掉别的任务刚建好的新池。"""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+from SayuStock.utils.constant import ErroText
+from SayuStock.utils.image_encode import EncodeOptions
+from SayuStock.stock_stockinfo.render_pool import RenderJob, RenderPool
+
+
+class _FakeExecutor:
+    """替身池：``submit`` 返回手动控制的 Future，记录被关了几次。"""
+
+    def __init__(self) -> None:
+        self.futures: list[Future] = []
+        self.shutdowns = 0
+
+    def submit(self, fn, *args) -> Future:
+        future: Future = Future()
+        self.futures.append(future)
+        return future
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False) -> None:
+        self.shutdowns += 1
+
+
+def test_stale_failures_do_not_tear_down_rebuilt_pool() -> None:
+    pool = RenderPool(size=2, timeout=0.2)
+    old, new = _FakeExecutor(), _FakeExecutor()
+    pool._executor = old  # type: ignore[assignment]
+    job = RenderJob("unknown", ())
+
+    async def run():
+        hung = asyncio.create_task(pool.render(job, EncodeOptions()))
+        await asyncio.sleep(0.1)
+        broken = asyncio.create_task(pool.render(job, EncodeOptions()))
+        await asyncio.sleep(0)
+        timed_out = await hung
+        # 第一个任务超时已把旧池丢掉；这时别的请求建好了新池
+        assert pool._executor is None
+        pool._executor = new  # type: ignore[assignment]
+        old.futures[1].set_exception(BrokenProcessPool("worker died"))
+        return timed_out, await broken
+
+    timed_out, fallback = asyncio.run(run())
+    assert timed_out == ErroText["renderTimeout"]
+    # 旧池上迟到的 BrokenProcessPool 只在线程里重画，不动新池
+    assert fallback == ErroText["notData"]
+    assert old.shutdowns == 1 and new.shutdowns == 0
+    assert pool._executor is new
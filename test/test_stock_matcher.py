@@ -0,0 +1,87 @@
+"""新闻 → 个股匹配单测：自动机与朴素扫描一致、最左最长消歧、代码边界、常用词不误标。"""
+
+from __future__ import annotations
+
+import random
+
+from SayuStock.utils.constant import chinese_stocks
+from SayuStock.utils.stock_matcher import AhoCorasick, StockMatcher, get_stock_matcher
+
+
+def _naive(patterns: dict[str, int], text: str) -> set[tuple[int, int, int]]:
+    out = set()
+    for pattern, value in patterns.items():
+        start = text.find(pattern)
+        while start >= 0:
+            out.add((start, start + len(pattern), value))
+            start = text.find(pattern, start + 1)
+    return out
+
+
+def test_automaton_finds_every_overlapping_match() -> None:
+    rng = random.Random(7)
+    alphabet = "abc"
+    patterns = {"".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))): i for i in range(40)}
+    patterns = {p: i for i, p in enumerate(patterns)}
+    ac = AhoCorasick(patterns)
+    for _ in range(50):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+        assert set(ac.iter_matches(text)) == _naive(patterns, text)
+
+
+def test_leftmost_longest_and_aliases() -> None:
+    matcher = StockMatcher(
+        {
+            "000001": {"name": "平安银行"},
+            "601318": {"name": "中国平安"},
+            "002463": {"name": "沪电股份"},
+            "600519": {"name": "贵州茅台"},
+        },
+        aliases={"平安": "601318", "茅台": "600519", "沪电": "002463"},
+    )
+    found = matcher.find("平安银行与中国平安齐涨，沪电扩产，茅台提价")
+    assert [(m.code, m.matched) for m in found] == [
+        ("000001", "平安银行"),
+        ("601318", "中国平安"),
+        ("002463", "沪电"),
+        ("600519", "茅台"),
+    ]
+    assert found[0].name == "平安银行" and (found[0].start, found[0].end) == (0, 4)
+    # 只剩别名时才落到别名
+    assert matcher.codes("平安") == ["601318"]
+
+
+def test_code_boundaries_and_dedup() -> None:
+    matcher = StockMatcher({"600519": {"name": "贵州茅台"}, "000001": {"name": "平安银行"}})
+    assert matcher.codes("茅台(600519)、平安银行000001 今日公告") == ["600519", "000001"]
+    # 紧挨数字 / 字母：是金额、单号，不是代码
+    assert matcher.codes("成交 16005190 手，订单 A600519") == []
+    assert matcher.codes("贵州茅台 600519 贵州茅台") == ["600519"]
+    assert matcher.tag_news([{"text": "000001 放量"}, {"desc": "贵州茅台"}, {}]) == [["000001"], ["600519"], []]
+
+
+def test_short_names_are_not_derived() -> None:
+    matcher = StockMatcher({"002463": {"name": "沪电股份"}, "600292": {"name": "武汉控股"}})
+    # 不从全称里去后缀派生简称，只认全称、代码和显式别名
+    assert matcher.codes("沪电扩产，武汉降雨") == []
+    assert matcher.codes("沪电股份扩产，武汉控股公告") == ["002463", "600292"]
+
+
+def test_generic_headlines_are_not_tagged() -> None:
+    matcher = get_stock_matcher({"茅台": "600519"})
+    for headline in (
+        "武汉发布暴雨预警，多只龙头股涨停",
+        "统一大市场建设提速",
+        "最美的风景在路上",
+        "北方地区迎来降温，标准化建设联合推进",
+        "城投债发行回暖，春天来了",
+    ):
+        assert matcher.codes(headline) == [], headline
+
+
+def test_full_universe_matcher() -> None:
+    matcher = get_stock_matcher({"茅台": "600519"})
+    assert matcher is get_stock_matcher({"茅台": "600519"})
+    assert len(matcher) >= 2 * len(chinese_stocks)
+    name = chinese_stocks["600000"]["name"]
+    assert matcher.codes(f"{name}公告：拟回购；茅台涨 2%，代码 600519") == ["600000", "600519"]
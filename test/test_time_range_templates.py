@@ -0,0 +1,65 @@
+"""分钟模板回归测试：缓存模板 + 向量平移与逐分钟生成结果逐项一致。"""
+
+from __future__ import annotations
+
+import datetime as dt
+
+from SayuStock.utils.time_range import (
+    MARKET_SESSIONS,
+    Market,
+    get_trading_minutes,
+    get_trading_datetimes,
+    _session_minute_offsets,
+    _generate_datetime_array,
+    _generate_datetime_array_with_base,
+)
+
+
+def _loop_reference(sessions: list[tuple[str, str]], base_day: dt.date) -> list[dt.datetime]:
+    """旧实现：逐分钟 strptime + timedelta。"""
+    out: list[dt.datetime] = []
+    base = dt.datetime.combine(base_day, dt.time(0, 0))
+    for start_str, end_str in sessions:
+        try:
+            start = dt.datetime.strptime(start_str, "%H:%M").replace(year=base.year, month=base.month, day=base.day)
+            end = dt.datetime.strptime(end_str, "%H:%M").replace(year=base.year, month=base.month, day=base.day)
+        except ValueError:
+            continue
+        if end <= start:
+            end += dt.timedelta(days=1)
+        while start <= end:
+            out.append(start)
+            start += dt.timedelta(minutes=1)
+    return list(dict.fromkeys(out))
+
+
+def test_templates_match_minute_loop_for_every_market() -> None:
+    for market, sessions in MARKET_SESSIONS.items():
+        assert _generate_datetime_array(sessions) == _loop_reference(sessions, dt.date(1900, 1, 1)), market
+        for day in (dt.date(2025, 3, 9), dt.date(2025, 12, 31), dt.date(2028, 2, 29)):
+            assert _generate_datetime_array_with_base(sessions, day) == _loop_reference(sessions, day), market
+
+
+def test_overlapping_and_invalid_sessions() -> None:
+    sessions = [("09:00", "10:00"), ("09:30", "10:30"), ("bad", "11:00"), ("23:50", "00:10")]
+    got = _generate_datetime_array_with_base(sessions, dt.date(2025, 1, 31))
+    assert got == _loop_reference(sessions, dt.date(2025, 1, 31))
+    assert got[-1] == dt.datetime(2025, 2, 1, 0, 10)
+    assert _generate_datetime_array([]) == []
+
+
+def test_string_views_and_template_cache() -> None:
+    a_share = MARKET_SESSIONS[Market.A_SHARE]
+    stamps = get_trading_datetimes("1.600519")
+    assert len(stamps) == 242
+    assert stamps[0] == "1900-01-01 09:30" and stamps[-1] == "1900-01-01 15:00"
+    assert get_trading_minutes("1.600519")[120:122] == ["11:30", "13:00"]
+    # 返回的是副本，调用方改了不污染缓存
+    stamps.clear()
+    assert len(get_trading_datetimes("1.600519")) == 242
+
+    night = get_trading_datetimes("rb2510")
+    assert night[0] == "1900-01-01 21:00" and night[-1] == "1900-01-02 02:30"
+
+    assert _session_minute_offsets(tuple(a_share)) is _session_minute_offsets(tuple(a_share))
+    assert not _session_minute_offsets(tuple(a_share)).flags.writeable
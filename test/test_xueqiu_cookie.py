@@ -0,0 +1,203 @@
+"""雪球 Cookie 管理单测：对着本地替身服务（发 Cookie、按假时钟过期、可整体吊销）跑。
+
+替身用 aiohttp 起在本机随机端口上：``/`` 相当于浏览器打开首页拿 Cookie，
+``/livenews`` 相当于快讯接口，Cookie 过期 / 被吊销时返回 ``400016``。
+"""
+
+import sys
+import json
+import asyncio
+import importlib.util
+from typing import Dict, Optional
+from pathlib import Path
+
+from aiohttp import ClientSession, web
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent.parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+_spec = importlib.util.spec_from_file_location(
+    "_xueqiu_cookie_test", Path(__file__).resolve().parent.parent / "SayuStock" / "utils" / "xueqiu_cookie.py"
+)
+assert _spec is not None and _spec.loader is not None
+xueqiu_cookie = importlib.util.module_from_spec(_spec)
+sys.modules[_spec.name] = xueqiu_cookie
+_spec.loader.exec_module(xueqiu_cookie)
+
+TTL = 3600.0
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _StandIn:
+    """本地替身：发 Cookie、按假时钟判断过期；``revoke`` 模拟服务端让所有旧 Cookie 失效。"""
+
+    def __init__(self, clock: _Clock, issue_delay: float = 0.05) -> None:
+        self.clock = clock
+        self.issue_delay = issue_delay
+        self.tokens: Dict[str, float] = {}
+        self.issued = 0
+        self.probes = 0
+        self.fail_next_issue = False
+        self.base = ""
+
+    async def home(self, request: web.Request) -> web.Response:
+        await asyncio.sleep(self.issue_delay)
+        if self.fail_next_issue:
+            self.fail_next_issue = False
+            return web.Response(status=503)
+        self.issued += 1
+        token = f"t{self.issued}"
+        self.tokens[token] = self.clock.now + TTL
+        return web.json_response({"cookie": f"xq_a_token={token}", "expires": self.tokens[token]})
+
+    async def livenews(self, request: web.Request) -> web.Response:
+        self.probes += 1
+        token = request.headers.get("Cookie", "").removeprefix("xq_a_token=")
+        if self.tokens.get(token, 0.0) <= self.clock.now:
+            return web.json_response({"error_code": "400016"})
+        return web.json_response({"items": []})
+
+    def revoke(self) -> None:
+        self.tokens.clear()
+
+    async def __aenter__(self) -> "_StandIn":
+        app = web.Application()
+        app.router.add_get("/", self.home)
+        app.router.add_get("/livenews", self.livenews)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+        self.base = f"http://127.0.0.1:{port}"
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self._runner.cleanup()
+
+    def manager(self, path: Optional[Path], **kwargs):
+        async def fetcher():
+            async with ClientSession() as client:
+                async with client.get(f"{self.base}/") as resp:
+                    resp.raise_for_status()
+                    data = await resp.json()
+            return data["cookie"], data["expires"]
+
+        async def probe(cookie: str) -> bool:
+            async with ClientSession() as client:
+                async with client.get(f"{self.base}/livenews", headers={"Cookie": cookie}) as resp:
+                    return (await resp.json()).get("error_code") != "400016"
+
+        kwargs.setdefault("refresh_margin", 600.0)
+        return xueqiu_cookie.XueqiuCookieManager(path, fetcher, probe, clock=self.clock, **kwargs)
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+# ============================================================
+# 落盘 / 重启
+# ============================================================
+def test_cookie_survives_restart_and_is_probed(tmp_path):
+    path = tmp_path / "xueqiu_cookie.json"
+
+    async def run():
+        clock = _Clock()
+        async with _StandIn(clock) as server:
+            applied = []
+            first = await server.manager(path, on_change=applied.append).get()
+            # "重启"：新实例读磁盘、探活通过，不再拿 Cookie
+            again = await server.manager(path).get()
+            # 服务端吊销了所有 Cookie：探活失败 → 刷新一次
+            server.revoke()
+            third = server.manager(path)
+            revoked = await third.get()
+            return server, first, again, revoked, applied, third
+
+    server, first, again, revoked, applied, third = _run(run())
+    assert first == again == "xq_a_token=t1" and applied == ["xq_a_token=t1"]
+    assert revoked == "xq_a_token=t2" and third.fetch_count == 1
+    assert server.issued == 2 and server.probes == 2
+    assert json.loads(path.read_text(encoding="utf-8"))["cookie"] == "xq_a_token=t2"
+
+
+def test_expired_file_is_not_reused(tmp_path):
+    path = tmp_path / "xueqiu_cookie.json"
+
+    async def run():
+        clock = _Clock()
+        async with _StandIn(clock) as server:
+            await server.manager(path).get()
+            clock.now += TTL + 1
+            cookie = await server.manager(path).get()
+            return server, cookie
+
+    server, cookie = _run(run())
+    # 过期的直接不载入，也就不用探活
+    assert cookie == "xq_a_token=t2" and server.issued == 2 and server.probes == 0
+
+
+# ============================================================
+# 并发 / 临期 / 失效
+# ============================================================
+def test_concurrent_callers_share_one_refresh():
+    async def run():
+        clock = _Clock()
+        async with _StandIn(clock) as server:
+            mgr = server.manager(None)
+            cookies = await asyncio.gather(*(mgr.get() for _ in range(20)))
+            # 都拿着 t1 去请求、都被报失效：只刷新一次，都拿到 t2
+            server.revoke()
+            renewed = await asyncio.gather(*(mgr.invalidate("xq_a_token=t1") for _ in range(20)))
+            # 晚到的失效报告（手上的已经是新的）不再刷新
+            late = await mgr.invalidate("xq_a_token=t1")
+            return server, mgr, cookies, renewed, late
+
+    server, mgr, cookies, renewed, late = _run(run())
+    assert set(cookies) == {"xq_a_token=t1"}
+    assert set(renewed) == {"xq_a_token=t2"} and late == "xq_a_token=t2"
+    assert server.issued == 2 and mgr.fetch_count == 2
+
+
+def test_refreshes_in_background_before_expiry():
+    async def run():
+        clock = _Clock()
+        async with _StandIn(clock, issue_delay=0.1) as server:
+            mgr = server.manager(None, refresh_margin=600.0)
+            await mgr.get()
+            clock.now += TTL - 300
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            current = await mgr.get()
+            waited = loop.time() - start
+            # 后台刷新期间再来的调用不会再起一次
+            assert await mgr.get() == current
+            await mgr._background
+            return server, mgr, current, waited
+
+    server, mgr, current, waited = _run(run())
+    assert current == "xq_a_token=t1" and waited < 0.1
+    assert mgr.cookie == "xq_a_token=t2" and server.issued == 2
+
+
+def test_failed_refresh_keeps_old_cookie():
+    async def run():
+        clock = _Clock()
+        async with _StandIn(clock) as server:
+            mgr = server.manager(None)
+            await mgr.get()
+            server.fail_next_issue = True
+            kept = await mgr.refresh("测试")
+            fresh = await mgr.refresh("测试")
+            return mgr, kept, fresh
+
+    mgr, kept, fresh = _run(run())
+    assert kept == "xq_a_token=t1" and fresh == "xq_a_token=t2" and mgr.fetch_count == 2